@@ -21,7 +21,12 @@ import os
 import shutil
 import inspect
 import importlib
-from typing import Union, List
+import json
+import hashlib
+import pickle
+from typing import Dict, Union, List, Optional, Tuple
+import numpy as np
+import pandas as pd
 from openmdao.core.explicitcomponent import ExplicitComponent
 from openmdao.core.implicitcomponent import ImplicitComponent
 from openmdao.core.indepvarcomp import IndepVarComp
@@ -29,13 +34,17 @@ from openmdao.core.group import Group
 from openmdao.core.system import System
 import openmdao.api as om
 from copy import deepcopy
+from functools import lru_cache
 from itertools import product
 from tempfile import TemporaryDirectory
 from pathlib import Path
 import tempfile
 from platform import system
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+import multiprocessing
 
-from fastoad.openmdao.variables import VariableList
+from fastoad.openmdao.variables import Variable, VariableList
 from fastoad.cmd.exceptions import FastFileExistsError
 from fastoad.openmdao.problem import FASTOADProblem
 from fastoad.io import DataFile, IVariableIOFormatter
@@ -51,8 +60,16 @@ from . import resources
 
 _LOGGER = logging.getLogger(__name__)
 
+# Arguments of the block analysis run by evaluate_many in a worker process, and the block analysis
+# itself once set up
+_WORKER_ARGUMENTS = None
+_WORKER_BLOCK_ANALYSIS = None
+
 SAMPLE_FILENAME = "fastga.yml"
 SAMPLE_XML_NAME = "fastga.xml"
+VARIABLE_DESCRIPTIONS_FILENAME = "variable_descriptions.txt"
+VARIABLE_DESCRIPTIONS_INDEX_FOLDER_PATH = pth.join(str(Path.home()), ".fast", "cache")
+FASTGA_PATH = pth.dirname(pth.dirname(pth.abspath(__file__)))
 BOOLEAN_OPTIONS = [
     "use_openvsp",
     "compute_mach_interpolation",
@@ -78,7 +95,7 @@ def file_temporary_transfer(file_path: str):
 
     tmp_folder = _create_tmp_directory()
     file_name = pth.split(file_path)[-1]
-    shutil.copy(file_path, pth.join(tmp_folder.name, file_name))
+    shutil.copy2(file_path, pth.join(tmp_folder.name, file_name))
     file = open(file_path, "r")
     lines = file.read()
     lines = lines.split("\n")
@@ -98,15 +115,281 @@ def file_temporary_transfer(file_path: str):
 
 
 def retrieve_original_file(tmp_folder, file_path: str):
-    # Retrieve the original file
+    # Retrieve the original file, with its modification time so that it is not seen as modified
 
     file_name = pth.split(file_path)[-1]
-    shutil.copy(pth.join(tmp_folder.name, file_name), file_path)
+    shutil.copy2(pth.join(tmp_folder.name, file_name), file_path)
 
     tmp_folder.cleanup()
 
 
-def generate_variables_description(subpackage_path: str, overwrite: bool = False):
+def _read_variable_descriptions(file_path: str) -> List[Tuple[str, str]]:
+    """
+    Reads a variable descriptions file.
+
+    :param file_path: path of the variable descriptions file
+    :return: list of the variable names and descriptions, descriptions being kept as written in
+    the file (with surrounding spaces and end of line)
+    """
+
+    variable_descriptions = []
+    with open(file_path, "r") as file:
+        for line in file:
+            if line[0] != "#" and len(line.split("||")) == 2:
+                variable_name, variable_description = line.split("||")
+                variable_descriptions.append((variable_name.replace(" ", ""), variable_description))
+
+    return variable_descriptions
+
+
+@lru_cache()
+def _get_default_propulsion_id() -> str:
+    """
+    :return: identifier of the first propulsion wrapper of FAST-GA, used to instantiate the
+    classes with a propulsion_id option
+    """
+
+    available_id_list = _get_simple_system_list()
+    idx_to_remove = []
+    for idx in range(len(available_id_list)):
+        available_id_list[idx] = available_id_list[idx][0]
+        if "PROPULSION" in available_id_list[idx]:
+            idx_to_remove.extend(list(range(idx + 1)))
+        if not ("fastga" in available_id_list[idx]):
+            idx_to_remove.append(idx)
+    idx_to_remove = list(dict.fromkeys(idx_to_remove))
+    for idx in sorted(idx_to_remove, reverse=True):
+        del available_id_list[idx]
+
+    return available_id_list[0]
+
+
+def _list_module_variables(file_path: str) -> Tuple[List[str], List[str], List[str]]:
+    """
+    Lists the variables of the classes of a python module of FAST-GA. If a class has boolean
+    options, all their alternatives are tested to ensure complete coverage of variables.
+
+    :param file_path: path of the python module
+    :return: names of the input variables, names of the output variables (including ivc outputs)
+    and paths of the FAST-GA files the classes of the module are defined in
+    """
+
+    root, name = pth.split(file_path)
+    input_names = []
+    output_names = []
+    source_files = [file_path]
+    spec = importlib.util.spec_from_file_location(name.replace(".py", ""), file_path)
+    module = importlib.util.module_from_spec(spec)
+    tmp_folder = None
+    # noinspection PyBroadException
+    try:
+        # if register decorator in module, temporary replace file removing decorators
+        # noinspection PyBroadException
+        try:
+            spec.loader.exec_module(module)
+        except:
+            _LOGGER.info("Trying to load {}, but it is not a module!".format(file_path))
+        if "RegisterOpenMDAOSystem" in dir(module):
+            tmp_folder = file_temporary_transfer(file_path)
+        spec.loader.exec_module(module)
+        class_list = [x for x in dir(module) if inspect.isclass(getattr(module, x))]
+        # noinspection PyUnboundLocalVariable
+        retrieve_original_file(tmp_folder, file_path)
+        if system() != "Windows":
+            root_lib = ".".join(root.split("/")[root.split("/").index("fastga") :])
+        else:
+            root_lib = ".".join(root.split("\\")[root.split("\\").index("fastga") :])
+        root_lib += "." + name.replace(".py", "")
+        for class_name in class_list:
+            # noinspection PyBroadException
+            try:
+                my_class = getattr(importlib.import_module(root_lib), class_name)
+                # Classes may come from other files of the package, their changes must be tracked
+                for parent_class in inspect.getmro(my_class):
+                    # noinspection PyBroadException
+                    try:
+                        source_file = pth.abspath(inspect.getsourcefile(parent_class))
+                    except Exception:
+                        continue
+                    if source_file.startswith(FASTGA_PATH) and source_file not in source_files:
+                        source_files.append(source_file)
+                options_dictionary = {}
+                if "propulsion_id" in my_class().options:
+                    options_dictionary["propulsion_id"] = _get_default_propulsion_id()
+                # noinspection PyProtectedMember
+                local_options = [
+                    option_name
+                    for option_name in BOOLEAN_OPTIONS
+                    if option_name in my_class().options._dict.keys()
+                ]
+                for options_tuple in product([True, False], repeat=len(local_options)):
+                    # Define local option dictionary
+                    for idx in range(len(local_options)):
+                        options_dictionary[local_options[idx]] = options_tuple[idx]
+                    variables = list_variables(my_class(**options_dictionary))
+                    input_names.extend([var.name for var in variables if var.is_input])
+                    output_names.extend([var.name for var in variables if not var.is_input])
+                    # Only the names of the ivc outputs are read, not their values
+                    with warnings.catch_warnings():
+                        warnings.simplefilter("ignore")
+                        output_names.extend(list_ivc_outputs_name(my_class(**options_dictionary)))
+            except:
+                _LOGGER.info("Failed to read {}.{} class parameters!".format(root_lib, class_name))
+    except:
+        if not (tmp_folder is None):
+            # noinspection PyUnboundLocalVariable
+            retrieve_original_file(tmp_folder, file_path)
+
+    # Remove duplicates
+    return list(dict.fromkeys(input_names)), list(dict.fromkeys(output_names)), source_files
+
+
+class VariableDescriptionsIndex:
+    """
+    Index of the files read by generate_variables_description: the variables of the variable
+    descriptions files, and the input and output variables of the python modules.
+
+    Each entry is stored with the modification times of the files it has been read from (for a
+    python module, the files its classes are defined in), and is read again only if one of them
+    changed. Changes in other imported files, e.g. the subsystems of a group, are not tracked: their
+    own modules are read again, and as variables are only ever added to the descriptions file, the
+    entry of the group can only miss variables the subsystems do not bring.
+
+    The index is saved in a JSON file, which can be deleted to read all the files again. The file
+    of a sub-package is kept out of the sources, see get_variables_description_index_path.
+    """
+
+    VERSION = 1
+
+    def __init__(self, file_path: Optional[str] = None):
+        """
+        :param file_path: path of the JSON file of the index, if None the index is neither loaded
+        nor saved
+        """
+
+        self.file_path = file_path
+        self._descriptions = {}
+        self._modules = {}
+        self._used_keys = set()
+
+        if file_path is not None and pth.exists(file_path):
+            try:
+                with open(file_path, "r") as file:
+                    content = json.load(file)
+                if content["version"] == self.VERSION:
+                    self._descriptions = content["descriptions"]
+                    self._modules = content["modules"]
+            except (ValueError, KeyError, TypeError):
+                _LOGGER.info("Variable descriptions index %s cannot be read, ignored", file_path)
+
+    def get_descriptions(self, file_path: str) -> List[Tuple[str, str]]:
+        """
+        :param file_path: path of a variable descriptions file
+        :return: list of the variable names and descriptions of the file, see
+        _read_variable_descriptions
+        """
+
+        key = pth.abspath(file_path)
+        self._used_keys.add(key)
+        entry = self._descriptions.get(key)
+        if entry is None or not self._is_up_to_date(entry["mtimes"]):
+            entry = {
+                "mtimes": self._get_mtimes([key]),
+                "variables": _read_variable_descriptions(key),
+            }
+            self._descriptions[key] = entry
+
+        return [tuple(variable) for variable in entry["variables"]]
+
+    def get_module_variables(self, file_path: str) -> Tuple[List[str], List[str]]:
+        """
+        :param file_path: path of a python module of FAST-GA
+        :return: names of the input variables and names of the output variables of the module, see
+        _list_module_variables
+        """
+
+        key = pth.abspath(file_path)
+        self._used_keys.add(key)
+        entry = self._modules.get(key)
+        if entry is None or not self._is_up_to_date(entry["mtimes"]):
+            input_names, output_names, source_files = _list_module_variables(key)
+            entry = {
+                "mtimes": self._get_mtimes(source_files),
+                "inputs": input_names,
+                "outputs": output_names,
+            }
+            self._modules[key] = entry
+
+        return entry["inputs"], entry["outputs"]
+
+    def save(self):
+        """
+        Saves the entries used since the index has been loaded in its JSON file. Failing to write it
+        is not an error, the files are then read again at next use.
+        """
+
+        if self.file_path is None:
+            return
+
+        content = {
+            "version": self.VERSION,
+            "descriptions": {
+                key: entry for key, entry in self._descriptions.items() if key in self._used_keys
+            },
+            "modules": {
+                key: entry for key, entry in self._modules.items() if key in self._used_keys
+            },
+        }
+        try:
+            os.makedirs(pth.dirname(self.file_path), exist_ok=True)
+            with open(self.file_path, "w") as file:
+                json.dump(content, file, indent=1)
+        except OSError:
+            _LOGGER.info("Variable descriptions index %s cannot be written", self.file_path)
+
+    @staticmethod
+    def _get_mtimes(file_paths: List[str]) -> Dict[str, float]:
+
+        return {file_path: os.stat(file_path).st_mtime for file_path in file_paths}
+
+    @staticmethod
+    def _is_up_to_date(mtimes: Dict[str, float]) -> bool:
+
+        for file_path, mtime in mtimes.items():
+            if not pth.exists(file_path) or os.stat(file_path).st_mtime != mtime:
+                return False
+
+        return True
+
+
+def get_variables_description_index_path(
+    subpackage_path: str, index_folder_path: Optional[str] = None
+) -> str:
+    """
+    :param subpackage_path: the path of a subpackage
+    :param index_folder_path: folder of the index files, VARIABLE_DESCRIPTIONS_INDEX_FOLDER_PATH
+    (in the user home directory) if None
+    :return: path of the variable descriptions index file of the subpackage, named after the
+    subpackage and a hash of its absolute path
+    """
+
+    if index_folder_path is None:
+        index_folder_path = VARIABLE_DESCRIPTIONS_INDEX_FOLDER_PATH
+    subpackage_path = pth.abspath(subpackage_path)
+    path_hash = hashlib.sha1(subpackage_path.encode("utf-8")).hexdigest()[:16]
+
+    return pth.join(
+        index_folder_path,
+        "variable_descriptions_{}_{}.json".format(pth.basename(subpackage_path), path_hash),
+    )
+
+
+def generate_variables_description(
+    subpackage_path: str,
+    overwrite: bool = False,
+    use_index: bool = True,
+    index_folder_path: Optional[str] = None,
+):
     """
     Generates/append the variable descriptions file for a given subpackage.
 
@@ -116,77 +399,70 @@ def generate_variables_description(subpackage_path: str, overwrite: bool = False
 
     generate_variables_description(my_package.__path__[0], overwrite=True)
 
+    The descriptions files read and the variables of the modules explored are kept in an index file
+    of the subpackage, so that only the files modified since the previous call are read again, see
+    VariableDescriptionsIndex. Index files are stored out of the subpackage, in index_folder_path.
+
     :param subpackage_path: the path of the subpackage to explore
     :param overwrite: if True, the file will be written, even if it already exists
+    :param use_index: if False, all the files are read again and the index file is not written
+    :param index_folder_path: folder of the index files, a cache folder of the user home directory
+    if None, see get_variables_description_index_path
     :raise FastFileExistsError: if overwrite==False and subpackage_path already exists
     """
 
-    if not overwrite and pth.exists(pth.join(subpackage_path, "variable_descriptions.txt")):
+    if not overwrite and pth.exists(pth.join(subpackage_path, VARIABLE_DESCRIPTIONS_FILENAME)):
         # noinspection PyStringFormat
         raise FastFileExistsError(
             "Variable descriptions file is not written because it already exists. "
             "Use overwrite=True to bypass."
-            % pth.join(subpackage_path, "variable_descriptions.txt"),
-            pth.join(subpackage_path, "variable_descriptions.txt"),
+            % pth.join(subpackage_path, VARIABLE_DESCRIPTIONS_FILENAME),
+            pth.join(subpackage_path, VARIABLE_DESCRIPTIONS_FILENAME),
         )
 
     if not pth.exists(subpackage_path):
         _LOGGER.info("Sub-package path %s not found!", subpackage_path)
     else:
+        index = VariableDescriptionsIndex(
+            get_variables_description_index_path(subpackage_path, index_folder_path)
+            if use_index
+            else None
+        )
+
         # Read file and construct dictionary of variables name index
         saved_dict = {}
-        if pth.exists(pth.join(subpackage_path, "variable_descriptions.txt")):
-            file = open(pth.join(subpackage_path, "variable_descriptions.txt"), "r")
-            for line in file:
-                if line[0] != "#" and len(line.split("||")) == 2:
-                    variable_name, variable_description = line.split("||")
-                    variable_name_length = len(variable_name)
-                    variable_name = variable_name.replace(" ", "")
-                    while variable_name_length != len(variable_name):
-                        variable_name = variable_name.replace(" ", "")
-                        variable_name_length = len(variable_name)
-                    saved_dict[variable_name] = (variable_description, subpackage_path)
-            file.close()
+        if pth.exists(pth.join(subpackage_path, VARIABLE_DESCRIPTIONS_FILENAME)):
+            for variable_name, variable_description in index.get_descriptions(
+                pth.join(subpackage_path, VARIABLE_DESCRIPTIONS_FILENAME)
+            ):
+                saved_dict[variable_name] = (variable_description, subpackage_path)
 
         # If path point to ./models directory list output variables described in the different models
         if pth.split(subpackage_path)[-1] == "models":
             for root, dirs, files in os.walk(subpackage_path, topdown=False):
-                vd_file_empty_description = False
                 empty_description_variables = []
-                for name in files:
-                    if name == "variable_descriptions.txt":
-                        file = open(pth.join(root, name), "r")
-                        for line in file:
-                            if line[0] != "#" and len(line.split("||")) == 2:
-                                variable_name, variable_description = line.split("||")
-                                if variable_description.replace(" ", "") == "\n":
-                                    vd_file_empty_description = True
-                                    empty_description_variables.append(
-                                        variable_name.replace(" ", "")
-                                    )
-                                variable_name_length = len(variable_name)
-                                variable_name = variable_name.replace(" ", "")
-                                while variable_name_length != len(variable_name):
-                                    variable_name = variable_name.replace(" ", "")
-                                    variable_name_length = len(variable_name)
-                                if variable_name not in saved_dict.keys():
-                                    saved_dict[variable_name] = (variable_description, root)
-                                else:
-                                    if not (
-                                        pth.split(root)[-1]
-                                        == pth.split(saved_dict[variable_name][1])[-1]
-                                    ):
-                                        warnings.warn(
-                                            "file variable_descriptions.txt from subpackage "
-                                            + pth.split(root)[-1]
-                                            + " contains parameter "
-                                            + variable_name
-                                            + " already saved in "
-                                            + pth.split(saved_dict[variable_name][1])[-1]
-                                            + " subpackage!"
-                                        )
-                        file.close()
-                if vd_file_empty_description:
+                if VARIABLE_DESCRIPTIONS_FILENAME in files:
+                    for variable_name, variable_description in index.get_descriptions(
+                        pth.join(root, VARIABLE_DESCRIPTIONS_FILENAME)
+                    ):
+                        if variable_description.replace(" ", "") == "\n":
+                            empty_description_variables.append(variable_name)
+                        if variable_name not in saved_dict.keys():
+                            saved_dict[variable_name] = (variable_description, root)
+                        else:
+                            if not (
+                                pth.split(root)[-1] == pth.split(saved_dict[variable_name][1])[-1]
+                            ):
+                                warnings.warn(
+                                    "file variable_descriptions.txt from subpackage "
+                                    + pth.split(root)[-1]
+                                    + " contains parameter "
+                                    + variable_name
+                                    + " already saved in "
+                                    + pth.split(saved_dict[variable_name][1])[-1]
+                                    + " subpackage!"
+                                )
+                if empty_description_variables:
                     warnings.warn(
                         "file variable_descriptions.txt from {} subpackage contains empty descriptions! \n".format(
                             pth.split(root)[-1]
@@ -195,156 +471,26 @@ def generate_variables_description(subpackage_path: str, overwrite: bool = False
                         + ", ".join(empty_description_variables)
                     )
 
-        # Explore subpackage models and find the output variables and store them in a dictionary
+        # Explore subpackage models and find the variables, input variables in models and output
+        # variables for subpackages (including ivc), and store them in a dictionary
         dict_to_be_saved = {}
         for root, dirs, files in os.walk(subpackage_path, topdown=False):
             for name in files:
                 if name[-3:] == ".py":
-                    spec = importlib.util.spec_from_file_location(
-                        name.replace(".py", ""), pth.join(root, name)
-                    )
-                    module = importlib.util.module_from_spec(spec)
-                    tmp_folder = None
-                    # noinspection PyBroadException
-                    try:
-                        # if register decorator in module, temporary replace file removing decorators
-                        # noinspection PyBroadException
-                        try:
-                            spec.loader.exec_module(module)
-                        except:
-                            _LOGGER.info(
-                                "Trying to load {}, but it is not a module!".format(
-                                    pth.join(root, name)
-                                )
-                            )
-                        if "RegisterOpenMDAOSystem" in dir(module):
-                            tmp_folder = file_temporary_transfer(pth.join(root, name))
-                        spec.loader.exec_module(module)
-                        class_list = [x for x in dir(module) if inspect.isclass(getattr(module, x))]
-                        # noinspection PyUnboundLocalVariable
-                        retrieve_original_file(tmp_folder, pth.join(root, name))
-                        if system() != "Windows":
-                            root_lib = ".".join(root.split("/")[root.split("/").index("fastga") :])
-                        else:
-                            root_lib = ".".join(
-                                root.split("\\")[root.split("\\").index("fastga") :]
-                            )
-                        root_lib += "." + name.replace(".py", "")
-                        for class_name in class_list:
-                            # noinspection PyBroadException
-                            try:
-                                my_class = getattr(importlib.import_module(root_lib), class_name)
-                                options_dictionary = {}
-                                if "propulsion_id" in my_class().options:
-                                    available_id_list = _get_simple_system_list()
-                                    idx_to_remove = []
-                                    for idx in range(len(available_id_list)):
-                                        available_id_list[idx] = available_id_list[idx][0]
-                                        if "PROPULSION" in available_id_list[idx]:
-                                            idx_to_remove.extend(list(range(idx + 1)))
-                                        if not ("fastga" in available_id_list[idx]):
-                                            idx_to_remove.append(idx)
-                                    idx_to_remove = list(dict.fromkeys(idx_to_remove))
-                                    for idx in sorted(idx_to_remove, reverse=True):
-                                        del available_id_list[idx]
-                                    options_dictionary["propulsion_id"] = available_id_list[0]
-                                variables = list_variables(my_class(**options_dictionary))
-                                local_options = []
-                                for option_name in BOOLEAN_OPTIONS:
-                                    # noinspection PyProtectedMember
-                                    if option_name in my_class().options._dict.keys():
-                                        local_options.append(option_name)
-                                # If no boolean options alternatives to be tested, search for input variables in models
-                                # and output variables for subpackages (including ivc)
-                                if len(local_options) == 0:
-                                    if pth.split(subpackage_path)[-1] == "models":
-                                        var_names = [var.name for var in variables if var.is_input]
-                                    else:
-                                        var_names = [
-                                            var.name for var in variables if not var.is_input
-                                        ]
-                                        if (
-                                            len(
-                                                list_ivc_outputs_name(
-                                                    my_class(**options_dictionary)
-                                                )
-                                            )
-                                            != 0
-                                        ):
-                                            var_names.append(
-                                                list_ivc_outputs_name(
-                                                    my_class(**options_dictionary)
-                                                )
-                                            )
-                                    # Remove duplicates
-                                    var_names = list(dict.fromkeys(var_names))
-                                    # Add to dictionary only variable name including data:, settings: or tuning:
-                                    for key in var_names:
-                                        if (
-                                            ("data:" in key)
-                                            or ("settings:" in key)
-                                            or ("tuning:" in key)
-                                        ):
-                                            if key not in dict_to_be_saved.keys():
-                                                dict_to_be_saved[key] = ""
-                                # If boolean options alternatives encountered, all alternatives have to be tested to
-                                # ensure complete coverage of variables. Working principle is similar to previous one.
-                                else:
-                                    for options_tuple in list(
-                                        product([True, False], repeat=len(local_options))
-                                    ):
-                                        # Define local option dictionary
-                                        for idx in range(len(local_options)):
-                                            options_dictionary[local_options[idx]] = options_tuple[
-                                                idx
-                                            ]
-                                        variables = list_variables(my_class(**options_dictionary))
-                                        if pth.split(subpackage_path)[-1] == "models":
-                                            var_names = [
-                                                var.name for var in variables if var.is_input
-                                            ]
-                                        else:
-                                            var_names = [
-                                                var.name for var in variables if not var.is_input
-                                            ]
-                                            if (
-                                                len(
-                                                    list_ivc_outputs_name(
-                                                        my_class(**options_dictionary)
-                                                    )
-                                                )
-                                                != 0
-                                            ):
-                                                var_names.append(
-                                                    list_ivc_outputs_name(
-                                                        my_class(**options_dictionary)
-                                                    )
-                                                )
-                                        # Remove duplicates
-                                        var_names = list(dict.fromkeys(var_names))
-                                        # Add to dictionary only variable name including data:, settings: or tuning:
-                                        for key in var_names:
-                                            if (
-                                                ("data:" in key)
-                                                or ("settings:" in key)
-                                                or ("tuning:" in key)
-                                            ):
-                                                if key not in dict_to_be_saved.keys():
-                                                    dict_to_be_saved[key] = ""
-                            except:
-                                _LOGGER.info(
-                                    "Failed to read {}.{} class parameters!".format(
-                                        root_lib, class_name
-                                    )
-                                )
-                    except:
-                        if not (tmp_folder is None):
-                            # noinspection PyUnboundLocalVariable
-                            retrieve_original_file(tmp_folder, pth.join(root, name))
+                    input_names, output_names = index.get_module_variables(pth.join(root, name))
+                    if pth.split(subpackage_path)[-1] == "models":
+                        var_names = input_names
+                    else:
+                        var_names = output_names
+                    # Add to dictionary only variable name including data:, settings: or tuning:
+                    for key in var_names:
+                        if ("data:" in key) or ("settings:" in key) or ("tuning:" in key):
+                            dict_to_be_saved[key] = ""
+        index.save()
 
         # Complete the variable descriptions file with missing outputs
-        if pth.exists(pth.join(subpackage_path, "variable_descriptions.txt")):
-            file = open(pth.join(subpackage_path, "variable_descriptions.txt"), "a")
+        if pth.exists(pth.join(subpackage_path, VARIABLE_DESCRIPTIONS_FILENAME)):
+            file = open(pth.join(subpackage_path, VARIABLE_DESCRIPTIONS_FILENAME), "a")
             if len(
                 set(list(dict_to_be_saved.keys())).intersection(set(list(saved_dict.keys())))
             ) != len(dict_to_be_saved.keys()):
@@ -352,7 +498,7 @@ def generate_variables_description(subpackage_path: str, overwrite: bool = False
             file.close()
         else:
             if len(dict_to_be_saved.keys()) != 0:
-                file = open(pth.join(subpackage_path, "variable_descriptions.txt"), "w")
+                file = open(pth.join(subpackage_path, VARIABLE_DESCRIPTIONS_FILENAME), "w")
                 file.write("# Documentation of variables used in FAST-GA models\n")
                 file.write("# Each line should be like:\n")
                 file.write(
@@ -363,7 +509,7 @@ def generate_variables_description(subpackage_path: str, overwrite: bool = False
                 )
                 file.close()
         if len(dict_to_be_saved.keys()) != 0:
-            file = open(pth.join(subpackage_path, "variable_descriptions.txt"), "a")
+            file = open(pth.join(subpackage_path, VARIABLE_DESCRIPTIONS_FILENAME), "a")
             sorted_keys = sorted(dict_to_be_saved.keys(), key=lambda x: x.lower())
             added_key = False
             added_key_names = []
@@ -560,41 +706,232 @@ def generate_block_analysis(
                 raise Exception(message)
         else:
             # If all inputs addressed either by .xml or var_inputs or in an IVC, construct the function
-            def patched_function(inputs_dict: dict) -> dict:
-                """
-                The patched function perform a run of an openmdao component or group applying FASTOAD formalism.
-
-                @param inputs_dict: dictionary of input (values, units) saved with their key name,
-                as an example: inputs_dict = {'in1': (3.0, "m")}.
-                @return: dictionary of the component/group outputs saving names as keys and (value, units) as tuple.
-                """
-
-                # Read .xml file and construct Independent Variable Component excluding outputs
-                if os.path.exists(xml_file_path):
-                    reader.path_separator = ":"
-                    ivc_local = reader.to_ivc()
-                else:
-                    ivc_local = IndepVarComp()
-                for name, value in inputs_dict.items():
-                    ivc_local.add_output(name, value[0], units=value[1])
-                group_local = AutoUnitsDefaultGroup()
-                group_local.add_subsystem("system", local_system, promotes=["*"])
-                group_local.add_subsystem("ivc", ivc_local, promotes=["*"])
-                problem_local = FASTOADProblem(group_local)
-                problem_local.setup()
-                problem_local.run_model()
-                if overwrite:
-                    problem_local.output_file_path = xml_file_path
-                    problem_local.write_outputs()
-                # Get output names from component/group and construct dictionary
-                outputs_units = [var.units for var in variables if not var.is_input]
-                outputs_dict = {}
-                for idx in range(len(outputs_names)):
-                    value = problem_local.get_val(outputs_names[idx], outputs_units[idx])
-                    outputs_dict[outputs_names[idx]] = (value, outputs_units[idx])
-                return outputs_dict
-
-            return patched_function
+            return BlockAnalysis(
+                local_system,
+                variables,
+                xml_file_path,
+                reader if os.path.exists(xml_file_path) else None,
+                overwrite,
+            )
+
+
+class BlockAnalysis:
+    """
+    Callable performing runs of an openmdao component or group applying FASTOAD formalism, as
+    returned by generate_block_analysis.
+
+    The problem is set up at the first call only, with the values read in the .xml file and the
+    given inputs. Next calls only set the given input values, run the model and read the outputs.
+    The problem is set up again if the names or shapes of the given inputs change, or after reset().
+    Used as a context manager, the problem is released on exit.
+    """
+
+    def __init__(
+        self,
+        local_system: System,
+        variables: VariableList,
+        xml_file_path: str,
+        reader: Optional[VariableList],
+        overwrite: bool = False,
+    ):
+        """
+        :param local_system: the component/group to run
+        :param variables: inputs and outputs of the component/group, as listed by list_variables
+        :param xml_file_path: .xml file the outputs are written in if overwrite
+        :param reader: variables read in the .xml file, None if there is no file
+        :param overwrite: if True, the outputs are written in the .xml file after each run
+        """
+        self.local_system = local_system
+        self.xml_file_path = xml_file_path
+        self.reader = reader
+        self.overwrite = overwrite
+        self.outputs_names = [var.name for var in variables if not var.is_input]
+        self.outputs_units = [var.units for var in variables if not var.is_input]
+        self.problem = None
+        self._inputs_signature = None
+
+    def __call__(self, inputs_dict: dict) -> dict:
+        """
+        Performs a run of the openmdao component or group.
+
+        :param inputs_dict: dictionary of input (values, units) saved with their key name,
+        as an example: inputs_dict = {'in1': (3.0, "m")}.
+        :return: dictionary of the component/group outputs saving names as keys and (value, units)
+        as tuple.
+        """
+
+        inputs_signature = {name: np.shape(value[0]) for name, value in inputs_dict.items()}
+        if self.problem is None or inputs_signature != self._inputs_signature:
+            self._setup(inputs_dict)
+            self._inputs_signature = inputs_signature
+        else:
+            for name, value in inputs_dict.items():
+                self.problem.set_val(name, value[0], units=value[1])
+
+        self.problem.run_model()
+        if self.overwrite:
+            self.problem.output_file_path = self.xml_file_path
+            self.problem.write_outputs()
+
+        # Get output names from component/group and construct dictionary, with copies of the values
+        # since the problem is reused
+        outputs_dict = {}
+        for name, units in zip(self.outputs_names, self.outputs_units):
+            outputs_dict[name] = (np.copy(self.problem.get_val(name, units)), units)
+
+        return outputs_dict
+
+    def reset(self):
+        """
+        Releases the problem, so that it is set up again at next call.
+        """
+
+        self.problem = None
+        self._inputs_signature = None
+
+    def __enter__(self) -> "BlockAnalysis":
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.reset()
+
+    def _setup(self, inputs_dict: dict):
+
+        # Read .xml file and construct Independent Variable Component excluding outputs
+        if self.reader is not None:
+            self.reader.path_separator = ":"
+            ivc_local = self.reader.to_ivc()
+        else:
+            ivc_local = IndepVarComp()
+        for name, value in inputs_dict.items():
+            ivc_local.add_output(name, value[0], units=value[1])
+        group_local = AutoUnitsDefaultGroup()
+        group_local.add_subsystem("system", self.local_system, promotes=["*"])
+        group_local.add_subsystem("ivc", ivc_local, promotes=["*"])
+        self.problem = FASTOADProblem(group_local)
+        self.problem.setup()
+
+
+def evaluate_many(
+    local_system: Union[ExplicitComponent, ImplicitComponent, Group, str],
+    var_inputs: List,
+    xml_file_path: str,
+    inputs_dicts: List[dict],
+    options: dict = None,
+    n_workers: Optional[int] = None,
+) -> pd.DataFrame:
+    """
+    Runs the block analysis of a component/group (see generate_block_analysis) for a list of input
+    values, as for a design of experiments. If n_workers is greater than 1, the runs are
+    distributed over a pool of processes, each of them setting its own problem up once. Should the
+    arguments not be transferable to the processes or the pool fail, the runs are done serially.
+    Errors in the definition of the block analysis (see generate_block_analysis) are raised before
+    any run.
+
+    :param local_system: the component/group, or the ID of a registered one
+    :param var_inputs: names of the inputs given in inputs_dicts instead of the .xml file
+    :param xml_file_path: .xml file the other inputs are read in
+    :param inputs_dicts: list of dictionaries of input (values, units), one per run, as an example:
+    [{'in1': (3.0, "m")}, {'in1': (4.0, "m")}]
+    :param options: options of the registered component/group
+    :param n_workers: maximum number of processes running at the same time, number of CPUs if None
+    :return: table with one row per run, in the order of inputs_dicts, and one column per input and
+    output (scalars as floats). Outputs of failed runs are NaN. Units of the columns are given in
+    the "units" attribute of the table
+    """
+
+    block_analysis = generate_block_analysis(
+        local_system, var_inputs, xml_file_path, options=options
+    )
+
+    if n_workers is None:
+        n_workers = os.cpu_count() or 1
+    n_workers = min(n_workers, len(inputs_dicts))
+    if n_workers > 1:
+        # Worker processes get the block analysis arguments by pickling unless they are forked
+        transferred = [inputs_dicts]
+        if multiprocessing.get_start_method() != "fork":
+            transferred.append((local_system, var_inputs, xml_file_path, options))
+        try:
+            pickle.dumps(transferred)
+        except (pickle.PicklingError, TypeError, AttributeError) as error:
+            _LOGGER.warning(
+                "Block analysis cannot be sent to processes (%s), running serially", error
+            )
+            n_workers = 1
+
+    outputs_dicts = None
+    if n_workers > 1:
+        try:
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                initializer=_initialize_worker,
+                initargs=(local_system, var_inputs, xml_file_path, options),
+            ) as executor:
+                outputs_dicts = list(
+                    executor.map(
+                        _evaluate_in_worker,
+                        inputs_dicts,
+                        chunksize=max(1, len(inputs_dicts) // (4 * n_workers)),
+                    )
+                )
+        except (BrokenProcessPool, OSError) as error:
+            _LOGGER.warning("Parallel block analysis failed (%s), switching to serial", error)
+            outputs_dicts = None
+
+    if outputs_dicts is None:
+        with block_analysis:
+            outputs_dicts = [_evaluate(block_analysis, inputs_dict) for inputs_dict in inputs_dicts]
+
+    rows = []
+    units = {}
+    for inputs_dict, outputs_dict in zip(inputs_dicts, outputs_dicts):
+        row = {}
+        for name, value in list(inputs_dict.items()) + list((outputs_dict or {}).items()):
+            array = np.asarray(value[0], dtype=float)
+            row[name] = array.item() if array.size == 1 else array
+            units.setdefault(name, value[1])
+        rows.append(row)
+    table = pd.DataFrame(rows)
+    for name, output_units in zip(block_analysis.outputs_names, block_analysis.outputs_units):
+        if name not in table.columns:
+            # None of the runs succeeded
+            table[name] = np.nan
+        units.setdefault(name, output_units)
+    table.attrs["units"] = units
+
+    return table
+
+
+def _evaluate(block_analysis: BlockAnalysis, inputs_dict: dict) -> Optional[dict]:
+    """Runs the block analysis, returns None and sets the problem up again if the run fails."""
+
+    # noinspection PyBroadException
+    try:
+        return block_analysis(inputs_dict)
+    except Exception:
+        _LOGGER.warning("Block analysis failed for inputs %s", inputs_dict, exc_info=True)
+        block_analysis.reset()
+        return None
+
+
+def _initialize_worker(local_system, var_inputs, xml_file_path, options):
+    """Stores the arguments of the block analysis in a worker process (see evaluate_many)."""
+    global _WORKER_ARGUMENTS, _WORKER_BLOCK_ANALYSIS
+    _WORKER_ARGUMENTS = (local_system, var_inputs, xml_file_path, options)
+    _WORKER_BLOCK_ANALYSIS = None
+
+
+def _evaluate_in_worker(inputs_dict: dict) -> Optional[dict]:
+    """Runs a point in a worker process, setting its block analysis up at first call."""
+    global _WORKER_BLOCK_ANALYSIS
+    if _WORKER_BLOCK_ANALYSIS is None:
+        local_system, var_inputs, xml_file_path, options = _WORKER_ARGUMENTS
+        _WORKER_BLOCK_ANALYSIS = generate_block_analysis(
+            local_system, var_inputs, xml_file_path, options=options
+        )
+
+    return _evaluate(_WORKER_BLOCK_ANALYSIS, inputs_dict)
 
 
 def list_all_subsystem(model, model_address, dict_subsystems):
@@ -653,15 +990,125 @@ class VariableListLocal(VariableList):
         return VariableListLocal.from_problem(problem, use_initial_values=True)
 
 
+class VariablesIndex:
+    """
+    Cache of the variables of OpenMDAO systems, as listed by VariableListLocal.from_system, so that
+    each system is set up only once per process.
+
+    Systems are identified by their class and options, hence only the systems fully defined by them
+    are cached: systems of OpenMDAO classes (e.g. ExecComp), groups with subsystems or components
+    with variables added before setup, and systems with options that are objects without a proper
+    representation are inspected at each call.
+
+    The index can be saved to and loaded from a JSON file, which must be deleted when models
+    change.
+    """
+
+    # Metadata of the variables saved in the JSON file
+    SAVED_METADATA = ["val", "units", "shape", "desc", "is_input"]
+
+    def __init__(self):
+        self._variables = {}
+
+    def get(self, local_system: System) -> VariableList:
+        """
+        :param local_system: OpenMDAO Component instance to inspect (setup() must NOT have been
+        called)
+        :return: VariableList instance, see VariableListLocal.from_system
+        """
+
+        key = self.get_key(local_system)
+        if key is None:
+            return self._inspect(local_system)
+        if key not in self._variables:
+            self._variables[key] = self._inspect(local_system)
+
+        return deepcopy(self._variables[key])
+
+    @staticmethod
+    def get_key(local_system: System) -> Optional[str]:
+        """
+        :return: key of the system in the index, None if the system cannot be cached
+        """
+
+        system_class = type(local_system)
+        if system_class.__module__.split(".")[0] == "openmdao":
+            return None
+        # noinspection PyProtectedMember
+        if getattr(local_system, "_static_subsystems_allprocs", None) or getattr(
+            local_system, "_static_var_rel2meta", None
+        ):
+            return None
+        options = repr(sorted(local_system.options.items(), key=lambda item: item[0]))
+        if " at 0x" in options:
+            return None
+
+        return "%s.%s(%s)" % (system_class.__module__, system_class.__qualname__, options)
+
+    def clear(self):
+        """
+        Empties the index.
+        """
+
+        self._variables = {}
+
+    def save(self, file_path: str):
+        """
+        Saves the index in a JSON file.
+
+        :param file_path: path of the JSON file
+        """
+
+        content = {}
+        for key, variables in self._variables.items():
+            content[key] = []
+            for variable in variables:
+                metadata = {"name": variable.name}
+                for name in self.SAVED_METADATA:
+                    value = variable.metadata.get(name)
+                    if isinstance(value, (np.ndarray, np.generic, tuple)):
+                        value = np.asarray(value).tolist()
+                    metadata[name] = value
+                content[key].append(metadata)
+        with open(file_path, "w") as file:
+            json.dump(content, file, indent=1)
+
+    def load(self, file_path: str):
+        """
+        Adds the content of a JSON file saved with save() to the index.
+
+        :param file_path: path of the JSON file
+        """
+
+        with open(file_path) as file:
+            content = json.load(file)
+        for key, variables in content.items():
+            variable_list = VariableListLocal()
+            for metadata in variables:
+                if metadata["shape"] is not None:
+                    metadata["shape"] = tuple(metadata["shape"])
+                if isinstance(metadata["val"], list):
+                    metadata["val"] = np.array(metadata["val"])
+                variable_list.append(Variable(**metadata))
+            self._variables[key] = variable_list
+
+    @staticmethod
+    def _inspect(local_system: System) -> VariableList:
+
+        if isinstance(local_system, om.Group):
+            new_component = AutoUnitsDefaultGroup()
+            new_component.add_subsystem("system", local_system, promotes=["*"])
+            local_system = new_component
+
+        return VariableListLocal.from_system(local_system)
+
+
+VARIABLES_INDEX = VariablesIndex()
+
+
 def list_variables(component: Union[om.ExplicitComponent, om.Group]) -> list:
     """ Reads all variables from a component/problem and return as a list """
-    if isinstance(component, om.Group):
-        new_component = AutoUnitsDefaultGroup()
-        new_component.add_subsystem("system", component, promotes=["*"])
-        component = new_component
-    variables = VariableListLocal.from_system(component)
-
-    return variables
+    return VARIABLES_INDEX.get(component)
 
 
 def list_inputs(component: Union[om.ExplicitComponent, om.Group]) -> list:
@@ -32,6 +32,13 @@ class Disc1(om.ExplicitComponent):
         outputs["data:geometry:variable_4"] = x1 + x21 * x22 - x3
 
 
+class Disc1Failing(Disc1):
+    """ Disc1 failing whatever the inputs, for testing failed runs """
+
+    def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+        raise ValueError("Computation failed")
+
+
 class Disc2(om.Group):
     """ An OpenMDAO component to encapsulate Disc1 and an IVC """
 
@@ -20,7 +20,7 @@ import pytest
 import warnings
 
 from fastga.command import api
-from fastga.command.unitary_tests.dummy_classes import Disc1, Disc2, Disc3
+from fastga.command.unitary_tests.dummy_classes import Disc1, Disc1Failing, Disc2, Disc3
 from fastga import models
 from fastga.models import (
     aerodynamics,
@@ -95,6 +95,106 @@ def test_input_vars_working():
     assert value == pytest.approx(17.0, abs=1e-3)
 
 
+def test_block_analysis_reuse():
+
+    missing_input_xml_file = pth.join(pth.dirname(__file__), "data/missing_one_input.xml")
+    var_inputs = ["data:geometry:variable_1"]
+
+    with api.generate_block_analysis(
+        Disc1(), var_inputs, missing_input_xml_file, overwrite=False
+    ) as block_analysis:
+        first_output_dict = block_analysis({"data:geometry:variable_1": (4.0, None)})
+        problem = block_analysis.problem
+
+        # The problem is not set up again, and previous outputs are not modified
+        output_dict = block_analysis({"data:geometry:variable_1": (10.0, None)})
+        assert block_analysis.problem is problem
+        assert output_dict.get("data:geometry:variable_4")[0] == pytest.approx(23.0, abs=1e-3)
+        assert first_output_dict.get("data:geometry:variable_4")[0] == pytest.approx(17.0, abs=1e-3)
+
+        block_analysis.reset()
+        assert block_analysis.problem is None
+        output_dict = block_analysis({"data:geometry:variable_1": (4.0, None)})
+        assert output_dict.get("data:geometry:variable_4")[0] == pytest.approx(17.0, abs=1e-3)
+
+    assert block_analysis.problem is None
+
+
+def test_evaluate_many():
+
+    missing_input_xml_file = pth.join(pth.dirname(__file__), "data/missing_one_input.xml")
+    var_inputs = ["data:geometry:variable_1"]
+    inputs_dicts = [{"data:geometry:variable_1": (float(value), None)} for value in range(6)]
+
+    table = api.evaluate_many(
+        Disc1(), var_inputs, missing_input_xml_file, inputs_dicts, n_workers=1
+    )
+    assert list(table["data:geometry:variable_1"]) == pytest.approx(range(6))
+    assert list(table["data:geometry:variable_4"]) == pytest.approx(range(13, 19))
+    assert table.attrs["units"]["data:geometry:variable_1"] is None
+
+    parallel_table = api.evaluate_many(
+        Disc1(), var_inputs, missing_input_xml_file, inputs_dicts, n_workers=2
+    )
+    assert list(parallel_table["data:geometry:variable_4"]) == pytest.approx(range(13, 19))
+
+    # Default number of processes is the number of CPUs
+    default_table = api.evaluate_many(Disc1(), var_inputs, missing_input_xml_file, inputs_dicts)
+    assert list(default_table["data:geometry:variable_4"]) == pytest.approx(range(13, 19))
+
+
+def test_evaluate_many_failures(caplog):
+
+    missing_input_xml_file = pth.join(pth.dirname(__file__), "data/missing_one_input.xml")
+    var_inputs = ["data:geometry:variable_1"]
+    inputs_dicts = [{"data:geometry:variable_1": (float(value), None)} for value in range(4)]
+
+    # Outputs of failed runs are NaN, even if all runs failed
+    table = api.evaluate_many(
+        Disc1Failing(), var_inputs, missing_input_xml_file, inputs_dicts, n_workers=2
+    )
+    assert list(table["data:geometry:variable_1"]) == pytest.approx(range(4))
+    assert table["data:geometry:variable_4"].isna().all()
+    assert "data:geometry:variable_4" in table.attrs["units"]
+
+    # Errors in the block analysis definition are raised without trying a serial run
+    with pytest.raises(Exception, match="out of component/group input list"):
+        api.evaluate_many(
+            Disc1(), ["data:geometry:variable_5"], missing_input_xml_file, inputs_dicts, n_workers=2
+        )
+    assert "switching to serial" not in caplog.text
+
+
+def test_variables_index(tmp_path):
+
+    variables_index = api.VariablesIndex()
+    variables = variables_index.get(Disc3(ivc_value=3.0))
+    assert variables_index.get_key(Disc3(ivc_value=3.0)) in variables_index._variables
+    assert variables_index.get_key(Disc3(ivc_value=4.0)) not in variables_index._variables
+    assert variables_index.get_key(Disc1()) != variables_index.get_key(Disc3())
+
+    # Returned lists are copies, modifying them does not alter the index
+    variables["data:geometry:variable_1"].value = 12.0
+    assert variables_index.get(Disc3(ivc_value=3.0))[
+        "data:geometry:variable_1"
+    ].value == pytest.approx(3.0)
+
+    variables_index.get(Disc1())
+    file_path = pth.join(str(tmp_path), "variables_index.json")
+    variables_index.save(file_path)
+    loaded_index = api.VariablesIndex()
+    loaded_index.load(file_path)
+    variables = variables_index.get(Disc1())
+    loaded_variables = loaded_index.get(Disc1())
+    assert loaded_variables.names() == variables.names()
+    for variable in variables:
+        assert loaded_variables[variable.name].is_input == variable.is_input
+        assert loaded_variables[variable.name].units == variable.units
+        assert loaded_variables[variable.name].value == pytest.approx(variable.value, nan_ok=True)
+
+    assert api.list_variables(Disc1()).names() == variables.names()
+
+
 def test_ivc_working():
     missing_input_xml_file = pth.join(pth.dirname(__file__), "data/missing_one_input.xml")
 
@@ -236,6 +336,74 @@ def test_missing_inputs_in_xml():
     assert right_error
 
 
+def test_variable_descriptions_index(tmp_path, monkeypatch):
+
+    descriptions_file_path = pth.join(str(tmp_path), "variable_descriptions.txt")
+    with open(descriptions_file_path, "w") as file:
+        file.write("# Comment || not read\n")
+        file.write("data:geometry:variable_1 || First variable\n")
+    index_file_path = pth.join(str(tmp_path), "index.json")
+    index = api.VariableDescriptionsIndex(index_file_path)
+    assert index.get_descriptions(descriptions_file_path) == [
+        ("data:geometry:variable_1", " First variable\n")
+    ]
+    input_names, output_names = index.get_module_variables(
+        pth.join(pth.dirname(__file__), "dummy_classes.py")
+    )
+    assert "data:geometry:variable_1" in input_names
+    assert "data:geometry:variable_4" in output_names
+    index.save()
+
+    # Unchanged files are not read again
+    def fail(file_path):
+        raise AssertionError(file_path + " read again")
+
+    monkeypatch.setattr(api, "_list_module_variables", fail)
+    monkeypatch.setattr(api, "_read_variable_descriptions", fail)
+    index = api.VariableDescriptionsIndex(index_file_path)
+    assert index.get_module_variables(pth.join(pth.dirname(__file__), "dummy_classes.py")) == (
+        input_names,
+        output_names,
+    )
+    assert len(index.get_descriptions(descriptions_file_path)) == 1
+    monkeypatch.undo()
+
+    with open(descriptions_file_path, "a") as file:
+        file.write("data:geometry:variable_2||\n")
+    mtime = os.stat(descriptions_file_path).st_mtime + 1.0
+    os.utime(descriptions_file_path, (mtime, mtime))
+    assert index.get_descriptions(descriptions_file_path)[1] == ("data:geometry:variable_2", "\n")
+
+
+def test_variable_descriptions_index_location(tmp_path):
+
+    subpackage_path = pth.join(str(tmp_path), "subpackage")
+    os.makedirs(subpackage_path)
+    with open(pth.join(subpackage_path, "variable_descriptions.txt"), "w") as file:
+        file.write("data:geometry:variable_1 || First variable\n")
+    index_folder_path = pth.join(str(tmp_path), "cache")
+
+    api.generate_variables_description(
+        subpackage_path, overwrite=True, index_folder_path=index_folder_path
+    )
+
+    # The index is written in the given folder, not in the subpackage
+    assert os.listdir(subpackage_path) == ["variable_descriptions.txt"]
+    assert os.listdir(index_folder_path) == [
+        pth.basename(api.get_variables_description_index_path(subpackage_path))
+    ]
+    assert (
+        pth.dirname(api.get_variables_description_index_path(subpackage_path))
+        == api.VARIABLE_DESCRIPTIONS_INDEX_FOLDER_PATH
+    )
+
+    # Subpackages with the same name get their own index
+    other_subpackage_path = pth.join(str(tmp_path), "other", "subpackage")
+    assert api.get_variables_description_index_path(
+        subpackage_path
+    ) != api.get_variables_description_index_path(other_subpackage_path)
+
+
 def test_variable_descriptions_auto_gen():
 
     with warnings.catch_warnings(record=True) as w:
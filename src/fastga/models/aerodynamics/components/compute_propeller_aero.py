@@ -14,17 +14,23 @@ Computation of propeller aero properties
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import os
 import os.path as pth
 import numpy as np
 import openmdao.api as om
 import math
 import logging
-import pandas as pd
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
 from scipy.optimize import fsolve
 
 from fastoad.model_base import Atmosphere
-import fastga.models.aerodynamics.external.xfoil as xfoil
-from fastga.models.aerodynamics.external.xfoil.xfoil_polar import XfoilPolar
+from fastga.models.aerodynamics.external.xfoil.polar_database import PolarDatabase
+from fastga.models.aerodynamics.external.xfoil.polar_surface import PolarSurface
+from fastga.models.aerodynamics.external.xfoil.xfoil_polar import (
+    XfoilPolar,
+    POLAR_DATABASE_FOLDER_PATH,
+)
 
 from fastoad.module_management.service_registry import RegisterOpenMDAOSystem
 from fastoad.module_management.constants import ModelDomain
@@ -33,6 +39,14 @@ _LOGGER = logging.getLogger(__name__)
 
 THRUST_PTS_NB = 30
 SPEED_PTS_NB = 10
+PITCH_PTS_NB = 100
+COARSE_PITCH_PTS_NB = 25
+
+# Section polars (alpha, cl, cd) read from the polar database are kept in memory between computations,
+# the least recently used are dropped first, entries are identified by polar name and database
+# modification time
+POLAR_CACHE_SIZE = 32
+_POLAR_CACHE = OrderedDict()
 
 
 @RegisterOpenMDAOSystem("fastga.aerodynamics.propeller", domain=ModelDomain.AERODYNAMICS)
@@ -50,6 +64,9 @@ class ComputePropellerPerformance(om.Group):
         )
         self.options.declare("elements_number", default=20, types=int)
         self.options.declare("vectors_length", default=10, types=int)
+        self.options.declare("n_workers", default=1, types=int)
+        self.options.declare("adaptive_pitch_sampling", default=False, types=bool)
+        self.options.declare("pitch_sampling_tolerance", default=1e-3, types=float)
 
     def setup(self):
         ivc = om.IndepVarComp()
@@ -73,6 +90,9 @@ class ComputePropellerPerformance(om.Group):
                 sections_profile_name_list=self.options["sections_profile_name_list"],
                 elements_number=self.options["elements_number"],
                 vectors_length=self.options["vectors_length"],
+                n_workers=self.options["n_workers"],
+                adaptive_pitch_sampling=self.options["adaptive_pitch_sampling"],
+                pitch_sampling_tolerance=self.options["pitch_sampling_tolerance"],
             ),
             promotes=["*"],
         )
@@ -90,6 +110,12 @@ class _ComputePropellerPerformance(om.ExplicitComponent):
         self.options.declare("average_rpm", default=2500.0, types=float)
         self.options.declare("elements_number", default=20, types=int)
         self.options.declare("vectors_length", default=10, types=int)
+        # Number of processes used to compute the (altitude, speed) cells of the tables, serial if 1
+        self.options.declare("n_workers", default=1, types=int)
+        # Pitch angles are sampled on a coarse grid then refined where the thrust and efficiency
+        # curves are not linearly interpolated within tolerance, instead of a PITCH_PTS_NB grid
+        self.options.declare("adaptive_pitch_sampling", default=False, types=bool)
+        self.options.declare("pitch_sampling_tolerance", default=1e-3, types=float)
 
     def setup(self):
         self.add_input("data:geometry:propeller:diameter", val=np.nan, units="m")
@@ -141,13 +167,18 @@ class _ComputePropellerPerformance(om.ExplicitComponent):
         v_max = inputs["data:TLAR:v_cruise"] * 1.2
         speed_interp = np.linspace(v_min, v_max, SPEED_PTS_NB)
 
-        # Construct table for init of climb
-        altitude = 0.0
-        thrust_vect, theta_vect, eta_vect = self.construct_table(
-            inputs, speed_interp, altitude, omega
-        )
-        # plt.show()
+        # Load sections polars once for all the elements
+        polars = {
+            profile_name: self.read_polar_result(profile_name)
+            for profile_name in self.options["sections_profile_name_list"]
+        }
+
+        # Construct tables for init of climb and for cruise
+        altitudes = [0.0, inputs["data:mission:sizing:main_route:cruise:altitude"]]
+        tables = self.construct_tables(inputs, speed_interp, altitudes, omega, polars)
+
         # Reformat table
+        thrust_vect, theta_vect, eta_vect = tables[0]
         thrust_limit, thrust_interp, efficiency_interp = self.reformat_table(thrust_vect, eta_vect)
         # # Plot graphs
         # X, Y = np.meshgrid(speed_interp, thrust_interp)
@@ -165,12 +196,8 @@ class _ComputePropellerPerformance(om.ExplicitComponent):
         outputs["data:aerodynamics:propeller:sea_level:thrust_limit"] = thrust_limit
         outputs["data:aerodynamics:propeller:sea_level:speed"] = speed_interp
 
-        # construct table for cruise
-        altitude = inputs["data:mission:sizing:main_route:cruise:altitude"]
-        thrust_vect, theta_vect, eta_vect = self.construct_table(
-            inputs, speed_interp, altitude, omega
-        )
-        # Reformat table
+        # Reformat cruise table
+        thrust_vect, theta_vect, eta_vect = tables[1]
         thrust_limit, thrust_interp, efficiency_interp = self.reformat_table(thrust_vect, eta_vect)
 
         _LOGGER.debug("Finishing propeller computation")
@@ -193,88 +220,259 @@ class _ComputePropellerPerformance(om.ExplicitComponent):
         self.theta_min = phi_75 - 10.0
         self.theta_max = phi_75 + 25.0
 
-    def construct_table(self, inputs, speed_interp, altitude, omega):
-        thrust_vect = []
-        theta_vect = []
-        eta_vect = []
-        for v_inf in speed_interp:
-            self.compute_extreme_pitch(inputs, v_inf)
-            theta_interp = np.linspace(self.theta_min, self.theta_max, 100)
-            local_thrust_vect = []
-            local_theta_vect = []
-            local_eta_vect = []
-            for theta_75 in theta_interp:
-                thrust, eta, _ = self.compute_pitch_performance(
-                    inputs, theta_75, v_inf, altitude, omega, self.options["elements_number"]
+    def construct_tables(self, inputs, speed_interp, altitudes, omega, polars=None):
+        """
+        Constructs the tables of the different altitudes. If n_workers option is greater than 1,
+        the (altitude, speed) cells are distributed over a pool of processes, results keep the
+        order of altitudes and speeds. Should the pool fail, the tables are computed serially.
+
+        :param inputs: structure of data relative to the blade geometry available from setup
+        :param speed_interp: flight speeds [m/s]
+        :param altitudes: flight altitudes [m]
+        :param omega: angular velocity of the propeller [RPM]
+        :param polars: dictionary of (alpha, cl, cd) polars per profile name, read if not provided
+
+        :return: list of (thrust, theta, eta) tables, one per altitude
+        """
+
+        cells = [(altitude, v_inf) for altitude in altitudes for v_inf in speed_interp]
+        n_workers = min(self.options["n_workers"], len(cells))
+        speed_tables = None
+        if n_workers > 1:
+            options = {
+                name: self.options[name]
+                for name in [
+                    "sections_profile_position_list",
+                    "sections_profile_name_list",
+                    "average_rpm",
+                    "elements_number",
+                    "vectors_length",
+                    "adaptive_pitch_sampling",
+                    "pitch_sampling_tolerance",
+                ]
+            }
+            inputs_copy = {
+                name: np.array(inputs[name])
+                for name in [
+                    "data:geometry:propeller:diameter",
+                    "data:geometry:propeller:hub_diameter",
+                    "data:geometry:propeller:blades_number",
+                    "data:geometry:propeller:sweep_vect",
+                    "data:geometry:propeller:chord_vect",
+                    "data:geometry:propeller:twist_vect",
+                    "data:geometry:propeller:radius_ratio_vect",
+                ]
+            }
+            # noinspection PyBroadException
+            try:
+                with ProcessPoolExecutor(max_workers=n_workers) as executor:
+                    speed_tables = list(
+                        executor.map(
+                            _compute_speed_table,
+                            [options] * len(cells),
+                            [inputs_copy] * len(cells),
+                            [v_inf for _, v_inf in cells],
+                            [altitude for altitude, _ in cells],
+                            [omega] * len(cells),
+                        )
+                    )
+            except Exception as error:
+                _LOGGER.warning(
+                    "Parallel propeller table construction failed (%s), switching to serial", error
                 )
-                if len(local_thrust_vect) != 0:
-                    local_thrust_vect.append(thrust)
-                    local_theta_vect.append(theta_75)
-                    local_eta_vect.append(eta)
-                else:
-                    local_thrust_vect.append(thrust)
-                    local_theta_vect.append(theta_75)
-                    local_eta_vect.append(eta)
-
-            # Find first the "monotone" zone (10 points of increase)
-            idx_in_zone = 0
-            thrust_difference = np.array(local_thrust_vect[1:]) - np.array(local_thrust_vect[0:-1])
-            for idx in range(5, len(thrust_difference)):
-                if np.sum(np.array(thrust_difference[idx - 5 : idx + 5]) > 0.0) == len(
-                    thrust_difference[idx - 5 : idx + 5]
-                ):
-                    idx_in_zone = idx + 1
-                    break
-            # Erase end of the curve if thrust decreases
-            if len(np.where(thrust_difference[idx_in_zone:] < 0.0)[0]) != 0:
-                idx_end = np.min(np.where(thrust_difference[idx_in_zone:] < 0.0)) + idx_in_zone
-                local_thrust_vect = local_thrust_vect[0 : idx_end + 1]
-                local_theta_vect = local_theta_vect[0 : idx_end + 1]
-                local_eta_vect = local_eta_vect[0 : idx_end + 1]
-            # Erase start of the curve if thrust is negative or decreases
-            idx_start = 0
-            thrust_difference = np.array(local_thrust_vect[1:]) - np.array(local_thrust_vect[0:-1])
-            if len(np.where(np.array(local_thrust_vect) < 0.0)[0]) != 0.0:
-                idx_start = int(np.max(np.where(np.array(local_thrust_vect) < 0.0)))
-            if len(np.where(thrust_difference < 0.0)[0]) != 0.0:
-                idx_start = max(idx_start, int(np.max(np.where(thrust_difference < 0.0)) + 1))
-            local_thrust_vect = local_thrust_vect[idx_start:]
-            local_theta_vect = local_theta_vect[idx_start:]
-            local_eta_vect = local_eta_vect[idx_start:]
-            # Erase remaining points with negative or >1.0 efficiency
-            idx_drop = np.where(
-                (np.array(local_eta_vect) <= 0.0) + (np.array(local_eta_vect) > 1.0)
-            )[0].tolist()
-            for idx in sorted(idx_drop, reverse=True):
-                del local_thrust_vect[idx]
-                del local_theta_vect[idx]
-                del local_eta_vect[idx]
-
-            # Save vectors
-            thrust_vect.append(local_thrust_vect)
-            theta_vect.append(local_theta_vect)
-            eta_vect.append(local_eta_vect)
-
-            # # Plot graphs
-            # thrust_vect.append(local_thrust_vect)
-            # theta_vect.append(local_theta_vect)
-            # eta_vect.append(local_eta_vect)
-            # plt.figure(1)
-            # plt.subplot(311)
-            # plt.xlabel("0.75R pitch angle [°]")
-            # plt.ylabel("Thrust [N]")
-            # plt.plot(local_theta_vect, local_thrust_vect)
-            # plt.subplot(312)
-            # plt.xlabel("0.75R pitch angle [°]")
-            # plt.ylabel("Efficiency [-]")
-            # plt.plot(local_theta_vect, local_eta_vect)
-            # plt.subplot(313)
-            # plt.xlabel("0.75R pitch angle [°]")
-            # plt.ylabel("Torque [-]")
-            # plt.plot(local_theta_vect,
-            #          v_inf * np.array(local_thrust_vect) / (np.array(local_eta_vect) * omega * math.pi / 30.0))
-
-        return thrust_vect, theta_vect, eta_vect
+                speed_tables = None
+
+        if speed_tables is None:
+            speed_tables = [
+                self.compute_speed_table(inputs, v_inf, altitude, omega, polars)
+                for altitude, v_inf in cells
+            ]
+
+        tables = []
+        for idx in range(len(altitudes)):
+            altitude_tables = speed_tables[idx * len(speed_interp) : (idx + 1) * len(speed_interp)]
+            tables.append(tuple(list(vectors) for vectors in zip(*altitude_tables)))
+
+        return tables
+
+    def construct_table(self, inputs, speed_interp, altitude, omega, polars=None):
+        """
+        Constructs the table of a single altitude, see construct_tables.
+        """
+
+        return self.construct_tables(inputs, speed_interp, [altitude], omega, polars)[0]
+
+    def compute_speed_table(self, inputs, v_inf, altitude, omega, polars=None):
+        self.compute_extreme_pitch(inputs, v_inf)
+        if self.options["adaptive_pitch_sampling"]:
+            theta_interp, thrust_interp, eta_interp = self.sample_pitch_adaptive(
+                inputs, v_inf, altitude, omega, polars
+            )
+        else:
+            theta_interp = np.linspace(self.theta_min, self.theta_max, PITCH_PTS_NB)
+            # All the pitch angles of a speed are solved at once
+            thrust_interp, eta_interp, _ = self.compute_pitch_performance_vect(
+                inputs,
+                theta_interp,
+                v_inf,
+                altitude,
+                omega,
+                self.options["elements_number"],
+                polars,
+            )
+        local_thrust_vect, local_theta_vect, local_eta_vect = self.trim_pitch_table(
+            thrust_interp, theta_interp, eta_interp
+        )
+
+        # # Plot graphs
+        # plt.figure(1)
+        # plt.subplot(311)
+        # plt.xlabel("0.75R pitch angle [°]")
+        # plt.ylabel("Thrust [N]")
+        # plt.plot(local_theta_vect, local_thrust_vect)
+        # plt.subplot(312)
+        # plt.xlabel("0.75R pitch angle [°]")
+        # plt.ylabel("Efficiency [-]")
+        # plt.plot(local_theta_vect, local_eta_vect)
+        # plt.subplot(313)
+        # plt.xlabel("0.75R pitch angle [°]")
+        # plt.ylabel("Torque [-]")
+        # plt.plot(local_theta_vect,
+        #          v_inf * np.array(local_thrust_vect) / (np.array(local_eta_vect) * omega * math.pi / 30.0))
+
+        return local_thrust_vect, local_theta_vect, local_eta_vect
+
+    def sample_pitch_adaptive(self, inputs, v_inf, altitude, omega, polars=None):
+        """
+        Samples the pitch angles of a speed adaptively: a coarse pass of COARSE_PITCH_PTS_NB points
+        brackets the useful zone of the thrust curve, then the intervals of the bracket are
+        bisected until the mid-point efficiency is linearly interpolated in thrust within
+        tolerance, as reformat_table re-interpolates the table. Intervals where thrust is not
+        increasing (ends of the useful zone) are bisected until the mid-point thrust and efficiency
+        are linearly interpolated in pitch angle within tolerance (relative to max thrust for the
+        thrust). The pitch angle limits should be computed first with compute_extreme_pitch.
+
+        :param inputs: structure of data relative to the blade geometry available from setup
+        :param v_inf: flight speed [m/s]
+        :param altitude: flight altitude [m]
+        :param omega: angular velocity of the propeller [RPM]
+        :param polars: dictionary of (alpha, cl, cd) polars per profile name, read if not provided
+
+        :return: sorted pitch angles [deg.] with related thrust [N] and efficiency [-], not trimmed
+        """
+
+        tolerance = self.options["pitch_sampling_tolerance"]
+        elements_number = self.options["elements_number"]
+        min_step = (self.theta_max - self.theta_min) / (4.0 * (PITCH_PTS_NB - 1))
+
+        # Coarse pass and bracketing of the useful zone with one point of margin on each side
+        theta_vect = np.linspace(self.theta_min, self.theta_max, COARSE_PITCH_PTS_NB)
+        thrust_vect, eta_vect, _ = self.compute_pitch_performance_vect(
+            inputs, theta_vect, v_inf, altitude, omega, elements_number, polars
+        )
+        _, local_theta_vect, _ = self.trim_pitch_table(thrust_vect, theta_vect, eta_vect)
+        if len(local_theta_vect) > 0:
+            idx_start = max(int(np.searchsorted(theta_vect, local_theta_vect[0])) - 1, 0)
+            idx_end = min(
+                int(np.searchsorted(theta_vect, local_theta_vect[-1])) + 1, COARSE_PITCH_PTS_NB - 1,
+            )
+            theta_vect = theta_vect[idx_start : idx_end + 1]
+            thrust_vect = thrust_vect[idx_start : idx_end + 1]
+            eta_vect = eta_vect[idx_start : idx_end + 1]
+
+        # Refinement of the intervals until the linear interpolation is converged, in thrust where
+        # thrust increases
+        refine = np.ones(len(theta_vect) - 1, dtype=bool)
+        while True:
+            refine = refine & (np.diff(theta_vect) > min_step)
+            if not np.any(refine):
+                break
+            theta_middle = 0.5 * (theta_vect[:-1] + theta_vect[1:])[refine]
+            thrust_middle, eta_middle, _ = self.compute_pitch_performance_vect(
+                inputs, theta_middle, v_inf, altitude, omega, elements_number, polars
+            )
+            thrust_start = thrust_vect[:-1][refine]
+            thrust_end = thrust_vect[1:][refine]
+            eta_start = eta_vect[:-1][refine]
+            eta_end = eta_vect[1:][refine]
+            increasing = (thrust_start < thrust_middle) & (thrust_middle < thrust_end)
+            thrust_span = np.where(increasing, thrust_end - thrust_start, 1.0)
+            thrust_ratio = np.where(increasing, (thrust_middle - thrust_start) / thrust_span, 0.5)
+            eta_error = np.abs(eta_middle - (eta_start + thrust_ratio * (eta_end - eta_start)))
+            thrust_error = np.where(
+                increasing, 0.0, np.abs(thrust_middle - 0.5 * (thrust_start + thrust_end))
+            )
+            converged = (thrust_error <= tolerance * np.max(np.abs(thrust_vect))) & (
+                eta_error <= tolerance
+            )
+            # Insert the new points, the two halves of an interval not converged are refined
+            idx_insert = np.where(refine)[0] + 1
+            theta_vect = np.insert(theta_vect, idx_insert, theta_middle)
+            thrust_vect = np.insert(thrust_vect, idx_insert, thrust_middle)
+            eta_vect = np.insert(eta_vect, idx_insert, eta_middle)
+            idx_new = idx_insert + np.arange(len(idx_insert))
+            refine = np.zeros(len(theta_vect) - 1, dtype=bool)
+            refine[idx_new[~converged] - 1] = True
+            refine[idx_new[~converged]] = True
+
+        return theta_vect, thrust_vect, eta_vect
+
+    @staticmethod
+    def trim_pitch_table(thrust_vect, theta_vect, eta_vect, half_window=None):
+        """
+        Keeps the useful zone of the thrust curve: the monotone zone (2 * half_window points of
+        increase) ending before thrust decreases, without negative thrust and efficiency outside
+        ]0, 1].
+
+        :param thrust_vect: thrust for increasing pitch angles [N]
+        :param theta_vect: pitch angles [deg.]
+        :param eta_vect: efficiency [-]
+        :param half_window: half number of points of increase defining the monotone zone, by
+        default 5 for PITCH_PTS_NB points, scaled to the number of points
+
+        :return: trimmed thrust, pitch angle and efficiency lists
+        """
+
+        local_thrust_vect = list(thrust_vect)
+        local_theta_vect = list(theta_vect)
+        local_eta_vect = list(eta_vect)
+        if half_window is None:
+            half_window = max(int(math.ceil(5.0 * len(local_thrust_vect) / PITCH_PTS_NB)), 1)
+
+        # Find first the "monotone" zone (2 * half_window points of increase)
+        idx_in_zone = 0
+        thrust_difference = np.array(local_thrust_vect[1:]) - np.array(local_thrust_vect[0:-1])
+        for idx in range(half_window, len(thrust_difference)):
+            if np.sum(
+                np.array(thrust_difference[idx - half_window : idx + half_window]) > 0.0
+            ) == len(thrust_difference[idx - half_window : idx + half_window]):
+                idx_in_zone = idx + 1
+                break
+        # Erase end of the curve if thrust decreases
+        if len(np.where(thrust_difference[idx_in_zone:] < 0.0)[0]) != 0:
+            idx_end = np.min(np.where(thrust_difference[idx_in_zone:] < 0.0)) + idx_in_zone
+            local_thrust_vect = local_thrust_vect[0 : idx_end + 1]
+            local_theta_vect = local_theta_vect[0 : idx_end + 1]
+            local_eta_vect = local_eta_vect[0 : idx_end + 1]
+        # Erase start of the curve if thrust is negative or decreases
+        idx_start = 0
+        thrust_difference = np.array(local_thrust_vect[1:]) - np.array(local_thrust_vect[0:-1])
+        if len(np.where(np.array(local_thrust_vect) < 0.0)[0]) != 0.0:
+            idx_start = int(np.max(np.where(np.array(local_thrust_vect) < 0.0)))
+        if len(np.where(thrust_difference < 0.0)[0]) != 0.0:
+            idx_start = max(idx_start, int(np.max(np.where(thrust_difference < 0.0)) + 1))
+        local_thrust_vect = local_thrust_vect[idx_start:]
+        local_theta_vect = local_theta_vect[idx_start:]
+        local_eta_vect = local_eta_vect[idx_start:]
+        # Erase remaining points with negative or >1.0 efficiency
+        eta_array = np.array(local_eta_vect)
+        idx_drop = np.where((eta_array <= 0.0) + (eta_array > 1.0))[0].tolist()
+        for idx in sorted(idx_drop, reverse=True):
+            del local_thrust_vect[idx]
+            del local_theta_vect[idx]
+            del local_eta_vect[idx]
+
+        return local_thrust_vect, local_theta_vect, local_eta_vect
 
     @staticmethod
     def reformat_table(thrust_vect, eta_vect):
@@ -297,19 +495,26 @@ class _ComputePropellerPerformance(om.ExplicitComponent):
 
         return thrust_limit, thrust_interp, efficiency_interp
 
-    def compute_pitch_performance(self, inputs, theta_75, v_inf, h, omega, elements_number):
+    def compute_pitch_performance(
+        self, inputs, theta_75, v_inf, h, omega, elements_number, polars=None
+    ):
 
         """
 
         This function calculates the thrust, efficiency and power at a given flight speed, altitude h and propeller
         angular speed.
 
+        Reference implementation of compute_pitch_performance_vect, which is the one used to build
+        the tables: the system of each element is solved with fsolve by bem_theory, disk_theory
+        and delta. It is kept to check the vectorized resolution in the tests.
+
         :param inputs: structure of data relative to the blade geometry available from setup
         :param theta_75: pitch defined at r = 0.75*R radial position [deg.]
         :param v_inf: flight speeds [m/s]
         :param h: flight altitude [m]
         :param omega: angular velocity of the propeller [RPM]
         :param elements_number: number of elements for discretization [-]
+        :param polars: dictionary of (alpha, cl, cd) polars per profile name, read if not provided
 
         :return: thrust [N], eta (efficiency) [-] and power [W]
         """
@@ -353,7 +558,10 @@ class _ComputePropellerPerformance(om.ExplicitComponent):
                 profile_name = sections_profile_name_list[int(index[-1])]
 
             # Load profile polars
-            alpha_element, cl_element, cd_element = self.read_polar_result(profile_name)
+            if polars is None:
+                alpha_element, cl_element, cd_element = self.read_polar_result(profile_name)
+            else:
+                alpha_element, cl_element, cd_element = polars[profile_name]
 
             # Search element angle to aircraft axial air (~v_inf) and sweep angle
             theta_75_ref = np.interp(0.75, radius_ratio_vect, twist_vect)
@@ -422,6 +630,419 @@ class _ComputePropellerPerformance(om.ExplicitComponent):
 
         return thrust, eta, torque
 
+    def compute_pitch_performance_vect(
+        self, inputs, theta_75_vect, v_inf, h, omega, elements_number, polars=None
+    ):
+
+        """
+        Vectorized version of compute_pitch_performance: the BEM vs. disk theory system of each
+        element is solved for all the pitch angles at once with solve_bem. As in the scalar version,
+        the solution of an element is used as initial guess for the next one.
+
+        :param inputs: structure of data relative to the blade geometry available from setup
+        :param theta_75_vect: pitch angles defined at r = 0.75*R radial position [deg.]
+        :param v_inf: flight speed [m/s]
+        :param h: flight altitude [m]
+        :param omega: angular velocity of the propeller [RPM]
+        :param elements_number: number of elements for discretization [-]
+        :param polars: dictionary of (alpha, cl, cd) polars per profile name, read if not provided
+
+        :return: thrust [N], eta (efficiency) [-] and torque [N.m] vectors
+        """
+
+        blades_number = float(inputs["data:geometry:propeller:blades_number"])
+        sections_profile_position_list = np.array(self.options["sections_profile_position_list"])
+        sections_profile_name_list = self.options["sections_profile_name_list"]
+        radius_min = float(inputs["data:geometry:propeller:hub_diameter"]) / 2.0
+        radius_max = float(inputs["data:geometry:propeller:diameter"]) / 2.0
+        sweep_vect = inputs["data:geometry:propeller:sweep_vect"]
+        chord_vect = inputs["data:geometry:propeller:chord_vect"]
+        twist_vect = inputs["data:geometry:propeller:twist_vect"]
+        radius_ratio_vect = inputs["data:geometry:propeller:radius_ratio_vect"]
+        v_inf = float(v_inf)
+        length = radius_max - radius_min
+        dr = length / elements_number
+        omega = omega * math.pi / 30.0
+        atm = Atmosphere(h, altitude_in_feet=False)
+        density = float(atm.density)
+        speed_of_sound = float(atm.speed_of_sound)
+        theta_75_vect = np.asarray(theta_75_vect, dtype=float)
+        theta_75_ref = np.interp(0.75, radius_ratio_vect, twist_vect)
+
+        # Initialise vectors
+        thrust = np.zeros_like(theta_75_vect)
+        torque = np.zeros_like(theta_75_vect)
+        vi_vect = np.full_like(theta_75_vect, 0.1 * v_inf)
+        vt_vect = np.ones_like(theta_75_vect)
+        convergence_report = {"iterations": 0, "max_residual": 0.0, "fsolve_fallbacks": 0}
+
+        # Loop on element number, all the pitch angles are solved at once
+        for i in range(elements_number):
+
+            # Calculate element center radius and chord
+            radius = radius_min + (i + 0.5) * dr
+            chord = np.interp(radius / radius_max, radius_ratio_vect, chord_vect)
+
+            # Find related profile name
+            index = np.where(sections_profile_position_list < (radius / radius_max))[0]
+            if len(index) == 0:
+                profile_name = sections_profile_name_list[0]
+            else:
+                profile_name = sections_profile_name_list[int(index[-1])]
+
+            # Load profile polars
+            if polars is None:
+                alpha_element, cl_element, cd_element = self.read_polar_result(profile_name)
+            else:
+                alpha_element, cl_element, cd_element = polars[profile_name]
+
+            # Search element angle to aircraft axial air (~v_inf) and sweep angle
+            theta = np.interp(radius / radius_max, radius_ratio_vect, twist_vect) + (
+                theta_75_vect - theta_75_ref
+            )
+            sweep = np.interp(radius / radius_max, radius_ratio_vect, sweep_vect)
+
+            # Solve BEM vs. disk theory system of equations
+            args = (
+                radius,
+                radius_max,
+                chord,
+                blades_number,
+                sweep,
+                omega,
+                v_inf,
+                theta,
+                alpha_element,
+                cl_element,
+                cd_element,
+                speed_of_sound,
+            )
+            vi_vect, vt_vect, report = self.solve_bem(vi_vect, vt_vect, *args)
+            convergence_report["iterations"] = max(
+                convergence_report["iterations"], report["iterations"]
+            )
+            convergence_report["max_residual"] = max(
+                convergence_report["max_residual"], report["max_residual"]
+            )
+            convergence_report["fsolve_fallbacks"] += report["fsolve_fallbacks"]
+
+            d_thrust, d_torque, _, out_of_polars = self.bem_theory_vect(
+                vi_vect,
+                vt_vect,
+                radius,
+                chord,
+                blades_number,
+                sweep,
+                omega,
+                v_inf,
+                theta,
+                alpha_element,
+                cl_element,
+                cd_element,
+                speed_of_sound,
+            )
+            thrust += np.where(out_of_polars, 0.0, d_thrust * dr * density)
+            torque += np.where(out_of_polars, 0.0, d_torque * dr * density)
+
+        power = torque * omega
+        eta = v_inf * thrust / power
+
+        _LOGGER.debug(
+            "BEM solved for %d pitch angles at %.1f m/s: %d iterations max, max residual %.2e, "
+            "%d fsolve fallback(s)",
+            len(theta_75_vect),
+            v_inf,
+            convergence_report["iterations"],
+            convergence_report["max_residual"],
+            convergence_report["fsolve_fallbacks"],
+        )
+
+        return thrust, eta, torque
+
+    @staticmethod
+    def solve_bem(
+        vi_vect: np.array,
+        vt_vect: np.array,
+        radius: float,
+        radius_max: float,
+        chord: float,
+        blades_number: float,
+        sweep: float,
+        omega: float,
+        v_inf: float,
+        theta: np.array,
+        alpha_element: np.array,
+        cl_element: np.array,
+        cd_element: np.array,
+        speed_of_sound: float,
+        tolerance: float = 1e-6,
+        max_iterations: int = 50,
+    ):
+        """
+        Solves the BEM vs. disk theory system of an element for a vector of profile angles with a
+        damped Newton iteration (finite differences jacobian, step halved until the residual
+        decreases). The systems that do not converge are solved again with fsolve starting from
+        the same initial guess.
+
+        :param vi_vect: initial guess of the axial induced speed [m/s]
+        :param vt_vect: initial guess of the tangential induced speed [m/s]
+        :param radius: radius position of the element center  [m]
+        :param radius_max: Max radius [m]
+        :param chord: chord at the center of element [m]
+        :param blades_number: number of blades [-]
+        :param sweep: sweep angle [deg.]
+        :param omega: angular speed of propeller [rad/sec]
+        :param v_inf: flight speed [m/s]
+        :param theta: profile angles relative to aircraft airflow v_inf [deg.]
+        :param alpha_element: reference angle vector for element polars [deg.]
+        :param cl_element: cl vector for element [-]
+        :param cd_element: cd vector for element [-]
+        :param speed_of_sound: speed of sound at flight altitude [m/s]
+        :param tolerance: relative tolerance on the Newton step [-]
+        :param max_iterations: maximum number of Newton iterations [-]
+
+        :return: axial and tangential induced speed vectors [m/s] and a convergence report
+        (iterations, max residual and number of fsolve fallbacks)
+        """
+
+        args = (
+            radius,
+            radius_max,
+            chord,
+            blades_number,
+            sweep,
+            omega,
+            v_inf,
+            theta,
+            alpha_element,
+            cl_element,
+            cd_element,
+            speed_of_sound,
+        )
+        residual = _ComputePropellerPerformance.delta_vect
+        vi_init = np.array(vi_vect, dtype=float)
+        vt_init = np.array(vt_vect, dtype=float)
+        vi_vect = vi_init.copy()
+        vt_vect = vt_init.copy()
+        converged = np.zeros(np.shape(vi_vect), dtype=bool)
+
+        iterations = 0
+        with np.errstate(all="ignore"):
+            while iterations < max_iterations and not np.all(converged):
+                iterations += 1
+                f_1, f_2 = residual(vi_vect, vt_vect, *args)
+                # Finite differences jacobian
+                step_i = 1e-7 * np.maximum(np.abs(vi_vect), 1.0)
+                step_t = 1e-7 * np.maximum(np.abs(vt_vect), 1.0)
+                f_1_i, f_2_i = residual(vi_vect + step_i, vt_vect, *args)
+                f_1_t, f_2_t = residual(vi_vect, vt_vect + step_t, *args)
+                j_11 = (f_1_i - f_1) / step_i
+                j_21 = (f_2_i - f_2) / step_i
+                j_12 = (f_1_t - f_1) / step_t
+                j_22 = (f_2_t - f_2) / step_t
+                determinant = j_11 * j_22 - j_12 * j_21
+                d_vi = np.where(converged, 0.0, -(j_22 * f_1 - j_12 * f_2) / determinant)
+                d_vt = np.where(converged, 0.0, -(j_11 * f_2 - j_21 * f_1) / determinant)
+                # Damping: the step is halved until the residual decreases
+                residual_norm = np.hypot(f_1, f_2)
+                damping = np.ones_like(vi_vect)
+                for _ in range(8):
+                    new_f_1, new_f_2 = residual(
+                        vi_vect + damping * d_vi, vt_vect + damping * d_vt, *args
+                    )
+                    not_decreasing = ~(np.hypot(new_f_1, new_f_2) < residual_norm) & ~converged
+                    if not np.any(not_decreasing):
+                        break
+                    damping = np.where(not_decreasing, damping / 2.0, damping)
+                d_vi = damping * d_vi
+                d_vt = damping * d_vt
+                vi_vect = vi_vect + d_vi
+                vt_vect = vt_vect + d_vt
+                converged = converged | (
+                    (np.abs(d_vi) <= tolerance * (1.0 + np.abs(vi_vect)))
+                    & (np.abs(d_vt) <= tolerance * (1.0 + np.abs(vt_vect)))
+                )
+            converged = converged & np.isfinite(vi_vect) & np.isfinite(vt_vect)
+
+        # Fallback on fsolve for the systems that did not converge
+        fallback_index = np.where(~converged)[0]
+        for idx in fallback_index:
+            element_args = args[0:7] + (theta[idx],) + args[8:]
+            speed_vect = fsolve(
+                lambda x: np.array(residual(x[0], x[1], *element_args), dtype=float),
+                np.array([vi_init[idx], vt_init[idx]]),
+                xtol=1e-3,
+            )
+            vi_vect[idx] = speed_vect[0]
+            vt_vect[idx] = speed_vect[1]
+
+        f_1, f_2 = residual(vi_vect, vt_vect, *args)
+        report = {
+            "iterations": iterations,
+            "max_residual": float(np.max(np.hypot(f_1, f_2))),
+            "fsolve_fallbacks": len(fallback_index),
+        }
+
+        return vi_vect, vt_vect, report
+
+    @staticmethod
+    def bem_theory_vect(
+        vi_vect: np.array,
+        vt_vect: np.array,
+        radius: float,
+        chord: float,
+        blades_number: float,
+        sweep: float,
+        omega: float,
+        v_inf: float,
+        theta: np.array,
+        alpha_element: np.array,
+        cl_element: np.array,
+        cd_element: np.array,
+        speed_of_sound: float,
+    ):
+        """
+        Vectorized version of bem_theory.
+
+        :param vi_vect: axial induced speed [m/s]
+        :param vt_vect: tangential induced speed [m/s]
+        :param radius: radius position of the element center  [m]
+        :param chord: chord at the center of element [m]
+        :param blades_number: number of blades [-]
+        :param sweep: sweep angle [deg.]
+        :param omega: angular speed of propeller [rad/sec]
+        :param v_inf: flight speed [m/s]
+        :param theta: profile angles relative to aircraft airflow v_inf [deg.]
+        :param alpha_element: reference angle vector for element polars [deg.]
+        :param cl_element: cl vector for element [-]
+        :param cd_element: cd vector for element [-]
+        :param speed_of_sound: speed of sound at flight altitude [m/s]
+
+        :return: The calculated dT/(rho*dr) and dQ/(rho*dr) increments with BEM method, the angle
+        of attack [deg.] and the out of polars flag.
+        """
+
+        # Calculate speed composition and relative air angle (in deg.)
+        v_ax = v_inf + vi_vect
+        v_t = (omega * radius - vt_vect) * math.cos(sweep * math.pi / 180.0)
+        w = np.sqrt(v_ax ** 2.0 + v_t ** 2.0)
+        phi = np.arctan(v_ax / v_t)
+        alpha = theta - phi * 180.0 / math.pi
+
+        # Compute local mach
+        mach_local = w / speed_of_sound
+
+        # Apply the compressibility corrections for cl and cd
+        out_of_polars = (alpha > np.max(alpha_element)) | (alpha < np.min(alpha_element))
+        cl = np.interp(alpha, alpha_element, cl_element)
+        cd = np.interp(alpha, alpha_element, cd_element)
+        beta = np.sqrt(np.abs(1.0 - mach_local ** 2.0))
+        # Prandtl-Glauert correction as Karman-Tsien and Laitone only apply to the pressure
+        # coefficient distribution
+        cl = cl / beta
+        cd = np.where(mach_local < 1.0, cd, cd / beta)
+
+        # Calculate force and momentum
+        d_thrust = 0.5 * blades_number * chord * w ** 2.0 * (cl * np.cos(phi) - cd * np.sin(phi))
+        d_torque = (
+            0.5 * blades_number * chord * w ** 2.0 * (cl * np.sin(phi) + cd * np.cos(phi)) * radius
+        )
+
+        return d_thrust, d_torque, alpha, out_of_polars
+
+    @staticmethod
+    def disk_theory_vect(
+        vi_vect: np.array,
+        vt_vect: np.array,
+        radius: float,
+        radius_max: float,
+        blades_number: float,
+        omega: float,
+        v_inf: float,
+    ):
+        """
+        Vectorized version of disk_theory.
+
+        :param vi_vect: axial induced speed [m/s]
+        :param vt_vect: tangential induced speed [m/s]
+        :param radius: radius position of the element center  [m]
+        :param radius_max: Max radius [m]
+        :param blades_number: number of blades [-]
+        :param omega: angular speed of propeller [rad/sec]
+        :param v_inf: flight speed [m/s]
+
+        :return: The calculated dT/(rho*dr) and dQ/(rho*dr) increments with disk theory method.
+        """
+
+        v_ax = v_inf + vi_vect
+
+        # f_tip is the tip loose factor
+        f_tip = (
+            2
+            / math.pi
+            * np.arccos(
+                np.exp(
+                    -blades_number
+                    / 2
+                    * (
+                        (radius_max - radius)
+                        / radius
+                        * np.sqrt(1 + (omega * radius / (v_ax + 1e-12 * (v_ax == 0.0))) ** 2.0)
+                    )
+                )
+            )
+        )
+
+        # Calculate force and momentum
+        d_thrust = 4.0 * math.pi * radius * v_ax * vi_vect * f_tip
+        d_torque = 4.0 * math.pi * radius ** 2.0 * v_ax * vt_vect * f_tip
+
+        return d_thrust, d_torque
+
+    @staticmethod
+    def delta_vect(
+        vi_vect: np.array,
+        vt_vect: np.array,
+        radius: float,
+        radius_max: float,
+        chord: float,
+        blades_number: float,
+        sweep: float,
+        omega: float,
+        v_inf: float,
+        theta: np.array,
+        alpha_element: np.array,
+        cl_element: np.array,
+        cd_element: np.array,
+        speed_of_sound: float,
+    ):
+        """
+        Vectorized version of delta.
+
+        :return: The difference between BEM dual methods for dT/(rho*dr) and dQ/ increments.
+        """
+
+        d_thrust_bem, _, _, _ = _ComputePropellerPerformance.bem_theory_vect(
+            vi_vect,
+            vt_vect,
+            radius,
+            chord,
+            blades_number,
+            sweep,
+            omega,
+            v_inf,
+            theta,
+            alpha_element,
+            cl_element,
+            cd_element,
+            speed_of_sound,
+        )
+        d_thrust_disk, d_torque_disk = _ComputePropellerPerformance.disk_theory_vect(
+            vi_vect, vt_vect, radius, radius_max, blades_number, omega, v_inf
+        )
+
+        return d_thrust_bem - d_thrust_disk, d_thrust_bem - d_torque_disk
+
     @staticmethod
     def bem_theory(
         speed_vect: np.array,
@@ -441,6 +1062,7 @@ class _ComputePropellerPerformance(om.ExplicitComponent):
         The core of the Propeller code. Given the geometry of a propeller element, its aerodynamic polars, flight
         conditions and axial/tangential velocities it computes the thrust and the torque produced using force and
         momentum with BEM theory.
+        Element-wise version of bem_theory_vect, used by the reference compute_pitch_performance.
 
         :param speed_vect: the vector of axial and tangential induced speed in m/s
         :param radius: radius position of the element center  [m]
@@ -526,6 +1148,7 @@ class _ComputePropellerPerformance(om.ExplicitComponent):
         The core of the Propeller code. Given the geometry of a propeller element, its aerodynamic polars, flight
         conditions and axial/tangential velocities it computes the thrust and the torque produced using force and
         momentum with disk theory.
+        Element-wise version of disk_theory_vect, used by the reference compute_pitch_performance.
 
         :param speed_vect: the vector of axial and tangential induced speed in m/s
         :param radius: radius position of the element center  [m]
@@ -611,6 +1234,7 @@ class _ComputePropellerPerformance(om.ExplicitComponent):
         The core of the Propeller code. Given the geometry of a propeller element, its aerodynamic polars, flight
         conditions and axial/tangential velocities it computes the thrust and the torque produced using force and
         momentum with disk theory.
+        Element-wise version of delta_vect, used by the reference compute_pitch_performance.
 
         :param speed_vect: the vector of axial and tangential induced speed in m/s
         :param radius: radius position of the element center  [m]
@@ -653,61 +1277,45 @@ class _ComputePropellerPerformance(om.ExplicitComponent):
 
     @staticmethod
     def read_polar_result(airfoil_name):
-        result_file = pth.join(xfoil.__path__[0], "resources", airfoil_name + "_30S.csv")
-        mach = 0.0
-        reynolds = 1e6
-        data_saved = pd.read_csv(result_file)
-        values = data_saved.to_numpy()[:, 1 : len(data_saved.to_numpy()[0])]
-        labels = data_saved.to_numpy()[:, 0].tolist()
-        data_saved = pd.DataFrame(values, index=labels)
-        index_mach = np.where(data_saved.loc["mach", :].to_numpy() == str(mach))[0]
-        data_reduced = data_saved.loc[labels, index_mach]
-        # Search if this exact reynolds has been computed and save results
-        reynolds_vect = np.array(
-            [float(x) for x in list(data_reduced.loc["reynolds", :].to_numpy())]
+        """
+        Reads the polar of a profile at Mach 0 and Reynolds 1e6 in the polar database, the polar is
+        interpolated only once as long as the database is not modified.
+
+        :param airfoil_name: name of the profile
+        :return: alpha [deg.], cl [-] and cd [-] vectors (read-only)
+        """
+        polar_database = PolarDatabase(POLAR_DATABASE_FOLDER_PATH)
+        polar_name = airfoil_name + "_30S"
+        polar_surface = PolarSurface.load(polar_database, polar_name)
+        # The modification time is read after the load, which may import a former csv polar
+        key = (
+            polar_database.database_path,
+            polar_name,
+            os.stat(polar_database.database_path).st_mtime_ns
+            if pth.exists(polar_database.database_path)
+            else None,
         )
-        index_reynolds = index_mach[np.where(reynolds_vect == reynolds)[0]]
-        if len(index_reynolds) == 1:
-            interpolated_result = data_reduced.loc[labels, index_reynolds]
-        # Else search for lower/upper Reynolds
+        if key in _POLAR_CACHE:
+            _POLAR_CACHE.move_to_end(key)
         else:
-            lower_reynolds = reynolds_vect[np.where(reynolds_vect < reynolds)[0]]
-            upper_reynolds = reynolds_vect[np.where(reynolds_vect > reynolds)[0]]
-            if not (len(lower_reynolds) == 0 or len(upper_reynolds) == 0):
-                index_lower_reynolds = index_mach[np.where(reynolds_vect == max(lower_reynolds))[0]]
-                index_upper_reynolds = index_mach[np.where(reynolds_vect == min(upper_reynolds))[0]]
-                interpolated_result = data_reduced.loc[labels, index_lower_reynolds]
-                # Calculate reynolds interval ratio
-                x_ratio = (min(upper_reynolds) - reynolds) / (
-                    min(upper_reynolds) - max(lower_reynolds)
+            result = None if polar_surface is None else polar_surface.search(0.0, 1e6)
+            if result is None:
+                raise ValueError(
+                    "No %s polar saved for Mach 0 and Reynolds 1e6 in %s"
+                    % (polar_name, polar_database.database_path)
                 )
-                # Search for common alpha range
-                alpha_lower = np.array(
-                    np.matrix(data_reduced.loc["alpha", index_lower_reynolds].to_numpy()[0])
-                ).ravel()
-                alpha_upper = np.array(
-                    np.matrix(data_reduced.loc["alpha", index_upper_reynolds].to_numpy()[0])
-                ).ravel()
-                alpha_shared = np.array(list(set(alpha_upper).intersection(alpha_lower)))
-                data_reduced.loc["alpha", index_lower_reynolds] = str(alpha_shared.tolist())
-                labels.remove("alpha")
-                # Calculate average values (cd, cl...) with linear interpolation
-                for label in labels:
-                    lower_value = np.array(
-                        np.matrix(data_reduced.loc[label, index_lower_reynolds].to_numpy()[0])
-                    ).ravel()
-                    upper_value = np.array(
-                        np.matrix(data_reduced.loc[label, index_upper_reynolds].to_numpy()[0])
-                    ).ravel()
-                    # If values relative to alpha vector, performs interpolation with shared vector
-                    if np.size(lower_value) == len(alpha_lower):
-                        lower_value = np.interp(alpha_shared, np.array(alpha_lower), lower_value)
-                        upper_value = np.interp(alpha_shared, np.array(alpha_upper), upper_value)
-                    value = (lower_value * x_ratio + upper_value * (1 - x_ratio)).tolist()
-                    interpolated_result.loc[label, index_lower_reynolds] = str(value)
-        # Extract alpha, cl and cd vectors
-        # noinspection PyUnboundLocalVariable
-        alpha_vect = np.array(np.matrix(interpolated_result.loc["alpha", :].to_numpy()[0])).ravel()
-        cl_vect = np.array(np.matrix(interpolated_result.loc["cl", :].to_numpy()[0])).ravel()
-        cd_vect = np.array(np.matrix(interpolated_result.loc["cd", :].to_numpy()[0])).ravel()
-        return alpha_vect, cl_vect, cd_vect
+            polar = tuple(np.array(result[label]) for label in ["alpha", "cl", "cd"])
+            for vector in polar:
+                vector.flags.writeable = False
+            _POLAR_CACHE[key] = polar
+            if len(_POLAR_CACHE) > POLAR_CACHE_SIZE:
+                _POLAR_CACHE.popitem(last=False)
+
+        return _POLAR_CACHE[key]
+
+
+def _compute_speed_table(options, inputs, v_inf, altitude, omega):
+    """Computes the table of a speed in a worker process (see construct_tables)."""
+    return _ComputePropellerPerformance(**options).compute_speed_table(
+        inputs, v_inf, altitude, omega
+    )
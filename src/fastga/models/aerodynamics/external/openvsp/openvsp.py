@@ -18,7 +18,6 @@ from importlib.resources import path
 import numpy as np
 import warnings
 import math
-import pandas as pd
 from openmdao.components.external_code_comp import ExternalCodeComp
 from openmdao.utils.file_wrap import InputFileGenerator
 import os
@@ -40,6 +39,7 @@ from ... import resources
 from . import resources as local_resources
 from . import openvsp3201
 from ...constants import SPAN_MESH_POINT, MACH_NB_PTS, ENGINE_COUNT
+from ..results_database import AeroResultsDatabase, RESULTS_LABELS
 
 from fastga.models.propulsion.fuel_propulsion.base import FuelEngineSet
 from fastga.models.propulsion.fuel_propulsion.basicIC_engine.basicIC_engine import (
@@ -180,24 +180,14 @@ class OPENVSPSimpleGeometry(ExternalCodeComp):
 
         # Search if results already exist:
         result_folder_path = self.options["result_folder_path"]
-        result_file_path = None
-        saved_area_ratio = 1.0
+        results_database = None
+        saved_results = None
         if result_folder_path != "":
-            result_file_path, saved_area_ratio = self.search_results(
-                result_folder_path, geometry_set
-            )
+            results_database = AeroResultsDatabase(result_folder_path, "openvsp")
+            saved_results = results_database.search(geometry_set)
 
         # If no result saved for that geometry under this mach condition, computation is done
-        if result_file_path is None:
-
-            # Create result folder first (if it must fail, let it fail as soon as possible)
-            if result_folder_path != "":
-                if not os.path.exists(result_folder_path):
-                    os.makedirs(pth.join(result_folder_path), exist_ok=True)
-
-            # Save the geometry (result_file_path is None entering the function)
-            if self.options["result_folder_path"] != "":
-                result_file_path = self.save_geometry(result_folder_path, geometry_set)
+        if saved_results is None:
 
             # Compute wing alone @ 0°/X° angle of attack
             wing_0 = self.compute_wing(inputs, outputs, altitude, mach, 0.0)
@@ -269,7 +259,7 @@ class OPENVSPSimpleGeometry(ExternalCodeComp):
                 cl_vector_htp.extend(additional_zeros)
 
             # Save results to defined path -----------------------------------------------------------------------------
-            if self.options["result_folder_path"] != "":
+            if results_database is not None:
                 results = [
                     cl_0_wing,
                     cl_alpha_wing,
@@ -287,39 +277,30 @@ class OPENVSPSimpleGeometry(ExternalCodeComp):
                     coef_k_htp,
                     sref_wing,
                 ]
-                self.save_results(result_file_path, results)
+                results_database.save(geometry_set, dict(zip(RESULTS_LABELS, results)))
 
         # Else retrieved results are used, eventually adapted with new area ratio
         else:
-            # Read values from result file -----------------------------------------------------------------------------
-            data = self.read_results(result_file_path)
-            saved_area_wing = float(data.loc["saved_ref_area", 0])
-            cl_0_wing = float(data.loc["cl_0_wing", 0])
-            cl_alpha_wing = float(data.loc["cl_alpha_wing", 0])
-            cm_0_wing = float(data.loc["cm_0_wing", 0])
-            y_vector_wing = np.array(
-                [float(i) for i in data.loc["y_vector_wing", 0][1:-2].split(",")]
-            ) * math.sqrt(sref_wing / saved_area_wing)
-            cl_vector_wing = np.array(
-                [float(i) for i in data.loc["cl_vector_wing", 0][1:-2].split(",")]
+            saved_area_wing = saved_results["saved_ref_area"]
+            saved_area_ratio = saved_results["area_ratio"]
+            cl_0_wing = saved_results["cl_0_wing"]
+            cl_alpha_wing = saved_results["cl_alpha_wing"]
+            cm_0_wing = saved_results["cm_0_wing"]
+            y_vector_wing = saved_results["y_vector_wing"] * math.sqrt(sref_wing / saved_area_wing)
+            cl_vector_wing = saved_results["cl_vector_wing"]
+            chord_vector_wing = saved_results["chord_vector_wing"] * math.sqrt(
+                sref_wing / saved_area_wing
             )
-            chord_vector_wing = np.array(
-                [float(i) for i in data.loc["chord_vector_wing", 0][1:-2].split(",")]
-            ) * math.sqrt(sref_wing / saved_area_wing)
-            coef_k_wing = float(data.loc["coef_k_wing", 0])
-            cl_0_htp = float(data.loc["cl_0_htp", 0]) * (area_ratio / saved_area_ratio)
-            cl_X_htp = float(data.loc["cl_X_htp", 0]) * (area_ratio / saved_area_ratio)
-            cl_alpha_htp = float(data.loc["cl_alpha_htp", 0]) * (area_ratio / saved_area_ratio)
-            cl_alpha_htp_isolated = float(data.loc["cl_alpha_htp_isolated", 0]) * (
+            coef_k_wing = saved_results["coef_k_wing"]
+            cl_0_htp = saved_results["cl_0_htp"] * (area_ratio / saved_area_ratio)
+            cl_X_htp = saved_results["cl_X_htp"] * (area_ratio / saved_area_ratio)
+            cl_alpha_htp = saved_results["cl_alpha_htp"] * (area_ratio / saved_area_ratio)
+            cl_alpha_htp_isolated = saved_results["cl_alpha_htp_isolated"] * (
                 area_ratio / saved_area_ratio
             )
-            y_vector_htp = np.array(
-                [float(i) for i in data.loc["y_vector_htp", 0][1:-2].split(",")]
-            )
-            cl_vector_htp = np.array(
-                [float(i) for i in data.loc["cl_vector_htp", 0][1:-2].split(",")]
-            ) * (area_ratio / saved_area_ratio)
-            coef_k_htp = float(data.loc["coef_k_htp", 0]) * (area_ratio / saved_area_ratio)
+            y_vector_htp = saved_results["y_vector_htp"]
+            cl_vector_htp = saved_results["cl_vector_htp"] * (area_ratio / saved_area_ratio)
+            coef_k_htp = saved_results["coef_k_htp"] * (area_ratio / saved_area_ratio)
 
         return (
             cl_0_wing,
@@ -1089,104 +1070,6 @@ class OPENVSPSimpleGeometry(ExternalCodeComp):
 
         return tmp_directory
 
-    @staticmethod
-    def search_results(result_folder_path, geometry_set):
-
-        if os.path.exists(result_folder_path):
-            geometry_set_labels = [
-                "sweep25_wing",
-                "taper_ratio_wing",
-                "aspect_ratio_wing",
-                "sweep25_htp",
-                "taper_ratio_htp",
-                "aspect_ratio_htp",
-                "mach",
-                "area_ratio",
-            ]
-            # If some results already stored search for corresponding geometry
-            if pth.exists(pth.join(result_folder_path, "geometry_0.csv")):
-                idx = 0
-                while pth.exists(pth.join(result_folder_path, "geometry_" + str(idx) + ".csv")):
-                    if pth.exists(pth.join(result_folder_path, "openvsp_" + str(idx) + ".csv")):
-                        data = pd.read_csv(
-                            pth.join(result_folder_path, "geometry_" + str(idx) + ".csv")
-                        )
-                        values = data.to_numpy()[:, 1].tolist()
-                        labels = data.to_numpy()[:, 0].tolist()
-                        data = pd.DataFrame(values, index=labels)
-                        # noinspection PyBroadException
-                        try:
-                            if np.size(data.loc[geometry_set_labels[0:-1], 0].to_numpy()) == 7:
-                                saved_set = np.around(
-                                    data.loc[geometry_set_labels[0:-1], 0].to_numpy(), decimals=6
-                                )
-                                if np.sum(saved_set == geometry_set[0:-1]) == 7:
-                                    result_file_path = pth.join(
-                                        result_folder_path, "openvsp_" + str(idx) + ".csv"
-                                    )
-                                    saved_area_ratio = data.loc["area_ratio", 0]
-                                    return result_file_path, saved_area_ratio
-                        except:
-                            break
-                    idx += 1
-
-        return None, 1.0
-
-    @staticmethod
-    def save_geometry(result_folder_path, geometry_set):
-
-        # Save geometry if not already computed by finding first available index
-        geometry_set_labels = [
-            "sweep25_wing",
-            "taper_ratio_wing",
-            "aspect_ratio_wing",
-            "sweep25_htp",
-            "taper_ratio_htp",
-            "aspect_ratio_htp",
-            "mach",
-            "area_ratio",
-        ]
-        data = pd.DataFrame(geometry_set, index=geometry_set_labels)
-        idx = 0
-        while pth.exists(pth.join(result_folder_path, "geometry_" + str(idx) + ".csv")):
-            idx += 1
-        data.to_csv(pth.join(result_folder_path, "geometry_" + str(idx) + ".csv"))
-        result_file_path = pth.join(result_folder_path, "openvsp_" + str(idx) + ".csv")
-
-        return result_file_path
-
-    @staticmethod
-    def save_results(result_file_path, results):
-
-        labels = [
-            "cl_0_wing",
-            "cl_alpha_wing",
-            "cm_0_wing",
-            "y_vector_wing",
-            "cl_vector_wing",
-            "chord_vector_wing",
-            "coef_k_wing",
-            "cl_0_htp",
-            "cl_X_htp",
-            "cl_alpha_htp",
-            "cl_alpha_htp_isolated",
-            "y_vector_htp",
-            "cl_vector_htp",
-            "coef_k_htp",
-            "saved_ref_area",
-        ]
-        data = pd.DataFrame(results, index=labels)
-        data.to_csv(result_file_path)
-
-    @staticmethod
-    def read_results(result_file_path):
-
-        data = pd.read_csv(result_file_path)
-        values = data.to_numpy()[:, 1].tolist()
-        labels = data.to_numpy()[:, 0].tolist()
-
-        return pd.DataFrame(values, index=labels)
-
 
 class OPENVSPSimpleGeometryDP(OPENVSPSimpleGeometry):
     def __init__(self, **kwargs):
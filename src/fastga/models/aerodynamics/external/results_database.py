@@ -0,0 +1,232 @@
+"""
+    Indexed storage of the VLM/OpenVSP results
+"""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import glob
+import hashlib
+import io
+import logging
+import os
+import os.path as pth
+import sqlite3
+from typing import Dict, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+DATABASE_FILE_NAME = "aero_results.sqlite"
+
+GEOMETRY_SET_LABELS = [
+    "sweep25_wing",
+    "taper_ratio_wing",
+    "aspect_ratio_wing",
+    "sweep25_htp",
+    "taper_ratio_htp",
+    "aspect_ratio_htp",
+    "mach",
+    "area_ratio",
+]
+
+RESULTS_LABELS = [
+    "cl_0_wing",
+    "cl_alpha_wing",
+    "cm_0_wing",
+    "y_vector_wing",
+    "cl_vector_wing",
+    "chord_vector_wing",
+    "coef_k_wing",
+    "cl_0_htp",
+    "cl_X_htp",
+    "cl_alpha_htp",
+    "cl_alpha_htp_isolated",
+    "y_vector_htp",
+    "cl_vector_htp",
+    "coef_k_htp",
+    "saved_ref_area",
+]
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class AeroResultsDatabase:
+    """
+    Results of an aerodynamic code (VLM, OpenVSP...) stored in a single SQLite file of the result
+    folder.
+
+    Entries are indexed by a hash of the geometry set rounded to 6 decimals, area ratio excluded
+    since it is only used to scale HTP results. Results are stored as native float arrays and each
+    save is a single transaction so that an interrupted run cannot leave a partial entry.
+    """
+
+    def __init__(self, result_folder_path: str, code_name: str):
+        """
+        :param result_folder_path: folder in which the database file is stored
+        :param code_name: name of the code the results come from (e.g. "vlm" or "openvsp")
+        """
+        self.result_folder_path = result_folder_path
+        self.code_name = code_name
+        self.database_path = pth.join(result_folder_path, DATABASE_FILE_NAME)
+
+    @staticmethod
+    def geometry_key(geometry_set: np.ndarray) -> str:
+        """
+        Computes the key of a geometry set (area ratio excluded, values rounded to 6 decimals).
+
+        :param geometry_set: array of values ordered as GEOMETRY_SET_LABELS
+        :return: hexadecimal hash of the rounded geometry
+        """
+        rounded_set = np.around(np.asarray(geometry_set, dtype=float)[0:-1], decimals=6) + 0.0
+        text = ",".join("{:.6f}".format(value) for value in rounded_set)
+
+        return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+    def search(self, geometry_set: np.ndarray) -> Optional[Dict[str, Union[float, np.ndarray]]]:
+        """
+        Looks for saved results of the geometry set.
+
+        :param geometry_set: array of values ordered as GEOMETRY_SET_LABELS
+        :return: dictionary with RESULTS_LABELS and "area_ratio" keys, None if not found
+        """
+        if not pth.exists(self.database_path):
+            # Results saved with the former csv format are imported once
+            if not glob.glob(pth.join(self.result_folder_path, "geometry_*.csv")):
+                return None
+            migrate_result_folder(self.result_folder_path)
+
+        # Connecting creates the database even if nothing was migrated, so that the csv files are
+        # only looked for on the first search
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT area_ratio, data FROM results WHERE code = ? AND key = ?",
+                (self.code_name, self.geometry_key(geometry_set)),
+            ).fetchone()
+        connection.close()
+        if row is None:
+            return None
+
+        with np.load(io.BytesIO(row[1])) as arrays:
+            results = {
+                name: (float(value) if value.ndim == 0 else value) for name, value in arrays.items()
+            }
+        results["area_ratio"] = row[0]
+
+        return results
+
+    def save(self, geometry_set: np.ndarray, results: Dict[str, Union[float, list, np.ndarray]]):
+        """
+        Saves (or replaces) the results of the geometry set.
+
+        :param geometry_set: array of values ordered as GEOMETRY_SET_LABELS
+        :param results: dictionary with RESULTS_LABELS keys
+        """
+        buffer = io.BytesIO()
+        np.savez(
+            buffer, **{name: np.asarray(results[name], dtype=float) for name in RESULTS_LABELS}
+        )
+        geometry_set = np.asarray(geometry_set, dtype=float)
+
+        os.makedirs(self.result_folder_path, exist_ok=True)
+        with self._connect() as connection:
+            connection.execute(
+                "INSERT OR REPLACE INTO results (code, key, geometry, area_ratio, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (
+                    self.code_name,
+                    self.geometry_key(geometry_set),
+                    geometry_set.tobytes(),
+                    float(geometry_set[-1]),
+                    buffer.getvalue(),
+                ),
+            )
+        connection.close()
+
+    def migrate_csv_results(self) -> int:
+        """
+        Ingests the results saved with the former geometry_<idx>.csv/<code_name>_<idx>.csv format.
+
+        :return: number of migrated entries
+        """
+        migrated = 0
+        for geometry_file in glob.glob(pth.join(self.result_folder_path, "geometry_*.csv")):
+            idx = pth.basename(geometry_file)[len("geometry_") : -len(".csv")]
+            result_file = pth.join(self.result_folder_path, self.code_name + "_" + idx + ".csv")
+            if not pth.exists(result_file):
+                continue
+            # noinspection PyBroadException
+            try:
+                geometry = _read_csv_entry(geometry_file)
+                data = _read_csv_entry(result_file)
+                geometry_set = np.around(
+                    np.array([float(geometry[name]) for name in GEOMETRY_SET_LABELS]), decimals=6
+                )
+                results = {}
+                for name in RESULTS_LABELS:
+                    value = data[name]
+                    if isinstance(value, str) and value.startswith("["):
+                        results[name] = np.array(
+                            [float(i) for i in value.strip("[]").split(",") if i.strip() != ""]
+                        )
+                    else:
+                        results[name] = float(value)
+            except Exception:
+                _LOGGER.warning("Unable to migrate %s results from %s", self.code_name, result_file)
+                continue
+            self.save(geometry_set, results)
+            migrated += 1
+
+        return migrated
+
+    def _connect(self) -> sqlite3.Connection:
+
+        connection = sqlite3.connect(self.database_path, timeout=30.0)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS results (code TEXT NOT NULL, key TEXT NOT NULL, "
+            "geometry BLOB NOT NULL, area_ratio REAL NOT NULL, data BLOB NOT NULL, "
+            "PRIMARY KEY (code, key))"
+        )
+
+        return connection
+
+
+def _read_csv_entry(file_path: str) -> dict:
+
+    data = pd.read_csv(file_path)
+    values = data.to_numpy()[:, 1].tolist()
+    labels = data.to_numpy()[:, 0].tolist()
+
+    return dict(zip(labels, values))
+
+
+def migrate_result_folder(result_folder_path: str) -> Dict[str, int]:
+    """
+    Ingests all the VLM and OpenVSP results of a folder saved in the former csv format.
+
+    :param result_folder_path: folder with geometry_*.csv and vlm_*.csv/openvsp_*.csv files
+    :return: number of migrated entries per code
+    """
+    return {
+        code_name: AeroResultsDatabase(result_folder_path, code_name).migrate_csv_results()
+        for code_name in ["vlm", "openvsp"]
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Migrates VLM/OpenVSP csv results of a folder to the indexed database"
+    )
+    parser.add_argument("result_folder_path", nargs="+", help="folder(s) to migrate")
+    for folder_path in parser.parse_args().result_folder_path:
+        print(folder_path, migrate_result_folder(folder_path))
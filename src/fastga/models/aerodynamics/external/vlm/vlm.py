@@ -19,16 +19,15 @@ import math
 import numpy as np
 import copy
 import openmdao.api as om
-from typing import Optional
-import os
-import os.path as pth
+from typing import Optional, Union
 import warnings
-import pandas as pd
 import logging
+from scipy.linalg import lu_factor, lu_solve
 
 from fastoad.model_base.atmosphere import Atmosphere
 
 from ...constants import SPAN_MESH_POINT, POLAR_POINT_COUNT, MACH_NB_PTS
+from ..results_database import AeroResultsDatabase, RESULTS_LABELS
 
 from fastga.models.geometry.profiles.get_profile import get_profile
 
@@ -47,6 +46,7 @@ class VLMSimpleGeometry(om.ExplicitComponent):
             "wing_airfoil_file", default="naca23012.af", types=str, allow_none=True
         )
         self.options.declare("htp_airfoil_file", default="naca0012.af", types=str, allow_none=True)
+        self._geometry_key = None
 
     def setup(self):
 
@@ -89,22 +89,45 @@ class VLMSimpleGeometry(om.ExplicitComponent):
         cl_alpha_aircraft parameter.
 
         """
-        _, cl_alpha_wing, _, _, _, _, _, _, cl_alpha_htp, _, _, _, _, _ = self.compute_aero_coef(
+        _, cl_alpha_wing, _, _, _, _, _, _, _, cl_alpha_htp, _, _, _, _ = self.compute_aero_coef(
             inputs, altitude, mach, aoa_angle
         )
         return float(cl_alpha_wing + cl_alpha_htp)
 
     def compute_cl_alpha_mach(self, inputs, outputs, aoa_angle, altitude, cruise_mach):
         """
-        Function that performs multiple run of OpenVSP to get an interpolation of Cl_alpha as a function of Mach
+        Function that performs a VLM polar sweep over Mach to get an interpolation of Cl_alpha as a function of Mach
         for later use in the computation of the V-n diagram
         """
         mach_interp = np.log(np.linspace(np.exp(0.15), np.exp(1.55 * cruise_mach), MACH_NB_PTS))
-        cl_alpha_interp = np.zeros(np.size(mach_interp))
-        for idx in range(len(mach_interp)):
-            cl_alpha_interp[idx] = self.compute_cl_alpha_aircraft(
-                inputs, altitude, mach_interp[idx], aoa_angle
+        # Fix mach number of digits to consider similar results
+        mach_interp = np.round(mach_interp * 1e3) / 1e3
+        cl_alpha_interp = np.full(np.size(mach_interp), np.nan)
+
+        # Use the results already saved by compute_aero_coef for those Mach numbers
+        if self.options["result_folder_path"] != "":
+            results_database = AeroResultsDatabase(self.options["result_folder_path"], "vlm")
+            area_ratio = float(inputs["data:geometry:horizontal_tail:area"]) / float(
+                inputs["data:geometry:wing:area"]
+            )
+            for idx, mach in enumerate(mach_interp):
+                saved_results = results_database.search(self._get_geometry_set(inputs, mach))
+                if saved_results is not None:
+                    cl_alpha_htp = saved_results["cl_alpha_htp"] * (
+                        area_ratio / saved_results["area_ratio"]
+                    )
+                    cl_alpha_interp[idx] = saved_results["cl_alpha_wing"] + cl_alpha_htp
+
+        # Other Mach numbers are computed in a single sweep @ 0°/X° angle of attack, its results are
+        # not saved since the sweep does not compute the drag and span outputs of a database entry
+        missing = np.isnan(cl_alpha_interp)
+        if np.any(missing):
+            sweep = self.compute_polar_sweep(
+                inputs, altitude, mach_interp[missing], np.array([0.0, float(aoa_angle)])
             )
+            cl_alpha_interp[missing] = (
+                sweep["cl_aircraft"][:, 1, 0] - sweep["cl_aircraft"][:, 0, 0]
+            ) / (aoa_angle * math.pi / 180)
 
         # We add the case were M=0, for thoroughness and since we are in an incompressible flow, the Cl_alpha is
         # approximately the same as for the first Mach of the interpolation
@@ -146,68 +169,36 @@ class VLMSimpleGeometry(om.ExplicitComponent):
         sref_wing = float(inputs["data:geometry:wing:area"])
         sref_htp = float(inputs["data:geometry:horizontal_tail:area"])
         area_ratio = sref_htp / sref_wing
-        sweep25_wing = float(inputs["data:geometry:wing:sweep_25"])
-        taper_ratio_wing = float(inputs["data:geometry:wing:taper_ratio"])
         aspect_ratio_wing = float(inputs["data:geometry:wing:aspect_ratio"])
-        sweep25_htp = float(inputs["data:geometry:horizontal_tail:sweep_25"])
         aspect_ratio_htp = float(inputs["data:geometry:horizontal_tail:aspect_ratio"])
-        taper_ratio_htp = float(inputs["data:geometry:horizontal_tail:taper_ratio"])
-        geometry_set = np.around(
-            np.array(
-                [
-                    sweep25_wing,
-                    taper_ratio_wing,
-                    aspect_ratio_wing,
-                    sweep25_htp,
-                    taper_ratio_htp,
-                    aspect_ratio_htp,
-                    mach,
-                    area_ratio,
-                ]
-            ),
-            decimals=6,
-        )
+        geometry_set = self._get_geometry_set(inputs, mach)
 
         # Search if results already exist:
         result_folder_path = self.options["result_folder_path"]
-        result_file_path = None
-        saved_area_ratio = 1.0
+        results_database = None
+        saved_results = None
         if result_folder_path != "":
-            result_file_path, saved_area_ratio = self.search_results(
-                result_folder_path, geometry_set
-            )
+            results_database = AeroResultsDatabase(result_folder_path, "vlm")
+            saved_results = results_database.search(geometry_set)
 
         # If no result saved for that geometry under this mach condition, computation is done
-        if result_file_path is None:
-
-            # Create result folder first (if it must fail, let it fail as soon as possible)
-            if result_folder_path != "":
-                if not os.path.exists(result_folder_path):
-                    os.makedirs(pth.join(result_folder_path), exist_ok=True)
-
-            # Save the geometry (result_file_path is None entering the function)
-            if self.options["result_folder_path"] != "":
-                result_file_path = self.save_geometry(result_folder_path, geometry_set)
+        if saved_results is None:
 
-            # Compute wing alone @ 0°/X° angle of attack
-            wing_0 = self.compute_wing(
-                inputs, altitude, mach, 0.0, flaps_angle=0.0, use_airfoil=True
-            )
-            wing_X = self.compute_wing(
-                inputs, altitude, mach, aoa_angle, flaps_angle=0.0, use_airfoil=True
+            # Compute wing alone @ 0°/X° angle of attack (both incidences solved at once)
+            aoa_angles = np.array([0.0, float(aoa_angle)])
+            wing_0, wing_X = self.compute_wing(
+                inputs, altitude, mach, aoa_angles, flaps_angle=0.0, use_airfoil=True
             )
 
             # Compute complete aircraft @ 0°/X° angle of attack
-            _, htp_0, _ = self.compute_aircraft(
-                inputs, altitude, mach, 0.0, flaps_angle=0.0, use_airfoil=True
-            )
-            _, htp_X, _ = self.compute_aircraft(
-                inputs, altitude, mach, aoa_angle, flaps_angle=0.0, use_airfoil=True
+            _, (htp_0, htp_X), _ = self.compute_aircraft(
+                inputs, altitude, mach, aoa_angles, flaps_angle=0.0, use_airfoil=True
             )
 
             # Compute isolated HTP @ 0°/X° angle of attack
-            htp_0_isolated = self.compute_htp(inputs, altitude, mach, 0.0, use_airfoil=True)
-            htp_X_isolated = self.compute_htp(inputs, altitude, mach, aoa_angle, use_airfoil=True)
+            htp_0_isolated, htp_X_isolated = self.compute_htp(
+                inputs, altitude, mach, aoa_angles, use_airfoil=True
+            )
 
             # Post-process wing data -----------------------------------------------------------------------------------
             k_fus = 1 + 0.025 * width_max / span_wing - 0.025 * (width_max / span_wing) ** 2
@@ -283,7 +274,7 @@ class VLMSimpleGeometry(om.ExplicitComponent):
                 cl_vector_htp.extend(additional_zeros)
 
             # Save results to defined path -----------------------------------------------------------------------------
-            if self.options["result_folder_path"] != "":
+            if results_database is not None:
                 results = [
                     cl_0_wing,
                     cl_alpha_wing,
@@ -301,39 +292,30 @@ class VLMSimpleGeometry(om.ExplicitComponent):
                     coef_k_htp,
                     sref_wing,
                 ]
-                self.save_results(result_file_path, results)
+                results_database.save(geometry_set, dict(zip(RESULTS_LABELS, results)))
 
         # Else retrieved results are used, eventually adapted with new area ratio
         else:
-            # Read values from result file -----------------------------------------------------------------------------
-            data = self.read_results(result_file_path)
-            saved_area_wing = float(data.loc["saved_ref_area", 0])
-            cl_0_wing = float(data.loc["cl_0_wing", 0])
-            cl_alpha_wing = float(data.loc["cl_alpha_wing", 0])
-            cm_0_wing = float(data.loc["cm_0_wing", 0])
-            y_vector_wing = np.array(
-                [float(i) for i in data.loc["y_vector_wing", 0][1:-2].split(",")]
-            ) * math.sqrt(sref_wing / saved_area_wing)
-            cl_vector_wing = np.array(
-                [float(i) for i in data.loc["cl_vector_wing", 0][1:-2].split(",")]
+            saved_area_wing = saved_results["saved_ref_area"]
+            saved_area_ratio = saved_results["area_ratio"]
+            cl_0_wing = saved_results["cl_0_wing"]
+            cl_alpha_wing = saved_results["cl_alpha_wing"]
+            cm_0_wing = saved_results["cm_0_wing"]
+            y_vector_wing = saved_results["y_vector_wing"] * math.sqrt(sref_wing / saved_area_wing)
+            cl_vector_wing = saved_results["cl_vector_wing"]
+            chord_vector_wing = saved_results["chord_vector_wing"] * math.sqrt(
+                sref_wing / saved_area_wing
             )
-            chord_vector_wing = np.array(
-                [float(i) for i in data.loc["chord_vector_wing", 0][1:-2].split(",")]
-            ) * math.sqrt(sref_wing / saved_area_wing)
-            coef_k_wing = float(data.loc["coef_k_wing", 0])
-            cl_0_htp = float(data.loc["cl_0_htp", 0]) * (area_ratio / saved_area_ratio)
-            cl_X_htp = float(data.loc["cl_X_htp", 0]) * (area_ratio / saved_area_ratio)
-            cl_alpha_htp = float(data.loc["cl_alpha_htp", 0]) * (area_ratio / saved_area_ratio)
-            cl_alpha_htp_isolated = float(data.loc["cl_alpha_htp_isolated", 0]) * (
+            coef_k_wing = saved_results["coef_k_wing"]
+            cl_0_htp = saved_results["cl_0_htp"] * (area_ratio / saved_area_ratio)
+            cl_X_htp = saved_results["cl_X_htp"] * (area_ratio / saved_area_ratio)
+            cl_alpha_htp = saved_results["cl_alpha_htp"] * (area_ratio / saved_area_ratio)
+            cl_alpha_htp_isolated = saved_results["cl_alpha_htp_isolated"] * (
                 area_ratio / saved_area_ratio
             )
-            y_vector_htp = np.array(
-                [float(i) for i in data.loc["y_vector_htp", 0][1:-2].split(",")]
-            )
-            cl_vector_htp = np.array(
-                [float(i) for i in data.loc["cl_vector_htp", 0][1:-2].split(",")]
-            )
-            coef_k_htp = float(data.loc["coef_k_htp", 0]) * (area_ratio / saved_area_ratio)
+            y_vector_htp = saved_results["y_vector_htp"]
+            cl_vector_htp = saved_results["cl_vector_htp"]
+            coef_k_htp = saved_results["coef_k_htp"] * (area_ratio / saved_area_ratio)
 
         return (
             cl_0_wing,
@@ -352,12 +334,39 @@ class VLMSimpleGeometry(om.ExplicitComponent):
             coef_k_htp,
         )
 
+    @staticmethod
+    def _get_geometry_set(inputs, mach: float) -> np.ndarray:
+        """
+        Geometry set identifying the saved results of a planform at a Mach number.
+
+        @param inputs: inputs parameters defined within FAST-OAD-GA
+        @param mach: air speed expressed in mach
+        @return: geometry set ordered as the GEOMETRY_SET_LABELS of the results database
+        """
+
+        return np.around(
+            np.array(
+                [
+                    float(inputs["data:geometry:wing:sweep_25"]),
+                    float(inputs["data:geometry:wing:taper_ratio"]),
+                    float(inputs["data:geometry:wing:aspect_ratio"]),
+                    float(inputs["data:geometry:horizontal_tail:sweep_25"]),
+                    float(inputs["data:geometry:horizontal_tail:taper_ratio"]),
+                    float(inputs["data:geometry:horizontal_tail:aspect_ratio"]),
+                    float(mach),
+                    float(inputs["data:geometry:horizontal_tail:area"])
+                    / float(inputs["data:geometry:wing:area"]),
+                ]
+            ),
+            decimals=6,
+        )
+
     def compute_wing(
         self,
         inputs,
         altitude: float,
         mach: float,
-        aoa_angle: float,
+        aoa_angle: Union[float, np.ndarray],
         flaps_angle: Optional[float] = 0.0,
         use_airfoil: Optional[bool] = True,
     ):
@@ -367,11 +376,12 @@ class VLMSimpleGeometry(om.ExplicitComponent):
         @param inputs: inputs parameters defined within FAST-OAD-GA
         @param altitude: altitude for aerodynamic calculation in meters
         @param mach: air speed expressed in mach
-        @param aoa_angle: air speed angle of attack with respect to aircraft (degree)
+        @param aoa_angle: air speed angle of attack with respect to aircraft (degree), if an array is given all the
+        angles are solved at once with the factorized AIC matrix
         @param flaps_angle: flaps angle in Deg (default=0.0: i.e. no deflection)
         @param use_airfoil: adds the camberline coordinates of the selected airfoil (default=True)
         @return: wing dictionary including aero parameters as keys: y_vector, cl_vector, cd_vector, cm_vector, cl
-        cdi, cm, coef_e
+        cdi, cm, coef_e (list of dictionaries if aoa_angle is an array)
         """
 
         # Generate geometries
@@ -382,15 +392,8 @@ class VLMSimpleGeometry(om.ExplicitComponent):
         meanchord = inputs["data:geometry:wing:MAC:length"]
 
         # Initialization
-        xc = self.WING["xc"]
-        panelchord = self.WING["panel_chord"]
-        panelsurf = self.WING["panel_surf"]
         if use_airfoil:
             self.generate_curvature(self.WING, self.options["wing_airfoil_file"])
-        panelangle_vect = self.WING["panel_angle_vect"]
-        AIC = self.WING["AIC"]
-        AIC_inv = np.linalg.inv(AIC)
-        AIC_wake = self.WING["AIC_wake"]
         self.apply_deflection(inputs, flaps_angle)
 
         # Compute air speed
@@ -398,60 +401,47 @@ class VLMSimpleGeometry(om.ExplicitComponent):
             Atmosphere(altitude, altitude_in_feet=False).speed_of_sound * mach, 0.01
         )  # avoid V=0 m/s crashes
 
-        # Calculate all the aerodynamic parameters
-        aoa_angle = aoa_angle * math.pi / 180
-        alpha = np.add(panelangle_vect, aoa_angle)
-        gamma = -np.dot(AIC_inv, alpha) * v_inf
-        cp = -2 / v_inf * np.divide(gamma, panelchord)
-        for i in range(self.nx):
-            cp[i * self.ny] = cp[i * self.ny] * 1
-        cl_wing = -np.sum(cp * panelsurf) / np.sum(panelsurf)
-        alphaind = np.dot(AIC_wake, gamma) / v_inf
-        cdind_panel = cp * alphaind
-        cdi_wing = np.sum(cdind_panel * panelsurf) / np.sum(panelsurf)
+        # Calculate all the aerodynamic parameters (one column per angle of attack)
+        alpha = self.WING["panel_angle_vect"][:, np.newaxis] + np.atleast_1d(aoa_angle) * (
+            math.pi / 180
+        )
+        cl_wing, cdi_wing, cm_wing, cl_span = self._solve_surface(
+            self.WING, alpha, v_inf, meanchord
+        )
         wing_e = (
             cl_wing ** 2 / (math.pi * aspect_ratio * cdi_wing) * 0.955
         )  # !!!: manual correction?
-        cmpanel = np.multiply(cp, (xc[: self.nx * self.ny] - meanchord / 4))
-        cm_wing = np.sum(cmpanel * panelsurf) / np.sum(panelsurf)
 
         # Calculate curves
-        wing_cl_vect = []
-        wing_y_vect = []
-        wing_chord_vect = []
-        yc_wing = self.WING["yc"]
         chord_wing = self.WING["chord"]
-        for j in range(self.ny):
-            cl_span = 0.0
-            y = yc_wing[j]
-            chord = (chord_wing[j] + chord_wing[j + 1]) / 2.0
-            for i in range(self.nx):
-                cl_span += -cp[i * self.ny + j] * panelchord[i * self.ny + j] / chord
-            wing_cl_vect.append(cl_span)
-            wing_y_vect.append(y)
-            wing_chord_vect.append(chord)
+        wing_y_vect = self.WING["yc"][: self.ny].tolist()
+        wing_chord_vect = ((chord_wing[: self.ny] + chord_wing[1 : self.ny + 1]) / 2.0).tolist()
 
         # Return values
-        wing = {
-            "y_vector": wing_y_vect,
-            "cl_vector": wing_cl_vect,
-            "chord_vector": wing_chord_vect,
-            "cd_vector": [],
-            "cm_vector": [],
-            "cl": cl_wing,
-            "cdi": cdi_wing,
-            "cm": cm_wing,
-            "coef_e": wing_e,
-        }
+        wing = []
+        for idx in range(np.size(cl_wing)):
+            wing.append(
+                {
+                    "y_vector": list(wing_y_vect),
+                    "cl_vector": cl_span[:, idx].tolist(),
+                    "chord_vector": list(wing_chord_vect),
+                    "cd_vector": [],
+                    "cm_vector": [],
+                    "cl": cl_wing[idx],
+                    "cdi": cdi_wing[idx],
+                    "cm": cm_wing[idx],
+                    "coef_e": wing_e[idx],
+                }
+            )
 
-        return wing
+        return wing if np.ndim(aoa_angle) else wing[0]
 
     def compute_htp(
         self,
         inputs,
         altitude: float,
         mach: float,
-        aoa_angle: float,
+        aoa_angle: Union[float, np.ndarray],
         use_airfoil: Optional[bool] = True,
     ):
         """VLM computation for the horizontal tail alone.
@@ -459,10 +449,11 @@ class VLMSimpleGeometry(om.ExplicitComponent):
         @param inputs: inputs parameters defined within FAST-OAD-GA
         @param altitude: altitude for aerodynamic calculation in meters
         @param mach: air speed expressed in mach
-        @param aoa_angle: air speed angle of attack with respect to aircraft (degree)
+        @param aoa_angle: air speed angle of attack with respect to aircraft (degree), if an array is given all the
+        angles are solved at once with the factorized AIC matrix
         @param use_airfoil: adds the camberline coordinates of the selected airfoil (default=True)
         @return: htp dictionary including aero parameters as keys: y_vector, cl_vector, cd_vector, cm_vector, cl
-        cdi, cm, coef_e
+        cdi, cm, coef_e (list of dictionaries if aoa_angle is an array)
         """
 
         # Generate geometries
@@ -473,70 +464,50 @@ class VLMSimpleGeometry(om.ExplicitComponent):
         meanchord = inputs["data:geometry:horizontal_tail:MAC:length"]
 
         # Initialization
-        xc = self.HTP["xc"]
-        panelchord = self.HTP["panel_chord"]
-        panelsurf = self.HTP["panel_surf"]
         if use_airfoil:
             self.generate_curvature(self.HTP, self.options["htp_airfoil_file"])
-        panelangle_vect = self.HTP["panel_angle_vect"]
-        AIC = self.HTP["AIC"]
-        AIC_inv = np.linalg.inv(AIC)
-        AIC_wake = self.HTP["AIC_wake"]
 
         # Compute air speed
         v_inf = max(
             Atmosphere(altitude, altitude_in_feet=False).speed_of_sound * mach, 0.01
         )  # avoid V=0 m/s crashes
 
-        # Calculate all the aerodynamic parameters
-        aoa_angle = aoa_angle * math.pi / 180
-        alpha = np.add(panelangle_vect, aoa_angle)
-        gamma = -np.dot(AIC_inv, alpha) * v_inf
-        cp = -2 / v_inf * np.divide(gamma, panelchord)
-        for i in range(self.nx):
-            cp[i * self.ny] = cp[i * self.ny] * 1
-        cl_htp = -np.sum(cp * panelsurf) / np.sum(panelsurf)
-        alphaind = np.dot(AIC_wake, gamma) / v_inf
-        cdind_panel = cp * alphaind
-        cdi_htp = np.sum(cdind_panel * panelsurf) / np.sum(panelsurf)
-        htp_e = cl_htp ** 2 / (math.pi * aspect_ratio * max(cdi_htp, 1e-12))  # avod 0.0 division
-        cmpanel = np.multiply(cp, (xc[: self.nx * self.ny] - meanchord / 4))
-        cm_htp = np.sum(cmpanel * panelsurf) / np.sum(panelsurf)
+        # Calculate all the aerodynamic parameters (one column per angle of attack)
+        alpha = self.HTP["panel_angle_vect"][:, np.newaxis] + np.atleast_1d(aoa_angle) * (
+            math.pi / 180
+        )
+        cl_htp, cdi_htp, cm_htp, cl_span = self._solve_surface(self.HTP, alpha, v_inf, meanchord)
+        htp_e = cl_htp ** 2 / (
+            math.pi * aspect_ratio * np.maximum(cdi_htp, 1e-12)
+        )  # avod 0.0 division
 
         # Calculate curves
-        htp_cl_vect = []
-        htp_y_vect = []
-        yc_htp = self.HTP["yc"]
-        chord_htp = self.HTP["chord"]
-        for j in range(self.ny):
-            cl_span = 0.0
-            y = yc_htp[j]
-            chord = (chord_htp[j] + chord_htp[j + 1]) / 2.0
-            for i in range(self.nx):
-                cl_span += -cp[i * self.ny + j] * panelchord[i * self.ny + j] / chord
-            htp_cl_vect.append(cl_span)
-            htp_y_vect.append(y)
+        htp_y_vect = self.HTP["yc"][: self.ny].tolist()
 
         # Return values
-        htp = {
-            "y_vector": htp_y_vect,
-            "cl_vector": htp_cl_vect,
-            "cd_vector": [],
-            "cm_vector": [],
-            "cl": cl_htp,
-            "cdi": cdi_htp,
-            "cm": cm_htp,
-            "coef_e": htp_e,
-        }
+        htp = []
+        for idx in range(np.size(cl_htp)):
+            htp.append(
+                {
+                    "y_vector": list(htp_y_vect),
+                    "cl_vector": cl_span[:, idx].tolist(),
+                    "cd_vector": [],
+                    "cm_vector": [],
+                    "cl": cl_htp[idx],
+                    "cdi": cdi_htp[idx],
+                    "cm": cm_htp[idx],
+                    "coef_e": htp_e[idx],
+                }
+            )
 
-        return htp
+        return htp if np.ndim(aoa_angle) else htp[0]
 
     def compute_aircraft(
         self,
         inputs,
         altitude: float,
         mach: float,
-        aoa_angle: float,
+        aoa_angle: Union[float, np.ndarray],
         flaps_angle: Optional[float] = 0.0,
         use_airfoil: Optional[bool] = True,
     ):
@@ -545,10 +516,12 @@ class VLMSimpleGeometry(om.ExplicitComponent):
         @param inputs: inputs parameters defined within FAST-OAD-GA
         @param altitude: altitude for aerodynamic calculation in meters
         @param mach: air speed expressed in mach
-        @param aoa_angle: air speed angle of attack with respect to aircraft (degree)
+        @param aoa_angle: air speed angle of attack with respect to aircraft (degree), if an array is given all the
+        angles are solved at once with the factorized AIC matrices
         @param use_airfoil: adds the camberline coordinates of the selected airfoil (default=True)
         @param flaps_angle: flaps angle in Deg (default=0.0: i.e. no deflection)
-        @return: wing/htp and aircraft dictionaries including their respective aerodynamic coefficients
+        @return: wing/htp and aircraft dictionaries including their respective aerodynamic coefficients (lists of
+        dictionaries if aoa_angle is an array)
         """
 
         # Get inputs
@@ -556,27 +529,221 @@ class VLMSimpleGeometry(om.ExplicitComponent):
 
         # Compute wing
         wing = self.compute_wing(
-            inputs, altitude, mach, aoa_angle, flaps_angle=flaps_angle, use_airfoil=use_airfoil
+            inputs,
+            altitude,
+            mach,
+            np.atleast_1d(aoa_angle),
+            flaps_angle=flaps_angle,
+            use_airfoil=use_airfoil,
         )
 
         # Calculate downwash angle based on Gudmundsson model (p.467)
-        cl_wing = wing["cl"]
+        cl_wing = np.array([wing_element["cl"] for wing_element in wing])
         beta = math.sqrt(1 - mach ** 2)  # Prandtl-Glauert
-        downwash_angle = 2.0 * np.array(cl_wing) / beta * 180.0 / (aspect_ratio_wing * np.pi ** 2)
-        aoa_angle_corrected = aoa_angle - downwash_angle
+        downwash_angle = 2.0 * cl_wing / beta * 180.0 / (aspect_ratio_wing * np.pi ** 2)
+        aoa_angle_corrected = np.atleast_1d(aoa_angle) - downwash_angle
 
         # Compute htp
         htp = self.compute_htp(inputs, altitude, mach, aoa_angle_corrected, use_airfoil=True)
 
         # Save results at aircraft level
-        aircraft = {"cl": wing["cl"] + htp["cl"], "cd0": None, "cdi": None, "coef_e": None}
+        aircraft = [
+            {"cl": wing_element["cl"] + htp_element["cl"], "cd0": None, "cdi": None, "coef_e": None}
+            for wing_element, htp_element in zip(wing, htp)
+        ]
 
-        return wing, htp, aircraft
+        if np.ndim(aoa_angle):
+            return wing, htp, aircraft
+        else:
+            return wing[0], htp[0], aircraft[0]
+
+    def compute_polar_sweep(
+        self,
+        inputs,
+        altitude: float,
+        mach_array: np.ndarray,
+        aoa_array: np.ndarray,
+        flaps_array: Optional[np.ndarray] = None,
+    ) -> np.ndarray:
+        """
+        VLM computation of the wing, the horizontal tail (in aircraft configuration) and the complete aircraft for
+        every combination of Mach number, angle of attack and flaps angle. Since the geometry and the factorized AIC
+        matrices do not depend on those parameters, all the combinations are solved in a single batched solve per
+        lifting surface. Lift and moment coefficients include the same Prandtl-Glauert, fuselage and area ratio
+        corrections as compute_aero_coef, induced drag is scaled by the square of the lift correction.
+
+        @param inputs: inputs parameters defined within FAST-OAD-GA
+        @param altitude: altitude for aerodynamic calculation in meters
+        @param mach_array: air speeds expressed in mach
+        @param aoa_array: air speed angles of attack with respect to aircraft (degree)
+        @param flaps_array: flaps angles in Deg (default=None: i.e. no deflection)
+        @return: structured array of shape (len(mach_array), len(aoa_array), len(flaps_array)) with the fields mach,
+        aoa_angle, flaps_angle, cl_wing, cdi_wing, cm_wing, cl_htp, cdi_htp, cl_aircraft, y_vector_wing,
+        cl_vector_wing, y_vector_htp and cl_vector_htp
+        """
+
+        mach_array = np.asarray(mach_array, dtype=float).ravel()
+        aoa_array = np.asarray(aoa_array, dtype=float).ravel()
+        if flaps_array is None:
+            flaps_array = np.array([0.0])
+        flaps_array = np.asarray(flaps_array, dtype=float).ravel()
+        n_mach = np.size(mach_array)
+        n_aoa = np.size(aoa_array)
+        n_flaps = np.size(flaps_array)
+
+        # Generate geometries
+        self._run(inputs)
+
+        # Get inputs
+        width_max = float(inputs["data:geometry:fuselage:maximum_width"])
+        span_wing = float(inputs["data:geometry:wing:span"])
+        aspect_ratio_wing = float(inputs["data:geometry:wing:aspect_ratio"])
+        area_ratio = float(inputs["data:geometry:horizontal_tail:area"]) / float(
+            inputs["data:geometry:wing:area"]
+        )
+
+        # Compute wing: one column per (flaps angle, angle of attack) combination, the panel angles being modified
+        # by the deflection of the flaps
+        self.generate_curvature(self.WING, self.options["wing_airfoil_file"])
+        panel_angle_clean = np.copy(self.WING["panel_angle_vect"])
+        alpha = np.zeros((self.nx * self.ny, n_flaps, n_aoa))
+        for idx, flaps_angle in enumerate(flaps_array):
+            self.WING["panel_angle_vect"] = np.copy(panel_angle_clean)
+            self.apply_deflection(inputs, flaps_angle)
+            alpha[:, idx, :] = self.WING["panel_angle_vect"][:, np.newaxis] + aoa_array * (
+                math.pi / 180
+            )
+        self.WING["panel_angle_vect"] = panel_angle_clean
+        cl_wing, cdi_wing, cm_wing, cl_span_wing = self._solve_surface(
+            self.WING,
+            alpha.reshape(self.nx * self.ny, n_flaps * n_aoa),
+            1.0,
+            inputs["data:geometry:wing:MAC:length"],
+        )
+
+        # Compute htp: downwash angle based on Gudmundsson model (p.467) depends on the Mach number through the
+        # Prandtl-Glauert correction, so one column per (mach, flaps angle, angle of attack) combination is solved
+        beta = np.sqrt(1 - mach_array ** 2)
+        downwash_angle = (
+            2.0
+            * cl_wing[np.newaxis, :]
+            / beta[:, np.newaxis]
+            * 180.0
+            / (aspect_ratio_wing * np.pi ** 2)
+        )
+        aoa_angle_corrected = np.tile(aoa_array, n_flaps)[np.newaxis, :] - downwash_angle
+        self.generate_curvature(self.HTP, self.options["htp_airfoil_file"])
+        alpha = self.HTP["panel_angle_vect"][:, np.newaxis] + aoa_angle_corrected.ravel() * (
+            math.pi / 180
+        )
+        cl_htp, cdi_htp, _, cl_span_htp = self._solve_surface(
+            self.HTP, alpha, 1.0, inputs["data:geometry:horizontal_tail:MAC:length"]
+        )
+
+        # Apply corrections and store results
+        k_fus = 1 + 0.025 * width_max / span_wing - 0.025 * (width_max / span_wing) ** 2
+        correction_wing = (k_fus / beta)[:, np.newaxis]
+        correction_htp = (area_ratio / beta)[:, np.newaxis]
+        shape = (n_mach, n_aoa, n_flaps)
+        sweep = np.zeros(
+            shape,
+            dtype=[
+                ("mach", float),
+                ("aoa_angle", float),
+                ("flaps_angle", float),
+                ("cl_wing", float),
+                ("cdi_wing", float),
+                ("cm_wing", float),
+                ("cl_htp", float),
+                ("cdi_htp", float),
+                ("cl_aircraft", float),
+                ("y_vector_wing", float, (self.ny,)),
+                ("cl_vector_wing", float, (self.ny,)),
+                ("y_vector_htp", float, (self.ny,)),
+                ("cl_vector_htp", float, (self.ny,)),
+            ],
+        )
+
+        def _reshape(value):
+            # Cases are solved flaps angle first then angle of attack, value has a (mach, case, ...) shape
+            return value.reshape((n_mach, n_flaps, n_aoa) + value.shape[2:]).swapaxes(1, 2)
+
+        sweep["mach"] = mach_array[:, np.newaxis, np.newaxis]
+        sweep["aoa_angle"] = aoa_array[np.newaxis, :, np.newaxis]
+        sweep["flaps_angle"] = flaps_array[np.newaxis, np.newaxis, :]
+        sweep["cl_wing"] = _reshape(cl_wing[np.newaxis, :] * correction_wing)
+        sweep["cdi_wing"] = _reshape(cdi_wing[np.newaxis, :] * correction_wing ** 2)
+        sweep["cm_wing"] = _reshape(cm_wing[np.newaxis, :] * correction_wing)
+        sweep["cl_htp"] = _reshape(cl_htp.reshape(n_mach, -1) * correction_htp)
+        sweep["cdi_htp"] = _reshape(cdi_htp.reshape(n_mach, -1) * correction_htp ** 2)
+        sweep["cl_aircraft"] = sweep["cl_wing"] + sweep["cl_htp"]
+        sweep["y_vector_wing"] = self.WING["yc"][: self.ny]
+        sweep["y_vector_htp"] = self.HTP["yc"][: self.ny]
+        sweep["cl_vector_wing"] = _reshape(
+            cl_span_wing.T[np.newaxis, :, :] * correction_wing[:, :, np.newaxis]
+        )
+        sweep["cl_vector_htp"] = _reshape(
+            cl_span_htp.T.reshape(n_mach, -1, self.ny) * correction_htp[:, :, np.newaxis]
+        )
+
+        return sweep
+
+    def _solve_surface(self, dictionary, alpha, v_inf, meanchord):
+        """
+        Solves the vortex strengths of a lifting surface for one or several incidences using the LU factorization
+        of its AIC matrix (multiple right-hand sides) and integrates the aerodynamic coefficients.
+
+        @param dictionary: WING or HTP geometry dictionary
+        @param alpha: local panels incidence (rad), array of shape (nx * ny, number of cases)
+        @param v_inf: air speed in m/s
+        @param meanchord: mean aerodynamic chord of the surface in meters
+        @return: cl, cdi, cm arrays (one value per case) and spanwise cl array of shape (ny, number of cases)
+        """
+
+        panelchord = dictionary["panel_chord"][:, np.newaxis]
+        panelsurf = dictionary["panel_surf"]
+        gamma = -lu_solve(dictionary["AIC_LU"], alpha) * v_inf
+        cp = -2 / v_inf * gamma / panelchord
+        alphaind = np.dot(dictionary["AIC_wake"], gamma) / v_inf
+        cl = -np.dot(panelsurf, cp) / np.sum(panelsurf)
+        cdi = np.dot(panelsurf, cp * alphaind) / np.sum(panelsurf)
+        cmpanel = cp * (dictionary["xc"][: self.nx * self.ny, np.newaxis] - meanchord / 4)
+        cm = np.dot(panelsurf, cmpanel) / np.sum(panelsurf)
+        chord = dictionary["chord"]
+        chord = (chord[: self.ny] + chord[1 : self.ny + 1]) / 2.0
+        cl_span = (
+            -np.sum((cp * panelchord).reshape(self.nx, self.ny, -1), axis=0) / chord[:, np.newaxis]
+        )
+
+        return cl, cdi, cm, cl_span
 
     def _run(self, inputs):
 
         wing_break = float(inputs["data:geometry:wing:kink:span_ratio"])
 
+        # The geometry, AIC matrices and their factorization only depend on the planforms, if those did not change
+        # only the panel angles (modified by airfoil curvature and flaps deflection) are reset
+        geometry_key = tuple(
+            float(inputs[name])
+            for name in [
+                "data:geometry:wing:kink:span_ratio",
+                "data:geometry:wing:root:y",
+                "data:geometry:wing:span",
+                "data:geometry:wing:root:chord",
+                "data:geometry:wing:tip:chord",
+                "data:geometry:flap:span_ratio",
+                "data:geometry:horizontal_tail:span",
+                "data:geometry:horizontal_tail:root:chord",
+                "data:geometry:horizontal_tail:tip:chord",
+            ]
+        ) + (DEFAULT_NX, DEFAULT_NY1, DEFAULT_NY2)
+        if self._geometry_key == geometry_key:
+            for dictionary in [self.WING, self.HTP]:
+                dictionary["z"] = np.zeros(self.nx + 1)
+                dictionary["panel_angle"] = np.zeros(self.nx)
+                dictionary["panel_angle_vect"] = np.zeros(self.nx * self.ny)
+            return
+
         # Define mesh size
         self.nx = int(DEFAULT_NX)
         if wing_break > 0.0:
@@ -620,6 +787,11 @@ class VLMSimpleGeometry(om.ExplicitComponent):
         # Generate HTP
         self._generate_htp(inputs)
 
+        # Factorize AIC matrices once for all the following solves
+        self.WING["AIC_LU"] = lu_factor(self.WING["AIC"])
+        self.HTP["AIC_LU"] = lu_factor(self.HTP["AIC"])
+        self._geometry_key = geometry_key
+
     def _generate_wing(self, inputs):
         """Generates the coordinates for VLM calculations and AIC matrix of the wing"""
 
@@ -698,108 +870,70 @@ class VLMSimpleGeometry(om.ExplicitComponent):
     def _generate_common(self, dictionary):
         """Common code shared between wing and htp to calculate geometry/aero parameters"""
 
-        # Initial data (zero matrix/array)
+        # Initial data
+        nx = self.nx
+        ny = self.ny
         x_LE = dictionary["x_LE"]
         chord = dictionary["chord"]
-        x_panel = dictionary["x_panel"]
         y_panel = dictionary["y_panel"]
-        panelspan = dictionary["panel_span"]
-        panelchord = dictionary["panel_chord"]
-        panelsurf = dictionary["panel_surf"]
-        xc = dictionary["xc"]
-        yc = dictionary["yc"]
-        x1 = dictionary["x1"]
-        y1 = dictionary["y1"]
-        x2 = dictionary["x2"]
-        y2 = dictionary["y2"]
-        AIC = dictionary["AIC"]
-        AIC_wake = dictionary["AIC_wake"]
         # Calculate panel corners x-coordinate
-        for i in range(self.nx + 1):
-            for j in range(2 * self.ny + 1):
-                x_panel[i, j] = x_LE[j] + chord[j] * i / self.nx
+        x_panel = x_LE + np.outer(np.arange(nx + 1) / nx, chord)
         # Calculate panel span with symmetry
-        for j in range(self.ny):
-            panelspan[j] = y_panel[j + 1] - y_panel[j]
-            panelspan[self.ny + j] = panelspan[j]
-        # Calculate characteristic points (Right side)
-        for i in range(self.nx):
-            for j in range(self.ny):
-                panelchord[i * self.ny + j] = 0.5 * (
-                    (x_panel[i + 1, j] - x_panel[i, j])
-                    + (x_panel[i + 1, j + 1] - x_panel[i, j + 1])
-                )
-                panelsurf[i * self.ny + j] = panelspan[j] * panelchord[i * self.ny + j]
-                xc[i * self.ny + j] = (x_panel[i, j] + x_panel[i, j + 1]) * 0.5 + 0.75 * panelchord[
-                    i * self.ny + j
-                ]
-                yc[i * self.ny + j] = (y_panel[j] + y_panel[j + 1]) * 0.5
-                x1[i * self.ny + j] = x_panel[i, j] + 0.25 * (x_panel[i + 1, j] - x_panel[i, j])
-                y1[i * self.ny + j] = y_panel[j]
-                x2[i * self.ny + j] = x_panel[i, j + 1] + 0.25 * (
-                    x_panel[i + 1, j + 1] - x_panel[i, j + 1]
-                )
-                y2[i * self.ny + j] = y_panel[j + 1]
-        # Calculate characteristic points (Left side)
-        for i in range(self.nx):
-            for j in range(self.ny):
-                xc[self.nx * self.ny + (i * self.ny + j)] = xc[i * self.ny + j]
-                yc[self.nx * self.ny + (i * self.ny + j)] = -yc[i * self.ny + j]
-                x1[self.nx * self.ny + (i * self.ny + j)] = x_panel[i, self.ny + j + 1] + 0.25 * (
-                    x_panel[i + 1, self.ny + j + 1] - x_panel[i, self.ny + j + 1]
-                )
-                y1[self.nx * self.ny + (i * self.ny + j)] = y_panel[self.ny + j + 1]
-                if j == 0:
-                    y2[self.nx * self.ny + (i * self.ny + j)] = 0
-                    x2[self.nx * self.ny + (i * self.ny + j)] = x_panel[i, 0] + 0.25 * (
-                        x_panel[i + 1, 0] - x_panel[i, 0]
-                    )
-                else:
-                    x2[self.nx * self.ny + (i * self.ny + j)] = x_panel[i, self.ny + j] + 0.25 * (
-                        x_panel[i + 1, self.ny + j] - x_panel[i, self.ny + j]
-                    )
-                    y2[self.nx * self.ny + (i * self.ny + j)] = y_panel[self.ny + j]
-        # Aerodynamic coefficients computation (Right side)
-        for i in range(self.nx * self.ny):
-            for j in range(self.nx * self.ny):
-                # Right wing
-                a = xc[i] - x1[j]
-                b = yc[i] - y1[j]
-                c = xc[i] - x2[j]
-                d = yc[i] - y2[j]
-                e = math.sqrt(a ** 2 + b ** 2)
-                f = math.sqrt(c ** 2 + d ** 2)
-                g = x2[j] - x1[j]
-                h = y2[j] - y1[j]
-                k = (g * a + h * b) / e - (g * c + h * d) / f
-                m = (1 + c / f) / d - (1 + a / e) / b
-                if a * d - b * c != 0:
-                    AIC[i, j] = (k / (a * d - b * c)) / (4 * math.pi)
-                AIC_wake[i, j] = m / (4 * math.pi)
-                AIC[i, j] = AIC[i, j] + m / (4 * math.pi)
-        # Aerodynamic coefficients computation (Left side)
-        for i in range(self.nx * self.ny):
-            for j in range(self.nx * self.ny):
-                # Left wing
-                a = xc[i] - x1[self.nx * self.ny + j]
-                b = yc[i] - y1[self.nx * self.ny + j]
-                c = xc[i] - x2[self.nx * self.ny + j]
-                d = yc[i] - y2[self.nx * self.ny + j]
-                e = math.sqrt(a ** 2 + b ** 2)
-                f = math.sqrt(c ** 2 + d ** 2)
-                g = x2[self.nx * self.ny + j] - x1[self.nx * self.ny + j]
-                h = y2[self.nx * self.ny + j] - y1[self.nx * self.ny + j]
-                k = (g * a + h * b) / e - (g * c + h * d) / f
-                m = (1 + c / f) / d - (1 + a / e) / b
-                if a * d - b * c != 0:
-                    AIC[i, j] = AIC[i, j] + (k / (a * d - b * c)) / (4 * math.pi)
-                AIC_wake[i, j] = AIC_wake[i, j] + m / (4 * math.pi)
-                AIC[i, j] = AIC[i, j] + m / (4 * math.pi)
+        panelspan = np.tile(y_panel[1 : ny + 1] - y_panel[0:ny], 2)
+        # Calculate characteristic points (Right side), panels are ordered chordwise first, i.e.
+        # index i * ny + j for chordwise position i and spanwise position j
+        panelchord = 0.5 * (
+            (x_panel[1:, 0:ny] - x_panel[:-1, 0:ny])
+            + (x_panel[1:, 1 : ny + 1] - x_panel[:-1, 1 : ny + 1])
+        )
+        panelsurf = panelspan[0:ny] * panelchord
+        xc_right = (x_panel[:-1, 0:ny] + x_panel[:-1, 1 : ny + 1]) * 0.5 + 0.75 * panelchord
+        yc_right = np.tile((y_panel[0:ny] + y_panel[1 : ny + 1]) * 0.5, (nx, 1))
+        x_quarter = x_panel[:-1, :] + 0.25 * (x_panel[1:, :] - x_panel[:-1, :])
+        x1_right = x_quarter[:, 0:ny]
+        y1_right = np.tile(y_panel[0:ny], (nx, 1))
+        x2_right = x_quarter[:, 1 : ny + 1]
+        y2_right = np.tile(y_panel[1 : ny + 1], (nx, 1))
+        # Calculate characteristic points (Left side), the inner edge of the first panel being
+        # the root of the wing (column 0)
+        x1_left = x_quarter[:, ny + 1 : 2 * ny + 1]
+        y1_left = np.tile(y_panel[ny + 1 : 2 * ny + 1], (nx, 1))
+        inner_columns = np.concatenate(([0], np.arange(ny + 1, 2 * ny)))
+        x2_left = x_quarter[:, inner_columns]
+        y2_left = np.tile(np.concatenate(([0.0], y_panel[ny + 1 : 2 * ny])), (nx, 1))
+        xc = np.concatenate((xc_right.ravel(), xc_right.ravel()))
+        yc = np.concatenate((yc_right.ravel(), -yc_right.ravel()))
+        x1 = np.concatenate((x1_right.ravel(), x1_left.ravel()))
+        y1 = np.concatenate((y1_right.ravel(), y1_left.ravel()))
+        x2 = np.concatenate((x2_right.ravel(), x2_left.ravel()))
+        y2 = np.concatenate((y2_right.ravel(), y2_left.ravel()))
+        # Aerodynamic coefficients computation, right and left side horseshoe vortices are
+        # evaluated at the control points of the right side in a single broadcast operation
+        n_panels = nx * ny
+        a = xc[:n_panels, np.newaxis] - x1[np.newaxis, :]
+        b = yc[:n_panels, np.newaxis] - y1[np.newaxis, :]
+        c = xc[:n_panels, np.newaxis] - x2[np.newaxis, :]
+        d = yc[:n_panels, np.newaxis] - y2[np.newaxis, :]
+        e = np.sqrt(a ** 2 + b ** 2)
+        f = np.sqrt(c ** 2 + d ** 2)
+        g = x2 - x1
+        h = y2 - y1
+        k = (g * a + h * b) / e - (g * c + h * d) / f
+        m = (1 + c / f) / d - (1 + a / e) / b
+        det = a * d - b * c
+        # A control point aligned with a bound vortex gets no induced velocity from it, the test is done
+        # relative to the distances so that round-off on det does not produce spurious coefficients
+        aligned = np.abs(det) <= 1e-10 * e * f
+        bound = np.divide(k, det, out=np.zeros_like(k), where=np.logical_not(aligned))
+        wake = m / (4 * math.pi)
+        aic_both_sides = bound / (4 * math.pi) + wake
+        AIC = aic_both_sides[:, :n_panels] + aic_both_sides[:, n_panels:]
+        AIC_wake = wake[:, :n_panels] + wake[:, n_panels:]
         # Save data
         dictionary["x_panel"] = x_panel
         dictionary["panel_span"] = panelspan
-        dictionary["panel_chord"] = panelchord
-        dictionary["panel_surf"] = panelsurf
+        dictionary["panel_chord"] = panelchord.ravel()
+        dictionary["panel_surf"] = panelsurf.ravel()
         dictionary["xc"] = xc
         dictionary["yc"] = yc
         dictionary["x1"] = x1
@@ -906,101 +1040,3 @@ class VLMSimpleGeometry(om.ExplicitComponent):
             ) / (lift_coeff[-1] - lift_coeff[-2])
         _LOGGER.warning("CL not in range. Linear extrapolation of CDp value {}".format(cdp))
         return cdp
-
-    @staticmethod
-    def search_results(result_folder_path, geometry_set):
-
-        if os.path.exists(result_folder_path):
-            geometry_set_labels = [
-                "sweep25_wing",
-                "taper_ratio_wing",
-                "aspect_ratio_wing",
-                "sweep25_htp",
-                "taper_ratio_htp",
-                "aspect_ratio_htp",
-                "mach",
-                "area_ratio",
-            ]
-            # If some results already stored search for corresponding geometry
-            if pth.exists(pth.join(result_folder_path, "geometry_0.csv")):
-                idx = 0
-                while pth.exists(pth.join(result_folder_path, "geometry_" + str(idx) + ".csv")):
-                    if pth.exists(pth.join(result_folder_path, "vlm_" + str(idx) + ".csv")):
-                        data = pd.read_csv(
-                            pth.join(result_folder_path, "geometry_" + str(idx) + ".csv")
-                        )
-                        values = data.to_numpy()[:, 1].tolist()
-                        labels = data.to_numpy()[:, 0].tolist()
-                        data = pd.DataFrame(values, index=labels)
-                        # noinspection PyBroadException
-                        try:
-                            if np.size(data.loc[geometry_set_labels[0:-1], 0].to_numpy()) == 7:
-                                saved_set = np.around(
-                                    data.loc[geometry_set_labels[0:-1], 0].to_numpy(), decimals=6
-                                )
-                                if np.sum(saved_set == geometry_set[0:-1]) == 7:
-                                    result_file_path = pth.join(
-                                        result_folder_path, "vlm_" + str(idx) + ".csv"
-                                    )
-                                    saved_area_ratio = data.loc["area_ratio", 0]
-                                    return result_file_path, saved_area_ratio
-                        except:
-                            break
-                    idx += 1
-
-        return None, 1.0
-
-    @staticmethod
-    def save_geometry(result_folder_path, geometry_set):
-
-        # Save geometry if not already computed by finding first available index
-        geometry_set_labels = [
-            "sweep25_wing",
-            "taper_ratio_wing",
-            "aspect_ratio_wing",
-            "sweep25_htp",
-            "taper_ratio_htp",
-            "aspect_ratio_htp",
-            "mach",
-            "area_ratio",
-        ]
-        data = pd.DataFrame(geometry_set, index=geometry_set_labels)
-        idx = 0
-        while pth.exists(pth.join(result_folder_path, "geometry_" + str(idx) + ".csv")):
-            idx += 1
-        data.to_csv(pth.join(result_folder_path, "geometry_" + str(idx) + ".csv"))
-        result_file_path = pth.join(result_folder_path, "vlm_" + str(idx) + ".csv")
-
-        return result_file_path
-
-    @staticmethod
-    def save_results(result_file_path, results):
-
-        labels = [
-            "cl_0_wing",
-            "cl_alpha_wing",
-            "cm_0_wing",
-            "y_vector_wing",
-            "cl_vector_wing",
-            "chord_vector_wing",
-            "coef_k_wing",
-            "cl_0_htp",
-            "cl_X_htp",
-            "cl_alpha_htp",
-            "cl_alpha_htp_isolated",
-            "y_vector_htp",
-            "cl_vector_htp",
-            "coef_k_htp",
-            "saved_ref_area",
-        ]
-        data = pd.DataFrame(results, index=labels)
-        data.to_csv(result_file_path)
-
-    @staticmethod
-    def read_results(result_file_path):
-
-        data = pd.read_csv(result_file_path)
-        values = data.to_numpy()[:, 1].tolist()
-        labels = data.to_numpy()[:, 0].tolist()
-
-        return pd.DataFrame(values, index=labels)
@@ -0,0 +1,327 @@
+"""
+    Indexed storage of the XFOIL polars
+"""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import argparse
+import glob
+import io
+import logging
+import os
+import os.path as pth
+import sqlite3
+from typing import Dict, List, Optional
+
+import numpy as np
+import pandas as pd
+
+DATABASE_FILE_NAME = "polars.sqlite"
+
+POLAR_LABELS = ["alpha", "cl", "cd", "cdp", "cm"]
+
+_LOGGER = logging.getLogger(__name__)
+
+# Polars loaded from the databases, identified by database path and polar name and reloaded only if
+# the database file or the csv file of the polar has been modified
+_LOADED_POLARS = {}
+
+
+class PolarDatabase:
+    """
+    XFOIL polars of a folder stored in a single SQLite file.
+
+    Each (Mach, Reynolds) run of a polar is a row indexed by polar name (e.g. "naca23012" or
+    "naca4430_30S"), Mach and Reynolds with alpha/cl/cd/cdp/cm stored as native float arrays.
+    Runs are only appended, so that a new run does not rewrite the previous ones, and the runs of a
+    polar are loaded once per process. Polars saved in the former <polar name>.csv format are
+    imported on first load, and their runs are imported again when the csv file is modified.
+    """
+
+    def __init__(self, folder_path: str):
+        """
+        :param folder_path: folder in which the database file is stored
+        """
+        self.folder_path = folder_path
+        self.database_path = pth.join(folder_path, DATABASE_FILE_NAME)
+
+    def load(self, polar_name: str) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Loads all the runs of a polar.
+
+        :param polar_name: name of the polar
+        :return: dictionary with "mach", "reynolds", "cl_max_2d" and "cl_min_2d" vectors (one value
+        per run) and POLAR_LABELS keys (one array per run), None if no run is saved
+        """
+        key = (pth.abspath(self.database_path), polar_name)
+        csv_file = pth.join(self.folder_path, polar_name + ".csv")
+        csv_modification_time = _modification_time(csv_file)
+        if key in _LOADED_POLARS and _LOADED_POLARS[key][0] == (
+            _modification_time(self.database_path),
+            csv_modification_time,
+        ):
+            return _LOADED_POLARS[key][1]
+
+        runs = None
+        # Polars saved with the former csv format are imported, again if the csv file is modified
+        if csv_modification_time is not None and csv_modification_time > self._csv_import_time(
+            polar_name
+        ):
+            runs = self._import_csv(polar_name, csv_file, csv_modification_time)
+
+        if runs is None and pth.exists(self.database_path):
+            with self._connect() as connection:
+                rows = connection.execute(
+                    "SELECT mach, reynolds, cl_max_2d, cl_min_2d, data FROM polars "
+                    "WHERE name = ? ORDER BY id",
+                    (polar_name,),
+                ).fetchall()
+            connection.close()
+            if rows:
+                runs = _rows_to_runs(rows)
+
+        _LOADED_POLARS[key] = (
+            (_modification_time(self.database_path), csv_modification_time),
+            runs,
+        )
+
+        return runs
+
+    def append(
+        self,
+        polar_name: str,
+        mach: float,
+        reynolds: float,
+        cl_max_2d: float,
+        cl_min_2d: float,
+        polar: Dict[str, np.ndarray],
+    ):
+        """
+        Appends a run to a polar.
+
+        :param polar_name: name of the polar
+        :param mach: Mach number of the run
+        :param reynolds: Reynolds number of the run
+        :param cl_max_2d: max lift coefficient of the run
+        :param cl_min_2d: min lift coefficient of the run
+        :param polar: dictionary with POLAR_LABELS keys
+        """
+        os.makedirs(self.folder_path, exist_ok=True)
+        with self._connect() as connection:
+            _insert_rows(connection, polar_name, [(mach, reynolds, cl_max_2d, cl_min_2d, polar)])
+        connection.close()
+
+    def has_runs(self, polar_name: str) -> bool:
+        """
+        :param polar_name: name of the polar
+        :return: True if runs of the polar are saved in the database (csv files not considered)
+        """
+        if not pth.exists(self.database_path):
+            return False
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT 1 FROM polars WHERE name = ? LIMIT 1", (polar_name,)
+            ).fetchone()
+        connection.close()
+
+        return row is not None
+
+    def _csv_import_time(self, polar_name: str) -> int:
+
+        if not pth.exists(self.database_path):
+            return -1
+        with self._connect() as connection:
+            row = connection.execute(
+                "SELECT modification_time FROM csv_imports WHERE name = ?", (polar_name,)
+            ).fetchone()
+        connection.close()
+
+        return -1 if row is None else row[0]
+
+    def _import_csv(
+        self, polar_name: str, csv_file: str, csv_modification_time: int
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Replaces the runs previously imported from the csv file of a polar by its current runs.
+
+        :return: runs of the csv file if they cannot be saved in the database, None otherwise
+        """
+        # noinspection PyBroadException
+        try:
+            rows = _read_csv_rows(csv_file)
+        except Exception:
+            _LOGGER.warning("Unable to read %s polar from %s", polar_name, csv_file)
+            return None
+        # noinspection PyBroadException
+        try:
+            os.makedirs(self.folder_path, exist_ok=True)
+            with self._connect() as connection:
+                previous_import = connection.execute(
+                    "SELECT first_id, last_id FROM csv_imports WHERE name = ?", (polar_name,)
+                ).fetchone()
+                if previous_import is not None:
+                    connection.execute(
+                        "DELETE FROM polars WHERE name = ? AND id BETWEEN ? AND ?",
+                        (polar_name,) + tuple(previous_import),
+                    )
+                ids = _insert_rows(connection, polar_name, rows)
+                connection.execute(
+                    "INSERT OR REPLACE INTO csv_imports (name, modification_time, first_id, "
+                    "last_id) VALUES (?, ?, ?, ?)",
+                    (
+                        polar_name,
+                        csv_modification_time,
+                        ids[0] if ids else 0,
+                        ids[-1] if ids else -1,
+                    ),
+                )
+            connection.close()
+            _LOGGER.info(
+                "%i %s polar runs imported in %s", len(rows), polar_name, self.database_path
+            )
+        except Exception:
+            _LOGGER.warning("Unable to import %s polar in %s", polar_name, self.database_path)
+            return _rows_to_runs(
+                [
+                    (mach, reynolds, cl_max_2d, cl_min_2d, _to_blob(polar))
+                    for mach, reynolds, cl_max_2d, cl_min_2d, polar in rows
+                ]
+            )
+
+        return None
+
+    def _connect(self) -> sqlite3.Connection:
+
+        connection = sqlite3.connect(self.database_path, timeout=30.0)
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS polars (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+            "name TEXT NOT NULL, mach REAL NOT NULL, reynolds REAL NOT NULL, "
+            "cl_max_2d REAL NOT NULL, cl_min_2d REAL NOT NULL, data BLOB NOT NULL)"
+        )
+        connection.execute(
+            "CREATE INDEX IF NOT EXISTS polars_index ON polars (name, mach, reynolds)"
+        )
+        connection.execute(
+            "CREATE TABLE IF NOT EXISTS csv_imports (name TEXT PRIMARY KEY, "
+            "modification_time INTEGER NOT NULL, first_id INTEGER NOT NULL, "
+            "last_id INTEGER NOT NULL)"
+        )
+
+        return connection
+
+
+def _modification_time(file_path: str) -> Optional[int]:
+
+    return os.stat(file_path).st_mtime_ns if pth.exists(file_path) else None
+
+
+def _insert_rows(connection: sqlite3.Connection, polar_name: str, rows: List[tuple]) -> List[int]:
+
+    return [
+        connection.execute(
+            "INSERT INTO polars (name, mach, reynolds, cl_max_2d, cl_min_2d, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (
+                polar_name,
+                float(mach),
+                float(reynolds),
+                float(cl_max_2d),
+                float(cl_min_2d),
+                _to_blob(polar),
+            ),
+        ).lastrowid
+        for mach, reynolds, cl_max_2d, cl_min_2d, polar in rows
+    ]
+
+
+def _to_blob(polar: Dict[str, np.ndarray]) -> bytes:
+
+    buffer = io.BytesIO()
+    np.savez(buffer, **{label: np.asarray(polar[label], dtype=float) for label in POLAR_LABELS})
+
+    return buffer.getvalue()
+
+
+def _rows_to_runs(rows: List[tuple]) -> Dict[str, np.ndarray]:
+
+    runs = {
+        "mach": np.array([row[0] for row in rows]),
+        "reynolds": np.array([row[1] for row in rows]),
+        "cl_max_2d": np.array([row[2] for row in rows]),
+        "cl_min_2d": np.array([row[3] for row in rows]),
+    }
+    polars = []
+    for row in rows:
+        with np.load(io.BytesIO(row[4])) as arrays:
+            polars.append({label: arrays[label] for label in POLAR_LABELS})
+    for label in POLAR_LABELS:
+        runs[label] = [polar[label] for polar in polars]
+        for vector in runs[label]:
+            vector.flags.writeable = False
+    for label in ["mach", "reynolds", "cl_max_2d", "cl_min_2d"]:
+        runs[label].flags.writeable = False
+
+    return runs
+
+
+def _read_csv_rows(csv_file: str) -> List[tuple]:
+
+    data = pd.read_csv(csv_file)
+    labels = data.to_numpy()[:, 0].tolist()
+    rows = []
+    for column in data.to_numpy()[:, 1:].T:
+        values = dict(zip(labels, column))
+        polar = {
+            label: np.array(
+                [float(x) for x in str(values[label]).strip("[]").split(",") if x.strip() != ""]
+            )
+            for label in POLAR_LABELS
+        }
+        rows.append(
+            (
+                float(values["mach"]),
+                float(values["reynolds"]),
+                float(values["cl_max_2d"]),
+                float(values["cl_min_2d"]),
+                polar,
+            )
+        )
+
+    return rows
+
+
+def migrate_polar_folder(folder_path: str) -> Dict[str, int]:
+    """
+    Imports all the polars of a folder saved in the former csv format, those already imported
+    being imported again only if their csv file has been modified since.
+
+    :param folder_path: folder with <polar name>.csv files
+    :return: number of runs per polar in the database
+    """
+    database = PolarDatabase(folder_path)
+    migrated = {}
+    for csv_file in sorted(glob.glob(pth.join(folder_path, "*.csv"))):
+        polar_name = pth.splitext(pth.basename(csv_file))[0]
+        runs = database.load(polar_name)
+        migrated[polar_name] = 0 if runs is None else len(runs["mach"])
+
+    return migrated
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Imports XFOIL polars saved in csv files of a folder to the indexed database"
+    )
+    parser.add_argument("folder_path", nargs="+", help="folder(s) to migrate")
+    for path in parser.parse_args().folder_path:
+        print(path, migrate_polar_folder(path))
@@ -0,0 +1,387 @@
+"""
+    Interpolation of the saved XFOIL polars on a (Mach, Reynolds, alpha) grid
+"""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import itertools
+import logging
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from .polar_database import PolarDatabase, POLAR_LABELS
+
+EXTRAPOLATION_NONE = "none"
+EXTRAPOLATION_CLIP = "clip"
+EXTRAPOLATION_LINEAR = "linear"
+EXTRAPOLATION_POLICIES = [EXTRAPOLATION_NONE, EXTRAPOLATION_CLIP, EXTRAPOLATION_LINEAR]
+
+DEFAULT_MACH_TOLERANCE = 0.03
+
+_COEFFICIENT_LABELS = POLAR_LABELS[1:]
+_SCALAR_LABELS = ["cl_max_2d", "cl_min_2d"]
+
+_LOGGER = logging.getLogger(__name__)
+
+# Surfaces built from the polars loaded by PolarDatabase, identified by database path and polar
+# name and rebuilt only if the loaded runs have changed
+_LOADED_SURFACES = {}
+
+_Axis = Tuple[np.ndarray, np.ndarray, np.ndarray]
+
+
+class PolarSurface:
+    """
+    Saved runs of a polar resampled on a regular (Mach, Reynolds, alpha) grid.
+
+    The grid nodes are all the Mach, Reynolds and alpha values of the saved runs. At each Mach, the
+    runs are interpolated linearly in Reynolds on the Reynolds nodes, and each run is interpolated
+    linearly in alpha on the alpha nodes within its own alpha range (outside of it, coefficients
+    are undefined). Any (Mach, Reynolds) or (Mach, Reynolds, alpha) query is then answered for
+    vectors of points by bilinear/trilinear interpolation on the grid.
+
+    Outside of the saved domain, the extrapolation policy applies:
+        - "none": the point is a miss (no value returned),
+        - "clip": the values at the domain boundary are used,
+        - "linear": the values are extrapolated linearly from the boundary cell.
+    Points closer to the domain than the Mach tolerance (absolute) or Reynolds tolerance (relative)
+    always use the values at the domain boundary. Points with undefined values at one of their
+    bracketing Mach nodes use the nearest Mach node if within the Mach tolerance.
+    """
+
+    def __init__(self, runs: Dict[str, np.ndarray]):
+        """
+        :param runs: saved runs of the polar as loaded from PolarDatabase
+        """
+        self.mach = np.unique(runs["mach"])
+        self.reynolds = np.unique(runs["reynolds"])
+        self.alpha = np.unique(np.round(np.concatenate(runs["alpha"]), 6))
+
+        # Runs of each Mach sorted by Reynolds (the first saved run is kept for duplicates), with
+        # coefficients on the alpha nodes
+        self._runs_by_mach = []
+        for mach in self.mach:
+            index_mach = np.where(runs["mach"] == mach)[0]
+            reynolds, index_reynolds = np.unique(runs["reynolds"][index_mach], return_index=True)
+            index_runs = index_mach[index_reynolds]
+            scalars = np.array(
+                [[runs[label][idx] for label in _SCALAR_LABELS] for idx in index_runs]
+            )
+            coefficients = np.array([self._resample(runs, idx) for idx in index_runs])
+            self._runs_by_mach.append((reynolds, scalars, coefficients))
+
+        self._grids = {}
+
+    @classmethod
+    def load(cls, database: PolarDatabase, polar_name: str) -> Optional["PolarSurface"]:
+        """
+        Builds the surface of a saved polar, or reuses it if the saved runs have not changed.
+
+        :param database: database in which the polar is saved
+        :param polar_name: name of the polar
+        :return: surface of the polar, None if no run is saved
+        """
+        runs = database.load(polar_name)
+        if runs is None:
+            return None
+
+        key = (database.database_path, polar_name)
+        if key not in _LOADED_SURFACES or _LOADED_SURFACES[key][0] is not runs:
+            _LOADED_SURFACES[key] = (runs, cls(runs))
+
+        return _LOADED_SURFACES[key][1]
+
+    def polar(
+        self,
+        mach: Union[float, np.ndarray],
+        reynolds: Union[float, np.ndarray],
+        extrapolation: str = EXTRAPOLATION_NONE,
+        mach_tolerance: float = DEFAULT_MACH_TOLERANCE,
+        reynolds_tolerance: float = 0.0,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Interpolates the polars at given (Mach, Reynolds) points on the alpha nodes.
+
+        :param mach: Mach number(s)
+        :param reynolds: Reynolds number(s), same size as mach
+        :param extrapolation: extrapolation policy, one of EXTRAPOLATION_POLICIES
+        :param mach_tolerance: absolute distance to the Mach domain with boundary values used
+        :param reynolds_tolerance: relative distance to the Reynolds domain with boundary values
+        used
+        :return: dictionary with "alpha" nodes, "valid" vector (False for a miss), "cl_max_2d" and
+        "cl_min_2d" vectors and POLAR_LABELS[1:] arrays (one line per point and one column per
+        alpha node, NaN where undefined)
+        """
+        mach, reynolds = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(mach, dtype=float)),
+            np.atleast_1d(np.asarray(reynolds, dtype=float)),
+        )
+        scalars, coefficients = self._get_grid(extrapolation)
+        (scalar_values, coefficient_values), valid = self._query(
+            [scalars, coefficients],
+            [
+                (self.mach, mach, mach_tolerance),
+                (self.reynolds, reynolds, reynolds_tolerance * reynolds),
+            ],
+            extrapolation,
+            _is_polar_defined,
+        )
+
+        result = {"alpha": self.alpha, "valid": valid}
+        for idx, label in enumerate(_SCALAR_LABELS):
+            result[label] = scalar_values[:, idx]
+        for idx, label in enumerate(_COEFFICIENT_LABELS):
+            result[label] = coefficient_values[:, idx, :]
+
+        return result
+
+    def evaluate(
+        self,
+        mach: Union[float, np.ndarray],
+        reynolds: Union[float, np.ndarray],
+        alpha: Union[float, np.ndarray],
+        extrapolation: str = EXTRAPOLATION_NONE,
+        mach_tolerance: float = DEFAULT_MACH_TOLERANCE,
+        reynolds_tolerance: float = 0.0,
+    ) -> Dict[str, np.ndarray]:
+        """
+        Interpolates the coefficients at given (Mach, Reynolds, alpha) points.
+
+        :param mach: Mach number(s)
+        :param reynolds: Reynolds number(s)
+        :param alpha: angle(s) of attack in degree
+        :param extrapolation: extrapolation policy, one of EXTRAPOLATION_POLICIES (also applied on
+        alpha)
+        :param mach_tolerance: absolute distance to the Mach domain with boundary values used
+        :param reynolds_tolerance: relative distance to the Reynolds domain with boundary values
+        used
+        :return: dictionary with "valid" vector (False for a miss) and POLAR_LABELS[1:] vectors (NaN
+        for a miss)
+        """
+        mach, reynolds, alpha = np.broadcast_arrays(
+            np.atleast_1d(np.asarray(mach, dtype=float)),
+            np.atleast_1d(np.asarray(reynolds, dtype=float)),
+            np.atleast_1d(np.asarray(alpha, dtype=float)),
+        )
+        _, coefficients = self._get_grid(extrapolation)
+        (values,), valid = self._query(
+            [np.moveaxis(coefficients, 2, 3)],
+            [
+                (self.mach, mach, mach_tolerance),
+                (self.reynolds, reynolds, reynolds_tolerance * reynolds),
+                (self.alpha, alpha, 0.0),
+            ],
+            extrapolation,
+            _is_defined,
+        )
+
+        result = {"valid": valid}
+        for idx, label in enumerate(_COEFFICIENT_LABELS):
+            result[label] = values[:, idx]
+
+        return result
+
+    def search(
+        self,
+        mach: float,
+        reynolds: float,
+        extrapolation: str = EXTRAPOLATION_NONE,
+        mach_tolerance: float = DEFAULT_MACH_TOLERANCE,
+        reynolds_tolerance: float = 0.0,
+    ) -> Optional[Dict[str, np.ndarray]]:
+        """
+        Interpolates the polar at a single (Mach, Reynolds) point on the alpha nodes where all the
+        coefficients are defined.
+
+        :param mach: Mach number
+        :param reynolds: Reynolds number
+        :param extrapolation: extrapolation policy, one of EXTRAPOLATION_POLICIES
+        :param mach_tolerance: absolute distance to the Mach domain with boundary values used
+        :param reynolds_tolerance: relative distance to the Reynolds domain with boundary values
+        used
+        :return: dictionary with "cl_max_2d", "cl_min_2d" and POLAR_LABELS keys, None for a miss
+        """
+        polar = self.polar(mach, reynolds, extrapolation, mach_tolerance, reynolds_tolerance)
+        if not polar["valid"][0]:
+            _LOGGER.debug("No saved polar for Mach %f and Reynolds %f", mach, reynolds)
+            return None
+
+        defined = np.all([np.isfinite(polar[label][0]) for label in _COEFFICIENT_LABELS], axis=0)
+        result = {label: polar[label][0] for label in _SCALAR_LABELS}
+        result["alpha"] = self.alpha[defined]
+        for label in _COEFFICIENT_LABELS:
+            result[label] = polar[label][0][defined]
+
+        return result
+
+    def _resample(self, runs: Dict[str, np.ndarray], idx: int) -> np.ndarray:
+        """
+        Interpolates the coefficients of a run on the alpha nodes, NaN outside of its alpha range.
+        """
+        alpha = runs["alpha"][idx]
+        order = np.argsort(alpha, kind="stable")
+
+        return np.array(
+            [
+                np.interp(self.alpha, alpha[order], runs[label][idx][order], np.nan, np.nan)
+                for label in _COEFFICIENT_LABELS
+            ]
+        )
+
+    def _get_grid(self, extrapolation: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the grid values as (Mach, Reynolds, scalar) and (Mach, Reynolds, coefficient, alpha)
+        arrays, the runs of each Mach being extrapolated in Reynolds with the given policy.
+        """
+        if extrapolation not in EXTRAPOLATION_POLICIES:
+            raise ValueError(
+                "Unknown extrapolation policy %s, must be one of %s"
+                % (extrapolation, EXTRAPOLATION_POLICIES)
+            )
+
+        if extrapolation not in self._grids:
+            scalars = np.full((len(self.mach), len(self.reynolds), len(_SCALAR_LABELS)), np.nan)
+            coefficients = np.full(
+                (len(self.mach), len(self.reynolds), len(_COEFFICIENT_LABELS), len(self.alpha)),
+                np.nan,
+            )
+            for idx, (reynolds, run_scalars, run_coefficients) in enumerate(self._runs_by_mach):
+                axes, valid = self._get_axes([(reynolds, self.reynolds, 0.0)], extrapolation)
+                scalars[idx, valid] = _interpolate(run_scalars, axes)[valid]
+                coefficients[idx, valid] = _interpolate(run_coefficients, axes)[valid]
+            scalars.flags.writeable = False
+            coefficients.flags.writeable = False
+            self._grids[extrapolation] = (scalars, coefficients)
+
+        return self._grids[extrapolation]
+
+    def _query(
+        self,
+        grids: List[np.ndarray],
+        queries: List[Tuple[np.ndarray, np.ndarray, Union[float, np.ndarray]]],
+        extrapolation: str,
+        is_defined: Callable[..., np.ndarray],
+    ) -> Tuple[List[np.ndarray], np.ndarray]:
+        """
+        Interpolates grid values at given points.
+
+        Points with undefined values at one of the bracketing Mach nodes (e.g. a Reynolds number
+        out of the range computed at this Mach) use the nearest Mach node if within tolerance.
+
+        :param grids: values with one dimension per axis first, Mach axis first
+        :param queries: list of (grid nodes, point values, tolerance) for each axis
+        :param extrapolation: extrapolation policy
+        :param is_defined: function returning for each point whether the interpolated values are
+        defined
+        :return: interpolated values for each grid (NaN for a miss) and vector that is False for a
+        miss
+        """
+        axes, valid = self._get_axes(queries, extrapolation)
+        values = [_interpolate(grid, axes) for grid in grids]
+        valid &= is_defined(*values)
+
+        mach_nodes, mach, mach_tolerance = queries[0]
+        nearest = np.argmin(np.abs(mach_nodes[:, np.newaxis] - mach), axis=0)
+        retry = ~valid & (np.abs(mach_nodes[nearest] - mach) <= mach_tolerance)
+        if np.any(retry):
+            other_axes, other_valid = self._get_axes(queries[1:], extrapolation)
+            nearest_axes = [(nearest, nearest, np.zeros(np.shape(mach)))] + other_axes
+            nearest_values = [_interpolate(grid, nearest_axes) for grid in grids]
+            retry &= other_valid & is_defined(*nearest_values)
+            for value, nearest_value in zip(values, nearest_values):
+                value[retry] = nearest_value[retry]
+            valid |= retry
+
+        for value in values:
+            value[~valid] = np.nan
+
+        return values, valid
+
+    @staticmethod
+    def _get_axes(
+        queries: List[Tuple[np.ndarray, np.ndarray, Union[float, np.ndarray]]], extrapolation: str
+    ) -> Tuple[List[_Axis], np.ndarray]:
+        """
+        Locates points on the grid axes.
+
+        :param queries: list of (grid nodes, point values, tolerance) for each axis
+        :param extrapolation: extrapolation policy
+        :return: list of (lower node index, upper node index, upper node weight) for each axis and
+        vector that is False for the points outside of the domain that are misses
+        """
+        axes = []
+        valid = np.ones(np.shape(queries[0][1]), dtype=bool)
+        for nodes, values, tolerance in queries:
+            outside = (values < nodes[0] - tolerance) | (values > nodes[-1] + tolerance)
+            if len(nodes) == 1:
+                lower = np.zeros(np.shape(values), dtype=int)
+                upper = lower
+                weight = np.zeros(np.shape(values))
+            else:
+                lower = np.clip(np.searchsorted(nodes, values, side="right") - 1, 0, len(nodes) - 2)
+                upper = lower + 1
+                weight = (values - nodes[lower]) / (nodes[upper] - nodes[lower])
+                if extrapolation == EXTRAPOLATION_LINEAR:
+                    weight = np.where(outside, weight, np.clip(weight, 0.0, 1.0))
+                else:
+                    weight = np.clip(weight, 0.0, 1.0)
+            if extrapolation == EXTRAPOLATION_NONE:
+                valid &= ~outside
+            axes.append((lower, upper, weight))
+
+        return axes, valid
+
+
+def _interpolate(grid: np.ndarray, axes: List[_Axis]) -> np.ndarray:
+    """
+    Multilinear interpolation on the first dimensions of a grid.
+
+    :param grid: values with one dimension per axis first
+    :param axes: list of (lower node index, upper node index, upper node weight) for each axis
+    :return: interpolated values, one line per point
+    """
+    result = 0.0
+    for corner in itertools.product([False, True], repeat=len(axes)):
+        index = tuple(
+            upper if is_upper else lower for (lower, upper, _), is_upper in zip(axes, corner)
+        )
+        weight = np.prod(
+            [
+                weight if is_upper else 1.0 - weight
+                for (_, _, weight), is_upper in zip(axes, corner)
+            ],
+            axis=0,
+        )
+        values = grid[index]
+        weight = weight.reshape(np.shape(weight) + (1,) * (values.ndim - 1))
+        # Corners without weight do not contribute, even if their values are undefined
+        result = result + np.where(weight != 0.0, weight * values, 0.0)
+
+    return result
+
+
+def _is_polar_defined(scalar_values: np.ndarray, coefficient_values: np.ndarray) -> np.ndarray:
+    """
+    :return: True for the polars with defined scalars and coefficients at two alpha nodes at least
+    """
+    return np.all(np.isfinite(scalar_values), axis=1) & (
+        np.sum(np.all(np.isfinite(coefficient_values), axis=1), axis=1) >= 2
+    )
+
+
+def _is_defined(values: np.ndarray) -> np.ndarray:
+    """
+    :return: True for the points with all coefficients defined
+    """
+    return np.all(np.isfinite(values), axis=1)
@@ -0,0 +1,270 @@
+"""
+This module runs batches of XFOIL computations concurrently
+"""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import logging
+import os
+import os.path as pth
+import subprocess
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import numpy as np
+
+# noinspection PyProtectedMember
+from fastoad._utils.resource_management.copy import copy_resource
+
+from . import xfoil699
+from .polar_database import PolarDatabase, POLAR_LABELS
+from .xfoil_polar import XfoilPolar, ALPHA_STEP, POLAR_DATABASE_FOLDER_PATH, XFOIL_EXE_NAME
+
+DEFAULT_SWEEP_TIMEOUT = 15.0
+
+_LOGGER = logging.getLogger(__name__)
+
+XfoilJob = namedtuple(
+    "XfoilJob",
+    ["airfoil_file", "mach", "reynolds", "alpha_start", "alpha_end", "activate_negative_angle"],
+    defaults=[0.0, 90.0, False],
+)
+"""
+XFOIL polar computation of an airfoil, with the same alpha range conventions as XfoilPolar
+(positive sweep from alpha_start to alpha_end, and negative one from -alpha_start to -alpha_end
+if activate_negative_angle).
+"""
+
+
+class XfoilBatch:
+    """
+    Runs XFOIL polar computations concurrently and saves them in the polar database.
+
+    Each alpha sweep of a job (two for the jobs with negative angles) runs in its own temporary
+    directory, and at most n_workers XFOIL processes run at the same time. An XFOIL process is
+    stopped if it lasts more than the timeout, and the alpha values computed until then are kept,
+    as XfoilPolar does. Results are post-processed as in XfoilPolar and appended to the polar
+    database by the calling process, so that XfoilPolar then finds them.
+    """
+
+    def __init__(
+        self,
+        n_workers: Optional[int] = None,
+        timeout: float = DEFAULT_SWEEP_TIMEOUT,
+        xfoil_exe_path: str = "",
+        iter_limit: int = 100,
+        database_folder_path: str = POLAR_DATABASE_FOLDER_PATH,
+        skip_saved: bool = True,
+    ):
+        """
+        :param n_workers: maximum number of XFOIL processes running at the same time, number of
+        CPUs if None
+        :param timeout: maximum duration of an alpha sweep in seconds
+        :param xfoil_exe_path: XFOIL executable, embedded one if empty
+        :param iter_limit: XFOIL iteration limit
+        :param database_folder_path: folder of the polar database results are saved in
+        :param skip_saved: if True, jobs with a run saved for the same Mach and Reynolds are not
+        computed again
+        """
+        self.n_workers = n_workers
+        self.timeout = timeout
+        self.xfoil_exe_path = xfoil_exe_path
+        self.iter_limit = iter_limit
+        self.database = PolarDatabase(database_folder_path)
+        self.skip_saved = skip_saved
+
+    def run(self, jobs: List[XfoilJob]) -> List[Optional[Dict[str, np.ndarray]]]:
+        """
+        Runs the jobs and saves the results in the polar database.
+
+        Jobs saved under the same polar name with the same Mach and Reynolds are computed once.
+
+        :param jobs: list of jobs
+        :return: for each job, dictionary with "mach", "reynolds", "cl_max_2d", "cl_min_2d" and
+        POLAR_LABELS keys, None if the job failed or was skipped (already saved)
+        """
+        jobs = [XfoilJob(*job) for job in jobs]
+        to_compute = []
+        job_indices = {}
+        sweeps = []
+        for idx, job in enumerate(jobs):
+            polar = self._get_polar(job)
+            mach = round(float(job.mach) * 1e4) / 1e4
+            reynolds = round(float(job.reynolds))
+            key = (polar.get_polar_name(), mach, reynolds)
+            if key in job_indices:
+                job_indices[key].append(idx)
+                continue
+            if self.skip_saved and self._is_saved(polar, mach, reynolds):
+                continue
+            job_indices[key] = [idx]
+            to_compute.append((key, job, polar, mach, reynolds))
+            sweeps.append((polar, mach, reynolds, job.alpha_start, job.alpha_end, ALPHA_STEP))
+            if job.activate_negative_angle:
+                sweeps.append(
+                    (
+                        polar,
+                        mach,
+                        reynolds,
+                        min(-1 * job.alpha_start, -ALPHA_STEP),
+                        -1 * job.alpha_end,
+                        -ALPHA_STEP,
+                    )
+                )
+
+        n_workers = self.n_workers
+        if n_workers is None:
+            n_workers = os.cpu_count() or 1
+        with ThreadPoolExecutor(max_workers=max(1, n_workers)) as executor:
+            sweep_results = iter(list(executor.map(lambda sweep: self._run_sweep(*sweep), sweeps)))
+
+        results = [None] * len(jobs)
+        for key, job, polar, mach, reynolds in to_compute:
+            result_array_p = next(sweep_results)
+            result_array_n = next(sweep_results) if job.activate_negative_angle else None
+            if result_array_p is None or (job.activate_negative_angle and result_array_n is None):
+                _LOGGER.warning(
+                    "XFOIL computation of %s at Mach %f and Reynolds %f failed",
+                    job.airfoil_file,
+                    mach,
+                    reynolds,
+                )
+                continue
+
+            cl_max_2d, cl_min_2d, error, padded_polar = polar.post_process(
+                result_array_p, result_array_n
+            )
+            if error:
+                continue
+            polar.save_polar(
+                self.database, key[0], mach, reynolds, cl_max_2d, cl_min_2d, padded_polar,
+            )
+            result = {
+                "mach": mach,
+                "reynolds": reynolds,
+                "cl_max_2d": cl_max_2d,
+                "cl_min_2d": cl_min_2d,
+            }
+            for label in POLAR_LABELS:
+                result[label] = polar.remove_padding(padded_polar["alpha"], padded_polar[label])
+            for idx in job_indices[key]:
+                results[idx] = result
+
+        return results
+
+    def _get_polar(self, job: XfoilJob) -> XfoilPolar:
+        """
+        :return: XfoilPolar component with the options of the job, for file generation and
+        post-processing
+        """
+        return XfoilPolar(
+            airfoil_file=job.airfoil_file,
+            alpha_start=float(job.alpha_start),
+            alpha_end=float(job.alpha_end),
+            activate_negative_angle=bool(job.activate_negative_angle),
+            iter_limit=self.iter_limit,
+            xfoil_exe_path=self.xfoil_exe_path,
+        )
+
+    def _is_saved(self, polar: XfoilPolar, mach: float, reynolds: float) -> bool:
+
+        runs = self.database.load(polar.get_polar_name())
+
+        return runs is not None and bool(
+            np.any((runs["mach"] == mach) & (runs["reynolds"] == reynolds))
+        )
+
+    def _run_sweep(
+        self,
+        polar: XfoilPolar,
+        mach: float,
+        reynolds: float,
+        alpha_start: float,
+        alpha_end: float,
+        step: float,
+    ) -> Optional[np.ndarray]:
+        """
+        Runs an alpha sweep in a new temporary directory.
+
+        :param polar: XfoilPolar component with the options of the job, shared by its sweeps
+
+        :return: XFOIL results, None if none could be read
+        """
+        started = time.monotonic()
+        tmp_directory = polar.create_tmp_directory()
+        try:
+            if self.xfoil_exe_path:
+                command = [self.xfoil_exe_path]
+            else:
+                # noinspection PyTypeChecker
+                copy_resource(xfoil699, XFOIL_EXE_NAME, tmp_directory.name)
+                command = [pth.join(tmp_directory.name, XFOIL_EXE_NAME)]
+
+            (
+                stdin_file_path,
+                stdout_file_path,
+                stderr_file_path,
+                tmp_result_file_path,
+            ) = polar.write_sweep_files(
+                tmp_directory.name, mach, reynolds, alpha_start, alpha_end, step
+            )
+
+            with open(stdin_file_path) as stdin, open(stdout_file_path, "w") as stdout, open(
+                stderr_file_path, "w"
+            ) as stderr:
+                try:
+                    subprocess.run(
+                        command,
+                        stdin=stdin,
+                        stdout=stdout,
+                        stderr=stderr,
+                        cwd=tmp_directory.name,
+                        timeout=self.timeout,
+                        check=False,
+                    )
+                except subprocess.TimeoutExpired:
+                    # Alpha values computed until the timeout are kept
+                    _LOGGER.info(
+                        "XFOIL computation of %s at Mach %f and Reynolds %f stopped after %.1fs",
+                        polar.options["airfoil_file"],
+                        mach,
+                        reynolds,
+                        time.monotonic() - started,
+                    )
+
+            if not pth.isfile(tmp_result_file_path):
+                return None
+            # noinspection PyBroadException
+            try:
+                result_array = polar.read_polar(tmp_result_file_path)
+            except Exception:
+                return None
+            result_array = np.atleast_1d(result_array)
+
+            return result_array if len(result_array) > 0 else None
+
+        # noinspection PyBroadException
+        except Exception:
+            _LOGGER.exception("Error in XFOIL computation of %s", polar.options["airfoil_file"])
+            return None
+
+        finally:
+            # noinspection PyBroadException
+            try:
+                tmp_directory.cleanup()
+            except Exception:
+                _LOGGER.info(
+                    "Error while trying to erase {} temporary directory!".format(tmp_directory.name)
+                )
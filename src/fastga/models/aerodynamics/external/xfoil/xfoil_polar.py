@@ -23,8 +23,7 @@ import tempfile
 from pathlib import Path
 from tempfile import TemporaryDirectory
 import warnings
-import pandas as pd
-from typing import Tuple
+from typing import Dict, Optional, Tuple
 import numpy as np
 from importlib.resources import path
 from openmdao.components.external_code_comp import ExternalCodeComp
@@ -36,6 +35,8 @@ from fastoad._utils.resource_management.copy import copy_resource
 
 from ...constants import POLAR_POINT_COUNT
 from . import resources as local_resources
+from .polar_database import PolarDatabase, POLAR_LABELS
+from .polar_surface import PolarSurface, EXTRAPOLATION_NONE, EXTRAPOLATION_POLICIES
 
 from fastga.models.geometry.profiles.get_profile import get_profile
 from fastga.models.aerodynamics.external.xfoil import xfoil699
@@ -47,6 +48,8 @@ OPTION_ALPHA_START = "alpha_start"
 OPTION_ALPHA_END = "alpha_end"
 OPTION_ITER_LIMIT = "iter_limit"
 OPTION_COMP_NEG_AIR_SYM = "activate_negative_angle"
+OPTION_POLAR_EXTRAPOLATION = "polar_extrapolation"
+OPTION_REYNOLDS_TOLERANCE = "reynolds_tolerance"
 DEFAULT_2D_CL_MAX = 1.9
 DEFAULT_2D_CL_MIN = -1.7
 ALPHA_STEP = 0.5
@@ -58,6 +61,7 @@ _DEFAULT_AIRFOIL_FILE = "naca23012.af"
 _TMP_PROFILE_FILE_NAME = "in"  # as short as possible to avoid problems of path length
 _TMP_RESULT_FILE_NAME = "out"  # as short as possible to avoid problems of path length
 XFOIL_EXE_NAME = "xfoil.exe"  # name of embedded XFoil executable
+POLAR_DATABASE_FOLDER_PATH = pth.join(pth.split(os.path.realpath(__file__))[0], "resources")
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -82,6 +86,21 @@ class XfoilPolar(ExternalCodeComp):
         self.options.declare(OPTION_ALPHA_END, default=90.0, types=float)
         self.options.declare(OPTION_ITER_LIMIT, default=100, types=int)
         self.options.declare(OPTION_COMP_NEG_AIR_SYM, default=False, types=bool)
+        self.options.declare(
+            OPTION_POLAR_EXTRAPOLATION,
+            default=EXTRAPOLATION_NONE,
+            values=EXTRAPOLATION_POLICIES,
+            desc="extrapolation policy of the saved polars outside of their Mach/Reynolds domain, "
+            "XFOIL is run for a miss",
+        )
+        self.options.declare(
+            OPTION_REYNOLDS_TOLERANCE,
+            default=0.0,
+            types=float,
+            lower=0.0,
+            desc="relative distance to the Reynolds domain of the saved polars within which the "
+            "boundary polar is used instead of running XFOIL",
+        )
 
     def setup(self):
 
@@ -110,110 +129,20 @@ class XfoilPolar(ExternalCodeComp):
         mach = round(float(inputs["xfoil:mach"]) * 1e4) / 1e4
         reynolds = round(float(inputs["xfoil:reynolds"]))
 
-        # Search if data already stored for this profile and mach with reynolds values bounding current value.
-        # If so, use linear interpolation with the nearest upper/lower reynolds
-        no_file = True
-        data_saved = None
-        interpolated_result = None
-        if self.options[OPTION_COMP_NEG_AIR_SYM]:
-            result_file = pth.join(
-                pth.split(os.path.realpath(__file__))[0],
-                "resources",
-                self.options["airfoil_file"].replace(
-                    ".af", "_" + str(math.ceil(self.options[OPTION_ALPHA_END]))
-                )
-                + "S.csv",
-            )
+        # Search if data already stored for this profile. If so, interpolate the saved polars in
+        # Mach and Reynolds
+        polar_name = self.get_polar_name()
+        polar_database = PolarDatabase(POLAR_DATABASE_FOLDER_PATH)
+        polar_surface = PolarSurface.load(polar_database, polar_name)
+        if polar_surface is None:
+            interpolated_result = None
         else:
-            result_file = pth.join(
-                pth.split(os.path.realpath(__file__))[0],
-                "resources",
-                self.options["airfoil_file"].replace(".af", "") + ".csv",
-            )
-        if pth.exists(result_file):
-            no_file = False
-            data_saved = pd.read_csv(result_file)
-            values = data_saved.to_numpy()[:, 1 : len(data_saved.to_numpy()[0])]
-            labels = data_saved.to_numpy()[:, 0].tolist()
-            data_saved = pd.DataFrame(values, index=labels)
-            saved_mach_list = data_saved.loc["mach", :].to_numpy().astype(float)
-            index_near_mach = np.where(abs(saved_mach_list - mach) < 0.03)[0]
-            near_mach = []
-            distance_to_mach = []
-            for index in index_near_mach:
-                if not (saved_mach_list[index] in near_mach):
-                    near_mach.append(saved_mach_list[index])
-                    distance_to_mach.append(abs(saved_mach_list[index] - mach))
-            if len(near_mach) == 0:
-                index_mach = np.where(data_saved.loc["mach", :].to_numpy() == str(mach))[0]
-            else:
-                selected_mach_index = distance_to_mach.index(min(distance_to_mach))
-                index_mach = np.where(saved_mach_list == near_mach[selected_mach_index])[0]
-            data_reduced = data_saved.loc[labels, index_mach]
-            # Search if this exact reynolds has been computed and save results
-            reynolds_vect = np.array(
-                [float(x) for x in list(data_reduced.loc["reynolds", :].to_numpy())]
+            interpolated_result = polar_surface.search(
+                mach,
+                reynolds,
+                extrapolation=self.options[OPTION_POLAR_EXTRAPOLATION],
+                reynolds_tolerance=self.options[OPTION_REYNOLDS_TOLERANCE],
             )
-            index_reynolds = index_mach[np.where(reynolds_vect == reynolds)[0]]
-            if len(index_reynolds) == 1:
-                interpolated_result = data_reduced.loc[labels, index_reynolds]
-            # Else search for lower/upper Reynolds
-            else:
-                lower_reynolds = reynolds_vect[np.where(reynolds_vect < reynolds)[0]]
-                upper_reynolds = reynolds_vect[np.where(reynolds_vect > reynolds)[0]]
-                if not (len(lower_reynolds) == 0 or len(upper_reynolds) == 0):
-                    index_lower_reynolds = index_mach[
-                        np.where(reynolds_vect == max(lower_reynolds))[0]
-                    ]
-                    index_upper_reynolds = index_mach[
-                        np.where(reynolds_vect == min(upper_reynolds))[0]
-                    ]
-                    lower_values = data_reduced.loc[labels, index_lower_reynolds]
-                    upper_values = data_reduced.loc[labels, index_upper_reynolds]
-                    # Initialise values with lower reynolds
-                    interpolated_result = lower_values
-                    # Calculate reynolds ratio split for linear interpolation
-                    x_ratio = (min(upper_reynolds) - reynolds) / (
-                        min(upper_reynolds) - max(lower_reynolds)
-                    )
-                    # Search for common alpha range for linear interpolation
-                    alpha_lower = (
-                        np.array(
-                            np.matrix(lower_values.loc["alpha", index_lower_reynolds].to_numpy()[0])
-                        )
-                        .ravel()
-                        .tolist()
-                    )
-                    alpha_upper = (
-                        np.array(
-                            np.matrix(upper_values.loc["alpha", index_upper_reynolds].to_numpy()[0])
-                        )
-                        .ravel()
-                        .tolist()
-                    )
-                    alpha_shared = np.array(list(set(alpha_upper).intersection(alpha_lower)))
-                    interpolated_result.loc["alpha", index_lower_reynolds] = str(
-                        alpha_shared.tolist()
-                    )
-                    labels.remove("alpha")
-                    # Calculate average values (cd, cl...) with linear interpolation
-                    for label in labels:
-                        lower_value = np.array(
-                            np.matrix(lower_values.loc[label, index_lower_reynolds].to_numpy()[0])
-                        ).ravel()
-                        upper_value = np.array(
-                            np.matrix(upper_values.loc[label, index_upper_reynolds].to_numpy()[0])
-                        ).ravel()
-                        # If values relative to alpha vector, performs interpolation with shared vector
-                        if np.size(lower_value) == len(alpha_lower):
-                            lower_value = np.interp(
-                                alpha_shared, np.array(alpha_lower), lower_value
-                            )
-                            upper_value = np.interp(
-                                alpha_shared, np.array(alpha_upper), upper_value
-                            )
-                        value = (lower_value * x_ratio + upper_value * (1 - x_ratio)).tolist()
-                        interpolated_result.loc[label, index_lower_reynolds] = str(value)
 
         if interpolated_result is None:
             # Create result folder first (if it must fail, let it fail as soon as possible)
@@ -223,7 +152,7 @@ class XfoilPolar(ExternalCodeComp):
 
             # Pre-processing (populating temp directory) -----------------------------------------------
             # XFoil exe
-            tmp_directory = self._create_tmp_directory()
+            tmp_directory = self.create_tmp_directory()
             if self.options[OPTION_XFOIL_EXE_PATH]:
                 # if a path for Xfoil has been provided, simply use it
                 self.options["command"] = [self.options[OPTION_XFOIL_EXE_PATH]]
@@ -240,20 +169,12 @@ class XfoilPolar(ExternalCodeComp):
 
             # profile file
             tmp_profile_file_path = pth.join(tmp_directory.name, _TMP_PROFILE_FILE_NAME)
-            profile = get_profile(file_name=self.options["airfoil_file"],).get_sides()
-            # noinspection PyTypeChecker
-            np.savetxt(
-                tmp_profile_file_path,
-                profile.to_numpy(),
-                fmt="%.15f",
-                delimiter=" ",
-                header="Wing",
-                comments="",
-            )
+            self._write_profile_file(self.options["airfoil_file"], tmp_profile_file_path)
 
             # standard input file
             tmp_result_file_path = pth.join(tmp_directory.name, _TMP_RESULT_FILE_NAME)
             self._write_script_file(
+                self.stdin,
                 reynolds,
                 mach,
                 tmp_profile_file_path,
@@ -269,11 +190,11 @@ class XfoilPolar(ExternalCodeComp):
             # noinspection PyBroadException
             try:
                 super().compute(inputs, outputs)
-                result_array_p = self._read_polar(tmp_result_file_path)
+                result_array_p = self.read_polar(tmp_result_file_path)
             except:  # catch the error and try to read result file for non-convergence on higher angles
                 e = sys.exc_info()[1]
                 try:
-                    result_array_p = self._read_polar(tmp_result_file_path)
+                    result_array_p = self.read_polar(tmp_result_file_path)
                 except:
                     raise TimeoutError("<p>Error: %s</p>" % e)
 
@@ -284,6 +205,7 @@ class XfoilPolar(ExternalCodeComp):
                 os.remove(tmp_result_file_path)
                 alpha_start = min(-1 * self.options[OPTION_ALPHA_START], -ALPHA_STEP)
                 self._write_script_file(
+                    self.stdin,
                     reynolds,
                     mach,
                     tmp_profile_file_path,
@@ -295,100 +217,33 @@ class XfoilPolar(ExternalCodeComp):
                 # noinspection PyBroadException
                 try:
                     super().compute(inputs, outputs)
-                    result_array_n = self._read_polar(tmp_result_file_path)
+                    result_array_n = self.read_polar(tmp_result_file_path)
                 except:  # catch the error and try to read result file for non-convergence on higher angles
                     e = sys.exc_info()[1]
                     try:
-                        result_array_n = self._read_polar(tmp_result_file_path)
+                        result_array_n = self.read_polar(tmp_result_file_path)
                     except:
                         raise TimeoutError("<p>Error: %s</p>" % e)
 
             # Post-processing --------------------------------------------------------------------------
             if self.options[OPTION_COMP_NEG_AIR_SYM]:
-                cl_max_2d, error = self._get_max_cl(result_array_p["alpha"], result_array_p["CL"])
                 # noinspection PyUnboundLocalVariable
-                cl_min_2d, _ = self._get_min_cl(result_array_n["alpha"], result_array_n["CL"])
-                alpha = result_array_n["alpha"].tolist()
-                alpha.reverse()
-                alpha.extend(result_array_p["alpha"].tolist())
-                cl = result_array_n["CL"].tolist()
-                cl.reverse()
-                cl.extend(result_array_p["CL"].tolist())
-                cd = result_array_n["CD"].tolist()
-                cd.reverse()
-                cd.extend(result_array_p["CD"].tolist())
-                cdp = result_array_n["CDp"].tolist()
-                cdp.reverse()
-                cdp.extend(result_array_p["CDp"].tolist())
-                cm = result_array_n["CM"].tolist()
-                cm.reverse()
-                cm.extend(result_array_p["CM"].tolist())
-            else:
-                cl_max_2d, error = self._get_max_cl(result_array_p["alpha"], result_array_p["CL"])
-                cl_min_2d, _ = self._get_min_cl(result_array_p["alpha"], result_array_p["CL"])
-                alpha = result_array_p["alpha"].tolist()
-                cl = result_array_p["CL"].tolist()
-                cd = result_array_p["CD"].tolist()
-                cdp = result_array_p["CDp"].tolist()
-                cm = result_array_p["CM"].tolist()
-
-            if POLAR_POINT_COUNT < len(alpha):
-                alpha_interp = np.linspace(alpha[0], alpha[-1], POLAR_POINT_COUNT)
-                cl = np.interp(alpha_interp, alpha, cl)
-                cd = np.interp(alpha_interp, alpha, cd)
-                cdp = np.interp(alpha_interp, alpha, cdp)
-                cm = np.interp(alpha_interp, alpha, cm)
-                alpha = alpha_interp
-                warnings.warn("Defined polar point in fast aerodynamics\\constants.py exceeded!")
+                cl_max_2d, cl_min_2d, error, polar = self.post_process(
+                    result_array_p, result_array_n
+                )
             else:
-                additional_zeros = list(np.zeros(POLAR_POINT_COUNT - len(alpha)))
-                alpha.extend(additional_zeros)
-                alpha = np.array(alpha)
-                cl.extend(additional_zeros)
-                cl = np.array(cl)
-                cd.extend(additional_zeros)
-                cd = np.array(cd)
-                cdp.extend(additional_zeros)
-                cdp = np.array(cdp)
-                cm.extend(additional_zeros)
-                cm = np.array(cm)
+                cl_max_2d, cl_min_2d, error, polar = self.post_process(result_array_p)
+            alpha = polar["alpha"]
+            cl = polar["cl"]
+            cd = polar["cd"]
+            cdp = polar["cdp"]
+            cm = polar["cm"]
 
             # Save results to defined path -------------------------------------------------------------
             if not error:
-                results = [
-                    np.array(mach),
-                    np.array(reynolds),
-                    np.array(cl_max_2d),
-                    np.array(cl_min_2d),
-                    str(self._reshape(alpha, alpha).tolist()),
-                    str(self._reshape(alpha, cl).tolist()),
-                    str(self._reshape(alpha, cd).tolist()),
-                    str(self._reshape(alpha, cdp).tolist()),
-                    str(self._reshape(alpha, cm).tolist()),
-                ]
-                labels = [
-                    "mach",
-                    "reynolds",
-                    "cl_max_2d",
-                    "cl_min_2d",
-                    "alpha",
-                    "cl",
-                    "cd",
-                    "cdp",
-                    "cm",
-                ]
-                if no_file or (data_saved is None):
-                    data = pd.DataFrame(results, index=labels)
-                else:
-                    data = pd.DataFrame(np.c_[data_saved, results], index=labels)
-                # noinspection PyBroadException
-                try:
-                    data.to_csv(result_file)
-                except:
-                    warnings.warn(
-                        "Unable to save XFoil results to *.csv file: writing permission denied for {} "
-                        "folder!".format(local_resources.__path__[0])
-                    )
+                self.save_polar(
+                    polar_database, polar_name, mach, reynolds, cl_max_2d, cl_min_2d, polar
+                )
 
             # Getting output files if needed ---------------------------------------------------------
             if self.options[OPTION_RESULT_FOLDER_PATH] != "":
@@ -431,17 +286,13 @@ class XfoilPolar(ExternalCodeComp):
 
         else:
             # Extract results
-            cl_max_2d = np.array(
-                np.matrix(interpolated_result.loc["cl_max_2d", :].to_numpy()[0])
-            ).ravel()
-            cl_min_2d = np.array(
-                np.matrix(interpolated_result.loc["cl_min_2d", :].to_numpy()[0])
-            ).ravel()
-            ALPHA = np.array(np.matrix(interpolated_result.loc["alpha", :].to_numpy()[0])).ravel()
-            CL = np.array(np.matrix(interpolated_result.loc["cl", :].to_numpy()[0])).ravel()
-            CD = np.array(np.matrix(interpolated_result.loc["cd", :].to_numpy()[0])).ravel()
-            CDP = np.array(np.matrix(interpolated_result.loc["cdp", :].to_numpy()[0])).ravel()
-            CM = np.array(np.matrix(interpolated_result.loc["cm", :].to_numpy()[0])).ravel()
+            cl_max_2d = interpolated_result["cl_max_2d"]
+            cl_min_2d = interpolated_result["cl_min_2d"]
+            ALPHA = interpolated_result["alpha"]
+            CL = interpolated_result["cl"]
+            CD = interpolated_result["cd"]
+            CDP = interpolated_result["cdp"]
+            CM = interpolated_result["cm"]
 
             # Modify vector length if necessary
             if POLAR_POINT_COUNT < len(ALPHA):
@@ -482,8 +333,169 @@ class XfoilPolar(ExternalCodeComp):
         outputs["xfoil:CL_max_2D"] = cl_max_2d
         outputs["xfoil:CL_min_2D"] = cl_min_2d
 
+    def get_polar_name(self) -> str:
+        """
+        :return: name of the saved polar of the airfoil, suffixed by the alpha range if computed on
+        negative angles
+        """
+        polar_name = self.options["airfoil_file"].replace(".af", "")
+        if self.options[OPTION_COMP_NEG_AIR_SYM]:
+            polar_name += "_" + str(math.ceil(self.options[OPTION_ALPHA_END])) + "S"
+
+        return polar_name
+
+    def post_process(
+        self, result_array_p: np.ndarray, result_array_n: Optional[np.ndarray] = None
+    ) -> Tuple[float, float, bool, Dict[str, np.ndarray]]:
+        """
+        Merges the XFOIL results of the positive and negative (if any) alpha sweeps.
+
+        :param result_array_p: XFOIL results of the positive alpha sweep
+        :param result_array_n: XFOIL results of the negative alpha sweep
+        :return: 2D max and min lift coefficients, True if they are not found and dictionary with
+        POLAR_LABELS keys padded with zeros (or interpolated) to POLAR_POINT_COUNT points
+        """
+        if result_array_n is not None:
+            cl_max_2d, error = self._get_max_cl(result_array_p["alpha"], result_array_p["CL"])
+            cl_min_2d, _ = self._get_min_cl(result_array_n["alpha"], result_array_n["CL"])
+            alpha = result_array_n["alpha"].tolist()
+            alpha.reverse()
+            alpha.extend(result_array_p["alpha"].tolist())
+            cl = result_array_n["CL"].tolist()
+            cl.reverse()
+            cl.extend(result_array_p["CL"].tolist())
+            cd = result_array_n["CD"].tolist()
+            cd.reverse()
+            cd.extend(result_array_p["CD"].tolist())
+            cdp = result_array_n["CDp"].tolist()
+            cdp.reverse()
+            cdp.extend(result_array_p["CDp"].tolist())
+            cm = result_array_n["CM"].tolist()
+            cm.reverse()
+            cm.extend(result_array_p["CM"].tolist())
+        else:
+            cl_max_2d, error = self._get_max_cl(result_array_p["alpha"], result_array_p["CL"])
+            cl_min_2d, _ = self._get_min_cl(result_array_p["alpha"], result_array_p["CL"])
+            alpha = result_array_p["alpha"].tolist()
+            cl = result_array_p["CL"].tolist()
+            cd = result_array_p["CD"].tolist()
+            cdp = result_array_p["CDp"].tolist()
+            cm = result_array_p["CM"].tolist()
+
+        if POLAR_POINT_COUNT < len(alpha):
+            alpha_interp = np.linspace(alpha[0], alpha[-1], POLAR_POINT_COUNT)
+            cl = np.interp(alpha_interp, alpha, cl)
+            cd = np.interp(alpha_interp, alpha, cd)
+            cdp = np.interp(alpha_interp, alpha, cdp)
+            cm = np.interp(alpha_interp, alpha, cm)
+            alpha = alpha_interp
+            warnings.warn("Defined polar point in fast aerodynamics\\constants.py exceeded!")
+        else:
+            additional_zeros = list(np.zeros(POLAR_POINT_COUNT - len(alpha)))
+            alpha.extend(additional_zeros)
+            alpha = np.array(alpha)
+            cl.extend(additional_zeros)
+            cl = np.array(cl)
+            cd.extend(additional_zeros)
+            cd = np.array(cd)
+            cdp.extend(additional_zeros)
+            cdp = np.array(cdp)
+            cm.extend(additional_zeros)
+            cm = np.array(cm)
+
+        return (
+            cl_max_2d,
+            cl_min_2d,
+            error,
+            {"alpha": alpha, "cl": cl, "cd": cd, "cdp": cdp, "cm": cm},
+        )
+
+    def save_polar(
+        self,
+        polar_database: PolarDatabase,
+        polar_name: str,
+        mach: float,
+        reynolds: float,
+        cl_max_2d: float,
+        cl_min_2d: float,
+        polar: Dict[str, np.ndarray],
+    ):
+        """
+        Appends a run to the saved polars, without the padding zeros.
+        """
+        alpha = polar["alpha"]
+        # noinspection PyBroadException
+        try:
+            polar_database.append(
+                polar_name,
+                mach,
+                reynolds,
+                cl_max_2d,
+                cl_min_2d,
+                {label: self.remove_padding(alpha, polar[label]) for label in POLAR_LABELS},
+            )
+        except:
+            warnings.warn(
+                "Unable to save XFoil results to polar database: writing permission denied "
+                "for {} folder!".format(polar_database.folder_path)
+            )
+
+    @staticmethod
+    def _write_profile_file(airfoil_file: str, file_path: str):
+        """
+        Writes the airfoil coordinates in the XFOIL format.
+        """
+        profile = get_profile(file_name=airfoil_file,).get_sides()
+        # noinspection PyTypeChecker
+        np.savetxt(
+            file_path, profile.to_numpy(), fmt="%.15f", delimiter=" ", header="Wing", comments="",
+        )
+
+    def write_sweep_files(
+        self,
+        directory: str,
+        mach: float,
+        reynolds: float,
+        alpha_start: float,
+        alpha_end: float,
+        step: float,
+    ) -> Tuple[str, str, str, str]:
+        """
+        Writes the profile and XFOIL session files of an alpha sweep in the provided directory.
+
+        :param directory: directory of the sweep, with a path short enough for XFOIL
+        :param mach: Mach number
+        :param reynolds: Reynolds number
+        :param alpha_start: first angle of the sweep in degrees
+        :param alpha_end: last angle of the sweep in degrees
+        :param step: angle step in degrees
+        :return: paths of the XFOIL standard input, output and error files, and of its result file
+        """
+        stdin_file_path = pth.join(directory, _INPUT_FILE_NAME)
+        tmp_profile_file_path = pth.join(directory, _TMP_PROFILE_FILE_NAME)
+        tmp_result_file_path = pth.join(directory, _TMP_RESULT_FILE_NAME)
+        self._write_profile_file(self.options["airfoil_file"], tmp_profile_file_path)
+        self._write_script_file(
+            stdin_file_path,
+            reynolds,
+            mach,
+            tmp_profile_file_path,
+            tmp_result_file_path,
+            alpha_start,
+            alpha_end,
+            step,
+        )
+
+        return (
+            stdin_file_path,
+            pth.join(directory, _STDOUT_FILE_NAME),
+            pth.join(directory, _STDERR_FILE_NAME),
+            tmp_result_file_path,
+        )
+
     def _write_script_file(
         self,
+        script_file_path,
         reynolds,
         mach,
         tmp_profile_file_path,
@@ -495,7 +507,7 @@ class XfoilPolar(ExternalCodeComp):
         parser = InputFileGenerator()
         with path(local_resources, _INPUT_FILE_NAME) as input_template_path:
             parser.set_template_file(str(input_template_path))
-            parser.set_generated_file(self.stdin)
+            parser.set_generated_file(script_file_path)
             parser.mark_anchor("RE")
             parser.transfer_var(float(reynolds), 1, 1)
             parser.mark_anchor("M")
@@ -514,7 +526,7 @@ class XfoilPolar(ExternalCodeComp):
             parser.generate()
 
     @staticmethod
-    def _read_polar(xfoil_result_file_path: str) -> np.ndarray:
+    def read_polar(xfoil_result_file_path: str) -> np.ndarray:
         """
         :param xfoil_result_file_path:
         :return: numpy array with XFoil polar results
@@ -583,7 +595,7 @@ class XfoilPolar(ExternalCodeComp):
         return DEFAULT_2D_CL_MIN, True
 
     @staticmethod
-    def _reshape(x: np.ndarray, y: np.ndarray) -> np.ndarray:
+    def remove_padding(x: np.ndarray, y: np.ndarray) -> np.ndarray:
         # Delete ending 0.0 values
         for idx in range(len(x)):
             if np.sum(x[idx : len(x)] == 0.0) == (len(x) - idx):
@@ -592,7 +604,7 @@ class XfoilPolar(ExternalCodeComp):
         return y
 
     @staticmethod
-    def _create_tmp_directory() -> TemporaryDirectory:
+    def create_tmp_directory() -> TemporaryDirectory:
         # Dev Note: XFOIL fails if length of provided file path exceeds 64 characters.
         #           Changing working directory to the tmp dir would allow to just provide file name,
         #           but it is not really safe (at least, it does mess with the coverage report).
@@ -157,7 +157,7 @@ def test_vlm_comp_high_speed():
         cl_alpha_htp=0.5928,
         cl_alpha_htp_isolated=0.8839,
         coef_k_htp=0.3267,
-        cl_alpha_vector=np.array([5.238, 5.238, 5.301, 5.384, 5.487, 5.609]),
+        cl_alpha_vector=np.array([5.728, 5.728, 5.794, 5.881, 5.989, 6.116]),
         mach_vector=np.array([0.0, 0.15, 0.214, 0.274, 0.331, 0.385]),
     )
 
@@ -31,6 +31,7 @@ from tests.xfoil_exe.get_xfoil import get_xfoil_path
 from fastga.models.aerodynamics.components.cd0 import Cd0
 from fastga.models.aerodynamics.external.xfoil.xfoil_polar import XfoilPolar
 from fastga.models.aerodynamics.external.xfoil import resources
+from fastga.models.aerodynamics.external.xfoil.polar_database import DATABASE_FILE_NAME
 from fastga.models.aerodynamics.external.vlm import ComputeAEROvlm
 from fastga.models.aerodynamics.external.openvsp import ComputeAEROopenvsp
 from fastga.models.aerodynamics.external.openvsp.compute_aero_slipstream import (
@@ -101,7 +102,8 @@ def polar_result_transfer():
 
     tmp_folder = _create_tmp_directory()
 
-    files = glob.iglob(pth.join(resources.__path__[0], "*.csv"))
+    files = list(glob.iglob(pth.join(resources.__path__[0], "*.csv")))
+    files.append(pth.join(resources.__path__[0], DATABASE_FILE_NAME))
 
     for file in files:
         if os.path.isfile(file):
@@ -118,7 +120,14 @@ def polar_result_transfer():
 def polar_result_retrieve(tmp_folder):
     # Retrieve the polar results set aside during the test duration if there are some [need writing permission]
 
-    files = glob.iglob(pth.join(tmp_folder.name, "*.csv"))
+    # noinspection PyBroadException
+    try:
+        os.remove(pth.join(resources.__path__[0], DATABASE_FILE_NAME))
+    except:
+        _LOGGER.info("Cannot remove {} file!".format(DATABASE_FILE_NAME))
+
+    files = list(glob.iglob(pth.join(tmp_folder.name, "*.csv")))
+    files.append(pth.join(tmp_folder.name, DATABASE_FILE_NAME))
 
     for file in files:
         if os.path.isfile(file):
@@ -0,0 +1,96 @@
+"""Test module for the XFOIL polar database"""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import os.path as pth
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ..external.xfoil.polar_database import PolarDatabase, DATABASE_FILE_NAME
+
+
+def _dummy_polar(reynolds):
+
+    alpha = np.arange(-5.0, 15.5, 0.5)
+    return {
+        "alpha": alpha,
+        "cl": 0.1 * alpha + reynolds / 1e7,
+        "cd": np.full_like(alpha, 0.01),
+        "cdp": np.full_like(alpha, 0.005),
+        "cm": np.full_like(alpha, -0.05),
+    }
+
+
+def _write_csv(csv_file, reynolds_list):
+
+    columns = []
+    for reynolds in reynolds_list:
+        polar = _dummy_polar(reynolds)
+        columns.append(
+            [0.1, reynolds, 1.5, -1.5] + [str(polar[label].tolist()) for label in polar.keys()]
+        )
+    pd.DataFrame(
+        np.array(columns, dtype=object).T,
+        index=["mach", "reynolds", "cl_max_2d", "cl_min_2d", "alpha", "cl", "cd", "cdp", "cm"],
+    ).to_csv(csv_file)
+
+
+def test_append_and_load(tmp_path):
+    """Tests that appended runs are loaded back and shared until the database changes!"""
+    database = PolarDatabase(str(tmp_path))
+    assert database.load("naca0012") is None
+    assert not database.has_runs("naca0012")
+
+    database.append("naca0012", 0.1, 1e6, 1.5, -1.5, _dummy_polar(1e6))
+    runs = database.load("naca0012")
+    assert runs["reynolds"] == pytest.approx([1e6])
+    assert runs["cl"][0] == pytest.approx(_dummy_polar(1e6)["cl"])
+    assert database.load("naca0012") is runs
+    assert database.has_runs("naca0012")
+    assert PolarDatabase(str(tmp_path)).load("naca0012_20S") is None
+
+    database.append("naca0012", 0.1, 3e6, 1.6, -1.6, _dummy_polar(3e6))
+    runs = database.load("naca0012")
+    assert runs["reynolds"] == pytest.approx([1e6, 3e6])
+
+
+def test_csv_migration(tmp_path):
+    """Tests that polars saved in the former csv format are imported on first load!"""
+    _write_csv(pth.join(str(tmp_path), "naca0012_20S.csv"), [1e6, 3e6])
+
+    runs = PolarDatabase(str(tmp_path)).load("naca0012_20S")
+
+    assert pth.exists(pth.join(str(tmp_path), DATABASE_FILE_NAME))
+    assert runs["reynolds"] == pytest.approx([1e6, 3e6])
+    assert runs["cm"][1] == pytest.approx(_dummy_polar(3e6)["cm"])
+    assert PolarDatabase(str(tmp_path)).load("naca0012") is None
+
+
+def test_csv_modification(tmp_path):
+    """Tests that the runs of a csv file are imported again when it is modified!"""
+    csv_file = pth.join(str(tmp_path), "naca0012_20S.csv")
+    _write_csv(csv_file, [1e6, 3e6])
+    database = PolarDatabase(str(tmp_path))
+    assert database.load("naca0012_20S")["reynolds"] == pytest.approx([1e6, 3e6])
+    database.append("naca0012_20S", 0.1, 5e6, 1.7, -1.7, _dummy_polar(5e6))
+
+    # Only the runs imported from the csv file are replaced
+    _write_csv(csv_file, [2e6])
+    modification_time = os.stat(csv_file).st_mtime_ns + 10 ** 9
+    os.utime(csv_file, ns=(modification_time, modification_time))
+    runs = database.load("naca0012_20S")
+    assert sorted(runs["reynolds"]) == pytest.approx([2e6, 5e6])
+    assert database.load("naca0012_20S") is runs
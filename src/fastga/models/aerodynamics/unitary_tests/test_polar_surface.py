@@ -0,0 +1,120 @@
+"""Test module for the interpolation of the XFOIL polars"""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import numpy as np
+import pytest
+
+from ..external.xfoil.polar_database import PolarDatabase
+from ..external.xfoil.polar_surface import PolarSurface
+
+
+def _cl(mach, reynolds, alpha):
+
+    return 0.1 * alpha + reynolds / 1e7 + mach
+
+
+def _dummy_polar(mach, reynolds, alpha_end=15.0):
+
+    alpha = np.arange(-5.0, alpha_end + 0.5, 0.5)
+    return {
+        "alpha": alpha,
+        "cl": _cl(mach, reynolds, alpha),
+        "cd": np.full_like(alpha, 0.01),
+        "cdp": np.full_like(alpha, 0.005),
+        "cm": np.full_like(alpha, -0.05),
+    }
+
+
+@pytest.fixture()
+def database(tmp_path):
+    database = PolarDatabase(str(tmp_path))
+    database.append("naca0012", 0.1, 1e6, 1.5, -1.5, _dummy_polar(0.1, 1e6))
+    database.append("naca0012", 0.1, 3e6, 1.7, -1.7, _dummy_polar(0.1, 3e6))
+    database.append("naca0012", 0.2, 1e6, 1.4, -1.4, _dummy_polar(0.2, 1e6))
+    database.append("naca0012", 0.2, 2e6, 1.5, -1.5, _dummy_polar(0.2, 2e6, alpha_end=10.0))
+    database.append("naca0012", 0.2, 3e6, 1.6, -1.6, _dummy_polar(0.2, 3e6))
+
+    return database
+
+
+def test_polar_interpolation(database):
+    """Tests the vectorized bilinear interpolation of the polars in Mach and Reynolds!"""
+    surface = PolarSurface.load(database, "naca0012")
+    assert PolarSurface.load(database, "naca0012") is surface
+    assert PolarSurface.load(database, "naca4412") is None
+
+    mach = np.array([0.1, 0.15, 0.15, 0.2, 0.22, 0.15])
+    reynolds = np.array([3e6, 1.5e6, 2.5e6, 1e6, 1e6, 4e6])
+    polar = surface.polar(mach, reynolds)
+
+    assert list(polar["valid"]) == [True, True, True, True, True, False]
+    assert polar["cl_max_2d"][:5] == pytest.approx([1.7, 1.5, 1.6, 1.4, 1.4])
+    assert np.all(np.isnan(polar["cl"][5]))
+    # The run at 2e6 limits the alpha range of the points in its cells
+    defined = np.isfinite(polar["cl"][:5])
+    assert list(polar["alpha"][defined[1]]) == list(polar["alpha"][defined[2]])
+    assert polar["alpha"][defined[1]][-1] == 10.0
+    assert polar["alpha"][defined[0]][-1] == 15.0
+    for idx in [0, 1, 2, 3]:
+        assert polar["cl"][idx][defined[idx]] == pytest.approx(
+            _cl(mach[idx], reynolds[idx], polar["alpha"][defined[idx]])
+        )
+    # Within the Mach tolerance, the polar at the domain boundary is used
+    assert polar["cl"][4][defined[4]] == pytest.approx(_cl(0.2, 1e6, polar["alpha"][defined[4]]))
+
+    result = surface.search(0.15, 2.5e6)
+    assert result["alpha"] == pytest.approx(polar["alpha"][defined[2]])
+    assert result["cl"] == pytest.approx(_cl(0.15, 2.5e6, result["alpha"]))
+    assert surface.search(0.3, 2e6) is None
+
+
+def test_extrapolation_policies(database):
+    """Tests the extrapolation policies and tolerance outside of the saved domain!"""
+    surface = PolarSurface.load(database, "naca0012")
+
+    assert surface.search(0.1, 3.3e6) is None
+    assert surface.search(0.1, 3.3e6, reynolds_tolerance=0.05) is None
+    result = surface.search(0.1, 3.1e6, reynolds_tolerance=0.05)
+    assert result["cl"] == pytest.approx(_cl(0.1, 3e6, result["alpha"]))
+
+    result = surface.search(0.1, 3.3e6, extrapolation="clip")
+    assert result["cl"] == pytest.approx(_cl(0.1, 3e6, result["alpha"]))
+    assert result["cl_max_2d"] == pytest.approx(1.7)
+
+    result = surface.search(0.1, 3.3e6, extrapolation="linear")
+    assert result["cl"] == pytest.approx(_cl(0.1, 3.3e6, result["alpha"]))
+    assert result["cl_max_2d"] == pytest.approx(1.73)
+    result = surface.search(0.35, 5e5, extrapolation="linear")
+    assert result["cl"] == pytest.approx(_cl(0.35, 5e5, result["alpha"]))
+
+    with pytest.raises(ValueError):
+        surface.search(0.1, 3.3e6, extrapolation="cubic")
+
+
+def test_trilinear_evaluation(database):
+    """Tests the vectorized trilinear interpolation of the coefficients!"""
+    surface = PolarSurface.load(database, "naca0012")
+
+    mach = np.array([0.12, 0.17, 0.2, 0.17, 0.17])
+    reynolds = np.array([1.2e6, 2.7e6, 2e6, 1.5e6, 2.7e6])
+    alpha = np.array([3.25, -4.1, 9.9, 12.0, 20.0])
+    values = surface.evaluate(mach, reynolds, alpha)
+
+    assert list(values["valid"]) == [True, True, True, False, False]
+    assert values["cl"][:3] == pytest.approx(_cl(mach[:3], reynolds[:3], alpha[:3]))
+    assert values["cd"][:3] == pytest.approx(0.01)
+    assert np.all(np.isnan(values["cm"][3:]))
+
+    values = surface.evaluate(0.17, 3e6, 20.0, extrapolation="linear")
+    assert values["cl"] == pytest.approx(_cl(0.17, 3e6, 20.0))
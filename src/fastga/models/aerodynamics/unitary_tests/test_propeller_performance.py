@@ -0,0 +1,193 @@
+"""Test module for propeller performance computation"""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+
+import numpy as np
+import pytest
+
+from ..components import compute_propeller_aero
+from ..components.compute_propeller_aero import _ComputePropellerPerformance, _POLAR_CACHE
+from ..external.xfoil.polar_database import PolarDatabase
+
+PROPELLER_INPUTS = {
+    "data:geometry:propeller:blades_number": np.array([2.0]),
+    "data:geometry:propeller:hub_diameter": np.array([0.4]),
+    "data:geometry:propeller:diameter": np.array([1.93]),
+    "data:geometry:propeller:sweep_vect": np.zeros(7),
+    "data:geometry:propeller:chord_vect": np.array(
+        [0.11163526, 0.15856474, 0.16254664, 0.21189369, 0.18558474, 0.11163526, 0.11163526]
+    ),
+    "data:geometry:propeller:twist_vect": np.array(
+        [59.9549991, 54.62741602, 50.40984436, 46.40324949, 43.92011437, 42.42629402, 42.19068494]
+    ),
+    "data:geometry:propeller:radius_ratio_vect": np.array(
+        [0.165, 0.3, 0.45, 0.655, 0.835, 0.975, 1.0]
+    ),
+}
+
+
+def test_polar_cache():
+    """Tests that section polars are read once and shared!"""
+    _POLAR_CACHE.clear()
+    alpha, cl, cd = _ComputePropellerPerformance.read_polar_result("naca4430")
+    assert len(_POLAR_CACHE) == 1
+    assert np.size(alpha) == np.size(cl) == np.size(cd)
+    assert not cl.flags.writeable
+
+    # Second read uses the cache
+    alpha_2, cl_2, cd_2 = _ComputePropellerPerformance.read_polar_result("naca4430")
+    assert cl_2 is cl
+    assert len(_POLAR_CACHE) == 1
+
+    _ComputePropellerPerformance.read_polar_result("naca4409")
+    assert len(_POLAR_CACHE) == 2
+
+
+def _dummy_polar(cl_0):
+
+    alpha = np.arange(-10.0, 20.5, 0.5)
+    return {
+        "alpha": alpha,
+        "cl": 0.1 * alpha + cl_0,
+        "cd": np.full_like(alpha, 0.01),
+        "cdp": np.full_like(alpha, 0.005),
+        "cm": np.full_like(alpha, -0.05),
+    }
+
+
+def test_polar_from_database(tmp_path, monkeypatch):
+    """Tests that section polars only saved in the polar database are read!"""
+    monkeypatch.setattr(compute_propeller_aero, "POLAR_DATABASE_FOLDER_PATH", str(tmp_path))
+    _POLAR_CACHE.clear()
+    database = PolarDatabase(str(tmp_path))
+    database.append("naca9999_30S", 0.0, 5e5, 1.4, -1.4, _dummy_polar(0.2))
+    database.append("naca9999_30S", 0.0, 2e6, 1.6, -1.6, _dummy_polar(0.5))
+
+    # Polar interpolated at Reynolds 1e6
+    alpha, cl, cd = _ComputePropellerPerformance.read_polar_result("naca9999")
+    assert alpha == pytest.approx(np.arange(-10.0, 20.5, 0.5))
+    assert cl == pytest.approx(0.1 * alpha + 0.3)
+    assert cd == pytest.approx(0.01)
+    assert _ComputePropellerPerformance.read_polar_result("naca9999")[1] is cl
+
+    # A new run is read once the database is modified (modification time is forced forward as it
+    # may not change between two quick appends)
+    database.append("naca9999_30S", 0.0, 1e6, 1.5, -1.5, _dummy_polar(0.4))
+    modification_time = os.stat(database.database_path).st_mtime_ns + 1000000000
+    os.utime(database.database_path, ns=(modification_time, modification_time))
+    _, cl, _ = _ComputePropellerPerformance.read_polar_result("naca9999")
+    assert cl == pytest.approx(0.1 * alpha + 0.4)
+
+    with pytest.raises(ValueError):
+        _ComputePropellerPerformance.read_polar_result("naca4430")
+
+
+def test_vectorized_bem():
+    """Tests that the batched BEM solver matches the element-wise fsolve resolution!"""
+    inputs = PROPELLER_INPUTS
+    component = _ComputePropellerPerformance(
+        sections_profile_position_list=[0.0, 0.25, 0.28, 0.35, 0.40, 0.45],
+        sections_profile_name_list=[
+            "naca4430",
+            "naca4424",
+            "naca4420",
+            "naca4414",
+            "naca4412",
+            "naca4409",
+        ],
+    )
+    theta_75_vect = np.array([20.0, 25.0, 30.0])
+
+    thrust_vect, eta_vect, _ = component.compute_pitch_performance_vect(
+        inputs, theta_75_vect, 40.0, 0.0, 2500.0, 10
+    )
+
+    for theta_75, thrust, eta in zip(theta_75_vect, thrust_vect, eta_vect):
+        thrust_ref, eta_ref, _ = component.compute_pitch_performance(
+            inputs, theta_75, 40.0, 0.0, 2500.0, 10
+        )
+        assert thrust == pytest.approx(thrust_ref, rel=1e-3)
+        assert eta == pytest.approx(eta_ref, rel=1e-3)
+
+
+def test_parallel_tables(monkeypatch):
+    """Tests that tables computed over a pool of processes are the ones computed serially!"""
+    options = dict(
+        sections_profile_position_list=[0.0],
+        sections_profile_name_list=["naca4430"],
+        elements_number=5,
+    )
+    speed_interp = np.array([20.0, 50.0, 80.0])
+    altitudes = [0.0, 2400.0]
+
+    tables = _ComputePropellerPerformance(**options).construct_tables(
+        PROPELLER_INPUTS, speed_interp, altitudes, 2500.0
+    )
+    parallel_tables = _ComputePropellerPerformance(n_workers=3, **options).construct_tables(
+        PROPELLER_INPUTS, speed_interp, altitudes, 2500.0
+    )
+
+    assert len(parallel_tables) == len(altitudes)
+    for table, parallel_table in zip(tables, parallel_tables):
+        for vectors, parallel_vectors in zip(table, parallel_table):
+            assert len(vectors) == len(speed_interp)
+            for vector, parallel_vector in zip(vectors, parallel_vectors):
+                assert np.array_equal(vector, parallel_vector)
+    table = _ComputePropellerPerformance(**options).construct_table(
+        PROPELLER_INPUTS, speed_interp, altitudes[1], 2500.0
+    )
+    for vectors, ref_vectors in zip(table, tables[1]):
+        for vector, ref_vector in zip(vectors, ref_vectors):
+            assert np.array_equal(vector, ref_vector)
+
+    # Should the pool be unavailable, the tables are computed serially
+    def broken_pool(*args, **kwargs):
+        raise OSError("no process available")
+
+    monkeypatch.setattr(compute_propeller_aero, "ProcessPoolExecutor", broken_pool)
+    fallback_tables = _ComputePropellerPerformance(n_workers=3, **options).construct_tables(
+        PROPELLER_INPUTS, speed_interp, altitudes, 2500.0
+    )
+    assert np.array_equal(fallback_tables[1][0][2], tables[1][0][2])
+
+
+def test_adaptive_pitch_sampling():
+    """Tests that adaptive pitch sampling brackets the thrust curve as a dense sampling does!"""
+    options = dict(
+        sections_profile_position_list=[0.0],
+        sections_profile_name_list=["naca4430"],
+        elements_number=5,
+    )
+    component = _ComputePropellerPerformance(adaptive_pitch_sampling=True, **options)
+    thrust_vect, theta_vect, eta_vect = component.compute_speed_table(
+        PROPELLER_INPUTS, 50.0, 0.0, 2500.0
+    )
+    assert np.all(np.diff(thrust_vect) > 0.0)
+    assert np.all(np.diff(theta_vect) > 0.0)
+    assert np.all((np.array(eta_vect) > 0.0) & (np.array(eta_vect) <= 1.0))
+
+    # Reference with a dense uniform sampling of the pitch angles
+    component.compute_extreme_pitch(PROPELLER_INPUTS, 50.0)
+    theta_ref = np.linspace(component.theta_min, component.theta_max, 1000)
+    thrust_ref, eta_ref, _ = component.compute_pitch_performance_vect(
+        PROPELLER_INPUTS, theta_ref, 50.0, 0.0, 2500.0, 5
+    )
+    thrust_ref, theta_ref, eta_ref = component.trim_pitch_table(thrust_ref, theta_ref, eta_ref)
+    assert thrust_vect[-1] == pytest.approx(thrust_ref[-1], rel=1e-2)
+    assert thrust_vect[0] == pytest.approx(thrust_ref[0], abs=5e-3 * thrust_ref[-1])
+    thrust_interp = np.linspace(thrust_ref[0], thrust_ref[-1], 30)[1:-1]
+    assert np.interp(thrust_interp, thrust_vect, eta_vect) == pytest.approx(
+        np.interp(thrust_interp, thrust_ref, eta_ref), abs=5e-3
+    )
@@ -0,0 +1,146 @@
+"""Test module for the VLM/OpenVSP results database"""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os.path as pth
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ..external import results_database
+from ..external.results_database import (
+    AeroResultsDatabase,
+    GEOMETRY_SET_LABELS,
+    RESULTS_LABELS,
+    DATABASE_FILE_NAME,
+)
+from ..external.vlm.vlm import VLMSimpleGeometry
+from ..constants import MACH_NB_PTS
+
+GEOMETRY_SET = np.array([0.0, 1.0, 7.981, 0.0, 1.0, 4.0, 0.12, 0.223])
+
+
+def _dummy_results():
+
+    results = {name: float(idx) for idx, name in enumerate(RESULTS_LABELS)}
+    for name in [
+        "y_vector_wing",
+        "cl_vector_wing",
+        "chord_vector_wing",
+        "y_vector_htp",
+        "cl_vector_htp",
+    ]:
+        results[name] = np.linspace(0.0, 1.0, 50).tolist()
+
+    return results
+
+
+def test_save_and_search(tmp_path):
+    """Tests that saved results are found back whatever the area ratio!"""
+    database = AeroResultsDatabase(str(tmp_path), "vlm")
+    assert database.search(GEOMETRY_SET) is None
+
+    database.save(GEOMETRY_SET, _dummy_results())
+
+    # Area ratio is not part of the key
+    other_area_ratio = GEOMETRY_SET.copy()
+    other_area_ratio[-1] = 0.3
+    saved_results = database.search(other_area_ratio)
+    assert saved_results["area_ratio"] == pytest.approx(0.223, abs=1e-9)
+    assert saved_results["cl_alpha_wing"] == pytest.approx(1.0, abs=1e-9)
+    assert isinstance(saved_results["cl_alpha_wing"], float)
+    assert np.size(saved_results["cl_vector_wing"]) == 50
+
+    # Mach is part of the key and results are stored per code
+    other_mach = GEOMETRY_SET.copy()
+    other_mach[-2] = 0.2
+    assert database.search(other_mach) is None
+    assert AeroResultsDatabase(str(tmp_path), "openvsp").search(GEOMETRY_SET) is None
+
+    # A new save for the same geometry replaces the previous entry
+    results = _dummy_results()
+    results["cl_alpha_wing"] = 5.0
+    database.save(GEOMETRY_SET, results)
+    assert database.search(GEOMETRY_SET)["cl_alpha_wing"] == pytest.approx(5.0, abs=1e-9)
+
+
+def test_csv_migration(tmp_path):
+    """Tests that results saved in the former csv format are imported on first search!"""
+    results = _dummy_results()
+    pd.DataFrame(GEOMETRY_SET, index=GEOMETRY_SET_LABELS).to_csv(
+        pth.join(str(tmp_path), "geometry_0.csv")
+    )
+    pd.DataFrame([str(value) for value in results.values()], index=list(results.keys())).to_csv(
+        pth.join(str(tmp_path), "openvsp_0.csv")
+    )
+
+    saved_results = AeroResultsDatabase(str(tmp_path), "openvsp").search(GEOMETRY_SET)
+
+    assert pth.exists(pth.join(str(tmp_path), DATABASE_FILE_NAME))
+    assert saved_results["coef_k_htp"] == pytest.approx(13.0, abs=1e-9)
+    assert saved_results["y_vector_htp"] == pytest.approx(np.linspace(0.0, 1.0, 50), abs=1e-9)
+    assert AeroResultsDatabase(str(tmp_path), "vlm").search(GEOMETRY_SET) is None
+
+
+def test_csv_migration_without_results(tmp_path, monkeypatch):
+    """Tests that csv files are looked for once even if no result could be migrated!"""
+    pd.DataFrame(GEOMETRY_SET, index=GEOMETRY_SET_LABELS).to_csv(
+        pth.join(str(tmp_path), "geometry_0.csv")
+    )
+    migrations = []
+    migrate_result_folder = results_database.migrate_result_folder
+    monkeypatch.setattr(
+        results_database,
+        "migrate_result_folder",
+        lambda folder_path: migrations.append(folder_path) or migrate_result_folder(folder_path),
+    )
+
+    database = AeroResultsDatabase(str(tmp_path), "vlm")
+    assert database.search(GEOMETRY_SET) is None
+    assert pth.exists(pth.join(str(tmp_path), DATABASE_FILE_NAME))
+    assert database.search(GEOMETRY_SET) is None
+    assert len(migrations) == 1
+
+
+def test_cl_alpha_mach_from_database(tmp_path):
+    """Tests that the VLM lift slope sweep over Mach uses the saved results!"""
+    inputs = {
+        "data:geometry:wing:sweep_25": 0.0,
+        "data:geometry:wing:taper_ratio": 1.0,
+        "data:geometry:wing:aspect_ratio": 7.981,
+        "data:geometry:horizontal_tail:sweep_25": 0.0,
+        "data:geometry:horizontal_tail:taper_ratio": 1.0,
+        "data:geometry:horizontal_tail:aspect_ratio": 4.0,
+        "data:geometry:horizontal_tail:area": 2.0,
+        "data:geometry:wing:area": 10.0,
+    }
+    vlm = VLMSimpleGeometry(result_folder_path=str(tmp_path))
+    database = AeroResultsDatabase(str(tmp_path), "vlm")
+    mach_interp = np.log(np.linspace(np.exp(0.15), np.exp(1.55 * 0.2), MACH_NB_PTS))
+    for mach in np.round(mach_interp * 1e3) / 1e3:
+        # Results saved for a smaller HTP
+        geometry_set = VLMSimpleGeometry._get_geometry_set(inputs, mach)
+        geometry_set[-1] = 0.1
+        database.save(geometry_set, _dummy_results())
+
+    def polar_sweep(*_, **__):
+        raise AssertionError("Saved results must be used")
+
+    vlm.compute_polar_sweep = polar_sweep
+    mach_vector, cl_alpha_vector = vlm.compute_cl_alpha_mach(inputs, None, 5.0, 0.0, 0.2)
+
+    # cl_alpha_wing + cl_alpha_htp, the latter scaled from the saved area ratio
+    assert mach_vector[0] == 0.0
+    assert mach_vector[1:] == pytest.approx(mach_interp, abs=1e-3)
+    assert cl_alpha_vector == pytest.approx(1.0 + 9.0 * 0.2 / 0.1, abs=1e-9)
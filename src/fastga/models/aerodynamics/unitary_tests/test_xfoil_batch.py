@@ -0,0 +1,135 @@
+"""Test module for the XFOIL batch runner"""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import os
+import os.path as pth
+import sys
+import time
+
+import numpy as np
+import pytest
+
+from ..external.xfoil.polar_database import PolarDatabase
+from ..external.xfoil.polar_surface import PolarSurface
+from ..external.xfoil.xfoil_batch import XfoilBatch, XfoilJob
+
+# Stand-in for XFOIL that reads the session script and writes a synthetic polar: linear lift up to
+# 15° then stall. It hangs after writing the polar for Reynolds above 9e6 and writes nothing for
+# Mach above 0.5.
+XFOIL_STAND_IN = """#!{python}
+import sys
+import time
+
+lines = [line.strip() for line in sys.stdin]
+reynolds = float(lines[lines.index("RE") + 1])
+mach = float(lines[lines.index("M") + 1])
+result_file_path = lines[lines.index("PACC") + 1]
+alpha_start, alpha_end, step = [float(x) for x in lines[lines.index("ASEQ") + 1:][:3]]
+if mach > 0.5:
+    sys.exit(1)
+
+with open(result_file_path, "w") as file:
+    file.write("\\n" * 12)
+    alpha = alpha_start
+    while (alpha - alpha_end) * step <= 1e-9:
+        cl = 0.1 * alpha + reynolds / 1e8 if abs(alpha) <= 15.0 else 0.1 * alpha - 0.05 * alpha
+        file.write(
+            "%8.3f %9.4f %10.5f %10.5f %9.4f 1.0 1.0\\n" % (alpha, cl, 0.01 + mach, 0.005, -0.05)
+        )
+        alpha += step
+if reynolds > 9e6:
+    time.sleep(60.0)
+"""
+
+
+@pytest.fixture()
+def xfoil_stand_in(tmp_path):
+    file_path = pth.join(str(tmp_path), "xfoil")
+    with open(file_path, "w") as file:
+        file.write(XFOIL_STAND_IN.format(python=sys.executable))
+    os.chmod(file_path, 0o755)
+
+    return file_path
+
+
+def test_batch(tmp_path, xfoil_stand_in):
+    """Tests that concurrent polar computations are post-processed and saved!"""
+    database_folder_path = pth.join(str(tmp_path), "polars")
+    batch = XfoilBatch(
+        n_workers=3, xfoil_exe_path=xfoil_stand_in, database_folder_path=database_folder_path
+    )
+    jobs = [
+        XfoilJob("naca0012.af", 0.1, 1e6, 0.0, 20.0, True),
+        XfoilJob("naca0012.af", 0.2, 3e6, 0.0, 20.0, True),
+        XfoilJob("naca0012.af", 0.8, 3e6, 0.0, 20.0, True),
+        ("naca4412.af", 0.1, 2e6, 0.0, 25.0),
+    ]
+    results = batch.run(jobs)
+
+    assert results[2] is None
+    assert results[0]["cl_max_2d"] == pytest.approx(1.51)
+    assert results[0]["cl_min_2d"] == pytest.approx(-1.49)
+    assert results[1]["alpha"] == pytest.approx(np.arange(-20.0, 20.5, 0.5))
+    assert results[1]["cd"] == pytest.approx(0.21)
+    assert results[3]["alpha"] == pytest.approx(np.arange(0.0, 25.5, 0.5))
+
+    database = PolarDatabase(database_folder_path)
+    runs = database.load("naca0012_20S")
+    assert runs["reynolds"] == pytest.approx([1e6, 3e6])
+    assert database.load("naca4412")["mach"] == pytest.approx([0.1])
+    result = PolarSurface.load(database, "naca0012_20S").search(0.15, 2e6, extrapolation="clip")
+    linear = np.abs(result["alpha"]) <= 15.0
+    assert result["cl"][linear] == pytest.approx(0.1 * result["alpha"][linear] + 0.02)
+
+    # Saved runs are not computed again
+    assert batch.run(jobs[:2]) == [None, None]
+    assert len(database.load("naca0012_20S")["mach"]) == 2
+
+
+def test_batch_timeout(tmp_path, xfoil_stand_in):
+    """Tests that a hanging XFOIL process is stopped and its results kept!"""
+    database_folder_path = pth.join(str(tmp_path), "polars")
+    batch = XfoilBatch(
+        n_workers=2,
+        timeout=1.0,
+        xfoil_exe_path=xfoil_stand_in,
+        database_folder_path=database_folder_path,
+    )
+
+    start = time.monotonic()
+    results = batch.run([XfoilJob("naca0012.af", 0.1, 9.5e6, 0.0, 20.0, True)])
+
+    assert time.monotonic() - start < 30.0
+    assert results[0]["cl_max_2d"] == pytest.approx(1.595)
+    assert PolarDatabase(database_folder_path).load("naca0012_20S")["reynolds"] == pytest.approx(
+        [9.5e6]
+    )
+
+
+def test_batch_duplicates(tmp_path, xfoil_stand_in):
+    """Tests that identical jobs are computed and saved once!"""
+    database_folder_path = pth.join(str(tmp_path), "polars")
+    batch = XfoilBatch(xfoil_exe_path=xfoil_stand_in, database_folder_path=database_folder_path)
+    jobs = [
+        XfoilJob("naca0012.af", 0.1, 1e6, 0.0, 20.0, True),
+        XfoilJob("naca0012.af", 0.100001, 1e6 + 0.1, 0.0, 20.0, True),
+        XfoilJob("naca0012.af", 0.1, 1e6, 0.0, 20.0, False),
+    ]
+    results = batch.run(jobs)
+
+    assert results[1] is results[0]
+    assert results[2]["alpha"] == pytest.approx(np.arange(0.0, 20.5, 0.5))
+    database = PolarDatabase(database_folder_path)
+    assert database.load("naca0012_20S")["reynolds"] == pytest.approx([1e6])
+    assert database.load("naca0012")["reynolds"] == pytest.approx([1e6])
@@ -33,7 +33,20 @@ class ComputeTotalArea(ExplicitComponent):
 
         self.add_output("data:geometry:aircraft:wet_area", units="m**2")
 
-        self.declare_partials("data:geometry:aircraft:wet_area", "*", method="fd")
+        self.declare_partials(
+            "data:geometry:aircraft:wet_area",
+            [
+                "data:geometry:wing:wet_area",
+                "data:geometry:fuselage:wet_area",
+                "data:geometry:horizontal_tail:wet_area",
+                "data:geometry:vertical_tail:wet_area",
+            ],
+            val=1.0,
+        )
+        self.declare_partials(
+            "data:geometry:aircraft:wet_area",
+            ["data:geometry:propulsion:nacelle:wet_area", "data:geometry:propulsion:count"],
+        )
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
         wet_area_wing = inputs["data:geometry:wing:wet_area"]
@@ -48,3 +61,12 @@ class ComputeTotalArea(ExplicitComponent):
         )
 
         outputs["data:geometry:aircraft:wet_area"] = wet_area_total
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+
+        partials[
+            "data:geometry:aircraft:wet_area", "data:geometry:propulsion:nacelle:wet_area"
+        ] = inputs["data:geometry:propulsion:count"]
+        partials["data:geometry:aircraft:wet_area", "data:geometry:propulsion:count"] = inputs[
+            "data:geometry:propulsion:nacelle:wet_area"
+        ]
@@ -24,6 +24,99 @@ from fastoad.module_management._bundle_loader import BundleLoader
 
 from fastga.models.propulsion.fuel_propulsion.base import FuelEngineSet
 
+CABIN_INPUTS = [
+    "data:geometry:cabin:seats:pilot:length",
+    "data:geometry:cabin:seats:pilot:width",
+    "data:geometry:cabin:seats:passenger:length",
+    "data:geometry:cabin:seats:passenger:width",
+    "data:geometry:cabin:seats:passenger:count_by_row",
+    "data:geometry:cabin:aisle_width",
+    "data:geometry:cabin:luggage:mass_max",
+]
+
+CABIN_OUTPUTS = [
+    "data:geometry:cabin:NPAX",
+    "data:geometry:fuselage:maximum_width",
+    "data:geometry:fuselage:maximum_height",
+    "data:geometry:fuselage:PAX_length",
+    "data:geometry:cabin:length",
+    "data:geometry:fuselage:luggage_length",
+]
+
+
+def _get_engine_inputs(component: ExplicitComponent) -> list:
+    """
+    To be called right after the setup of the engine wrapper.
+
+    :return: names of the inputs added so far by the engine wrapper, except the propulsion layout
+    """
+    # noinspection PyProtectedMember
+    return [
+        input_name
+        for input_name in component._var_rel_names["input"]
+        if input_name != "data:geometry:propulsion:layout"
+    ]
+
+
+def _compute_cabin_partials(inputs) -> dict:
+    """
+    Computes the partials of the cabin dimensions, the number of rows being constant.
+
+    :return: partials of the cabin outputs by output and input names
+    """
+    npax_max = inputs["data:geometry:cabin:seats:passenger:NPAX_max"]
+    w_pilot_seats = inputs["data:geometry:cabin:seats:pilot:width"]
+    w_pass_seats = inputs["data:geometry:cabin:seats:passenger:width"]
+    seats_p_row = inputs["data:geometry:cabin:seats:passenger:count_by_row"]
+    w_aisle = inputs["data:geometry:cabin:aisle_width"]
+    luggage_mass_max = inputs["data:geometry:cabin:luggage:mass_max"]
+
+    n_rows = math.ceil(float(npax_max) / float(seats_p_row))
+    d_l_pax = {
+        "data:geometry:cabin:seats:pilot:length": 1.0,
+        "data:geometry:cabin:seats:passenger:length": n_rows,
+    }
+    if 2 * w_pilot_seats >= seats_p_row * w_pass_seats + w_aisle:
+        w_cabin = 2 * w_pilot_seats
+        d_w_cabin = {"data:geometry:cabin:seats:pilot:width": 2.0}
+    else:
+        w_cabin = seats_p_row * w_pass_seats + w_aisle
+        d_w_cabin = {
+            "data:geometry:cabin:seats:passenger:width": seats_p_row,
+            "data:geometry:cabin:seats:passenger:count_by_row": w_pass_seats,
+            "data:geometry:cabin:aisle_width": 1.0,
+        }
+    luggage_density = 161.0  # In kg/m3
+    d_l_lug_d_mass = 1.0 / (luggage_density * 0.8 * math.pi * (w_cabin / 2) ** 2)
+    l_lug = luggage_mass_max * d_l_lug_d_mass
+    d_l_lug = {
+        input_name: -2.0 * l_lug / w_cabin * d_w_cabin_d_input
+        for input_name, d_w_cabin_d_input in d_w_cabin.items()
+    }
+    d_l_lug["data:geometry:cabin:luggage:mass_max"] = d_l_lug_d_mass
+    d_b_f = {
+        input_name: 1.06 * d_w_cabin_d_input for input_name, d_w_cabin_d_input in d_w_cabin.items()
+    }
+
+    return {
+        "data:geometry:cabin:NPAX": {"data:geometry:cabin:seats:passenger:count_by_row": n_rows},
+        "data:geometry:fuselage:maximum_width": d_b_f,
+        "data:geometry:fuselage:maximum_height": d_b_f,
+        "data:geometry:fuselage:PAX_length": d_l_pax,
+        "data:geometry:cabin:length": {**d_l_pax, **d_l_lug},
+        "data:geometry:fuselage:luggage_length": d_l_lug,
+    }
+
+
+def _set_partials(partials, partials_inputs: dict, d_outputs: dict):
+    """
+    Sets the partials of each output with respect to its declared inputs, 0.0 for the ones missing
+    in d_outputs.
+    """
+    for output_name, input_names in partials_inputs.items():
+        for input_name in input_names:
+            partials[output_name, input_name] = d_outputs.get(output_name, {}).get(input_name, 0.0)
+
 
 class ComputeFuselageGeometryBasic(ExplicitComponent):
     # TODO: Document equations. Cite sources
@@ -39,7 +132,14 @@ class ComputeFuselageGeometryBasic(ExplicitComponent):
 
         self.add_output("data:geometry:cabin:length", units="m")
 
-        self.declare_partials("*", "*", method="fd")
+        self.declare_partials(
+            "data:geometry:cabin:length", "data:geometry:fuselage:length", val=1.0
+        )
+        self.declare_partials(
+            "data:geometry:cabin:length",
+            ["data:geometry:fuselage:front_length", "data:geometry:fuselage:rear_length"],
+            val=-1.0,
+        )
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
 
@@ -62,6 +162,7 @@ class ComputeFuselageGeometryCabinSizingFD(ExplicitComponent):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._engine_wrapper = None
+        self._partials_inputs = None
 
     def initialize(self):
         self.options.declare("propulsion_id", default="", types=str)
@@ -69,6 +170,7 @@ class ComputeFuselageGeometryCabinSizingFD(ExplicitComponent):
     def setup(self):
         self._engine_wrapper = BundleLoader().instantiate_component(self.options["propulsion_id"])
         self._engine_wrapper.setup(self)
+        engine_inputs = _get_engine_inputs(self)
 
         self.add_input("data:geometry:cabin:seats:passenger:NPAX_max", val=np.nan)
         self.add_input("data:geometry:cabin:seats:pilot:length", val=np.nan, units="m")
@@ -104,9 +206,38 @@ class ComputeFuselageGeometryCabinSizingFD(ExplicitComponent):
         self.add_output("data:geometry:cabin:length", units="m")
         self.add_output("data:geometry:fuselage:luggage_length", units="m")
 
+        self._partials_inputs = {output_name: CABIN_INPUTS for output_name in CABIN_OUTPUTS}
+        self._partials_inputs["data:geometry:fuselage:front_length"] = CABIN_INPUTS + [
+            "data:geometry:propeller:depth"
+        ]
+        self._partials_inputs["data:geometry:fuselage:length"] = [
+            "data:geometry:wing:MAC:at25percent:x",
+            "data:geometry:horizontal_tail:MAC:at25percent:x:from_wingMAC25",
+            "data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25",
+            "data:geometry:horizontal_tail:MAC:length",
+            "data:geometry:vertical_tail:MAC:length",
+        ]
+        self._partials_inputs["data:geometry:aircraft:length"] = self._partials_inputs[
+            "data:geometry:fuselage:length"
+        ] + [
+            "data:geometry:horizontal_tail:sweep_25",
+            "data:geometry:horizontal_tail:span",
+            "data:geometry:vertical_tail:sweep_25",
+            "data:geometry:vertical_tail:span",
+        ]
+        self._partials_inputs["data:geometry:fuselage:rear_length"] = (
+            self._partials_inputs["data:geometry:fuselage:front_length"]
+            + self._partials_inputs["data:geometry:fuselage:length"]
+        )
+        for output_name, input_names in self._partials_inputs.items():
+            self.declare_partials(output_name, input_names)
+        # Engine dimensions are computed by the engine model, the number of passengers is only
+        # used through the number of rows
         self.declare_partials(
-            "*", "*", method="fd"
-        )  # FIXME: declare proper partials without int values
+            ["data:geometry:fuselage:front_length", "data:geometry:fuselage:rear_length"],
+            engine_inputs,
+            method="fd",
+        )
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
 
@@ -177,6 +308,76 @@ class ComputeFuselageGeometryCabinSizingFD(ExplicitComponent):
         outputs["data:geometry:cabin:length"] = cabin_length
         outputs["data:geometry:fuselage:luggage_length"] = l_lug
 
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+
+        prop_layout = inputs["data:geometry:propulsion:layout"]
+        ht_lp = inputs["data:geometry:horizontal_tail:MAC:at25percent:x:from_wingMAC25"]
+        vt_lp = inputs["data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25"]
+        ht_length = inputs["data:geometry:horizontal_tail:MAC:length"]
+        vt_length = inputs["data:geometry:vertical_tail:MAC:length"]
+        sweep_25_vt = inputs["data:geometry:vertical_tail:sweep_25"]
+        b_v = inputs["data:geometry:vertical_tail:span"]
+        sweep_25_ht = inputs["data:geometry:horizontal_tail:sweep_25"]
+        b_h = inputs["data:geometry:horizontal_tail:span"]
+
+        d_outputs = _compute_cabin_partials(inputs)
+
+        if prop_layout == 3.0:
+            d_lav = {"data:geometry:propeller:depth": 1.0}
+        else:
+            d_lav = {
+                input_name: 1.40 * d_h_f_d_input
+                for input_name, d_h_f_d_input in d_outputs[
+                    "data:geometry:fuselage:maximum_height"
+                ].items()
+            }
+        if ht_lp + 0.75 * ht_length >= vt_lp + 0.75 * vt_length:
+            d_fus_length = {
+                "data:geometry:horizontal_tail:MAC:at25percent:x:from_wingMAC25": 1.0,
+                "data:geometry:horizontal_tail:MAC:length": 0.75,
+            }
+        else:
+            d_fus_length = {
+                "data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25": 1.0,
+                "data:geometry:vertical_tail:MAC:length": 0.75,
+            }
+        d_fus_length["data:geometry:wing:MAC:at25percent:x"] = 1.0
+        if ht_lp + 0.75 * ht_length + b_h / 2.0 * math.tan(
+            sweep_25_ht * math.pi / 180
+        ) >= vt_lp + 0.75 * vt_length + b_v * math.tan(sweep_25_vt * math.pi / 180):
+            d_plane_length = {
+                "data:geometry:horizontal_tail:MAC:at25percent:x:from_wingMAC25": 1.0,
+                "data:geometry:horizontal_tail:MAC:length": 0.75,
+                "data:geometry:horizontal_tail:sweep_25": b_h
+                / 2.0
+                / math.cos(sweep_25_ht * math.pi / 180) ** 2
+                * math.pi
+                / 180,
+                "data:geometry:horizontal_tail:span": math.tan(sweep_25_ht * math.pi / 180) / 2.0,
+            }
+        else:
+            d_plane_length = {
+                "data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25": 1.0,
+                "data:geometry:vertical_tail:MAC:length": 0.75,
+                "data:geometry:vertical_tail:sweep_25": b_v
+                / math.cos(sweep_25_vt * math.pi / 180) ** 2
+                * math.pi
+                / 180,
+                "data:geometry:vertical_tail:span": math.tan(sweep_25_vt * math.pi / 180),
+            }
+        d_plane_length["data:geometry:wing:MAC:at25percent:x"] = 1.0
+        d_lar = dict(d_fus_length)
+        for d_length in [d_lav, d_outputs["data:geometry:cabin:length"]]:
+            for input_name, d_length_d_input in d_length.items():
+                d_lar[input_name] = d_lar.get(input_name, 0.0) - d_length_d_input
+
+        d_outputs["data:geometry:fuselage:front_length"] = d_lav
+        d_outputs["data:geometry:fuselage:length"] = d_fus_length
+        d_outputs["data:geometry:aircraft:length"] = d_plane_length
+        d_outputs["data:geometry:fuselage:rear_length"] = d_lar
+
+        _set_partials(partials, self._partials_inputs, d_outputs)
+
 
 class ComputeFuselageGeometryCabinSizingFL(ExplicitComponent):
     # TODO: Document equations. Cite sources
@@ -187,6 +388,7 @@ class ComputeFuselageGeometryCabinSizingFL(ExplicitComponent):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self._engine_wrapper = None
+        self._partials_inputs = None
 
     def initialize(self):
         self.options.declare("propulsion_id", default="", types=str)
@@ -194,6 +396,7 @@ class ComputeFuselageGeometryCabinSizingFL(ExplicitComponent):
     def setup(self):
         self._engine_wrapper = BundleLoader().instantiate_component(self.options["propulsion_id"])
         self._engine_wrapper.setup(self)
+        engine_inputs = _get_engine_inputs(self)
 
         self.add_input("data:geometry:cabin:seats:passenger:NPAX_max", val=np.nan)
         self.add_input("data:geometry:cabin:seats:pilot:length", val=np.nan, units="m")
@@ -214,9 +417,20 @@ class ComputeFuselageGeometryCabinSizingFL(ExplicitComponent):
         self.add_output("data:geometry:cabin:length", units="m")
         self.add_output("data:geometry:fuselage:luggage_length", units="m")
 
+        self._partials_inputs = {output_name: CABIN_INPUTS for output_name in CABIN_OUTPUTS}
+        self._partials_inputs["data:geometry:fuselage:front_length"] = CABIN_INPUTS
+        self._partials_inputs["data:geometry:fuselage:length"] = CABIN_INPUTS + [
+            "data:geometry:fuselage:rear_length"
+        ]
+        for output_name, input_names in self._partials_inputs.items():
+            self.declare_partials(output_name, input_names)
+        # Engine dimensions are computed by the engine model, the number of passengers is only
+        # used through the number of rows
         self.declare_partials(
-            "*", "*", method="fd"
-        )  # FIXME: declare proper partials without int values
+            ["data:geometry:fuselage:front_length", "data:geometry:fuselage:length"],
+            engine_inputs,
+            method="fd",
+        )
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
 
@@ -269,3 +483,28 @@ class ComputeFuselageGeometryCabinSizingFL(ExplicitComponent):
         outputs["data:geometry:fuselage:PAX_length"] = l_pax
         outputs["data:geometry:cabin:length"] = cabin_length
         outputs["data:geometry:fuselage:luggage_length"] = l_lug
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+
+        prop_layout = inputs["data:geometry:propulsion:layout"]
+
+        d_outputs = _compute_cabin_partials(inputs)
+
+        if prop_layout == 3.0:
+            d_lav = {}
+        else:
+            d_lav = {
+                input_name: 1.7 * d_h_f_d_input
+                for input_name, d_h_f_d_input in d_outputs[
+                    "data:geometry:fuselage:maximum_height"
+                ].items()
+            }
+        d_fus_length = {"data:geometry:fuselage:rear_length": 1.0}
+        for d_length in [d_lav, d_outputs["data:geometry:cabin:length"]]:
+            for input_name, d_length_d_input in d_length.items():
+                d_fus_length[input_name] = d_fus_length.get(input_name, 0.0) + d_length_d_input
+
+        d_outputs["data:geometry:fuselage:front_length"] = d_lav
+        d_outputs["data:geometry:fuselage:length"] = d_fus_length
+
+        _set_partials(partials, self._partials_inputs, d_outputs)
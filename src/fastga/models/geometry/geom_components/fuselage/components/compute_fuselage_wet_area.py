@@ -45,7 +45,17 @@ class ComputeFuselageWetArea(ExplicitComponent):
 
         self.add_output("data:geometry:fuselage:wet_area", units="m**2")
 
-        self.declare_partials("*", "*", method="fd")
+        if self.options[FUSELAGE_WET_AREA_OPTION] == 1.0:
+            self.declare_partials(
+                "data:geometry:fuselage:wet_area",
+                [
+                    "data:geometry:fuselage:maximum_width",
+                    "data:geometry:fuselage:maximum_height",
+                    "data:geometry:fuselage:length",
+                ],
+            )
+        else:
+            self.declare_partials("data:geometry:fuselage:wet_area", "*")
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
 
@@ -69,3 +79,34 @@ class ComputeFuselageWetArea(ExplicitComponent):
             wet_area_fus = wet_area_nose + wet_area_cyl + wet_area_tail
 
         outputs["data:geometry:fuselage:wet_area"] = wet_area_fus
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+
+        b_f = inputs["data:geometry:fuselage:maximum_width"]
+        h_f = inputs["data:geometry:fuselage:maximum_height"]
+        fus_length = inputs["data:geometry:fuselage:length"]
+        lav = inputs["data:geometry:fuselage:front_length"]
+        lar = inputs["data:geometry:fuselage:rear_length"]
+
+        fus_dia = math.sqrt(b_f * h_f)
+        if self.options[FUSELAGE_WET_AREA_OPTION] == 1.0:
+            d_wet_area_d_dia = math.pi * (fus_length - 3.4 * fus_dia)
+        else:
+            cyl_length = fus_length - lav - lar
+            d_wet_area_d_dia = 2.45 * lav + math.pi * cyl_length + 2.3 * lar
+            partials["data:geometry:fuselage:wet_area", "data:geometry:fuselage:front_length"] = (
+                2.45 - math.pi
+            ) * fus_dia
+            partials["data:geometry:fuselage:wet_area", "data:geometry:fuselage:rear_length"] = (
+                2.3 - math.pi
+            ) * fus_dia
+
+        partials["data:geometry:fuselage:wet_area", "data:geometry:fuselage:maximum_width"] = (
+            d_wet_area_d_dia * h_f / (2.0 * fus_dia)
+        )
+        partials["data:geometry:fuselage:wet_area", "data:geometry:fuselage:maximum_height"] = (
+            d_wet_area_d_dia * b_f / (2.0 * fus_dia)
+        )
+        partials["data:geometry:fuselage:wet_area", "data:geometry:fuselage:length"] = (
+            math.pi * fus_dia
+        )
@@ -34,6 +34,19 @@ class ComputeHTChord(ExplicitComponent):
         self.add_output("data:geometry:horizontal_tail:root:chord", units="m")
         self.add_output("data:geometry:horizontal_tail:tip:chord", units="m")
 
+        self.declare_partials(
+            "data:geometry:horizontal_tail:span",
+            ["data:geometry:horizontal_tail:area", "data:geometry:horizontal_tail:aspect_ratio"],
+        )
+        self.declare_partials(
+            ["data:geometry:horizontal_tail:root:chord", "data:geometry:horizontal_tail:tip:chord"],
+            [
+                "data:geometry:horizontal_tail:area",
+                "data:geometry:horizontal_tail:aspect_ratio",
+                "data:geometry:horizontal_tail:taper_ratio",
+            ],
+        )
+
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
         s_h = inputs["data:geometry:horizontal_tail:area"]
         taper_ht = inputs["data:geometry:horizontal_tail:taper_ratio"]
@@ -48,3 +61,42 @@ class ComputeHTChord(ExplicitComponent):
         outputs["data:geometry:horizontal_tail:span"] = b_h
         outputs["data:geometry:horizontal_tail:root:chord"] = root_chord
         outputs["data:geometry:horizontal_tail:tip:chord"] = tip_chord
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+        s_h = inputs["data:geometry:horizontal_tail:area"]
+        taper_ht = inputs["data:geometry:horizontal_tail:taper_ratio"]
+        aspect_ratio = inputs["data:geometry:horizontal_tail:aspect_ratio"]
+
+        b_h = np.sqrt(max(aspect_ratio * s_h, 0.1))
+        if aspect_ratio * s_h > 0.1:
+            d_b_h_d_area = aspect_ratio / (2.0 * b_h)
+            d_b_h_d_aspect_ratio = s_h / (2.0 * b_h)
+        else:
+            d_b_h_d_area = 0.0
+            d_b_h_d_aspect_ratio = 0.0
+        root_chord = s_h * 2 / (1 + taper_ht) / b_h
+        d_root_chord_d_area = 2 / (1 + taper_ht) / b_h - root_chord / b_h * d_b_h_d_area
+        d_root_chord_d_aspect_ratio = -root_chord / b_h * d_b_h_d_aspect_ratio
+        d_root_chord_d_taper_ratio = -root_chord / (1 + taper_ht)
+
+        span_name = "data:geometry:horizontal_tail:span"
+        root_chord_name = "data:geometry:horizontal_tail:root:chord"
+        tip_chord_name = "data:geometry:horizontal_tail:tip:chord"
+        partials[span_name, "data:geometry:horizontal_tail:area"] = d_b_h_d_area
+        partials[span_name, "data:geometry:horizontal_tail:aspect_ratio"] = d_b_h_d_aspect_ratio
+        partials[root_chord_name, "data:geometry:horizontal_tail:area"] = d_root_chord_d_area
+        partials[
+            root_chord_name, "data:geometry:horizontal_tail:aspect_ratio"
+        ] = d_root_chord_d_aspect_ratio
+        partials[
+            root_chord_name, "data:geometry:horizontal_tail:taper_ratio"
+        ] = d_root_chord_d_taper_ratio
+        partials[tip_chord_name, "data:geometry:horizontal_tail:area"] = (
+            d_root_chord_d_area * taper_ht
+        )
+        partials[tip_chord_name, "data:geometry:horizontal_tail:aspect_ratio"] = (
+            d_root_chord_d_aspect_ratio * taper_ht
+        )
+        partials[tip_chord_name, "data:geometry:horizontal_tail:taper_ratio"] = (
+            d_root_chord_d_taper_ratio * taper_ht + root_chord
+        )
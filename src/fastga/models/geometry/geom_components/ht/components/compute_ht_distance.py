@@ -31,9 +31,7 @@ class ComputeHTDistance(om.ExplicitComponent):
         self.add_output("data:geometry:horizontal_tail:z:from_wingMAC25", units="m")
 
         self.declare_partials(
-            "data:geometry:horizontal_tail:z:from_wingMAC25",
-            ["data:geometry:vertical_tail:span"],
-            method="fd",
+            "data:geometry:horizontal_tail:z:from_wingMAC25", ["data:geometry:vertical_tail:span"],
         )
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
@@ -46,3 +44,15 @@ class ComputeHTDistance(om.ExplicitComponent):
             height_ht = 0 + span
 
         outputs["data:geometry:horizontal_tail:z:from_wingMAC25"] = height_ht
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+        tail_type = inputs["data:geometry:has_T_tail"]
+
+        if tail_type == 0.0:
+            d_height_d_span = 0.0
+        else:
+            d_height_d_span = 1.0
+
+        partials[
+            "data:geometry:horizontal_tail:z:from_wingMAC25", "data:geometry:vertical_tail:span"
+        ] = d_height_d_span
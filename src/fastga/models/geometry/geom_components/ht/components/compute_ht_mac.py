@@ -20,6 +20,67 @@ import numpy as np
 from openmdao.core.explicitcomponent import ExplicitComponent
 
 
+def _compute_mac_partials(inputs, partials) -> dict:
+    """
+    Computes the partials of the mean aerodynamic chord length and position of the horizontal
+    tail.
+
+    :return: partials of the local x position of the mean aerodynamic chord
+    """
+    root_chord = inputs["data:geometry:horizontal_tail:root:chord"]
+    tip_chord = inputs["data:geometry:horizontal_tail:tip:chord"]
+    sweep_25_ht = inputs["data:geometry:horizontal_tail:sweep_25"]
+    b_h = inputs["data:geometry:horizontal_tail:span"]
+
+    tmp = root_chord * 0.25 + b_h / 2 * math.tan(sweep_25_ht / 180.0 * math.pi) - tip_chord * 0.25
+    chords_sum = root_chord + tip_chord
+    squared_chords_sum = root_chord ** 2 + root_chord * tip_chord + tip_chord ** 2
+    x0_ratio = (root_chord + 2 * tip_chord) / (3 * chords_sum)
+
+    d_mac_d_root_chord = (
+        ((2 * root_chord + tip_chord) * chords_sum - squared_chords_sum) / chords_sum ** 2 * 2 / 3
+    )
+    d_mac_d_tip_chord = (
+        ((root_chord + 2 * tip_chord) * chords_sum - squared_chords_sum) / chords_sum ** 2 * 2 / 3
+    )
+    partials[
+        "data:geometry:horizontal_tail:MAC:length", "data:geometry:horizontal_tail:root:chord"
+    ] = d_mac_d_root_chord
+    partials[
+        "data:geometry:horizontal_tail:MAC:length", "data:geometry:horizontal_tail:tip:chord"
+    ] = d_mac_d_tip_chord
+
+    d_x0 = {
+        "data:geometry:horizontal_tail:root:chord": 0.25 * x0_ratio
+        - tmp * tip_chord / (3 * chords_sum ** 2),
+        "data:geometry:horizontal_tail:tip:chord": -0.25 * x0_ratio
+        + tmp * root_chord / (3 * chords_sum ** 2),
+        "data:geometry:horizontal_tail:sweep_25": b_h
+        / 2
+        / math.cos(sweep_25_ht / 180.0 * math.pi) ** 2
+        * math.pi
+        / 180.0
+        * x0_ratio,
+        "data:geometry:horizontal_tail:span": math.tan(sweep_25_ht / 180.0 * math.pi)
+        / 2
+        * x0_ratio,
+    }
+    for input_name, d_x0_d_input in d_x0.items():
+        partials["data:geometry:horizontal_tail:MAC:at25percent:x:local", input_name] = d_x0_d_input
+
+    partials["data:geometry:horizontal_tail:MAC:y", "data:geometry:horizontal_tail:root:chord"] = (
+        -b_h * 0.5 * tip_chord / (3 * chords_sum ** 2)
+    )
+    partials["data:geometry:horizontal_tail:MAC:y", "data:geometry:horizontal_tail:tip:chord"] = (
+        b_h * 0.5 * root_chord / (3 * chords_sum ** 2)
+    )
+    partials["data:geometry:horizontal_tail:MAC:y", "data:geometry:horizontal_tail:span"] = (
+        0.5 * root_chord + tip_chord
+    ) / (3 * chords_sum)
+
+    return d_x0
+
+
 # TODO: it would be good to have a function to compute MAC for HT, VT and WING
 class ComputeHTmacFD(ExplicitComponent):
     # TODO: Document equations. Cite sources
@@ -40,7 +101,6 @@ class ComputeHTmacFD(ExplicitComponent):
         self.declare_partials(
             "data:geometry:horizontal_tail:MAC:length",
             ["data:geometry:horizontal_tail:root:chord", "data:geometry:horizontal_tail:tip:chord"],
-            method="fd",
         )
         self.declare_partials(
             "data:geometry:horizontal_tail:MAC:at25percent:x:local",
@@ -50,7 +110,6 @@ class ComputeHTmacFD(ExplicitComponent):
                 "data:geometry:horizontal_tail:sweep_25",
                 "data:geometry:horizontal_tail:span",
             ],
-            method="fd",
         )
         self.declare_partials(
             "data:geometry:horizontal_tail:MAC:y",
@@ -59,7 +118,6 @@ class ComputeHTmacFD(ExplicitComponent):
                 "data:geometry:horizontal_tail:tip:chord",
                 "data:geometry:horizontal_tail:span",
             ],
-            method="fd",
         )
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
@@ -85,6 +143,10 @@ class ComputeHTmacFD(ExplicitComponent):
         outputs["data:geometry:horizontal_tail:MAC:at25percent:x:local"] = x0_ht
         outputs["data:geometry:horizontal_tail:MAC:y"] = y0_ht
 
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+
+        _compute_mac_partials(inputs, partials)
+
 
 class ComputeHTmacFL(ExplicitComponent):
     # TODO: Document equations. Cite sources
@@ -107,7 +169,31 @@ class ComputeHTmacFL(ExplicitComponent):
         self.add_output("data:geometry:horizontal_tail:MAC:y", units="m")
         self.add_output("data:geometry:horizontal_tail:MAC:at25percent:x:from_wingMAC25", units="m")
 
-        self.declare_partials("*", "*", method="fd")
+        self.declare_partials(
+            [
+                "data:geometry:horizontal_tail:MAC:length",
+                "data:geometry:horizontal_tail:MAC:at25percent:x:local",
+                "data:geometry:horizontal_tail:MAC:y",
+            ],
+            [
+                "data:geometry:horizontal_tail:root:chord",
+                "data:geometry:horizontal_tail:tip:chord",
+                "data:geometry:horizontal_tail:sweep_25",
+                "data:geometry:horizontal_tail:span",
+            ],
+        )
+        self.declare_partials(
+            "data:geometry:horizontal_tail:MAC:at25percent:x:from_wingMAC25",
+            [
+                "data:geometry:horizontal_tail:root:chord",
+                "data:geometry:horizontal_tail:tip:chord",
+                "data:geometry:horizontal_tail:sweep_25",
+                "data:geometry:horizontal_tail:span",
+                "data:geometry:fuselage:length",
+                "data:geometry:vertical_tail:tip:x",
+                "data:geometry:wing:MAC:at25percent:x",
+            ],
+        )
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
         root_chord = inputs["data:geometry:horizontal_tail:root:chord"]
@@ -141,3 +227,39 @@ class ComputeHTmacFL(ExplicitComponent):
         outputs["data:geometry:horizontal_tail:MAC:at25percent:x:local"] = x0_ht
         outputs["data:geometry:horizontal_tail:MAC:y"] = y0_ht
         outputs["data:geometry:horizontal_tail:MAC:at25percent:x:from_wingMAC25"] = ht_lp
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+        tail_type = inputs["data:geometry:has_T_tail"]
+
+        d_x0 = _compute_mac_partials(inputs, partials)
+
+        for input_name, d_x0_d_input in d_x0.items():
+            partials[
+                "data:geometry:horizontal_tail:MAC:at25percent:x:from_wingMAC25", input_name
+            ] = d_x0_d_input
+        if tail_type == 1.0:
+            partials[
+                "data:geometry:horizontal_tail:MAC:at25percent:x:from_wingMAC25",
+                "data:geometry:vertical_tail:tip:x",
+            ] = 1.0
+            partials[
+                "data:geometry:horizontal_tail:MAC:at25percent:x:from_wingMAC25",
+                "data:geometry:fuselage:length",
+            ] = 0.0
+        else:
+            partials[
+                "data:geometry:horizontal_tail:MAC:at25percent:x:from_wingMAC25",
+                "data:geometry:vertical_tail:tip:x",
+            ] = 0.0
+            partials[
+                "data:geometry:horizontal_tail:MAC:at25percent:x:from_wingMAC25",
+                "data:geometry:fuselage:length",
+            ] = 1.0
+            partials[
+                "data:geometry:horizontal_tail:MAC:at25percent:x:from_wingMAC25",
+                "data:geometry:horizontal_tail:root:chord",
+            ] -= 1.0
+        partials[
+            "data:geometry:horizontal_tail:MAC:at25percent:x:from_wingMAC25",
+            "data:geometry:wing:MAC:at25percent:x",
+        ] = -1.0
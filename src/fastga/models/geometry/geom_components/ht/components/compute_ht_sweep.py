@@ -34,7 +34,7 @@ class ComputeHTSweep(ExplicitComponent):
         self.add_output("data:geometry:horizontal_tail:sweep_0", units="deg")
         self.add_output("data:geometry:horizontal_tail:sweep_100", units="deg")
 
-        self.declare_partials("*", "*", method="fd")
+        self.declare_partials("*", "*")
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
         b_h = inputs["data:geometry:horizontal_tail:span"]
@@ -77,3 +77,40 @@ class ComputeHTSweep(ExplicitComponent):
 
         outputs["data:geometry:horizontal_tail:sweep_0"] = sweep_0
         outputs["data:geometry:horizontal_tail:sweep_100"] = sweep_100
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+        b_h = inputs["data:geometry:horizontal_tail:span"]
+        root_chord = inputs["data:geometry:horizontal_tail:root:chord"]
+        tip_chord = inputs["data:geometry:horizontal_tail:tip:chord"]
+        sweep_25 = inputs["data:geometry:horizontal_tail:sweep_25"]
+
+        half_span = b_h / 2.0
+        tan_sweep_25 = math.tan(sweep_25 / 180.0 * math.pi)
+        # Sweeps are 90° - atan(half_span / x), x being the distance along the chord of the tip
+        # point from the root one
+        for sweep_name, x_tip, chord_ratio in [
+            (
+                "data:geometry:horizontal_tail:sweep_0",
+                0.25 * root_chord - 0.25 * tip_chord + half_span * tan_sweep_25,
+                0.25,
+            ),
+            (
+                "data:geometry:horizontal_tail:sweep_100",
+                half_span * tan_sweep_25 - 0.75 * root_chord + 0.75 * tip_chord,
+                -0.75,
+            ),
+        ]:
+            # d(atan(y / x)) = (x * dy - y * dx) / (x ** 2 + y ** 2)
+            factor = -180.0 / math.pi / (x_tip ** 2 + half_span ** 2)
+            partials[sweep_name, "data:geometry:horizontal_tail:root:chord"] = factor * (
+                -half_span * chord_ratio
+            )
+            partials[sweep_name, "data:geometry:horizontal_tail:tip:chord"] = factor * (
+                half_span * chord_ratio
+            )
+            partials[sweep_name, "data:geometry:horizontal_tail:span"] = factor * (
+                x_tip * 0.5 - half_span * 0.5 * tan_sweep_25
+            )
+            partials[sweep_name, "data:geometry:horizontal_tail:sweep_25"] = factor * (
+                -(half_span ** 2) / math.cos(sweep_25 / 180.0 * math.pi) ** 2 * math.pi / 180.0
+            )
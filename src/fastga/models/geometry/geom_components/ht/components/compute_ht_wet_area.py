@@ -30,7 +30,7 @@ class ComputeHTWetArea(ExplicitComponent):
 
         self.add_output("data:geometry:horizontal_tail:wet_area", units="m**2")
 
-        self.declare_partials("*", "data:geometry:horizontal_tail:area", method="fd")
+        self.declare_partials("*", "data:geometry:horizontal_tail:area")
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
 
@@ -44,3 +44,16 @@ class ComputeHTWetArea(ExplicitComponent):
         wet_area = wet_area_coeff * area
 
         outputs["data:geometry:horizontal_tail:wet_area"] = wet_area
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+
+        tail_type = inputs["data:geometry:has_T_tail"]
+
+        if tail_type == 1.0:
+            wet_area_coeff = 1.6 * 1.05  # k_b coef from Gudmunnson p.707
+        else:
+            wet_area_coeff = 2.0 * 1.05  # k_b coef from Gudmunnson p.707
+
+        partials[
+            "data:geometry:horizontal_tail:wet_area", "data:geometry:horizontal_tail:area"
+        ] = wet_area_coeff
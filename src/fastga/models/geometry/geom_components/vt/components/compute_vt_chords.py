@@ -35,10 +35,9 @@ class ComputeVTChords(ExplicitComponent):
         self.declare_partials(
             "data:geometry:vertical_tail:span",
             ["data:geometry:vertical_tail:aspect_ratio", "data:geometry:vertical_tail:area"],
-            method="fd",
         )
-        self.declare_partials("data:geometry:vertical_tail:root:chord", "*", method="fd")
-        self.declare_partials("data:geometry:vertical_tail:tip:chord", "*", method="fd")
+        self.declare_partials("data:geometry:vertical_tail:root:chord", "*")
+        self.declare_partials("data:geometry:vertical_tail:tip:chord", "*")
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
         lambda_vt = float(inputs["data:geometry:vertical_tail:aspect_ratio"])
@@ -52,3 +51,40 @@ class ComputeVTChords(ExplicitComponent):
         outputs["data:geometry:vertical_tail:span"] = b_v
         outputs["data:geometry:vertical_tail:root:chord"] = root_chord
         outputs["data:geometry:vertical_tail:tip:chord"] = tip_chord
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+        lambda_vt = inputs["data:geometry:vertical_tail:aspect_ratio"]
+        s_v = inputs["data:geometry:vertical_tail:area"]
+        taper_v = inputs["data:geometry:vertical_tail:taper_ratio"]
+
+        b_v = np.sqrt(max(lambda_vt * s_v, 0.1))
+        if lambda_vt * s_v > 0.1:
+            d_b_v_d_area = lambda_vt / (2.0 * b_v)
+            d_b_v_d_aspect_ratio = s_v / (2.0 * b_v)
+        else:
+            d_b_v_d_area = 0.0
+            d_b_v_d_aspect_ratio = 0.0
+        root_chord = s_v * 2 / (1 + taper_v) / b_v
+        d_root_chord_d_area = 2 / (1 + taper_v) / b_v - root_chord / b_v * d_b_v_d_area
+        d_root_chord_d_aspect_ratio = -root_chord / b_v * d_b_v_d_aspect_ratio
+        d_root_chord_d_taper_ratio = -root_chord / (1 + taper_v)
+
+        span_name = "data:geometry:vertical_tail:span"
+        root_chord_name = "data:geometry:vertical_tail:root:chord"
+        tip_chord_name = "data:geometry:vertical_tail:tip:chord"
+        partials[span_name, "data:geometry:vertical_tail:area"] = d_b_v_d_area
+        partials[span_name, "data:geometry:vertical_tail:aspect_ratio"] = d_b_v_d_aspect_ratio
+        partials[root_chord_name, "data:geometry:vertical_tail:area"] = d_root_chord_d_area
+        partials[
+            root_chord_name, "data:geometry:vertical_tail:aspect_ratio"
+        ] = d_root_chord_d_aspect_ratio
+        partials[
+            root_chord_name, "data:geometry:vertical_tail:taper_ratio"
+        ] = d_root_chord_d_taper_ratio
+        partials[tip_chord_name, "data:geometry:vertical_tail:area"] = d_root_chord_d_area * taper_v
+        partials[tip_chord_name, "data:geometry:vertical_tail:aspect_ratio"] = (
+            d_root_chord_d_aspect_ratio * taper_v
+        )
+        partials[tip_chord_name, "data:geometry:vertical_tail:taper_ratio"] = (
+            d_root_chord_d_taper_ratio * taper_v + root_chord
+        )
@@ -21,6 +21,63 @@ import numpy as np
 from openmdao.core.explicitcomponent import ExplicitComponent
 
 
+def _compute_mac_partials(inputs, partials) -> dict:
+    """
+    Computes the partials of the mean aerodynamic chord length and position of the vertical tail.
+
+    :return: partials of the local x position of the mean aerodynamic chord
+    """
+    root_chord = inputs["data:geometry:vertical_tail:root:chord"]
+    tip_chord = inputs["data:geometry:vertical_tail:tip:chord"]
+    sweep_25_vt = inputs["data:geometry:vertical_tail:sweep_25"]
+    b_v = inputs["data:geometry:vertical_tail:span"]
+
+    tmp = root_chord * 0.25 + b_v * math.tan(sweep_25_vt / 180.0 * math.pi) - tip_chord * 0.25
+    chords_sum = root_chord + tip_chord
+    squared_chords_sum = root_chord ** 2 + root_chord * tip_chord + tip_chord ** 2
+    x0_ratio = (root_chord + 2 * tip_chord) / (3 * chords_sum)
+
+    d_mac_d_root_chord = (
+        ((2 * root_chord + tip_chord) * chords_sum - squared_chords_sum) / chords_sum ** 2 * 2 / 3
+    )
+    d_mac_d_tip_chord = (
+        ((root_chord + 2 * tip_chord) * chords_sum - squared_chords_sum) / chords_sum ** 2 * 2 / 3
+    )
+    partials[
+        "data:geometry:vertical_tail:MAC:length", "data:geometry:vertical_tail:root:chord"
+    ] = d_mac_d_root_chord
+    partials[
+        "data:geometry:vertical_tail:MAC:length", "data:geometry:vertical_tail:tip:chord"
+    ] = d_mac_d_tip_chord
+
+    d_x0 = {
+        "data:geometry:vertical_tail:root:chord": 0.25 * x0_ratio
+        - tmp * tip_chord / (3 * chords_sum ** 2),
+        "data:geometry:vertical_tail:tip:chord": -0.25 * x0_ratio
+        + tmp * root_chord / (3 * chords_sum ** 2),
+        "data:geometry:vertical_tail:sweep_25": b_v
+        / math.cos(sweep_25_vt / 180.0 * math.pi) ** 2
+        * math.pi
+        / 180.0
+        * x0_ratio,
+        "data:geometry:vertical_tail:span": math.tan(sweep_25_vt / 180.0 * math.pi) * x0_ratio,
+    }
+    for input_name, d_x0_d_input in d_x0.items():
+        partials["data:geometry:vertical_tail:MAC:at25percent:x:local", input_name] = d_x0_d_input
+
+    partials["data:geometry:vertical_tail:MAC:z", "data:geometry:vertical_tail:root:chord"] = (
+        -2 * b_v * 0.5 * tip_chord / (3 * chords_sum ** 2)
+    )
+    partials["data:geometry:vertical_tail:MAC:z", "data:geometry:vertical_tail:tip:chord"] = (
+        2 * b_v * 0.5 * root_chord / (3 * chords_sum ** 2)
+    )
+    partials["data:geometry:vertical_tail:MAC:z", "data:geometry:vertical_tail:span"] = (
+        2 * (0.5 * root_chord + tip_chord) / (3 * chords_sum)
+    )
+
+    return d_x0
+
+
 # TODO: it would be good to have a function to compute MAC for HT, VT and WING
 class ComputeVTmacFD(ExplicitComponent):
     # TODO: Document equations. Cite sources
@@ -46,10 +103,15 @@ class ComputeVTmacFD(ExplicitComponent):
         self.declare_partials(
             "data:geometry:vertical_tail:MAC:length",
             ["data:geometry:vertical_tail:root:chord", "data:geometry:vertical_tail:tip:chord"],
-            method="fd",
         )
         self.declare_partials(
-            "data:geometry:vertical_tail:MAC:at25percent:x:local", "*", method="fd"
+            "data:geometry:vertical_tail:MAC:at25percent:x:local",
+            [
+                "data:geometry:vertical_tail:root:chord",
+                "data:geometry:vertical_tail:tip:chord",
+                "data:geometry:vertical_tail:sweep_25",
+                "data:geometry:vertical_tail:span",
+            ],
         )
         self.declare_partials(
             "data:geometry:vertical_tail:MAC:z",
@@ -58,12 +120,14 @@ class ComputeVTmacFD(ExplicitComponent):
                 "data:geometry:vertical_tail:tip:chord",
                 "data:geometry:vertical_tail:span",
             ],
-            method="fd",
         )
         self.declare_partials(
             "data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25",
-            ["data:geometry:horizontal_tail:MAC:at25percent:x:from_wingMAC25",],
-            method="fd",
+            [
+                "data:geometry:horizontal_tail:MAC:at25percent:x:from_wingMAC25",
+                "data:geometry:vertical_tail:sweep_25",
+                "data:geometry:vertical_tail:span",
+            ],
         )
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
@@ -96,6 +160,39 @@ class ComputeVTmacFD(ExplicitComponent):
         outputs["data:geometry:vertical_tail:MAC:z"] = z0_vt
         outputs["data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25"] = vt_lp
 
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+        sweep_25_vt = inputs["data:geometry:vertical_tail:sweep_25"]
+        b_v = inputs["data:geometry:vertical_tail:span"]
+        has_t_tail = inputs["data:geometry:has_T_tail"]
+
+        _compute_mac_partials(inputs, partials)
+
+        partials[
+            "data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25",
+            "data:geometry:horizontal_tail:MAC:at25percent:x:from_wingMAC25",
+        ] = 1.0
+        if has_t_tail:
+            d_lp_d_sweep = (
+                -0.6 * b_v / math.cos(sweep_25_vt / 180.0 * math.pi) ** 2 * math.pi / 180.0
+            )
+            partials[
+                "data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25",
+                "data:geometry:vertical_tail:span",
+            ] = -0.6 * math.tan(sweep_25_vt / 180.0 * math.pi)
+            partials[
+                "data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25",
+                "data:geometry:vertical_tail:sweep_25",
+            ] = d_lp_d_sweep
+        else:
+            partials[
+                "data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25",
+                "data:geometry:vertical_tail:span",
+            ] = 0.0
+            partials[
+                "data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25",
+                "data:geometry:vertical_tail:sweep_25",
+            ] = 0.0
+
 
 class ComputeVTmacFL(ExplicitComponent):
     # TODO: Document equations. Cite sources
@@ -117,7 +214,43 @@ class ComputeVTmacFL(ExplicitComponent):
         self.add_output("data:geometry:vertical_tail:MAC:z", units="m")
         self.add_output("data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25", units="m")
 
-        self.declare_partials("*", "*", method="fd")
+        self.declare_partials(
+            "data:geometry:vertical_tail:MAC:length",
+            ["data:geometry:vertical_tail:root:chord", "data:geometry:vertical_tail:tip:chord"],
+        )
+        self.declare_partials(
+            "data:geometry:vertical_tail:MAC:z",
+            [
+                "data:geometry:vertical_tail:root:chord",
+                "data:geometry:vertical_tail:tip:chord",
+                "data:geometry:vertical_tail:span",
+            ],
+        )
+        self.declare_partials(
+            [
+                "data:geometry:vertical_tail:MAC:at25percent:x:local",
+                "data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25",
+            ],
+            [
+                "data:geometry:vertical_tail:root:chord",
+                "data:geometry:vertical_tail:tip:chord",
+                "data:geometry:vertical_tail:sweep_25",
+                "data:geometry:vertical_tail:span",
+            ],
+        )
+        self.declare_partials(
+            "data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25",
+            ["data:geometry:fuselage:length", "data:geometry:wing:MAC:at25percent:x"],
+        )
+        self.declare_partials(
+            "data:geometry:vertical_tail:tip:x",
+            [
+                "data:geometry:vertical_tail:root:chord",
+                "data:geometry:vertical_tail:sweep_25",
+                "data:geometry:vertical_tail:span",
+                "data:geometry:fuselage:length",
+            ],
+        )
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
         root_chord = inputs["data:geometry:vertical_tail:root:chord"]
@@ -146,3 +279,38 @@ class ComputeVTmacFL(ExplicitComponent):
         outputs["data:geometry:vertical_tail:tip:x"] = x_tip
         outputs["data:geometry:vertical_tail:MAC:z"] = z0_vt
         outputs["data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25"] = vt_lp
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+        sweep_25_vt = inputs["data:geometry:vertical_tail:sweep_25"]
+        b_v = inputs["data:geometry:vertical_tail:span"]
+
+        d_x0 = _compute_mac_partials(inputs, partials)
+
+        for input_name, d_x0_d_input in d_x0.items():
+            partials[
+                "data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25", input_name
+            ] = d_x0_d_input
+        partials[
+            "data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25",
+            "data:geometry:vertical_tail:root:chord",
+        ] -= 1.0
+        partials[
+            "data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25",
+            "data:geometry:fuselage:length",
+        ] = 1.0
+        partials[
+            "data:geometry:vertical_tail:MAC:at25percent:x:from_wingMAC25",
+            "data:geometry:wing:MAC:at25percent:x",
+        ] = -1.0
+
+        # x_tip = b_v * tan(sweep_25_vt) + fus_length - root_chord
+        partials[
+            "data:geometry:vertical_tail:tip:x", "data:geometry:vertical_tail:span"
+        ] = math.tan(sweep_25_vt / 180.0 * math.pi)
+        partials["data:geometry:vertical_tail:tip:x", "data:geometry:vertical_tail:sweep_25"] = (
+            b_v / math.cos(sweep_25_vt / 180.0 * math.pi) ** 2 * math.pi / 180.0
+        )
+        partials["data:geometry:vertical_tail:tip:x", "data:geometry:fuselage:length"] = 1.0
+        partials[
+            "data:geometry:vertical_tail:tip:x", "data:geometry:vertical_tail:root:chord"
+        ] = -1.0
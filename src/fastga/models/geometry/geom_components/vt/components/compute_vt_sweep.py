@@ -35,8 +35,8 @@ class ComputeVTSweep(ExplicitComponent):
         self.add_output("data:geometry:vertical_tail:sweep_0", units="deg")
         self.add_output("data:geometry:vertical_tail:sweep_100", units="deg")
 
-        self.declare_partials("data:geometry:vertical_tail:sweep_0", "*", method="fd")
-        self.declare_partials("data:geometry:vertical_tail:sweep_100", "*", method="fd")
+        self.declare_partials("data:geometry:vertical_tail:sweep_0", "*")
+        self.declare_partials("data:geometry:vertical_tail:sweep_100", "*")
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
         root_chord = inputs["data:geometry:vertical_tail:root:chord"]
@@ -77,3 +77,39 @@ class ComputeVTSweep(ExplicitComponent):
 
         outputs["data:geometry:vertical_tail:sweep_0"] = sweep_0
         outputs["data:geometry:vertical_tail:sweep_100"] = sweep_100
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+        root_chord = inputs["data:geometry:vertical_tail:root:chord"]
+        tip_chord = inputs["data:geometry:vertical_tail:tip:chord"]
+        sweep_25 = inputs["data:geometry:vertical_tail:sweep_25"]
+        b_v = inputs["data:geometry:vertical_tail:span"]
+
+        tan_sweep_25 = math.tan(sweep_25 / 180.0 * math.pi)
+        # Sweeps are 90° - atan(b_v / x), x being the distance along the chord of the tip point
+        # from the root one
+        for sweep_name, x_tip, chord_ratio in [
+            (
+                "data:geometry:vertical_tail:sweep_0",
+                0.25 * root_chord - 0.25 * tip_chord + b_v * tan_sweep_25,
+                0.25,
+            ),
+            (
+                "data:geometry:vertical_tail:sweep_100",
+                b_v * tan_sweep_25 - 0.75 * root_chord + 0.75 * tip_chord,
+                -0.75,
+            ),
+        ]:
+            # d(atan(y / x)) = (x * dy - y * dx) / (x ** 2 + y ** 2)
+            factor = -180.0 / math.pi / (x_tip ** 2 + b_v ** 2)
+            partials[sweep_name, "data:geometry:vertical_tail:root:chord"] = factor * (
+                -b_v * chord_ratio
+            )
+            partials[sweep_name, "data:geometry:vertical_tail:tip:chord"] = factor * (
+                b_v * chord_ratio
+            )
+            partials[sweep_name, "data:geometry:vertical_tail:span"] = factor * (
+                x_tip - b_v * tan_sweep_25
+            )
+            partials[sweep_name, "data:geometry:vertical_tail:sweep_25"] = factor * (
+                -(b_v ** 2) / math.cos(sweep_25 / 180.0 * math.pi) ** 2 * math.pi / 180.0
+            )
@@ -44,18 +44,58 @@ class ComputeMFW(ExplicitComponent):
                 "data:geometry:wing:root:thickness_ratio",
                 "data:geometry:wing:tip:thickness_ratio",
             ],
-            method="fd",
         )
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
 
-        fuel_type = inputs["data:propulsion:IC_engine:fuel_type"]
         wing_area = inputs["data:geometry:wing:area"]
         root_chord = inputs["data:geometry:wing:root:chord"]
         tip_chord = inputs["data:geometry:wing:tip:chord"]
         root_thickness_ratio = inputs["data:geometry:wing:root:thickness_ratio"]
         tip_thickness_ratio = inputs["data:geometry:wing:tip:thickness_ratio"]
 
+        m_vol_fuel = self._fuel_volume_mass(inputs["data:propulsion:IC_engine:fuel_type"])
+
+        # Tanks are between 1st (30% MAC) and 3rd (60% MAC) longeron: 30% of the wing
+        ave_thickness = (
+            0.7 * (root_chord * root_thickness_ratio + tip_chord * tip_thickness_ratio) / 2.0
+        )
+        mfv = 0.3 * wing_area * ave_thickness
+        mfw = mfv * m_vol_fuel
+
+        outputs["data:weight:aircraft:MFW"] = mfw
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+
+        wing_area = inputs["data:geometry:wing:area"]
+        root_chord = inputs["data:geometry:wing:root:chord"]
+        tip_chord = inputs["data:geometry:wing:tip:chord"]
+        root_thickness_ratio = inputs["data:geometry:wing:root:thickness_ratio"]
+        tip_thickness_ratio = inputs["data:geometry:wing:tip:thickness_ratio"]
+
+        m_vol_fuel = self._fuel_volume_mass(inputs["data:propulsion:IC_engine:fuel_type"])
+
+        # mfw = 0.3 * wing_area * ave_thickness * m_vol_fuel
+        factor = 0.3 * 0.7 / 2.0 * m_vol_fuel
+        partials["data:weight:aircraft:MFW", "data:geometry:wing:area"] = factor * (
+            root_chord * root_thickness_ratio + tip_chord * tip_thickness_ratio
+        )
+        partials["data:weight:aircraft:MFW", "data:geometry:wing:root:chord"] = (
+            factor * wing_area * root_thickness_ratio
+        )
+        partials["data:weight:aircraft:MFW", "data:geometry:wing:tip:chord"] = (
+            factor * wing_area * tip_thickness_ratio
+        )
+        partials["data:weight:aircraft:MFW", "data:geometry:wing:root:thickness_ratio"] = (
+            factor * wing_area * root_chord
+        )
+        partials["data:weight:aircraft:MFW", "data:geometry:wing:tip:thickness_ratio"] = (
+            factor * wing_area * tip_chord
+        )
+
+    @staticmethod
+    def _fuel_volume_mass(fuel_type) -> float:
+
         if fuel_type == 1.0:
             m_vol_fuel = 718.9  # gasoline volume-mass [kg/m**3], cold worst case, Avgas
         elif fuel_type == 2.0:
@@ -66,11 +106,4 @@ class ComputeMFW(ExplicitComponent):
             m_vol_fuel = 718.9
             warnings.warn("Fuel type {} does not exist, replaced by type 1!".format(fuel_type))
 
-        # Tanks are between 1st (30% MAC) and 3rd (60% MAC) longeron: 30% of the wing
-        ave_thickness = (
-            0.7 * (root_chord * root_thickness_ratio + tip_chord * tip_thickness_ratio) / 2.0
-        )
-        mfv = 0.3 * wing_area * ave_thickness
-        mfw = mfv * m_vol_fuel
-
-        outputs["data:weight:aircraft:MFW"] = mfw
+        return m_vol_fuel
@@ -35,7 +35,7 @@ class ComputeWingB50(ExplicitComponent):
 
         self.add_output("data:geometry:wing:b_50", units="m")
 
-        self.declare_partials("data:geometry:wing:b_50", "*", method="fd")
+        self.declare_partials("data:geometry:wing:b_50", "*")
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
         x4_wing = inputs["data:geometry:wing:tip:leading_edge:x:local"]
@@ -49,3 +49,34 @@ class ComputeWingB50(ExplicitComponent):
         b_50 = span / math.cos(sweep_50)
 
         outputs["data:geometry:wing:b_50"] = b_50
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+        x4_wing = inputs["data:geometry:wing:tip:leading_edge:x:local"]
+        y2_wing = inputs["data:geometry:wing:root:y"]
+        y4_wing = inputs["data:geometry:wing:tip:y"]
+        l1_wing = inputs["data:geometry:wing:root:virtual_chord"]
+        l4_wing = inputs["data:geometry:wing:tip:chord"]
+        span = inputs["data:geometry:wing:span"]
+
+        # b_50 = span * sqrt(1 + tan(sweep_50) ** 2)
+        tan_sweep_50 = (x4_wing + l4_wing * 0.5 - 0.5 * l1_wing) / (y4_wing - y2_wing)
+        d_b_50_d_tan = span * tan_sweep_50 / np.sqrt(1.0 + tan_sweep_50 ** 2)
+
+        partials["data:geometry:wing:b_50", "data:geometry:wing:span"] = np.sqrt(
+            1.0 + tan_sweep_50 ** 2
+        )
+        partials[
+            "data:geometry:wing:b_50", "data:geometry:wing:tip:leading_edge:x:local"
+        ] = d_b_50_d_tan / (y4_wing - y2_wing)
+        partials["data:geometry:wing:b_50", "data:geometry:wing:tip:chord"] = (
+            0.5 * d_b_50_d_tan / (y4_wing - y2_wing)
+        )
+        partials["data:geometry:wing:b_50", "data:geometry:wing:root:virtual_chord"] = (
+            -0.5 * d_b_50_d_tan / (y4_wing - y2_wing)
+        )
+        partials["data:geometry:wing:b_50", "data:geometry:wing:root:y"] = (
+            d_b_50_d_tan * tan_sweep_50 / (y4_wing - y2_wing)
+        )
+        partials["data:geometry:wing:b_50", "data:geometry:wing:tip:y"] = (
+            -d_b_50_d_tan * tan_sweep_50 / (y4_wing - y2_wing)
+        )
@@ -33,7 +33,7 @@ class ComputeWingL1AndL4(ExplicitComponent):
         self.add_output("data:geometry:wing:root:virtual_chord", units="m")
         self.add_output("data:geometry:wing:tip:chord", units="m")
 
-        self.declare_partials("*", "*", method="fd")
+        self.declare_partials("*", "*")
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
 
@@ -48,3 +48,40 @@ class ComputeWingL1AndL4(ExplicitComponent):
 
         outputs["data:geometry:wing:root:virtual_chord"] = l1_wing
         outputs["data:geometry:wing:tip:chord"] = l4_wing
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+
+        wing_area = inputs["data:geometry:wing:area"]
+        y2_wing = inputs["data:geometry:wing:root:y"]
+        y4_wing = inputs["data:geometry:wing:tip:y"]
+        taper_ratio = inputs["data:geometry:wing:taper_ratio"]
+
+        denominator = 2.0 * y2_wing + (y4_wing - y2_wing) * (1.0 + taper_ratio)
+        d_chord_d_area = 1.0 / denominator
+        d_chord_d_y2 = -wing_area * (1.0 - taper_ratio) / denominator ** 2
+        d_chord_d_y4 = -wing_area * (1.0 + taper_ratio) / denominator ** 2
+        d_chord_d_taper_ratio = -wing_area * (y4_wing - y2_wing) / denominator ** 2
+
+        partials[
+            "data:geometry:wing:root:virtual_chord", "data:geometry:wing:area"
+        ] = d_chord_d_area
+        partials[
+            "data:geometry:wing:root:virtual_chord", "data:geometry:wing:root:y"
+        ] = d_chord_d_y2
+        partials["data:geometry:wing:root:virtual_chord", "data:geometry:wing:tip:y"] = d_chord_d_y4
+        partials[
+            "data:geometry:wing:root:virtual_chord", "data:geometry:wing:taper_ratio"
+        ] = d_chord_d_taper_ratio
+
+        partials["data:geometry:wing:tip:chord", "data:geometry:wing:area"] = (
+            taper_ratio * d_chord_d_area
+        )
+        partials["data:geometry:wing:tip:chord", "data:geometry:wing:root:y"] = (
+            taper_ratio * d_chord_d_y2
+        )
+        partials["data:geometry:wing:tip:chord", "data:geometry:wing:tip:y"] = (
+            taper_ratio * d_chord_d_y4
+        )
+        partials["data:geometry:wing:tip:chord", "data:geometry:wing:taper_ratio"] = (
+            wing_area / denominator + taper_ratio * d_chord_d_taper_ratio
+        )
@@ -45,7 +45,6 @@ class ComputeWingMAC(ExplicitComponent):
                 "data:geometry:wing:tip:chord",
                 "data:geometry:wing:area",
             ],
-            method="fd",
         )
         self.declare_partials(
             "data:geometry:wing:MAC:leading_edge:x:local",
@@ -57,7 +56,6 @@ class ComputeWingMAC(ExplicitComponent):
                 "data:geometry:wing:tip:chord",
                 "data:geometry:wing:area",
             ],
-            method="fd",
         )
         self.declare_partials(
             "data:geometry:wing:MAC:y",
@@ -68,7 +66,6 @@ class ComputeWingMAC(ExplicitComponent):
                 "data:geometry:wing:tip:chord",
                 "data:geometry:wing:area",
             ],
-            method="fd",
         )
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
@@ -96,3 +93,70 @@ class ComputeWingMAC(ExplicitComponent):
         outputs["data:geometry:wing:MAC:length"] = l0_wing
         outputs["data:geometry:wing:MAC:leading_edge:x:local"] = x0_wing
         outputs["data:geometry:wing:MAC:y"] = y0_wing
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+
+        wing_area = inputs["data:geometry:wing:area"]
+        x4_wing = inputs["data:geometry:wing:tip:leading_edge:x:local"]
+        y2_wing = inputs["data:geometry:wing:root:y"]
+        y4_wing = inputs["data:geometry:wing:tip:y"]
+        l2_wing = inputs["data:geometry:wing:root:chord"]
+        l4_wing = inputs["data:geometry:wing:tip:chord"]
+
+        chords_sum = l2_wing ** 2 + l4_wing ** 2 + l2_wing * l4_wing
+        l0_numerator = 3 * y2_wing * l2_wing ** 2 + (y4_wing - y2_wing) * chords_sum
+        partials["data:geometry:wing:MAC:length", "data:geometry:wing:root:y"] = (
+            3 * l2_wing ** 2 - chords_sum
+        ) * (2 / (3 * wing_area))
+        partials["data:geometry:wing:MAC:length", "data:geometry:wing:tip:y"] = chords_sum * (
+            2 / (3 * wing_area)
+        )
+        partials["data:geometry:wing:MAC:length", "data:geometry:wing:root:chord"] = (
+            6 * y2_wing * l2_wing + (y4_wing - y2_wing) * (2 * l2_wing + l4_wing)
+        ) * (2 / (3 * wing_area))
+        partials["data:geometry:wing:MAC:length", "data:geometry:wing:tip:chord"] = (
+            (y4_wing - y2_wing) * (2 * l4_wing + l2_wing) * (2 / (3 * wing_area))
+        )
+        partials["data:geometry:wing:MAC:length", "data:geometry:wing:area"] = (
+            -l0_numerator * 2 / (3 * wing_area ** 2)
+        )
+
+        x0_wing = (x4_wing * ((y4_wing - y2_wing) * (2 * l4_wing + l2_wing))) / (3 * wing_area)
+        d_x0_d_x4 = (y4_wing - y2_wing) * (2 * l4_wing + l2_wing) / (3 * wing_area)
+        partials[
+            "data:geometry:wing:MAC:leading_edge:x:local",
+            "data:geometry:wing:tip:leading_edge:x:local",
+        ] = d_x0_d_x4
+        partials["data:geometry:wing:MAC:leading_edge:x:local", "data:geometry:wing:root:y"] = (
+            -x4_wing * (2 * l4_wing + l2_wing) / (3 * wing_area)
+        )
+        partials["data:geometry:wing:MAC:leading_edge:x:local", "data:geometry:wing:tip:y"] = (
+            x4_wing * (2 * l4_wing + l2_wing) / (3 * wing_area)
+        )
+        partials["data:geometry:wing:MAC:leading_edge:x:local", "data:geometry:wing:root:chord"] = (
+            x4_wing * (y4_wing - y2_wing) / (3 * wing_area)
+        )
+        partials["data:geometry:wing:MAC:leading_edge:x:local", "data:geometry:wing:tip:chord"] = (
+            2 * x4_wing * (y4_wing - y2_wing) / (3 * wing_area)
+        )
+        partials["data:geometry:wing:MAC:leading_edge:x:local", "data:geometry:wing:area"] = (
+            -x0_wing / wing_area
+        )
+
+        chords_moment = l4_wing * (y2_wing + 2 * y4_wing) + l2_wing * (y4_wing + 2 * y2_wing)
+        y0_numerator = 3 * y2_wing ** 2 * l2_wing + (y4_wing - y2_wing) * chords_moment
+        partials["data:geometry:wing:MAC:y", "data:geometry:wing:root:y"] = (
+            6 * y2_wing * l2_wing - chords_moment + (y4_wing - y2_wing) * (l4_wing + 2 * l2_wing)
+        ) / (3 * wing_area)
+        partials["data:geometry:wing:MAC:y", "data:geometry:wing:tip:y"] = (
+            chords_moment + (y4_wing - y2_wing) * (2 * l4_wing + l2_wing)
+        ) / (3 * wing_area)
+        partials["data:geometry:wing:MAC:y", "data:geometry:wing:root:chord"] = (
+            3 * y2_wing ** 2 + (y4_wing - y2_wing) * (y4_wing + 2 * y2_wing)
+        ) / (3 * wing_area)
+        partials["data:geometry:wing:MAC:y", "data:geometry:wing:tip:chord"] = (
+            (y4_wing - y2_wing) * (y2_wing + 2 * y4_wing) / (3 * wing_area)
+        )
+        partials["data:geometry:wing:MAC:y", "data:geometry:wing:area"] = -y0_numerator / (
+            3 * wing_area ** 2
+        )
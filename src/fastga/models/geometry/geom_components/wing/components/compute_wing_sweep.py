@@ -44,7 +44,6 @@ class ComputeWingSweep(ExplicitComponent):
                 "data:geometry:wing:root:y",
                 "data:geometry:wing:tip:y",
             ],
-            method="fd",
         )
         self.declare_partials(
             "data:geometry:wing:sweep_100_inner",
@@ -55,7 +54,6 @@ class ComputeWingSweep(ExplicitComponent):
                 "data:geometry:wing:root:chord",
                 "data:geometry:wing:tip:chord",
             ],
-            method="fd",
         )
         self.declare_partials(
             "data:geometry:wing:sweep_100_outer",
@@ -66,7 +64,6 @@ class ComputeWingSweep(ExplicitComponent):
                 "data:geometry:wing:root:chord",
                 "data:geometry:wing:tip:chord",
             ],
-            method="fd",
         )
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
@@ -84,3 +81,35 @@ class ComputeWingSweep(ExplicitComponent):
         outputs["data:geometry:wing:sweep_100_outer"] = math.atan(
             (x4_wing + l4_wing - l2_wing) / (y4_wing - y2_wing)
         )
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+
+        x4_wing = inputs["data:geometry:wing:tip:leading_edge:x:local"]
+        y2_wing = inputs["data:geometry:wing:root:y"]
+        y4_wing = inputs["data:geometry:wing:tip:y"]
+        l2_wing = inputs["data:geometry:wing:root:chord"]
+        l4_wing = inputs["data:geometry:wing:tip:chord"]
+
+        # d(atan(x / y)) = (y * dx - x * dy) / (x ** 2 + y ** 2)
+        denominator = x4_wing ** 2 + (y4_wing - y2_wing) ** 2
+        partials["data:geometry:wing:sweep_0", "data:geometry:wing:tip:leading_edge:x:local"] = (
+            y4_wing - y2_wing
+        ) / denominator
+        partials["data:geometry:wing:sweep_0", "data:geometry:wing:root:y"] = x4_wing / denominator
+        partials["data:geometry:wing:sweep_0", "data:geometry:wing:tip:y"] = -x4_wing / denominator
+
+        x_trailing_edge = x4_wing + l4_wing - l2_wing
+        denominator = x_trailing_edge ** 2 + (y4_wing - y2_wing) ** 2
+        for sweep_name in [
+            "data:geometry:wing:sweep_100_inner",
+            "data:geometry:wing:sweep_100_outer",
+        ]:
+            partials[sweep_name, "data:geometry:wing:tip:leading_edge:x:local"] = (
+                y4_wing - y2_wing
+            ) / denominator
+            partials[sweep_name, "data:geometry:wing:tip:chord"] = (y4_wing - y2_wing) / denominator
+            partials[sweep_name, "data:geometry:wing:root:chord"] = (
+                -(y4_wing - y2_wing) / denominator
+            )
+            partials[sweep_name, "data:geometry:wing:root:y"] = x_trailing_edge / denominator
+            partials[sweep_name, "data:geometry:wing:tip:y"] = -x_trailing_edge / denominator
@@ -32,7 +32,19 @@ class ComputeWingToc(om.ExplicitComponent):
         self.add_output("data:geometry:wing:kink:thickness_ratio")
         self.add_output("data:geometry:wing:tip:thickness_ratio")
 
-        self.declare_partials("*", "*", method="fd")
+        self.declare_partials(
+            "data:geometry:wing:root:thickness_ratio",
+            "data:geometry:wing:thickness_ratio",
+            val=1.24,
+        )
+        self.declare_partials(
+            "data:geometry:wing:kink:thickness_ratio",
+            "data:geometry:wing:thickness_ratio",
+            val=0.94,
+        )
+        self.declare_partials(
+            "data:geometry:wing:tip:thickness_ratio", "data:geometry:wing:thickness_ratio", val=0.86
+        )
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
 
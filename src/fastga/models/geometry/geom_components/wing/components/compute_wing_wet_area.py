@@ -32,7 +32,7 @@ class ComputeWingWetArea(ExplicitComponent):
         self.add_output("data:geometry:wing:outer_area", units="m**2")
         self.add_output("data:geometry:wing:wet_area", units="m**2")
 
-        self.declare_partials("*", "*", method="fd")
+        self.declare_partials("*", "*")
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
 
@@ -46,3 +46,21 @@ class ComputeWingWetArea(ExplicitComponent):
 
         outputs["data:geometry:wing:outer_area"] = s_pf
         outputs["data:geometry:wing:wet_area"] = wet_area_wing
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+
+        l1_wing = inputs["data:geometry:wing:root:virtual_chord"]
+        width_max = inputs["data:geometry:fuselage:maximum_width"]
+
+        partials["data:geometry:wing:outer_area", "data:geometry:wing:area"] = 1.0
+        partials[
+            "data:geometry:wing:outer_area", "data:geometry:wing:root:virtual_chord"
+        ] = -width_max
+        partials["data:geometry:wing:outer_area", "data:geometry:fuselage:maximum_width"] = -l1_wing
+        partials["data:geometry:wing:wet_area", "data:geometry:wing:area"] = 2 * 1.07
+        partials["data:geometry:wing:wet_area", "data:geometry:wing:root:virtual_chord"] = (
+            -2 * width_max * 1.07
+        )
+        partials["data:geometry:wing:wet_area", "data:geometry:fuselage:maximum_width"] = (
+            -2 * l1_wing * 1.07
+        )
@@ -46,7 +46,6 @@ class ComputeWingX(ExplicitComponent):
                 "data:geometry:wing:kink:chord",
                 "data:geometry:wing:sweep_25",
             ],
-            method="fd",
         )
         self.declare_partials(
             "data:geometry:wing:tip:leading_edge:x:local",
@@ -57,7 +56,6 @@ class ComputeWingX(ExplicitComponent):
                 "data:geometry:wing:tip:chord",
                 "data:geometry:wing:sweep_25",
             ],
-            method="fd",
         )
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
@@ -78,3 +76,31 @@ class ComputeWingX(ExplicitComponent):
 
         outputs["data:geometry:wing:kink:leading_edge:x:local"] = x3_wing
         outputs["data:geometry:wing:tip:leading_edge:x:local"] = x4_wing
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+        y2_wing = inputs["data:geometry:wing:root:y"]
+        y3_wing = inputs["data:geometry:wing:kink:y"]
+        y4_wing = inputs["data:geometry:wing:tip:y"]
+        sweep_25 = inputs["data:geometry:wing:sweep_25"]
+
+        for x_name, y_name, chord_name, y_wing in [
+            (
+                "data:geometry:wing:kink:leading_edge:x:local",
+                "data:geometry:wing:kink:y",
+                "data:geometry:wing:kink:chord",
+                y3_wing,
+            ),
+            (
+                "data:geometry:wing:tip:leading_edge:x:local",
+                "data:geometry:wing:tip:y",
+                "data:geometry:wing:tip:chord",
+                y4_wing,
+            ),
+        ]:
+            partials[x_name, "data:geometry:wing:root:virtual_chord"] = 1.0 / 4.0
+            partials[x_name, "data:geometry:wing:root:y"] = -math.tan(sweep_25)
+            partials[x_name, y_name] = math.tan(sweep_25)
+            partials[x_name, chord_name] = -1.0 / 4.0
+            partials[x_name, "data:geometry:wing:sweep_25"] = (y_wing - y2_wing) / math.cos(
+                sweep_25
+            ) ** 2
@@ -40,10 +40,9 @@ class ComputeWingY(ExplicitComponent):
         self.declare_partials(
             "data:geometry:wing:span",
             ["data:geometry:wing:area", "data:geometry:wing:aspect_ratio"],
-            method="fd",
         )
         self.declare_partials(
-            "data:geometry:wing:root:y", "data:geometry:fuselage:maximum_width", method="fd"
+            "data:geometry:wing:root:y", "data:geometry:fuselage:maximum_width", val=0.5
         )
         self.declare_partials(
             "data:geometry:wing:kink:y",
@@ -52,12 +51,10 @@ class ComputeWingY(ExplicitComponent):
                 "data:geometry:wing:aspect_ratio",
                 "data:geometry:wing:kink:span_ratio",
             ],
-            method="fd",
         )
         self.declare_partials(
             "data:geometry:wing:tip:y",
-            ["data:geometry:wing:area", "data:geometry:wing:aspect_ratio",],
-            method="fd",
+            ["data:geometry:wing:area", "data:geometry:wing:aspect_ratio"],
         )
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
@@ -78,3 +75,27 @@ class ComputeWingY(ExplicitComponent):
         outputs["data:geometry:wing:root:y"] = y2_wing
         outputs["data:geometry:wing:kink:y"] = y3_wing
         outputs["data:geometry:wing:tip:y"] = y4_wing
+
+    def compute_partials(self, inputs, partials, discrete_inputs=None):
+
+        lambda_wing = inputs["data:geometry:wing:aspect_ratio"]
+        wing_area = inputs["data:geometry:wing:area"]
+        wing_break = inputs["data:geometry:wing:kink:span_ratio"]
+
+        span = math.sqrt(lambda_wing * wing_area)
+        d_span_d_lambda = wing_area / (2.0 * span)
+        d_span_d_area = lambda_wing / (2.0 * span)
+
+        partials["data:geometry:wing:span", "data:geometry:wing:aspect_ratio"] = d_span_d_lambda
+        partials["data:geometry:wing:span", "data:geometry:wing:area"] = d_span_d_area
+        partials["data:geometry:wing:tip:y", "data:geometry:wing:aspect_ratio"] = (
+            d_span_d_lambda / 2.0
+        )
+        partials["data:geometry:wing:tip:y", "data:geometry:wing:area"] = d_span_d_area / 2.0
+        partials["data:geometry:wing:kink:y", "data:geometry:wing:aspect_ratio"] = (
+            d_span_d_lambda / 2.0 * wing_break
+        )
+        partials["data:geometry:wing:kink:y", "data:geometry:wing:area"] = (
+            d_span_d_area / 2.0 * wing_break
+        )
+        partials["data:geometry:wing:kink:y", "data:geometry:wing:kink:span_ratio"] = span / 2.0
@@ -53,7 +53,12 @@ from ..geom_components.nacelle.compute_nacelle import ComputeNacelleGeometry
 from ..geom_components import ComputeTotalArea
 from ..geometry import GeometryFixedFuselage, GeometryFixedTailDistance
 
-from tests.testing_utilities import run_system, get_indep_var_comp, list_inputs
+from tests.testing_utilities import (
+    run_system,
+    get_indep_var_comp,
+    list_inputs,
+    check_partials,
+)
 
 from .dummy_engines import ENGINE_WRAPPER_SR22 as ENGINE_WRAPPER
 
@@ -515,3 +520,48 @@ def test_complete_geometry_FL():
     problem = run_system(GeometryFixedFuselage(propulsion_id=ENGINE_WRAPPER), ivc)
     total_surface = problem.get_val("data:geometry:aircraft:wet_area", units="m**2")
     assert total_surface == pytest.approx(62.965, abs=1e-3)
+
+
+def test_geometry_partials():
+    """ Tests analytic partials of the geometry components against finite differences """
+
+    for component in [
+        ComputeVTChords(),
+        ComputeVTmacFD(),
+        ComputeVTSweep(),
+        ComputeVTWetArea(),
+        ComputeHTDistance(),
+        ComputeHTChord(),
+        ComputeHTmacFD(),
+        ComputeHTSweep(),
+        ComputeHTWetArea(),
+        ComputeFuselageGeometryBasic(),
+        ComputeFuselageWetArea(),
+        ComputeWingToc(),
+        ComputeWingY(),
+        ComputeWingL1AndL4(),
+        ComputeWingL2AndL3(),
+        ComputeWingX(),
+        ComputeWingB50(),
+        ComputeWingMAC(),
+        ComputeWingSweep(),
+        ComputeWingWetArea(),
+        ComputeMFW(),
+        ComputeTotalArea(),
+        ComputeFuselageGeometryCabinSizingFD(propulsion_id=ENGINE_WRAPPER),
+        ComputeFuselageGeometryCabinSizingFL(propulsion_id=ENGINE_WRAPPER),
+    ]:
+        # Research independent input value in .xml file
+        ivc = get_indep_var_comp(list_inputs(component), __file__, XML_FILE)
+
+        # Run problem and check analytic partials, number of passengers and propulsion layout
+        # being integer values
+        problem = run_system(component, ivc)
+        check_partials(
+            problem,
+            excluded_inputs=[
+                "data:geometry:cabin:seats:passenger:NPAX_max",
+                "data:geometry:cabin:seats:passenger:count_by_row",
+                "data:geometry:propulsion:layout",
+            ],
+        )
@@ -173,14 +173,12 @@ class AerostructuralLoad(ComputeVN):
         cruise_v_tas = inputs["data:TLAR:v_cruise"]
 
         factor_of_safety = 1.5
-        shear_max_conditions = []
-        rbm_max_conditions = []
+        sizing_conditions = []
+        lift_sections = []
+        weight_arrays = []
 
         atm = Atmosphere(cruise_alt)
 
-        shear_max = 0.0
-        rbm_max = 0.0
-
         # STEP 2/XX - DELETE THE ADDITIONAL ZEROS WE HAD TO PUT TO FIT OPENMDAO AND ADD A POINT AT THE ROOT (Y=0) AND AT
         # THE VERY TIP (Y=SPAN/2) TO GET THE WHOLE SPAN OF THE WING IN THE INTERPOLATION WE WILL DO LATER ##############
 
@@ -216,11 +214,6 @@ class AerostructuralLoad(ComputeVN):
             y_vector_slip_orig, y_vector_orig, y_vector, cl_vector_slip, chord_vector
         )
 
-        lift_shear_diagram = np.full(len(y_vector), 0.0)
-        lift_bending_diagram = np.full(len(y_vector), 0.0)
-        weight_shear_diagram = np.full(len(y_vector), 0.0)
-        weight_bending_diagram = np.full(len(y_vector), 0.0)
-
         # STEP 4/XX - WE INITIALIZE THE LOOPS ON THE DIFFERENT SIZING CASE THAT WE DEFINED AND THEN LAUNCH THEM ########
         ################################################################################################################
 
@@ -267,38 +260,36 @@ class AerostructuralLoad(ComputeVN):
                 )
                 weight_array = weight_array_orig * factor_of_safety * load_factor
 
-                # STEP 4.3/XX - WE COMPUTE THE SHEAR AND WEIGHT DIAGRAM WITH THE APPROPRIATE FUNCTION, IDENTIFY THE
-                # MOST EXTREME CONSTRAINTS AND SAVE THE CONDITIONS IN WHICH THEY ARE EXPERIENCED FOR LATER USE IN
-                # THE POST-PROCESSING PHASE ########################################################################
+                sizing_conditions.append([mass, load_factor])
+                lift_sections.append(lift_section)
+                weight_arrays.append(weight_array)
+
+        # STEP 4.3/XX - WE COMPUTE THE SHEAR AND WEIGHT DIAGRAMS OF ALL THE SIZING CASES AT ONCE, IDENTIFY THE MOST
+        # EXTREME CONSTRAINTS AND SAVE THE CONDITIONS IN WHICH THEY ARE EXPERIENCED FOR LATER USE IN THE
+        # POST-PROCESSING PHASE ########################################################################################
+
+        (
+            lift_shear_diagrams,
+            weight_shear_diagrams,
+            lift_bending_diagrams,
+            weight_bending_diagrams,
+        ) = AerostructuralLoad.compute_diagrams(
+            y_vector, np.array(lift_sections), np.array(weight_arrays)
+        )
 
-                tot_shear_diagram = AerostructuralLoad.compute_shear_diagram(
-                    y_vector, weight_array + lift_section
-                )
-                tot_bending_moment_diagram = AerostructuralLoad.compute_bending_moment_diagram(
-                    y_vector, weight_array + lift_section
-                )
-                root_shear_force = tot_shear_diagram[0]
-                root_bending_moment = tot_bending_moment_diagram[0]
-
-                if abs(root_shear_force) > shear_max:
-                    shear_max_conditions = [mass, load_factor]
-                    lift_shear_diagram = AerostructuralLoad.compute_shear_diagram(
-                        y_vector, lift_section
-                    )
-                    weight_shear_diagram = AerostructuralLoad.compute_shear_diagram(
-                        y_vector, weight_array
-                    )
-                    shear_max = abs(root_shear_force)
-
-                if abs(root_bending_moment) > rbm_max:
-                    rbm_max_conditions = [mass, load_factor]
-                    lift_bending_diagram = AerostructuralLoad.compute_bending_moment_diagram(
-                        y_vector, lift_section
-                    )
-                    weight_bending_diagram = AerostructuralLoad.compute_bending_moment_diagram(
-                        y_vector, weight_array
-                    )
-                    rbm_max = abs(root_bending_moment)
+        # The first case of maximum root value is kept, as when the cases were compared one by one
+        shear_max_index = int(
+            np.argmax(np.abs(lift_shear_diagrams[:, 0] + weight_shear_diagrams[:, 0]))
+        )
+        rbm_max_index = int(
+            np.argmax(np.abs(lift_bending_diagrams[:, 0] + weight_bending_diagrams[:, 0]))
+        )
+        shear_max_conditions = sizing_conditions[shear_max_index]
+        lift_shear_diagram = lift_shear_diagrams[shear_max_index]
+        weight_shear_diagram = weight_shear_diagrams[shear_max_index]
+        rbm_max_conditions = sizing_conditions[rbm_max_index]
+        lift_bending_diagram = lift_bending_diagrams[rbm_max_index]
+        weight_bending_diagram = weight_bending_diagrams[rbm_max_index]
 
         # STEP 5/XX - WE ADD ZEROS TO THE RESULTS ARRAYS TO MAKE THEM FIT THE OPENMDAO FORMAT ##########################
         ################################################################################################################
@@ -329,40 +320,73 @@ class AerostructuralLoad(ComputeVN):
         Function that computes the shear diagram of a given array with linear forces in them
 
         @param y_vector: an array containing the position of the different station at which the linear forces are given
-        @param force_array: an array containing the linear forces
+        @param force_array: an array containing the linear forces, or several arrays of linear forces stacked along
+        the first axis
         @return: shear_force_diagram an array representing the shear diagram of the linear forces given in input
         """
 
-        # We first create the array to fill
-        shear_force_diagram = np.zeros(len(y_vector))
+        force_array = np.asarray(force_array, dtype=float)
 
-        # Each station of the shear diagram is equal to the integral of the forces on all subsequent station
-        for i in range(len(y_vector)):
-            shear_force_diagram[i] = trapz(force_array[i:], y_vector[i:])
+        # Each station of the shear diagram is equal to the integral of the forces on all subsequent station, which is
+        # the reverse cumulative sum of the trapezoids between two consecutive stations
+        trapezoids = 0.5 * (force_array[..., 1:] + force_array[..., :-1]) * np.diff(y_vector)
+        shear_force_diagram = np.zeros_like(force_array)
+        shear_force_diagram[..., :-1] = np.cumsum(trapezoids[..., ::-1], axis=-1)[..., ::-1]
 
         return shear_force_diagram
 
     @staticmethod
-    def compute_bending_moment_diagram(y_vector, force_array):
+    def compute_bending_moment_diagram(y_vector, force_array, shear_force_diagram=None):
         """
         Function that computes the root bending diagram of a given array with linear forces in them
 
         @param y_vector: an array containing the position of the different station at which the linear forces are given
-        @param force_array: an array containing the linear forces
+        @param force_array: an array containing the linear forces, or several arrays of linear forces stacked along
+        the first axis
+        @param shear_force_diagram: the shear diagram of the linear forces, computed if not given
         @return: bending_moment_diagram an array representing the root bending diagram of the linear forces given in
         input
         """
 
-        # We first create the array to fill
-        bending_moment_diagram = np.zeros(len(y_vector))
+        force_array = np.asarray(force_array, dtype=float)
+        if shear_force_diagram is None:
+            shear_force_diagram = AerostructuralLoad.compute_shear_diagram(y_vector, force_array)
 
-        # Each station of the shear diagram is equal to the root bending moment created by all subsequent stations
-        for i in range(len(y_vector)):
-            lever_arm = y_vector - y_vector[i]
-            bending_moment_diagram[i] = trapz(force_array[i:] * lever_arm[i:], y_vector[i:])
+        # Each station of the shear diagram is equal to the root bending moment created by all subsequent stations.
+        # Moving the lever arm origin from one station to the previous one adds the shear at the station times the
+        # distance between them, and the trapezoid between them adds its own moment
+        step = np.diff(y_vector)
+        moments = (shear_force_diagram[..., 1:] + 0.5 * force_array[..., 1:] * step) * step
+        bending_moment_diagram = np.zeros_like(force_array)
+        bending_moment_diagram[..., :-1] = np.cumsum(moments[..., ::-1], axis=-1)[..., ::-1]
 
         return bending_moment_diagram
 
+    @staticmethod
+    def compute_diagrams(y_vector, lift_array, weight_array):
+        """
+        Function that computes the shear and root bending diagrams of the lift and weight linear forces in one pass
+
+        @param y_vector: an array containing the position of the different station at which the linear forces are given
+        @param lift_array: an array containing the linear lift forces, or several arrays stacked along the first axis
+        @param weight_array: an array containing the linear weight forces, with the same shape as lift_array
+        @return: lift_shear_diagram, weight_shear_diagram, lift_bending_diagram and weight_bending_diagram, with the
+        shape of the arrays given in input
+        """
+
+        force_array = np.stack([lift_array, weight_array])
+        shear_force_diagram = AerostructuralLoad.compute_shear_diagram(y_vector, force_array)
+        bending_moment_diagram = AerostructuralLoad.compute_bending_moment_diagram(
+            y_vector, force_array, shear_force_diagram
+        )
+
+        return (
+            shear_force_diagram[0],
+            shear_force_diagram[1],
+            bending_moment_diagram[0],
+            bending_moment_diagram[1],
+        )
+
     @staticmethod
     def compute_cl_s(y_vector_cl_orig, y_vector_chord_orig, y_vector, cl_list, chord_list):
         """
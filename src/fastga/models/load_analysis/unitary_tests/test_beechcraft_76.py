@@ -1262,3 +1262,42 @@ def test_compute_lift_distribution():
         ]
     )
     assert np.max(np.abs(lift_array - lift_result)) <= 1e-1
+
+
+def test_compute_diagrams():
+    """ Tests the shear and root bending diagrams against their integral definition """
+
+    y_vector = np.array([0.0, 0.3, 1.1, 1.5, 2.7, 3.4, 5.0])
+    lift_array = np.array([[4000.0, 3900.0, 3700.0, 3500.0, 2900.0, 2300.0, 0.0]])
+    lift_array = np.concatenate([lift_array, 2.0 * lift_array])
+    weight_array = np.array([[-900.0, -850.0, -2000.0, -700.0, -500.0, -300.0, -100.0]])
+    weight_array = np.concatenate([weight_array, 1.5 * weight_array])
+
+    (
+        lift_shear_diagram,
+        weight_shear_diagram,
+        lift_bending_diagram,
+        weight_bending_diagram,
+    ) = AerostructuralLoad.compute_diagrams(y_vector, lift_array, weight_array)
+
+    for force_array, shear_diagram, bending_diagram in [
+        (lift_array, lift_shear_diagram, lift_bending_diagram),
+        (weight_array, weight_shear_diagram, weight_bending_diagram),
+    ]:
+        assert np.shape(shear_diagram) == np.shape(force_array)
+        for case in range(len(force_array)):
+            for i in range(len(y_vector)):
+                assert shear_diagram[case, i] == pytest.approx(
+                    np.trapz(force_array[case, i:], y_vector[i:]), rel=1e-12
+                )
+                assert bending_diagram[case, i] == pytest.approx(
+                    np.trapz(force_array[case, i:] * (y_vector[i:] - y_vector[i]), y_vector[i:]),
+                    rel=1e-12,
+                )
+
+    assert AerostructuralLoad.compute_shear_diagram(y_vector, lift_array[0]) == pytest.approx(
+        lift_shear_diagram[0], rel=1e-12
+    )
+    assert AerostructuralLoad.compute_bending_moment_diagram(
+        y_vector, weight_array[1]
+    ) == pytest.approx(weight_bending_diagram[1], rel=1e-12)
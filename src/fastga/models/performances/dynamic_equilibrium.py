@@ -15,8 +15,10 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import os
+import os.path as pth
 import math
 import logging
+from collections import namedtuple, OrderedDict
 import numpy as np
 import openmdao.api as om
 from scipy.constants import g
@@ -44,16 +46,282 @@ CSV_DATA_LABELS = [
     "name",
 ]
 
+OUT_FILE_FORMATS = ["csv", "parquet", "npz"]
+
+ALPHA_ENG = 0.0  # fixme: angle between propulsion and wing not defined
+NEWTON_MAX_ITERATIONS = 20
+NEWTON_TOLERANCE = 1.0e-6
+
+# Outputs (and results file points) of the last computations of a mission phase are kept in memory
+# and returned for the same inputs, the least recently used are dropped first
+CACHE_SIZE = 16
+
 _LOGGER = logging.getLogger(__name__)
 
+_SNAPSHOT_FIELDS = [
+    "low_speed",
+    "flap_condition",
+    "coef_k_wing",
+    "coef_k_htp",
+    "cl_alpha_wing",
+    "cl0_wing",
+    "cm0_wing",
+    "cd0",
+    "cl_flaps",
+    "cd_flaps",
+    "cl0_htp",
+    "cl_alpha_htp",
+    "cl_alpha_htp_isolated",
+    "cl_max_clean_wing",
+    "cl_max_clean_htp",
+    "cl_elevator_delta",
+    "cd_elevator_delta",
+    "z_eng",
+    "wing_mac",
+    "wing_area",
+    "x_wing",
+    "x_htp",
+    "cm_alpha_fus",
+    "fixed_mass_moment",
+    "fixed_mass",
+    "tank_cg_x",
+]
+
+
+class EquilibriumSnapshot(namedtuple("EquilibriumSnapshot", _SNAPSHOT_FIELDS)):
+    """
+    Immutable set of the aerodynamic and mass data used by the dynamic equilibrium, read once from
+    the component inputs for a given aerodynamic model (low speed or cruise) and flap condition.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def from_inputs(cls, inputs, low_speed: bool = False, flap_condition: str = "none"):
+        """
+        :param inputs: inputs derived from aero and mass models
+        :param low_speed: define which aerodynamic models should be used (either low speed or high speed)
+        :param flap_condition: can refer either to "takeoff" or "landing" if high-lift contribution should be considered
+        """
+
+        speed = "low_speed" if low_speed else "cruise"
+        if low_speed and flap_condition in ("takeoff", "landing"):
+            cl_flaps = float(inputs["data:aerodynamics:flaps:" + flap_condition + ":CL"])
+            cd_flaps = float(inputs["data:aerodynamics:flaps:" + flap_condition + ":CD"])
+        else:
+            # Flaps are only considered with the low speed aerodynamic models
+            flap_condition = "none"
+            cl_flaps = 0.0
+            cd_flaps = 0.0
+        x_wing = float(inputs["data:geometry:wing:MAC:at25percent:x"])
+
+        return cls(
+            low_speed=bool(low_speed),
+            flap_condition=flap_condition,
+            coef_k_wing=float(
+                inputs["data:aerodynamics:wing:" + speed + ":induced_drag_coefficient"]
+            ),
+            coef_k_htp=float(
+                inputs["data:aerodynamics:horizontal_tail:" + speed + ":induced_drag_coefficient"]
+            ),
+            cl_alpha_wing=float(inputs["data:aerodynamics:wing:" + speed + ":CL_alpha"]),
+            cl0_wing=float(inputs["data:aerodynamics:wing:" + speed + ":CL0_clean"]),
+            cm0_wing=float(inputs["data:aerodynamics:wing:" + speed + ":CM0_clean"]),
+            cd0=float(inputs["data:aerodynamics:aircraft:" + speed + ":CD0"]),
+            cl_flaps=cl_flaps,
+            cd_flaps=cd_flaps,
+            cl0_htp=float(inputs["data:aerodynamics:horizontal_tail:" + speed + ":CL0"]),
+            cl_alpha_htp=float(inputs["data:aerodynamics:horizontal_tail:" + speed + ":CL_alpha"]),
+            cl_alpha_htp_isolated=float(
+                inputs["data:aerodynamics:horizontal_tail:" + speed + ":CL_alpha_isolated"]
+            ),
+            cl_max_clean_wing=float(inputs["data:aerodynamics:wing:low_speed:CL_max_clean"]),
+            cl_max_clean_htp=float(
+                inputs["data:aerodynamics:horizontal_tail:low_speed:CL_max_clean"]
+            ),
+            cl_elevator_delta=float(inputs["data:aerodynamics:elevator:low_speed:CL_delta"]),
+            cd_elevator_delta=float(inputs["data:aerodynamics:elevator:low_speed:CD_delta"]),
+            z_eng=float(
+                inputs["data:weight:aircraft_empty:CG:z"]
+                - inputs["data:weight:propulsion:engine:CG:z"]
+            ),
+            wing_mac=float(inputs["data:geometry:wing:MAC:length"]),
+            wing_area=float(inputs["data:geometry:wing:area"]),
+            x_wing=x_wing,
+            x_htp=x_wing
+            + float(inputs["data:geometry:horizontal_tail:MAC:at25percent:x:from_wingMAC25"]),
+            cm_alpha_fus=float(inputs["data:aerodynamics:fuselage:cm_alpha"]),
+            fixed_mass_moment=float(
+                inputs["data:weight:aircraft:in_flight_variation:fixed_mass_comp:equivalent_moment"]
+            ),
+            fixed_mass=float(
+                inputs["data:weight:aircraft:in_flight_variation:fixed_mass_comp:mass"]
+            ),
+            tank_cg_x=float(inputs["data:weight:propulsion:tank:CG:x"]),
+        )
+
+
+class TrajectoryRecorder:
+    """
+    In-memory record of the mission points with a column of preallocated array per label of
+    CSV_DATA_LABELS, written at once in the mission results file(s).
+    """
+
+    def __init__(self, capacity: int = 256):
+        """
+        :param capacity: number of points the columns are first allocated for
+        """
+        self._columns = {
+            label: np.empty(capacity, dtype=object if label == "name" else float)
+            for label in CSV_DATA_LABELS
+        }
+        self._size = 0
+
+    def __len__(self):
+        return self._size
+
+    def append(self, values: list):
+        """
+        Records a point.
+
+        :param values: point values in the order of CSV_DATA_LABELS
+        """
+
+        if self._size == len(self._columns["time"]):
+            for label, column in self._columns.items():
+                self._columns[label] = np.concatenate((column, np.empty_like(column)))
+        for label, value in zip(CSV_DATA_LABELS, values):
+            self._columns[label][self._size] = value
+        self._size += 1
+
+    def clear(self):
+        """
+        Forgets the recorded points (the allocated columns are kept).
+        """
+
+        self._size = 0
+
+    def copy(self) -> "TrajectoryRecorder":
+        """
+        :return: a recorder with a copy of the recorded points
+        """
+
+        recorder = TrajectoryRecorder(capacity=max(self._size, 1))
+        for label, column in self._columns.items():
+            recorder._columns[label][: self._size] = column[: self._size]
+        recorder._size = self._size
+
+        return recorder
+
+    def to_dataframe(self, index_start: int = 0) -> pd.DataFrame:
+        """
+        :param index_start: index of the first point
+        :return: the recorded points
+        """
+
+        return pd.DataFrame(
+            {label: column[: self._size] for label, column in self._columns.items()},
+            columns=CSV_DATA_LABELS,
+            index=pd.RangeIndex(index_start, index_start + self._size),
+        )
+
+    def flush(self, file_path: str, formats=("csv",)):
+        """
+        Appends the recorded points to the results files, then clears the record.
+
+        :param file_path: path of the .csv results file, the other formats being written next to it
+        with their own extension
+        :param formats: formats of the results files, among OUT_FILE_FORMATS ("parquet" needs
+        pyarrow or fastparquet to be installed)
+        """
+
+        for file_format in formats:
+            format_file_path = get_out_file_path(file_path, file_format)
+            if file_format == "csv":
+                if pth.exists(format_file_path):
+                    with open(format_file_path) as file:
+                        index_start = sum(1 for _ in file) - 1
+                    self.to_dataframe(index_start).to_csv(format_file_path, mode="a", header=False)
+                else:
+                    self.to_dataframe().to_csv(format_file_path)
+            elif file_format == "parquet":
+                df = self.to_dataframe()
+                if pth.exists(format_file_path):
+                    df = pd.concat((pd.read_parquet(format_file_path), df), ignore_index=True)
+                df.to_parquet(format_file_path)
+            else:
+                columns = {
+                    label: column[: self._size].astype(str if label == "name" else float)
+                    for label, column in self._columns.items()
+                }
+                if pth.exists(format_file_path):
+                    with np.load(format_file_path) as saved_columns:
+                        columns = {
+                            label: np.concatenate((saved_columns[label], columns[label]))
+                            for label in CSV_DATA_LABELS
+                        }
+                np.savez(format_file_path, **columns)
+
+        self.clear()
+
+
+def _check_out_file_formats(name, value):
+    for file_format in value:
+        if file_format not in OUT_FILE_FORMATS:
+            raise ValueError(
+                "Option '{}' with value {} is not valid: formats must be in {}".format(
+                    name, value, OUT_FILE_FORMATS
+                )
+            )
+
+
+def get_out_file_path(file_path: str, file_format: str) -> str:
+    """
+    :param file_path: path of the .csv results file
+    :param file_format: one of OUT_FILE_FORMATS
+    :return: path of the results file in given format
+    """
+
+    if file_format == "csv":
+        return file_path
+
+    return pth.splitext(file_path)[0] + "." + file_format
+
 
 class DynamicEquilibrium(om.ExplicitComponent):
     """
     Compute the derivatives and associated lift-drag-thrust decomposition depending if DP model is included or not
     """
 
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._trajectory = TrajectoryRecorder()
+        self._flushed_trajectory = None
+        self._cache = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+
     def initialize(self):
         self.options.declare("out_file", default="", types=str)
+        self.options.declare(
+            "out_file_formats",
+            default=["csv"],
+            types=list,
+            check_valid=_check_out_file_formats,
+            desc="formats of the results files among " + ", ".join(OUT_FILE_FORMATS),
+        )
+        self.options.declare(
+            "cache_size",
+            default=CACHE_SIZE,
+            types=int,
+            desc="number of computations kept in memory, 0 to disable the cache",
+        )
+        self.options.declare(
+            "cache_tolerance",
+            default=0.0,
+            types=float,
+            desc="relative tolerance under which inputs are considered equal to cached ones",
+        )
 
     def setup(self):
         self.add_input("data:geometry:wing:MAC:leading_edge:x:local", val=np.nan, units="m")
@@ -123,7 +391,8 @@ class DynamicEquilibrium(om.ExplicitComponent):
         """
         Method that founds the regulated thrust and aircraft to air angle to obtain dynamic equilibrium
 
-        :param inputs: inputs derived from aero and mass models
+        :param inputs: inputs derived from aero and mass models, or EquilibriumSnapshot built from
+        them once for all the points of a phase
         :param gamma: path angle (in rad.) equal to climb rate c=dh/dt over air speed V, sin(gamma)=c/V
         :param q: dynamic pressure q=1/2*rho*V²
         :param dvx_dt: acceleration linear to air speed
@@ -134,140 +403,144 @@ class DynamicEquilibrium(om.ExplicitComponent):
         :param low_speed: define which aerodynamic models should be used (either low speed or high speed)
         """
 
-        # Choose local aero-coefficients
-        if low_speed:
-            coef_k_wing = inputs["data:aerodynamics:wing:low_speed:induced_drag_coefficient"]
-            coef_k_htp = inputs[
-                "data:aerodynamics:horizontal_tail:low_speed:induced_drag_coefficient"
-            ]
-            cl_alpha_wing = inputs["data:aerodynamics:wing:low_speed:CL_alpha"]
-            cl0_wing = inputs["data:aerodynamics:wing:low_speed:CL0_clean"]
-            cd0 = inputs["data:aerodynamics:aircraft:low_speed:CD0"]
-            cl0_htp = inputs["data:aerodynamics:horizontal_tail:low_speed:CL0"]
-            cl_alpha_htp = inputs["data:aerodynamics:horizontal_tail:low_speed:CL_alpha"]
-            cl_alpha_htp_isolated = inputs[
-                "data:aerodynamics:horizontal_tail:low_speed:CL_alpha_isolated"
-            ]
-        else:
-            coef_k_wing = inputs["data:aerodynamics:wing:cruise:induced_drag_coefficient"]
-            coef_k_htp = inputs["data:aerodynamics:horizontal_tail:cruise:induced_drag_coefficient"]
-            cl_alpha_wing = inputs["data:aerodynamics:wing:cruise:CL_alpha"]
-            cl0_wing = inputs["data:aerodynamics:wing:cruise:CL0_clean"]
-            cd0 = inputs["data:aerodynamics:aircraft:cruise:CD0"]
-            cl0_htp = inputs["data:aerodynamics:horizontal_tail:cruise:CL0"]
-            cl_alpha_htp = inputs["data:aerodynamics:horizontal_tail:cruise:CL_alpha"]
-            cl_alpha_htp_isolated = inputs[
-                "data:aerodynamics:horizontal_tail:cruise:CL_alpha_isolated"
-            ]
-        z_cg_aircraft = inputs["data:weight:aircraft_empty:CG:z"]
-        z_cg_engine = inputs["data:weight:propulsion:engine:CG:z"]
-        wing_mac = inputs["data:geometry:wing:MAC:length"]
-        wing_area = inputs["data:geometry:wing:area"]
-        cl_max_clean = inputs["data:aerodynamics:horizontal_tail:low_speed:CL_max_clean"]
-        cl_elevator_delta = inputs["data:aerodynamics:elevator:low_speed:CL_delta"]
-        cd_elevator_delta = inputs["data:aerodynamics:elevator:low_speed:CD_delta"]
-        z_eng = z_cg_aircraft - z_cg_engine
-        alpha_eng = 0.0  # fixme: angle between propulsion and wing not defined
-
-        # Define the system of equations to be solved: load equilibrium along the air x/z axis and
-        # moment equilibrium performed with found_cl_repartition sub-function.
-        # The moment generated by (x_cg_aircraft - x_cg_engine) * T * sin(alpha - alpha_eng) is neglected!
+        snapshot = self._get_snapshot(inputs, low_speed, flap_condition)
+        gamma, q, dvx_dt, dvz_dt, mass = (float(x) for x in (gamma, q, dvx_dt, dvz_dt, mass))
+
+        # Define the system of equations to be solved with alpha defined in degree and thrust in kN
+        # to be homogenous on x-tolerance
         def equations(x):
-            alpha = x[0] * math.pi / 180.0  # defined in degree to be homogenous on x-tolerance
-            thrust = x[1] * 1000.0  # defined in kN to be homogenous on x-tolerance
-
-            load_factor = (
-                -dvz_dt + g * math.cos(gamma) - thrust / mass * math.sin(alpha - alpha_eng)
-            ) / g
-            # Additional aerodynamics
-            delta_cl = 0.0
-            delta_cm = z_eng * thrust * math.cos(alpha - alpha_eng) / (wing_mac * q * wing_area)
-            cl_wing_blown, cl_htp, _ = self.found_cl_repartition(
-                inputs, load_factor, mass, q, delta_cm, low_speed
-            )
-            if low_speed:
-                if flap_condition == "takeoff":
-                    cl_wing = inputs["data:aerodynamics:flaps:takeoff:CL"]
-                    cd0_flaps = inputs["data:aerodynamics:flaps:takeoff:CD"]
-                elif flap_condition == "landing":
-                    cl_wing = inputs["data:aerodynamics:flaps:landing:CL"]
-                    cd0_flaps = inputs["data:aerodynamics:flaps:landing:CD"]
-                else:
-                    cl_wing = 0.0
-                    cd0_flaps = 0.0
-            else:
-                cl_wing = 0.0
-                cd0_flaps = 0.0
-            cl_wing += cl0_wing + cl_alpha_wing * alpha
-            # TODO : Change formula for trimmable htp
-            # Calculate the elevator command if htp not trimmed
-            delta_e = (cl_htp - (alpha * cl_alpha_htp + cl0_htp)) / cl_elevator_delta
-            cd = (
-                cd0
-                + cd0_flaps
-                + coef_k_wing * cl_wing ** 2
-                + coef_k_htp * cl_htp ** 2
-                + (cd_elevator_delta * delta_e ** 2.0)
+            residuals, _ = self._equilibrium_residuals(
+                snapshot, x[0] * math.pi / 180.0, x[1] * 1000.0, gamma, q, dvx_dt, dvz_dt, mass
             )
-            drag = q * cd * wing_area
-            f1 = float(
-                thrust * math.cos(alpha - alpha_eng)
-                - mass * g * math.sin(gamma)
-                - drag
-                - mass * dvx_dt
-            )
-            f2 = float(cl_wing_blown - (cl_wing + delta_cl))
+            return np.array(residuals, dtype=float)
 
-            return np.array([f1, f2])
+        def equations_jacobian(x):
+            _, jacobian = self._equilibrium_residuals(
+                snapshot,
+                x[0] * math.pi / 180.0,
+                x[1] * 1000.0,
+                gamma,
+                q,
+                dvx_dt,
+                dvz_dt,
+                mass,
+                with_jacobian=True,
+            )
+            return np.array(jacobian, dtype=float) * np.array([math.pi / 180.0, 1000.0])
 
         if len(previous_step) == 2:
-            result = fsolve(
-                equations,
-                np.array([previous_step[0] * 180.0 / math.pi, previous_step[1] / 1000.0]),
-                xtol=1.0e-3,
-            )
+            x0 = np.array([previous_step[0] * 180.0 / math.pi, previous_step[1] / 1000.0])
         else:
-            result = fsolve(equations, np.array([0.0, 1.0]), xtol=1.0e-3)
+            x0 = np.array([0.0, 1.0])
+        result = fsolve(equations, x0, fprime=equations_jacobian, xtol=1.0e-3)
         alpha_equilibrium = result[0] * math.pi / 180.0
         # noinspection PyTypeChecker
         thrust_equilibrium = result[1] * 1000.0
 
-        # Calculate the htp angle if trimmed
-        load_factor_local = (
-            -dvz_dt
-            + g * math.cos(gamma)
-            - thrust_equilibrium / mass * math.sin(alpha_equilibrium - alpha_eng)
-        ) / g
-        delta_cm_local = (
-            z_eng
-            * thrust_equilibrium
-            * math.cos(alpha_equilibrium - alpha_eng)
-            / (wing_mac * q * wing_area)
-        )
-        cl_wing_local, cl_htp_local, error = self.found_cl_repartition(
-            inputs, load_factor_local, mass, q, delta_cm_local, low_speed
-        )
-        if cl_htp_local > cl_max_clean:
-            error = True
-        delta_htp = (
-            cl_htp_local - (alpha_equilibrium * cl_alpha_htp + cl0_htp) / cl_alpha_htp_isolated
+        cl_wing_local, cl_htp_local, delta_htp, delta_elevator, error = self._equilibrium_state(
+            snapshot, alpha_equilibrium, thrust_equilibrium, gamma, q, dvz_dt, mass
         )
 
-        # Calculate the elevator angle if htp not trimmed
-        delta_elevator = (
-            cl_htp_local - (alpha_equilibrium * cl_alpha_htp + cl0_htp)
-        ) / cl_elevator_delta
-
         return (
             alpha_equilibrium,
             thrust_equilibrium,
-            cl_wing_local,
-            cl_htp_local,
-            delta_htp,
-            delta_elevator,
-            error,
+            float(cl_wing_local),
+            float(cl_htp_local),
+            float(delta_htp),
+            float(delta_elevator),
+            bool(error),
         )
 
+    def dynamic_equilibrium_segment(
+        self,
+        inputs,
+        gamma,
+        q,
+        dvx_dt,
+        dvz_dt,
+        mass,
+        flap_condition: str = "none",
+        previous_step: tuple = (),
+        low_speed: bool = False,
+    ):
+        """
+        Vectorized version of dynamic_equilibrium that founds the equilibrium of all the points of
+        a flight segment at once, with Newton iterations using the analytic jacobian of the
+        equations. The points the iterations do not converge for are solved with
+        dynamic_equilibrium.
+
+        :param inputs: inputs derived from aero and mass models, or EquilibriumSnapshot built from
+        them
+        :param gamma: path angles (in rad.) of the points
+        :param q: dynamic pressures of the points
+        :param dvx_dt: accelerations linear to air speed of the points
+        :param dvz_dt: accelerations perpendicular to air speed of the points
+        :param mass: masses of the points
+        :param flap_condition: can refer either to "takeoff" or "landing" if high-lift contribution should be considered
+        :param previous_step: give previous equilibrium arrays of the points if known to accelerate the calculation
+        :param low_speed: define which aerodynamic models should be used (either low speed or high speed)
+        :return: the same results as dynamic_equilibrium as arrays (one value per point)
+        """
+
+        snapshot = self._get_snapshot(inputs, low_speed, flap_condition)
+        gamma, q, dvx_dt, dvz_dt, mass = np.broadcast_arrays(
+            *(np.asarray(x, dtype=float).ravel() for x in (gamma, q, dvx_dt, dvz_dt, mass))
+        )
+
+        if len(previous_step) == 2:
+            alpha, thrust = np.broadcast_arrays(
+                *(np.asarray(x, dtype=float).ravel() for x in previous_step)
+            )
+        else:
+            # Initial guess neglecting the htp lift and the elevator drag
+            cl = mass * g * np.cos(gamma) / (q * snapshot.wing_area)
+            alpha = (cl - snapshot.cl_flaps - snapshot.cl0_wing) / snapshot.cl_alpha_wing
+            thrust = (
+                q
+                * snapshot.wing_area
+                * (snapshot.cd0 + snapshot.cd_flaps + snapshot.coef_k_wing * cl ** 2)
+                + mass * g * np.sin(gamma)
+                + mass * dvx_dt
+            )
+        x0 = (alpha, thrust)
+
+        converged = np.zeros(np.shape(alpha), dtype=bool)
+        for _ in range(NEWTON_MAX_ITERATIONS):
+            (f1, f2), ((df1_da, df1_dt), (df2_da, df2_dt)) = self._equilibrium_residuals(
+                snapshot, alpha, thrust, gamma, q, dvx_dt, dvz_dt, mass, with_jacobian=True
+            )
+            determinant = df1_da * df2_dt - df1_dt * df2_da
+            with np.errstate(divide="ignore", invalid="ignore"):
+                alpha_step = (df2_dt * f1 - df1_dt * f2) / determinant
+                thrust_step = (df1_da * f2 - df2_da * f1) / determinant
+            alpha = alpha - alpha_step
+            thrust = thrust - thrust_step
+            # Same units as the x-tolerance of dynamic_equilibrium
+            converged = (np.abs(alpha_step) * 180.0 / math.pi < NEWTON_TOLERANCE) & (
+                np.abs(thrust_step) / 1000.0 < NEWTON_TOLERANCE
+            )
+            if np.all(converged):
+                break
+
+        for idx in np.flatnonzero(~converged):
+            alpha[idx], thrust[idx] = self.dynamic_equilibrium(
+                snapshot,
+                gamma[idx],
+                q[idx],
+                dvx_dt[idx],
+                dvz_dt[idx],
+                mass[idx],
+                snapshot.flap_condition,
+                (x0[0][idx], x0[1][idx]) if len(previous_step) == 2 else (),
+                low_speed,
+            )[0:2]
+
+        cl_wing, cl_htp, delta_htp, delta_elevator, error = self._equilibrium_state(
+            snapshot, alpha, thrust, gamma, q, dvz_dt, mass
+        )
+
+        return alpha, thrust, cl_wing, cl_htp, delta_htp, delta_elevator, error
+
     @staticmethod
     def found_cl_repartition(
         inputs, load_factor: float, mass: float, q: float, delta_cm: float, low_speed: bool = False
@@ -275,7 +548,8 @@ class DynamicEquilibrium(om.ExplicitComponent):
         """
         Method that founds the lift equilibrium with regard to the global moment
 
-        :param inputs: inputs derived from aero and mass models
+        :param inputs: inputs derived from aero and mass models, or EquilibriumSnapshot built from
+        them
         :param load_factor: load factor applied to the aircraft expressed as a ratio of g
         :param mass: current aircraft mass
         :param q: dynamic pressure q=1/2*rho*V²
@@ -283,46 +557,202 @@ class DynamicEquilibrium(om.ExplicitComponent):
         :param low_speed: define which aerodynamic models should be used (either low speed or high speed)
         """
 
-        l0_wing = inputs["data:geometry:wing:MAC:length"]
-        x_wing = inputs["data:geometry:wing:MAC:at25percent:x"]
-        wing_area = inputs["data:geometry:wing:area"]
-        x_htp = x_wing + inputs["data:geometry:horizontal_tail:MAC:at25percent:x:from_wingMAC25"]
-        cm_alpha_fus = inputs["data:aerodynamics:fuselage:cm_alpha"]
-        if low_speed:
-            cl_alpha_wing = inputs["data:aerodynamics:wing:low_speed:CL_alpha"]
-            cl0_wing = inputs["data:aerodynamics:wing:low_speed:CL0_clean"]
-            cm0_wing = inputs["data:aerodynamics:wing:low_speed:CM0_clean"]
-        else:
-            cl_alpha_wing = inputs["data:aerodynamics:wing:cruise:CL_alpha"]
-            cl0_wing = inputs["data:aerodynamics:wing:cruise:CL0_clean"]
-            cm0_wing = inputs["data:aerodynamics:wing:cruise:CM0_clean"]
-        cl_max_clean = inputs["data:aerodynamics:wing:low_speed:CL_max_clean"]
-
-        c1 = inputs["data:weight:aircraft:in_flight_variation:fixed_mass_comp:equivalent_moment"]
-        cg_tank = inputs["data:weight:propulsion:tank:CG:x"]
-        c3 = inputs["data:weight:aircraft:in_flight_variation:fixed_mass_comp:mass"]
-        fuel_mass = mass - c3
-        x_cg = (c1 + cg_tank * fuel_mass) / (c3 + fuel_mass)
-
-        # Define matrix equilibrium (applying load and moment equilibrium)
-        a11 = 1
-        a12 = 1
-        b1 = mass * g * load_factor / (q * wing_area)
-        a21 = (x_wing - x_cg) - (cm_alpha_fus / cl_alpha_wing) * l0_wing
-        a22 = x_htp - x_cg
-        b2 = (cm0_wing + delta_cm + (cm_alpha_fus / cl_alpha_wing) * cl0_wing) * l0_wing
-
-        a = np.array([[a11, a12], [float(a21), float(a22)]])
-        b = np.array([b1, b2])
-        inv_a = np.linalg.inv(a)
-        CL = np.dot(inv_a, b)
+        snapshot = DynamicEquilibrium._get_snapshot(inputs, low_speed)
+        cl_wing, cl_htp, error = DynamicEquilibrium._cl_repartition(
+            snapshot, float(load_factor), float(mass), float(q), float(delta_cm)
+        )
+
+        return float(cl_wing), float(cl_htp), bool(error)
+
+    @staticmethod
+    def _cl_repartition(snapshot: EquilibriumSnapshot, load_factor, mass, q, delta_cm):
+        """
+        Same as found_cl_repartition, for floats as well as arrays of flight points.
+        """
+
+        # Solve matrix equilibrium (applying load and moment equilibrium) [[1, 1], [a21, a22]] *
+        # [cl_wing, cl_htp] = [b1, b2]
+        a21, a22 = DynamicEquilibrium._repartition_matrix(snapshot, mass)
+        b1 = mass * g * load_factor / (q * snapshot.wing_area)
+        b2 = (
+            snapshot.cm0_wing
+            + delta_cm
+            + (snapshot.cm_alpha_fus / snapshot.cl_alpha_wing) * snapshot.cl0_wing
+        ) * snapshot.wing_mac
+        cl_wing = (a22 * b1 - b2) / (a22 - a21)
+        cl_htp = (b2 - a21 * b1) / (a22 - a21)
 
         # Return equilibrated lift coefficients if low speed maximum clean Cl not exceeded otherwise only cl_wing, 3rd
         # term is an error flag returned by the function
-        if CL[0] < cl_max_clean:
-            return float(CL[0]), float(CL[1]), False
-        else:
-            return float(mass * g * load_factor / (q * wing_area)), 0.0, True
+        error = np.logical_not(cl_wing < snapshot.cl_max_clean_wing)
+
+        return np.where(error, b1, cl_wing), np.where(error, 0.0, cl_htp), error
+
+    @staticmethod
+    def _repartition_matrix(snapshot: EquilibriumSnapshot, mass):
+        """
+        :return: moment equilibrium coefficients of the wing and htp lift coefficients
+        """
+
+        fuel_mass = mass - snapshot.fixed_mass
+        x_cg = (snapshot.fixed_mass_moment + snapshot.tank_cg_x * fuel_mass) / (
+            snapshot.fixed_mass + fuel_mass
+        )
+        a21 = (snapshot.x_wing - x_cg) - (
+            snapshot.cm_alpha_fus / snapshot.cl_alpha_wing
+        ) * snapshot.wing_mac
+        a22 = snapshot.x_htp - x_cg
+
+        return a21, a22
+
+    @staticmethod
+    def _lift_repartition(snapshot: EquilibriumSnapshot, alpha, thrust, gamma, q, dvz_dt, mass):
+        """
+        :return: wing and htp lift coefficients balancing the load factor and moment of the thrust,
+        and the error flag of _cl_repartition
+        """
+
+        load_factor = (-dvz_dt + g * np.cos(gamma) - thrust / mass * np.sin(alpha - ALPHA_ENG)) / g
+        # Additional aerodynamics
+        delta_cm = (
+            snapshot.z_eng
+            * thrust
+            * np.cos(alpha - ALPHA_ENG)
+            / (snapshot.wing_mac * q * snapshot.wing_area)
+        )
+
+        return DynamicEquilibrium._cl_repartition(snapshot, load_factor, mass, q, delta_cm)
+
+    @staticmethod
+    def _equilibrium_residuals(
+        snapshot: EquilibriumSnapshot,
+        alpha,
+        thrust,
+        gamma,
+        q,
+        dvx_dt,
+        dvz_dt,
+        mass,
+        with_jacobian: bool = False,
+    ):
+        """
+        Residuals of the load equilibrium along the air x/z axis, the moment equilibrium being
+        performed with the lift repartition. The moment generated by
+        (x_cg_aircraft - x_cg_engine) * T * sin(alpha - alpha_eng) is neglected!
+
+        :param alpha: aircraft to air angle(s) in rad.
+        :param thrust: thrust(s) in N
+        :param with_jacobian: if True, derivatives of the residuals are computed
+        :return: residuals (f1, f2) and, if with_jacobian, their derivatives with respect to alpha and
+        thrust ((df1/dalpha, df1/dthrust), (df2/dalpha, df2/dthrust)), else None
+        """
+
+        q_s = q * snapshot.wing_area
+        cos_alpha = np.cos(alpha - ALPHA_ENG)
+        sin_alpha = np.sin(alpha - ALPHA_ENG)
+        delta_cl = 0.0
+        cl_wing_blown, cl_htp, error = DynamicEquilibrium._lift_repartition(
+            snapshot, alpha, thrust, gamma, q, dvz_dt, mass
+        )
+        cl_wing = snapshot.cl_flaps + snapshot.cl0_wing + snapshot.cl_alpha_wing * alpha
+        # TODO : Change formula for trimmable htp
+        # Calculate the elevator command if htp not trimmed
+        delta_e = (
+            cl_htp - (alpha * snapshot.cl_alpha_htp + snapshot.cl0_htp)
+        ) / snapshot.cl_elevator_delta
+        cd = (
+            snapshot.cd0
+            + snapshot.cd_flaps
+            + snapshot.coef_k_wing * cl_wing ** 2
+            + snapshot.coef_k_htp * cl_htp ** 2
+            + (snapshot.cd_elevator_delta * delta_e ** 2.0)
+        )
+        f1 = thrust * cos_alpha - mass * g * np.sin(gamma) - q_s * cd - mass * dvx_dt
+        f2 = cl_wing_blown - (cl_wing + delta_cl)
+        if not with_jacobian:
+            return (f1, f2), None
+
+        # The lift repartition is linear in the total lift b1 and moment b2 of _cl_repartition
+        d_b1_d_alpha = -thrust * cos_alpha / q_s
+        d_b1_d_thrust = -sin_alpha / q_s
+        d_b2_d_alpha = -snapshot.z_eng * thrust * sin_alpha / q_s
+        d_b2_d_thrust = snapshot.z_eng * cos_alpha / q_s
+        a21, a22 = DynamicEquilibrium._repartition_matrix(snapshot, mass)
+        d_cl_wing_blown_d_alpha = np.where(
+            error, d_b1_d_alpha, (a22 * d_b1_d_alpha - d_b2_d_alpha) / (a22 - a21)
+        )
+        d_cl_wing_blown_d_thrust = np.where(
+            error, d_b1_d_thrust, (a22 * d_b1_d_thrust - d_b2_d_thrust) / (a22 - a21)
+        )
+        d_cl_htp_d_alpha = np.where(error, 0.0, (d_b2_d_alpha - a21 * d_b1_d_alpha) / (a22 - a21))
+        d_cl_htp_d_thrust = np.where(
+            error, 0.0, (d_b2_d_thrust - a21 * d_b1_d_thrust) / (a22 - a21)
+        )
+        d_delta_e_d_alpha = (d_cl_htp_d_alpha - snapshot.cl_alpha_htp) / snapshot.cl_elevator_delta
+        d_delta_e_d_thrust = d_cl_htp_d_thrust / snapshot.cl_elevator_delta
+        d_cd_d_alpha = (
+            2.0 * snapshot.coef_k_wing * cl_wing * snapshot.cl_alpha_wing
+            + 2.0 * snapshot.coef_k_htp * cl_htp * d_cl_htp_d_alpha
+            + 2.0 * snapshot.cd_elevator_delta * delta_e * d_delta_e_d_alpha
+        )
+        d_cd_d_thrust = (
+            2.0 * snapshot.coef_k_htp * cl_htp * d_cl_htp_d_thrust
+            + 2.0 * snapshot.cd_elevator_delta * delta_e * d_delta_e_d_thrust
+        )
+        jacobian = (
+            (-thrust * sin_alpha - q_s * d_cd_d_alpha, cos_alpha - q_s * d_cd_d_thrust),
+            (d_cl_wing_blown_d_alpha - snapshot.cl_alpha_wing, d_cl_wing_blown_d_thrust),
+        )
+
+        return (f1, f2), jacobian
+
+    @staticmethod
+    def _equilibrium_state(snapshot: EquilibriumSnapshot, alpha, thrust, gamma, q, dvz_dt, mass):
+        """
+        :return: wing and htp lift coefficients, htp and elevator angles and error flag at the
+        equilibrium
+        """
+
+        cl_wing, cl_htp, error = DynamicEquilibrium._lift_repartition(
+            snapshot, alpha, thrust, gamma, q, dvz_dt, mass
+        )
+        error = error | (cl_htp > snapshot.cl_max_clean_htp)
+
+        # Calculate the htp angle if trimmed
+        delta_htp = cl_htp - (alpha * snapshot.cl_alpha_htp + snapshot.cl0_htp) / (
+            snapshot.cl_alpha_htp_isolated
+        )
+
+        # Calculate the elevator angle if htp not trimmed
+        delta_elevator = (
+            cl_htp - (alpha * snapshot.cl_alpha_htp + snapshot.cl0_htp)
+        ) / snapshot.cl_elevator_delta
+
+        return cl_wing, cl_htp, delta_htp, delta_elevator, error
+
+    @staticmethod
+    def _get_snapshot(inputs, low_speed: bool, flap_condition: str = None) -> EquilibriumSnapshot:
+        """
+        :return: the snapshot if inputs is one, after checking it matches the required aerodynamic
+        models, else a snapshot built from inputs
+        """
+
+        if not isinstance(inputs, EquilibriumSnapshot):
+            return EquilibriumSnapshot.from_inputs(inputs, low_speed, flap_condition or "none")
+
+        if flap_condition is None:
+            flap_condition = inputs.flap_condition
+        elif not low_speed or flap_condition not in ("takeoff", "landing"):
+            flap_condition = "none"
+        if inputs.low_speed != bool(low_speed) or inputs.flap_condition != flap_condition:
+            raise ValueError(
+                "Equilibrium snapshot built for low_speed={} and flap_condition={} used with "
+                "low_speed={} and flap_condition={}".format(
+                    inputs.low_speed, inputs.flap_condition, low_speed, flap_condition
+                )
+            )
+
+        return inputs
 
     def save_point(
         self,
@@ -340,7 +770,8 @@ class DynamicEquilibrium(om.ExplicitComponent):
         name: str,
     ):
         """
-        Method to save mission point to .csv file for further post-processing
+        Method to record mission point for further post-processing, written to the .csv file by
+        flush_points
 
         :param time: mission time in seconds
         :param altitude: flight altitude in meters
@@ -362,31 +793,8 @@ class DynamicEquilibrium(om.ExplicitComponent):
         cl_htp = float(equilibrium_result[3])
         atm = Atmosphere(altitude, altitude_in_feet=False)
         mach = v_tas / atm.speed_of_sound
-        if not os.path.exists(self.options["out_file"]):
-            df = pd.DataFrame(columns=CSV_DATA_LABELS)
-            df.loc[0] = [
-                float(time),
-                float(altitude),
-                float(distance),
-                float(mass),
-                float(v_tas),
-                float(v_cas),
-                float(mach),
-                float(rho),
-                float(gamma),
-                alpha,
-                cl_wing,
-                cl_htp,
-                thrust,
-                float(thrust_rate),
-                float(sfc),
-                name,
-            ]
-            df.to_csv(self.options["out_file"])
-        else:
-            df = pd.read_csv(self.options["out_file"])
-            del df["Unnamed: 0"]
-            data = [
+        self._trajectory.append(
+            [
                 float(time),
                 float(altitude),
                 float(distance),
@@ -404,6 +812,94 @@ class DynamicEquilibrium(om.ExplicitComponent):
                 float(sfc),
                 name,
             ]
-            row = pd.Series(data, index=CSV_DATA_LABELS)
-            df = df.append(row, ignore_index=True)
-            df.to_csv(self.options["out_file"])
+        )
+
+    def flush_points(self):
+        """
+        Method to append the mission points recorded by save_point to the results file(s)
+        """
+
+        self._flushed_trajectory = self._trajectory.copy()
+        self._trajectory.flush(self.options["out_file"], self.options["out_file_formats"])
+
+    def load_cached_outputs(self, inputs, outputs) -> bool:
+        """
+        Method to set the outputs of a previous computation with the same inputs (quantized with
+        cache_tolerance), and to write its mission points in the results file(s).
+
+        :return: True if the outputs were found in cache, False if they must be computed
+        """
+
+        self._flushed_trajectory = None
+        if self.options["cache_size"] <= 0 or self.under_approx:
+            return False
+
+        key = self._get_cache_key(inputs)
+        if key not in self._cache:
+            self.cache_misses += 1
+            _LOGGER.debug(
+                "%s results not found in cache (%d hits, %d misses)",
+                self.pathname,
+                self.cache_hits,
+                self.cache_misses,
+            )
+            return False
+
+        self._cache.move_to_end(key)
+        cached_outputs, trajectory = self._cache[key]
+        outputs.set_val(cached_outputs)
+        if self.options["out_file"] != "" and trajectory is not None:
+            trajectory.copy().flush(self.options["out_file"], self.options["out_file_formats"])
+        self.cache_hits += 1
+        _LOGGER.debug(
+            "%s results found in cache (%d hits, %d misses)",
+            self.pathname,
+            self.cache_hits,
+            self.cache_misses,
+        )
+
+        return True
+
+    def save_cached_outputs(self, inputs, outputs):
+        """
+        Method to keep in cache the outputs of a computation and the mission points it flushed.
+        """
+
+        if self.options["cache_size"] <= 0 or self.under_approx:
+            return
+
+        self._cache[self._get_cache_key(inputs)] = (
+            outputs.asarray().copy(),
+            self._flushed_trajectory,
+        )
+        while len(self._cache) > self.options["cache_size"]:
+            self._cache.popitem(last=False)
+
+    def _get_cache_key(self, inputs) -> bytes:
+        """
+        :return: inputs rounded to cache_tolerance times their order of magnitude, as bytes
+        """
+
+        values = np.array(inputs.asarray(), dtype=float)
+        tolerance = self.options["cache_tolerance"]
+        if tolerance > 0.0:
+            magnitude = 10.0 ** np.floor(
+                np.log10(np.where(np.isfinite(values) & (values != 0.0), np.abs(values), 1.0))
+            )
+            values = np.round(values / (tolerance * magnitude)) * (tolerance * magnitude) + 0.0
+
+        return values.tobytes()
+
+    def delete_out_file(self):
+        """
+        Method to delete the results file(s) of a previous mission and the points not flushed
+        """
+
+        self._trajectory.clear()
+        for file_format in self.options["out_file_formats"]:
+            file_path = get_out_file_path(self.options["out_file"], file_format)
+            # noinspection PyBroadException
+            try:
+                os.remove(file_path)
+            except:
+                _LOGGER.info("Failed to remove {} file!".format(file_path))
@@ -13,12 +13,11 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import numpy as np
-import os
 import math
 import openmdao.api as om
-import copy
 import logging
-from typing import Sequence, Union
+from collections import namedtuple
+from typing import Callable, Sequence, Union
 
 from scipy.constants import g
 from scipy.interpolate import interp1d
@@ -33,7 +32,11 @@ from fastoad.module_management.service_registry import RegisterOpenMDAOSystem
 from fastoad.module_management.constants import ModelDomain
 
 from fastga.models.performances.takeoff import SAFETY_HEIGHT, TakeOffPhase
-from fastga.models.performances.dynamic_equilibrium import DynamicEquilibrium
+from fastga.models.performances.dynamic_equilibrium import (
+    DynamicEquilibrium,
+    EquilibriumSnapshot,
+    CACHE_SIZE,
+)
 
 from fastga.models.propulsion.fuel_propulsion.base import FuelEngineSet
 from fastga.models.weight.cg.cg_variation import InFlightCGVariation
@@ -42,9 +45,22 @@ POINTS_NB_CLIMB = 100
 POINTS_NB_CRUISE = 100
 POINTS_NB_DESCENT = 50
 MAX_CALCULATION_TIME = 15  # time in seconds
+MAX_MASS_ITERATIONS = 20
+MASS_TOLERANCE = 1.0e-3  # mass in kg
+ADAPTIVE_INITIAL_STEPS = 4
+ADAPTIVE_MAX_POINTS = 1000
 
 _LOGGER = logging.getLogger(__name__)
 
+SegmentConditions = namedtuple(
+    "SegmentConditions",
+    ["altitude", "true_airspeed", "density", "mach", "gamma", "q", "dvx_dt", "time_rate"],
+)
+"""
+Flight conditions of the points of a segment, time_rate being the derivative of time with respect
+to the position the segment is integrated on (altitude or ground distance).
+"""
+
 
 @RegisterOpenMDAOSystem("fastga.performances.mission", domain=ModelDomain.PERFORMANCE)
 class Mission(om.Group):
@@ -58,6 +74,28 @@ class Mission(om.Group):
     def initialize(self):
         self.options.declare("propulsion_id", default=None, types=str, allow_none=True)
         self.options.declare("out_file", default="", types=str)
+        self.options.declare("out_file_formats", default=["csv"], types=list)
+        self.options.declare(
+            "cache_size",
+            default=CACHE_SIZE,
+            types=int,
+            desc="number of computations of each phase kept in memory, 0 to disable the cache",
+        )
+        self.options.declare(
+            "cache_tolerance",
+            default=0.0,
+            types=float,
+            desc="relative tolerance under which the inputs of a phase are considered equal to "
+            "cached ones",
+        )
+        self.options.declare(
+            "integration_tolerance",
+            default=None,
+            types=float,
+            allow_none=True,
+            desc="relative error tolerance on the fuel and distance of the climb, cruise and descent, integrated with "
+            "adaptive steps if given (with fixed steps otherwise)",
+        )
 
     def setup(self):
         self.add_subsystem("in_flight_cg_variation", InFlightCGVariation(), promotes=["*"])
@@ -72,14 +110,24 @@ class Mission(om.Group):
         self.add_subsystem(
             "climb",
             _compute_climb(
-                propulsion_id=self.options["propulsion_id"], out_file=self.options["out_file"],
+                propulsion_id=self.options["propulsion_id"],
+                out_file=self.options["out_file"],
+                out_file_formats=self.options["out_file_formats"],
+                cache_size=self.options["cache_size"],
+                cache_tolerance=self.options["cache_tolerance"],
+                integration_tolerance=self.options["integration_tolerance"],
             ),
             promotes=["*"],
         )
         self.add_subsystem(
             "cruise",
             _compute_cruise(
-                propulsion_id=self.options["propulsion_id"], out_file=self.options["out_file"],
+                propulsion_id=self.options["propulsion_id"],
+                out_file=self.options["out_file"],
+                out_file_formats=self.options["out_file_formats"],
+                cache_size=self.options["cache_size"],
+                cache_tolerance=self.options["cache_tolerance"],
+                integration_tolerance=self.options["integration_tolerance"],
             ),
             promotes=["*"],
         )
@@ -87,7 +135,12 @@ class Mission(om.Group):
         self.add_subsystem(
             "descent",
             _compute_descent(
-                propulsion_id=self.options["propulsion_id"], out_file=self.options["out_file"],
+                propulsion_id=self.options["propulsion_id"],
+                out_file=self.options["out_file"],
+                out_file_formats=self.options["out_file_formats"],
+                cache_size=self.options["cache_size"],
+                cache_tolerance=self.options["cache_tolerance"],
+                integration_tolerance=self.options["integration_tolerance"],
             ),
             promotes=["*"],
         )
@@ -272,6 +325,149 @@ class _Atmosphere(Atmosphere):
         self._unitary_reynolds = None
 
 
+def _fly_segment(
+    component: DynamicEquilibrium,
+    equilibrium_snapshot: EquilibriumSnapshot,
+    propulsion_model: FuelEngineSet,
+    engine_setting: EngineSetting,
+    mass_start: float,
+    time_steps: np.ndarray,
+    conditions: SegmentConditions,
+):
+    """
+    Founds the equilibrium of all the points of a flight segment at once and computes their
+    consumption, the mass of each point being updated with the fuel consumed at the previous points
+    until it converges.
+
+    :param component: component solving the equilibrium
+    :param equilibrium_snapshot: aerodynamic and mass data of the equilibrium
+    :param propulsion_model: propulsion model of the aircraft
+    :param engine_setting: engine setting of the segment
+    :param mass_start: mass at the first point in kg
+    :param time_steps: time each point consumption is integrated on in s
+    :param conditions: flight conditions of the points
+    :return: equilibrium results, computed flight points, mass and consumed mass of the points
+    """
+
+    mass = np.full_like(time_steps, mass_start)
+    equilibrium = ()
+    for _ in range(MAX_MASS_ITERATIONS):
+        equilibrium = component.dynamic_equilibrium_segment(
+            equilibrium_snapshot,
+            conditions.gamma,
+            conditions.q,
+            conditions.dvx_dt,
+            0.0,
+            mass,
+            "none",
+            equilibrium[0:2],
+        )
+        flight_point = FlightPoint(
+            mach=conditions.mach,
+            altitude=conditions.altitude,
+            engine_setting=engine_setting,
+            thrust_is_regulated=np.full_like(time_steps, True, dtype=bool),
+            thrust_rate=np.zeros_like(time_steps),
+            thrust=equilibrium[1],
+        )
+        propulsion_model.compute_flight_points(flight_point)
+        consumed_mass = propulsion_model.get_consumed_mass(flight_point, time_steps)
+        previous_mass = mass
+        mass = mass_start - (np.cumsum(consumed_mass) - consumed_mass)
+        if np.all(np.abs(mass - previous_mass) < MASS_TOLERANCE):
+            break
+
+    return equilibrium, flight_point, mass, consumed_mass
+
+
+def _fly_adaptive_segment(
+    component: DynamicEquilibrium,
+    equilibrium_snapshot: EquilibriumSnapshot,
+    propulsion_model: FuelEngineSet,
+    engine_setting: EngineSetting,
+    mass_start: float,
+    position: np.ndarray,
+    flight_conditions: Callable[[np.ndarray], SegmentConditions],
+    tolerance: float,
+):
+    """
+    Integrates a flight segment with steps adapted to its fuel consumption and ground distance.
+
+    The explicit Euler error of each step is estimated from the variation of the fuel and distance
+    rates between its two ends, and the steps with an error above their share (in length) of
+    tolerance times the segment fuel or distance are split until none is left.
+
+    :param component: component solving the equilibrium
+    :param equilibrium_snapshot: aerodynamic and mass data of the equilibrium
+    :param propulsion_model: propulsion model of the aircraft
+    :param engine_setting: engine setting of the segment
+    :param mass_start: mass at the first point in kg
+    :param position: initial positions of the points, the last one being the end of the segment
+    :param flight_conditions: function returning the flight conditions of the points at given
+    positions
+    :param tolerance: relative error tolerance on the fuel and distance of the segment
+    :return: positions, time steps, flight conditions, equilibrium results, computed flight points,
+    mass and consumed mass of the points (the last point having a null time step)
+    """
+
+    length = abs(position[-1] - position[0])
+    points_limited = False
+    while True:
+        conditions = flight_conditions(position)
+        position_steps = np.abs(np.diff(position))
+        time_steps = np.append(position_steps * np.abs(conditions.time_rate[:-1]), 0.0)
+        equilibrium, flight_point, mass, consumed_mass = _fly_segment(
+            component,
+            equilibrium_snapshot,
+            propulsion_model,
+            engine_setting,
+            mass_start,
+            time_steps,
+            conditions,
+        )
+        if length == 0.0:
+            break
+
+        # Estimate the error of each step on fuel and distance, the Euler scheme using the rate at
+        # the beginning of the step, and split the steps above tolerance in as many steps as the
+        # ratio of their error to their share of tolerance (error is proportional to step length)
+        fuel_rate = propulsion_model.get_consumed_mass(flight_point, np.abs(conditions.time_rate))
+        distance_rate = (
+            conditions.true_airspeed * np.cos(conditions.gamma) * np.abs(conditions.time_rate)
+        )
+        ratio = np.zeros_like(position_steps)
+        for rate, value in [
+            (fuel_rate, np.sum(consumed_mass)),
+            (distance_rate, np.sum(distance_rate[:-1] * position_steps)),
+        ]:
+            if value > 0.0:
+                ratio = np.maximum(
+                    ratio, 0.5 * np.abs(np.diff(rate)) * length / (tolerance * value)
+                )
+        if np.all(ratio <= 1.0):
+            break
+        if points_limited:
+            _LOGGER.warning("Integration tolerance not reached with %d points", len(position))
+            break
+        steps_count = np.maximum(np.ceil(ratio), 1.0).astype(int)
+        if np.sum(steps_count) + 1 > ADAPTIVE_MAX_POINTS:
+            # Share the maximum number of points among the steps in proportion to their error
+            steps_count = np.maximum(
+                np.floor(steps_count * (ADAPTIVE_MAX_POINTS - 1) / np.sum(steps_count)), 1.0
+            ).astype(int)
+            points_limited = True
+        step_index = np.arange(np.sum(steps_count)) - np.repeat(
+            np.cumsum(steps_count) - steps_count, steps_count
+        )
+        position = np.append(
+            np.repeat(position[:-1], steps_count)
+            + step_index * np.repeat(np.diff(position) / steps_count, steps_count),
+            position[-1],
+        )
+
+    return position, time_steps, conditions, equilibrium, flight_point, mass, consumed_mass
+
+
 class _compute_taxi(om.ExplicitComponent):
     """
     Compute the fuel consumption for taxi based on speed and duration.
@@ -346,6 +542,14 @@ class _compute_climb(DynamicEquilibrium):
     def initialize(self):
         super().initialize()
         self.options.declare("propulsion_id", default="", types=str)
+        self.options.declare(
+            "integration_tolerance",
+            default=None,
+            types=float,
+            allow_none=True,
+            desc="relative error tolerance on the fuel and distance of the phase, integrated with "
+            "adaptive steps if given (with fixed steps otherwise)",
+        )
 
     def setup(self):
         super().setup()
@@ -376,18 +580,16 @@ class _compute_climb(DynamicEquilibrium):
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
 
-        # Delete previous .csv results
+        # Delete previous results
         if self.options["out_file"] != "":
-            # noinspection PyBroadException
-            try:
-                os.remove(self.options["out_file"])
-            except:
-                _LOGGER.info("Failed to remove {} file!".format(self.options["out_file"]))
+            self.delete_out_file()
+        if self.load_cached_outputs(inputs, outputs):
+            return
 
         propulsion_model = FuelEngineSet(
             self._engine_wrapper.get_model(inputs), inputs["data:geometry:propulsion:count"]
         )
-        cruise_altitude = inputs["data:mission:sizing:main_route:cruise:altitude"]
+        cruise_altitude = float(inputs["data:mission:sizing:main_route:cruise:altitude"])
         cd0 = inputs["data:aerodynamics:aircraft:cruise:CD0"]
         coef_k_wing = inputs["data:aerodynamics:wing:cruise:induced_drag_coefficient"]
         cl_max_clean = inputs["data:aerodynamics:wing:low_speed:CL_max_clean"]
@@ -404,121 +606,125 @@ class _compute_climb(DynamicEquilibrium):
         # Define initial conditions
         t_start = time.time()
         altitude_t = SAFETY_HEIGHT  # conversion to m
-        distance_t = 0.0
-        time_t = 0.0
-        mass_t = mtow - (m_to + m_tk + m_ic)
-        mass_fuel_t = 0.0
-        previous_step = ()
+        mass_start = float(mtow - (m_to + m_tk + m_ic))
+        equilibrium_snapshot = EquilibriumSnapshot.from_inputs(inputs)
 
         # Calculate constant speed (cos(gamma)~1) and corresponding climb angle
         # FIXME: VCAS constant-speed strategy is specific to ICE-propeller configuration, should be an input!
         cl = math.sqrt(3 * cd0 / coef_k_wing)
         atm = _Atmosphere(altitude_t, altitude_in_feet=False)
-        vs1 = math.sqrt((mass_t * g) / (0.5 * atm.density * wing_area * cl_max_clean))
-        v_cas = max(math.sqrt((mass_t * g) / (0.5 * atm.density * wing_area * cl)), 1.3 * vs1)
-        atm.calibrated_airspeed = v_cas
-        v_tas = atm.true_airspeed
-        gamma = math.asin(climb_rate_sl / v_tas)
+        vs1 = math.sqrt((mass_start * g) / (0.5 * atm.density * wing_area * cl_max_clean))
+        v_cas = max(math.sqrt((mass_start * g) / (0.5 * atm.density * wing_area * cl)), 1.3 * vs1)
 
-        # Define specific time step ~POINTS_NB_CLIMB points for calculation (with ground conditions)
-        time_step = ((cruise_altitude - SAFETY_HEIGHT) / climb_rate_sl) / float(POINTS_NB_CLIMB)
-
-        while altitude_t < cruise_altitude:
+        climb_rate_interp = interp1d([0.0, cruise_altitude], [climb_rate_sl, climb_rate_cl])
 
-            # Calculate dynamic pressure
-            atm = _Atmosphere(altitude_t, altitude_in_feet=False)
+        def flight_conditions(altitude):
+            # Calculate dynamic pressure and acceleration of the points (v_z is the climb rate)
+            atm = _Atmosphere(altitude, altitude_in_feet=False)
             atm.calibrated_airspeed = v_cas
             v_tas = atm.true_airspeed
-            climb_rate = interp1d([0.0, float(cruise_altitude)], [climb_rate_sl, climb_rate_cl])(
-                altitude_t
-            )
-            gamma = math.asin(climb_rate / v_tas)
-            mach = v_tas / atm.speed_of_sound
-            atm_1 = _Atmosphere(altitude_t + 1.0, altitude_in_feet=False)
+            v_z = climb_rate_interp(altitude)
+            gamma = np.arcsin(v_z / v_tas)
+            atm_1 = _Atmosphere(altitude + 1.0, altitude_in_feet=False)
             atm_1.calibrated_airspeed = v_cas
             dv_tas_dh = atm_1.true_airspeed - v_tas
-            dvx_dt = dv_tas_dh * v_tas * math.sin(gamma)
-            q = 0.5 * atm.density * v_tas ** 2
+            return SegmentConditions(
+                altitude,
+                v_tas,
+                atm.density,
+                v_tas / atm.speed_of_sound,
+                gamma,
+                0.5 * atm.density * v_tas ** 2,
+                dv_tas_dh * v_tas * np.sin(gamma),
+                1.0 / v_z,
+            )
 
-            # Find equilibrium
-            previous_step = self.dynamic_equilibrium(
-                inputs, gamma, q, dvx_dt, 0.0, mass_t, "none", previous_step[0:2]
+        if self.options["integration_tolerance"] is None:
+            # Define specific time step ~POINTS_NB_CLIMB points for calculation (with ground
+            # conditions) and the altitude of the points, which does not depend on the equilibrium
+            time_step = ((cruise_altitude - SAFETY_HEIGHT) / climb_rate_sl) / float(POINTS_NB_CLIMB)
+            altitude = []
+            time_steps = []
+            while altitude_t < cruise_altitude:
+                v_z = float(climb_rate_interp(altitude_t))
+                time_step = min(time_step, (cruise_altitude - altitude_t) / v_z)
+                altitude.append(altitude_t)
+                time_steps.append(time_step)
+                altitude_t += v_z * time_step
+
+                # Check calculation duration
+                if (time.time() - t_start) > MAX_CALCULATION_TIME:
+                    raise Exception(
+                        "Time calculation duration for climb phase [{}s] exceeded!".format(
+                            MAX_CALCULATION_TIME
+                        )
+                    )
+            time_steps = np.array(time_steps + [0.0])
+            conditions = flight_conditions(np.array(altitude + [altitude_t]))
+
+            # Find equilibrium and compute consumption
+            equilibrium, flight_point, mass, consumed_mass = _fly_segment(
+                self,
+                equilibrium_snapshot,
+                propulsion_model,
+                EngineSetting.CLIMB,
+                mass_start,
+                time_steps,
+                conditions,
             )
-            thrust = float(previous_step[1])
-
-            # Compute consumption
-            flight_point = FlightPoint(
-                mach=mach,
-                altitude=altitude_t,
-                engine_setting=EngineSetting.CLIMB,
-                thrust_is_regulated=True,
-                thrust=thrust,
+        else:
+            (
+                _,
+                time_steps,
+                conditions,
+                equilibrium,
+                flight_point,
+                mass,
+                consumed_mass,
+            ) = _fly_adaptive_segment(
+                self,
+                equilibrium_snapshot,
+                propulsion_model,
+                EngineSetting.CLIMB,
+                mass_start,
+                np.linspace(altitude_t, cruise_altitude, ADAPTIVE_INITIAL_STEPS + 1),
+                flight_conditions,
+                self.options["integration_tolerance"],
             )
-            propulsion_model.compute_flight_points(flight_point)
-            if flight_point.thrust_rate > 1.0:
-                _LOGGER.warning("Thrust rate is above 1.0, value clipped at 1.0")
+        if np.any(flight_point.thrust_rate > 1.0):
+            _LOGGER.warning("Thrust rate is above 1.0, value clipped at 1.0")
+
+        # Calculate distance variation (earth axis) and time of the points
+        distance_steps = conditions.true_airspeed * np.cos(conditions.gamma) * time_steps
+        distance_t = np.cumsum(distance_steps) - distance_steps
+        time_t = np.cumsum(time_steps) - time_steps
 
-            # Save results
-            if self.options["out_file"] != "":
+        # Save results
+        if self.options["out_file"] != "":
+            for idx in range(len(time_steps)):
                 self.save_point(
-                    time_t,
-                    altitude_t,
-                    distance_t,
-                    mass_t,
-                    v_tas,
+                    time_t[idx],
+                    conditions.altitude[idx],
+                    distance_t[idx],
+                    mass[idx],
+                    conditions.true_airspeed[idx],
                     v_cas,
-                    atm.density,
-                    gamma * 180.0 / math.pi,
-                    previous_step,
-                    flight_point.thrust_rate,
-                    flight_point.sfc,
+                    conditions.density[idx],
+                    conditions.gamma[idx] * 180.0 / math.pi,
+                    [result[idx] for result in equilibrium],
+                    flight_point.thrust_rate[idx],
+                    flight_point.sfc[idx],
                     "sizing:main_route:climb",
                 )
+            self.flush_points()
 
-            consumed_mass_1s = propulsion_model.get_consumed_mass(flight_point, 1.0)
-
-            # Calculate distance variation (earth axis)
-            v_z = v_tas * math.sin(gamma)
-            v_x = v_tas * math.cos(gamma)
-            time_step = min(time_step, (cruise_altitude - altitude_t) / v_z)
-            altitude_t += v_z * time_step
-            distance_t += v_x * time_step
-
-            # Estimate mass evolution and update time
-            mass_fuel_t += consumed_mass_1s * time_step
-            mass_t = mass_t - consumed_mass_1s * time_step
-            time_t += time_step
-
-            # Check calculation duration
-            if (time.time() - t_start) > MAX_CALCULATION_TIME:
-                raise Exception(
-                    "Time calculation duration for climb phase [{}s] exceeded!".format(
-                        MAX_CALCULATION_TIME
-                    )
-                )
-
-        # Save results
-        if self.options["out_file"] != "":
-            self.save_point(
-                time_t,
-                altitude_t,
-                distance_t,
-                mass_t,
-                v_tas,
-                v_cas,
-                atm.density,
-                gamma * 180.0 / np.pi,
-                previous_step,
-                flight_point.thrust_rate,
-                flight_point.sfc,
-                "sizing:main_route:climb",
-            )
-
-        outputs["data:mission:sizing:main_route:climb:fuel"] = mass_fuel_t
-        outputs["data:mission:sizing:main_route:climb:distance"] = distance_t
-        outputs["data:mission:sizing:main_route:climb:duration"] = time_t
+        outputs["data:mission:sizing:main_route:climb:fuel"] = np.sum(consumed_mass)
+        outputs["data:mission:sizing:main_route:climb:distance"] = np.sum(distance_steps)
+        outputs["data:mission:sizing:main_route:climb:duration"] = np.sum(time_steps)
         outputs["data:mission:sizing:main_route:climb:v_cas"] = v_cas
 
+        self.save_cached_outputs(inputs, outputs)
+
 
 class _compute_cruise(DynamicEquilibrium):
     """
@@ -533,6 +739,14 @@ class _compute_cruise(DynamicEquilibrium):
     def initialize(self):
         super().initialize()
         self.options.declare("propulsion_id", default="", types=str)
+        self.options.declare(
+            "integration_tolerance",
+            default=None,
+            types=float,
+            allow_none=True,
+            desc="relative error tolerance on the fuel and distance of the phase, integrated with "
+            "adaptive steps if given (with fixed steps otherwise)",
+        )
 
     def setup(self):
         super().setup()
@@ -560,118 +774,133 @@ class _compute_cruise(DynamicEquilibrium):
         self.declare_partials("*", "*", method="fd")
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+        if self.load_cached_outputs(inputs, outputs):
+            return
+
         propulsion_model = FuelEngineSet(
             self._engine_wrapper.get_model(inputs), inputs["data:geometry:propulsion:count"]
         )
-        v_tas = inputs["data:TLAR:v_cruise"]
-        cruise_distance = max(
-            0.0,
-            (
-                inputs["data:TLAR:range"]
-                - inputs["data:mission:sizing:main_route:climb:distance"]
-                - inputs["data:mission:sizing:main_route:descent:distance"]
-            ),
+        v_tas = float(inputs["data:TLAR:v_cruise"])
+        cruise_distance = float(
+            max(
+                0.0,
+                (
+                    inputs["data:TLAR:range"]
+                    - inputs["data:mission:sizing:main_route:climb:distance"]
+                    - inputs["data:mission:sizing:main_route:descent:distance"]
+                ),
+            )
         )
-        cruise_altitude = inputs["data:mission:sizing:main_route:cruise:altitude"]
+        cruise_altitude = float(inputs["data:mission:sizing:main_route:cruise:altitude"])
         mtow = inputs["data:weight:aircraft:MTOW"]
         m_to = inputs["data:mission:sizing:taxi_out:fuel"]
         m_tk = inputs["data:mission:sizing:takeoff:fuel"]
         m_ic = inputs["data:mission:sizing:initial_climb:fuel"]
         m_cl = inputs["data:mission:sizing:main_route:climb:fuel"]
 
-        # Define specific time step ~POINTS_NB_CRUISE points for calculation
-        time_step = (cruise_distance / v_tas) / float(POINTS_NB_CRUISE)
-
         # Define initial conditions
         t_start = time.time()
         distance_t = 0.0
-        time_t = 0.0
-        mass_fuel_t = 0.0
-        mass_t = mtow - (m_to + m_tk + m_ic + m_cl)
+        mass_start = float(mtow - (m_to + m_tk + m_ic + m_cl))
         atm = _Atmosphere(cruise_altitude, altitude_in_feet=False)
         atm.true_airspeed = v_tas
         mach = atm.mach
-        previous_step = ()
-
-        while distance_t < cruise_distance:
-
-            # Calculate dynamic pressure
-            q = 0.5 * atm.density * v_tas ** 2
+        q = 0.5 * atm.density * v_tas ** 2
+        equilibrium_snapshot = EquilibriumSnapshot.from_inputs(inputs)
+
+        def flight_conditions(distance):
+            return SegmentConditions(
+                np.full_like(distance, cruise_altitude),
+                np.full_like(distance, v_tas),
+                np.full_like(distance, atm.density),
+                np.full_like(distance, mach),
+                np.zeros_like(distance),
+                np.full_like(distance, q),
+                np.zeros_like(distance),
+                np.full_like(distance, 1.0 / v_tas),
+            )
 
-            # Find equilibrium
-            previous_step = self.dynamic_equilibrium(
-                inputs, 0.0, q, 0.0, 0.0, mass_t, "none", previous_step[0:2]
+        if self.options["integration_tolerance"] is None:
+            # Define specific time step ~POINTS_NB_CRUISE points for calculation
+            time_step = (cruise_distance / v_tas) / float(POINTS_NB_CRUISE)
+
+            # Define the distance of the points and the time their consumption is integrated on
+            # (the remaining time after the distance increase)
+            distance = []
+            time_steps = []
+            while distance_t < cruise_distance:
+                distance.append(distance_t)
+                distance_t += v_tas * min(time_step, (cruise_distance - distance_t) / v_tas)
+                time_steps.append(min(time_step, (cruise_distance - distance_t) / v_tas))
+
+                # Check calculation duration
+                if (time.time() - t_start) > MAX_CALCULATION_TIME:
+                    raise Exception(
+                        "Time calculation duration for cruise phase [{}s] exceeded!".format(
+                            MAX_CALCULATION_TIME
+                        )
+                    )
+            distance = np.array(distance + [distance_t])
+            time_steps = np.array(time_steps + [0.0])
+
+            # Find equilibrium and compute consumption
+            equilibrium, flight_point, mass, consumed_mass = _fly_segment(
+                self,
+                equilibrium_snapshot,
+                propulsion_model,
+                EngineSetting.CRUISE,
+                mass_start,
+                time_steps,
+                flight_conditions(distance),
             )
-            thrust = float(previous_step[1])
-
-            # Compute consumption
-            flight_point = FlightPoint(
-                mach=mach,
-                altitude=cruise_altitude,
-                engine_setting=EngineSetting.CRUISE,
-                thrust_is_regulated=True,
-                thrust=thrust,
+        else:
+            (
+                distance,
+                time_steps,
+                _,
+                equilibrium,
+                flight_point,
+                mass,
+                consumed_mass,
+            ) = _fly_adaptive_segment(
+                self,
+                equilibrium_snapshot,
+                propulsion_model,
+                EngineSetting.CRUISE,
+                mass_start,
+                np.linspace(0.0, cruise_distance, ADAPTIVE_INITIAL_STEPS + 1),
+                flight_conditions,
+                self.options["integration_tolerance"],
             )
-            propulsion_model.compute_flight_points(flight_point)
-            if flight_point.thrust_rate > 1.0:
-                _LOGGER.warning("Thrust rate is above 1.0, value clipped at 1.0")
+            distance_t = cruise_distance
+        if np.any(flight_point.thrust_rate > 1.0):
+            _LOGGER.warning("Thrust rate is above 1.0, value clipped at 1.0")
+        time_t = np.cumsum(time_steps) - time_steps
 
-            # Save results
-            if self.options["out_file"] != "":
+        # Save results
+        if self.options["out_file"] != "":
+            for idx in range(len(distance)):
                 self.save_point(
-                    time_t + inputs["data:mission:sizing:main_route:climb:duration"],
+                    time_t[idx] + inputs["data:mission:sizing:main_route:climb:duration"],
                     cruise_altitude,
-                    distance_t + inputs["data:mission:sizing:main_route:climb:distance"],
-                    mass_t,
+                    distance[idx] + inputs["data:mission:sizing:main_route:climb:distance"],
+                    mass[idx],
                     v_tas,
                     atm.calibrated_airspeed,
                     atm.density,
                     0.0,
-                    previous_step,
-                    flight_point.thrust_rate,
-                    flight_point.sfc,
+                    [result[idx] for result in equilibrium],
+                    flight_point.thrust_rate[idx],
+                    flight_point.sfc[idx],
                     "sizing:main_route:cruise",
                 )
+            self.flush_points()
 
-            consumed_mass_1s = propulsion_model.get_consumed_mass(flight_point, 1.0)
-            # Calculate distance increase
-            distance_t += v_tas * min(time_step, (cruise_distance - distance_t) / v_tas)
-
-            # Estimate mass evolution and update time
-            mass_fuel_t += consumed_mass_1s * min(time_step, (cruise_distance - distance_t) / v_tas)
-            mass_t = mass_t - consumed_mass_1s * min(
-                time_step, (cruise_distance - distance_t) / v_tas
-            )
-            time_t += min(time_step, (cruise_distance - distance_t) / v_tas)
-
-            # Check calculation duration
-            if (time.time() - t_start) > MAX_CALCULATION_TIME:
-                raise Exception(
-                    "Time calculation duration for cruise phase [{}s] exceeded!".format(
-                        MAX_CALCULATION_TIME
-                    )
-                )
-
-        # Save results
-        if self.options["out_file"] != "":
-            self.save_point(
-                time_t + inputs["data:mission:sizing:main_route:climb:duration"],
-                cruise_altitude,
-                distance_t + inputs["data:mission:sizing:main_route:climb:distance"],
-                mass_t,
-                v_tas,
-                atm.calibrated_airspeed,
-                atm.density,
-                0.0,
-                previous_step,
-                flight_point.thrust_rate,
-                flight_point.sfc,
-                "sizing:main_route:cruise",
-            )
-
-        outputs["data:mission:sizing:main_route:cruise:fuel"] = mass_fuel_t
+        outputs["data:mission:sizing:main_route:cruise:fuel"] = np.sum(consumed_mass)
         outputs["data:mission:sizing:main_route:cruise:distance"] = distance_t
-        outputs["data:mission:sizing:main_route:cruise:duration"] = time_t
+        outputs["data:mission:sizing:main_route:cruise:duration"] = np.sum(time_steps)
+
+        self.save_cached_outputs(inputs, outputs)
 
 
 class _compute_descent(DynamicEquilibrium):
@@ -689,6 +918,14 @@ class _compute_descent(DynamicEquilibrium):
     def initialize(self):
         super().initialize()
         self.options.declare("propulsion_id", default="", types=str)
+        self.options.declare(
+            "integration_tolerance",
+            default=None,
+            types=float,
+            allow_none=True,
+            desc="relative error tolerance on the fuel and distance of the phase, integrated with "
+            "adaptive steps if given (with fixed steps otherwise)",
+        )
 
     def setup(self):
         super().setup()
@@ -719,11 +956,14 @@ class _compute_descent(DynamicEquilibrium):
         self.declare_partials("*", "*", method="fd")
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+        if self.load_cached_outputs(inputs, outputs):
+            return
+
         propulsion_model = FuelEngineSet(
             self._engine_wrapper.get_model(inputs), inputs["data:geometry:propulsion:count"]
         )
         cruise_altitude = inputs["data:mission:sizing:main_route:cruise:altitude"]
-        descent_rate = inputs["data:mission:sizing:main_route:descent:descent_rate"]
+        descent_rate = float(inputs["data:mission:sizing:main_route:descent:descent_rate"])
         cl = inputs["data:aerodynamics:aircraft:cruise:optimal_CL"]
         cl_max_clean = inputs["data:aerodynamics:wing:low_speed:CL_max_clean"]
         wing_area = inputs["data:geometry:wing:area"]
@@ -736,94 +976,164 @@ class _compute_descent(DynamicEquilibrium):
 
         # Define initial conditions
         t_start = time.time()
-        altitude_t = copy.deepcopy(cruise_altitude)
-        distance_t = 0.0
-        time_t = 0.0
-        mass_fuel_t = 0.0
-        mass_t = mtow - (m_to + m_tk + m_ic + m_cl + m_cr)
-        previous_step = ()
+        altitude_t = float(cruise_altitude)
+        mass_start = float(mtow - (m_to + m_tk + m_ic + m_cl + m_cr))
+        equilibrium_snapshot = EquilibriumSnapshot.from_inputs(inputs)
 
         # Calculate constant speed (cos(gamma)~1) and corresponding descent angle
         # FIXME: VCAS constant-speed strategy is specific to ICE-propeller configuration, should be an input!
         atm = _Atmosphere(altitude_t)
-        vs1 = math.sqrt((mass_t * g) / (0.5 * atm.density * wing_area * cl_max_clean))
-        v_cas = max(math.sqrt((mass_t * g) / (0.5 * atm.density * wing_area * cl)), 1.3 * vs1)
-        atm.calibrated_airspeed = v_cas
-        v_tas = atm.true_airspeed
-        gamma = math.asin(descent_rate / v_cas)
-
-        # Define specific time step ~POINTS_NB_CLIMB points for calculation (with ground conditions)
-        time_step = abs((altitude_t / descent_rate)) / float(POINTS_NB_DESCENT)
-
-        while altitude_t > 0.0:
-
-            # Calculate dynamic pressure
-            atm = _Atmosphere(altitude_t, altitude_in_feet=False)
+        vs1 = math.sqrt((mass_start * g) / (0.5 * atm.density * wing_area * cl_max_clean))
+        v_cas = max(math.sqrt((mass_start * g) / (0.5 * atm.density * wing_area * cl)), 1.3 * vs1)
+        gamma_t = math.asin(descent_rate / v_cas)
+
+        # Path angle of the points below each altitude (reduced where the thrust is negative)
+        gamma_steps = [(altitude_t, gamma_t)]
+
+        def flight_conditions(altitude):
+            # Calculate dynamic pressure and acceleration of the points
+            gamma = np.empty_like(altitude)
+            for altitude_step, gamma_step in gamma_steps:
+                gamma[altitude <= altitude_step] = gamma_step
+            atm = _Atmosphere(altitude, altitude_in_feet=False)
             atm.calibrated_airspeed = v_cas
             v_tas = atm.true_airspeed
-            mach = v_tas / atm.speed_of_sound
-            atm_1 = _Atmosphere(altitude_t + 1.0, altitude_in_feet=False)
+            atm_1 = _Atmosphere(altitude + 1.0, altitude_in_feet=False)
             atm_1.calibrated_airspeed = v_cas
             dv_tas_dh = atm_1.true_airspeed - v_tas
-            dvx_dt = dv_tas_dh * v_tas * math.sin(gamma)
-            q = 0.5 * atm.density * v_tas ** 2
+            return SegmentConditions(
+                altitude,
+                v_tas,
+                atm.density,
+                v_tas / atm.speed_of_sound,
+                gamma,
+                0.5 * atm.density * v_tas ** 2,
+                dv_tas_dh * v_tas * np.sin(gamma),
+                1.0 / (v_tas * np.sin(gamma)),
+            )
 
-            # Find equilibrium, decrease gamma if obtained thrust is negative
-            previous_step = self.dynamic_equilibrium(
-                inputs, gamma, q, dvx_dt, 0.0, mass_t, "none", previous_step[0:2]
+        # Define specific time step ~POINTS_NB_CLIMB points for calculation (with ground conditions)
+        time_step = abs((altitude_t / descent_rate)) / float(POINTS_NB_DESCENT)
+        if self.options["integration_tolerance"] is None:
+            altitude, time_steps = self._compute_altitude(
+                altitude_t, gamma_t, time_step, v_cas, t_start
             )
-            thrust = previous_step[1]
-            while thrust < 0.0:
-                gamma = 0.9 * gamma
-                previous_step = self.dynamic_equilibrium(
-                    inputs, gamma, q, dvx_dt, 0.0, mass_t, "none", previous_step[0:2]
-                )
-                thrust = previous_step[1]
+        else:
+            altitude = np.linspace(altitude_t, 0.0, ADAPTIVE_INITIAL_STEPS + 1)
+
+        while True:
 
-            # Compute consumption
+            # Find equilibrium and compute consumption
             # FIXME: DESCENT setting on engine does not exist, replaced by CLIMB for test
-            flight_point = FlightPoint(
-                mach=mach,
-                altitude=altitude_t,
-                engine_setting=EngineSetting.CLIMB,
-                thrust_is_regulated=True,
-                thrust=thrust,
-            )
-            propulsion_model.compute_flight_points(flight_point)
-            # Save results
-            if self.options["out_file"] != "":
+            if self.options["integration_tolerance"] is None:
+                conditions = flight_conditions(altitude)
+                equilibrium, flight_point, mass, consumed_mass = _fly_segment(
+                    self,
+                    equilibrium_snapshot,
+                    propulsion_model,
+                    EngineSetting.CLIMB,
+                    mass_start,
+                    time_steps,
+                    conditions,
+                )
+            else:
+                (
+                    altitude,
+                    time_steps,
+                    conditions,
+                    equilibrium,
+                    flight_point,
+                    mass,
+                    consumed_mass,
+                ) = _fly_adaptive_segment(
+                    self,
+                    equilibrium_snapshot,
+                    propulsion_model,
+                    EngineSetting.CLIMB,
+                    mass_start,
+                    altitude,
+                    flight_conditions,
+                    self.options["integration_tolerance"],
+                )
+
+            # Decrease gamma from the first point with a negative thrust, which changes the altitude
+            # of the following points when they are defined with fixed time steps
+            negative_thrust = np.flatnonzero(equilibrium[1][:-1] < 0.0)
+            if len(negative_thrust) == 0:
+                break
+            idx = negative_thrust[0]
+            gamma_t = 0.9 * conditions.gamma[idx]
+            gamma_steps = [
+                (altitude_step, gamma_step)
+                for altitude_step, gamma_step in gamma_steps
+                if altitude_step > altitude[idx]
+            ] + [(altitude[idx], gamma_t)]
+            if self.options["integration_tolerance"] is None:
+                altitude_end, time_steps_end = self._compute_altitude(
+                    altitude[idx], gamma_t, time_step, v_cas, t_start
+                )
+                altitude = np.concatenate((altitude[:idx], altitude_end))
+                time_steps = np.concatenate((time_steps[:idx], time_steps_end))
+
+        # Calculate distance variation (earth axis) and time of the points
+        distance_steps = conditions.true_airspeed * np.cos(conditions.gamma) * time_steps
+        distance_t = np.cumsum(distance_steps) - distance_steps
+        time_t = np.cumsum(time_steps) - time_steps
+
+        # Save results
+        if self.options["out_file"] != "":
+            for idx in range(len(altitude)):
                 self.save_point(
-                    time_t
+                    time_t[idx]
                     + inputs["data:mission:sizing:main_route:climb:duration"]
                     + inputs["data:mission:sizing:main_route:cruise:duration"],
-                    altitude_t,
-                    distance_t
+                    altitude[idx],
+                    distance_t[idx]
                     + inputs["data:mission:sizing:main_route:climb:distance"]
                     + inputs["data:mission:sizing:main_route:cruise:distance"],
-                    mass_t,
-                    v_tas,
+                    mass[idx],
+                    conditions.true_airspeed[idx],
                     v_cas,
-                    atm.density,
-                    gamma * 180.0 / np.pi,
-                    previous_step,
-                    flight_point.thrust_rate,
-                    flight_point.sfc,
+                    conditions.density[idx],
+                    conditions.gamma[idx] * 180.0 / np.pi,
+                    [result[idx] for result in equilibrium],
+                    flight_point.thrust_rate[idx],
+                    flight_point.sfc[idx],
                     "sizing:main_route:descent",
                 )
-            consumed_mass_1s = propulsion_model.get_consumed_mass(flight_point, 1.0)
-
-            # Calculate distance variation (earth axis)
-            v_x = v_tas * math.cos(gamma)
-            v_z = v_tas * math.sin(gamma)
+            self.flush_points()
+
+        outputs["data:mission:sizing:main_route:descent:fuel"] = np.sum(consumed_mass)
+        outputs["data:mission:sizing:main_route:descent:distance"] = np.sum(distance_steps)
+        outputs["data:mission:sizing:main_route:descent:duration"] = np.sum(time_steps)
+
+        self.save_cached_outputs(inputs, outputs)
+
+    @staticmethod
+    def _compute_altitude(altitude_t, gamma, time_step, v_cas, t_start):
+        """
+        Computes the altitude of the points descending with constant VCAS and path angle.
+
+        :param altitude_t: altitude of the first point in m
+        :param gamma: path angle in rad.
+        :param time_step: time step in s
+        :param v_cas: calibrated air speed in m/s
+        :param t_start: start time of the phase computation
+        :return: altitude of the points and time step from each point to the next one (null for
+        the last point, which is the end of the descent)
+        """
+
+        altitude = []
+        time_steps = []
+        while altitude_t > 0.0:
+            atm = _Atmosphere(altitude_t, altitude_in_feet=False)
+            atm.calibrated_airspeed = v_cas
+            v_z = atm.true_airspeed * math.sin(gamma)
             time_step = min(time_step, -altitude_t / v_z)
-            distance_t += v_x * time_step
+            altitude.append(altitude_t)
+            time_steps.append(time_step)
             altitude_t += v_z * time_step
 
-            # Estimate mass evolution and update time
-            mass_fuel_t += consumed_mass_1s * time_step
-            mass_t = mass_t - consumed_mass_1s * time_step
-            time_t += time_step
-
             # Check calculation duration
             if (time.time() - t_start) > MAX_CALCULATION_TIME:
                 raise Exception(
@@ -832,27 +1142,4 @@ class _compute_descent(DynamicEquilibrium):
                     )
                 )
 
-        # Save results
-        if self.options["out_file"] != "":
-            self.save_point(
-                time_t
-                + inputs["data:mission:sizing:main_route:climb:duration"]
-                + inputs["data:mission:sizing:main_route:cruise:duration"],
-                altitude_t,
-                distance_t
-                + inputs["data:mission:sizing:main_route:climb:distance"]
-                + inputs["data:mission:sizing:main_route:cruise:distance"],
-                mass_t,
-                v_tas,
-                v_cas,
-                atm.density,
-                gamma * 180.0 / np.pi,
-                previous_step,
-                flight_point.thrust_rate,
-                flight_point.sfc,
-                "sizing:main_route:descent",
-            )
-
-        outputs["data:mission:sizing:main_route:descent:fuel"] = mass_fuel_t
-        outputs["data:mission:sizing:main_route:descent:distance"] = distance_t
-        outputs["data:mission:sizing:main_route:descent:duration"] = time_t
+        return np.array(altitude + [altitude_t]), np.array(time_steps + [0.0])
@@ -13,7 +13,6 @@
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
 import numpy as np
-import os
 import math
 import openmdao.api as om
 import copy
@@ -33,7 +32,11 @@ from fastoad.module_management.service_registry import RegisterOpenMDAOSystem
 from fastoad.module_management.constants import ModelDomain
 
 from fastga.models.performances.takeoff_HE import SAFETY_HEIGHT, TakeOffPhase
-from fastga.models.performances.dynamic_equilibrium import DynamicEquilibrium
+from fastga.models.performances.dynamic_equilibrium import (
+    DynamicEquilibrium,
+    EquilibriumSnapshot,
+    CACHE_SIZE,
+)
 
 from fastga.models.propulsion.hybrid_propulsion.base import HybridEngineSet
 from fastga.models.weight.cg.cg_variation import InFlightCGVariation
@@ -59,6 +62,20 @@ class Mission_HE(om.Group):
     def initialize(self):
         self.options.declare("propulsion_id", default=None, types=str, allow_none=True)
         self.options.declare("out_file", default="", types=str)
+        self.options.declare("out_file_formats", default=["csv"], types=list)
+        self.options.declare(
+            "cache_size",
+            default=CACHE_SIZE,
+            types=int,
+            desc="number of computations of each phase kept in memory, 0 to disable the cache",
+        )
+        self.options.declare(
+            "cache_tolerance",
+            default=0.0,
+            types=float,
+            desc="relative tolerance under which the inputs of a phase are considered equal to "
+            "cached ones",
+        )
 
     def setup(self):
         self.add_subsystem("in_flight_cg_variation", InFlightCGVariation(), promotes=["*"])
@@ -73,14 +90,22 @@ class Mission_HE(om.Group):
         self.add_subsystem(
             "climb",
             _compute_climb(
-                propulsion_id=self.options["propulsion_id"], out_file=self.options["out_file"],
+                propulsion_id=self.options["propulsion_id"],
+                out_file=self.options["out_file"],
+                out_file_formats=self.options["out_file_formats"],
+                cache_size=self.options["cache_size"],
+                cache_tolerance=self.options["cache_tolerance"],
             ),
             promotes=["*"],
         )
         self.add_subsystem(
             "cruise",
             _compute_cruise(
-                propulsion_id=self.options["propulsion_id"], out_file=self.options["out_file"],
+                propulsion_id=self.options["propulsion_id"],
+                out_file=self.options["out_file"],
+                out_file_formats=self.options["out_file_formats"],
+                cache_size=self.options["cache_size"],
+                cache_tolerance=self.options["cache_tolerance"],
             ),
             promotes=["*"],
         )
@@ -88,7 +113,11 @@ class Mission_HE(om.Group):
         self.add_subsystem(
             "descent",
             _compute_descent(
-                propulsion_id=self.options["propulsion_id"], out_file=self.options["out_file"],
+                propulsion_id=self.options["propulsion_id"],
+                out_file=self.options["out_file"],
+                out_file_formats=self.options["out_file_formats"],
+                cache_size=self.options["cache_size"],
+                cache_tolerance=self.options["cache_tolerance"],
             ),
             promotes=["*"],
         )
@@ -565,13 +594,11 @@ class _compute_climb(DynamicEquilibrium):
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
 
-        # Delete previous .csv results
+        # Delete previous results
         if self.options["out_file"] != "":
-            # noinspection PyBroadException
-            try:
-                os.remove(self.options["out_file"])
-            except:
-                _LOGGER.info("Failed to remove {} file!".format(self.options["out_file"]))
+            self.delete_out_file()
+        if self.load_cached_outputs(inputs, outputs):
+            return
 
         propulsion_model = HybridEngineSet(
             self._engine_wrapper.get_model(inputs), inputs["data:geometry:propulsion:count"]
@@ -597,6 +624,7 @@ class _compute_climb(DynamicEquilibrium):
         mass_t = mtow - (m_to + m_tk + m_ic)
         mass_fuel_t = 0.0
         previous_step = ()
+        equilibrium_snapshot = EquilibriumSnapshot.from_inputs(inputs)
 
         # Define initial conditions of the battery(ies)
         bat_capacity = 0.0
@@ -642,7 +670,7 @@ class _compute_climb(DynamicEquilibrium):
 
             # Find equilibrium
             previous_step = self.dynamic_equilibrium(
-                inputs, gamma, q, dvx_dt, 0.0, mass_t, "none", previous_step[0:2]
+                equilibrium_snapshot, gamma, q, dvx_dt, 0.0, mass_t, "none", previous_step[0:2]
             )
             thrust = float(previous_step[1])
 
@@ -735,6 +763,7 @@ class _compute_climb(DynamicEquilibrium):
                 flight_point.sfc,
                 "sizing:main_route:climb",
             )
+            self.flush_points()
 
         outputs["data:mission:sizing:main_route:climb:fuel"] = mass_fuel_t
         outputs["data:mission:sizing:main_route:climb:distance"] = distance_t
@@ -748,6 +777,8 @@ class _compute_climb(DynamicEquilibrium):
         outputs["data:mission:sizing:main_route:climb:battery_time_array"] = climb_time
         outputs["data:mission:sizing:main_route:climb:battery_capacity_array"] = climb_capacity
 
+        self.save_cached_outputs(inputs, outputs)
+
 
 class _compute_cruise(DynamicEquilibrium):
     """
@@ -803,6 +834,9 @@ class _compute_cruise(DynamicEquilibrium):
         self.declare_partials("*", "*", method="fd")
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+        if self.load_cached_outputs(inputs, outputs):
+            return
+
         propulsion_model = HybridEngineSet(
             self._engine_wrapper.get_model(inputs), inputs["data:geometry:propulsion:count"]
         )
@@ -844,6 +878,7 @@ class _compute_cruise(DynamicEquilibrium):
         atm.true_airspeed = v_tas
         mach = atm.mach
         previous_step = ()
+        equilibrium_snapshot = EquilibriumSnapshot.from_inputs(inputs)
 
         while distance_t < cruise_distance:
 
@@ -852,7 +887,7 @@ class _compute_cruise(DynamicEquilibrium):
 
             # Find equilibrium
             previous_step = self.dynamic_equilibrium(
-                inputs, 0.0, q, 0.0, 0.0, mass_t, "none", previous_step[0:2]
+                equilibrium_snapshot, 0.0, q, 0.0, 0.0, mass_t, "none", previous_step[0:2]
             )
             thrust = float(previous_step[1])
 
@@ -945,6 +980,7 @@ class _compute_cruise(DynamicEquilibrium):
                 flight_point.sfc,
                 "sizing:main_route:cruise",
             )
+            self.flush_points()
 
         outputs["data:mission:sizing:main_route:cruise:fuel"] = mass_fuel_t
         # outputs["data:mission:sizing:main_route:cruise:power"] = power_cruise
@@ -957,6 +993,8 @@ class _compute_cruise(DynamicEquilibrium):
         outputs["data:mission:sizing:main_route:cruise:distance"] = distance_t
         outputs["data:mission:sizing:main_route:cruise:duration"] = time_t
 
+        self.save_cached_outputs(inputs, outputs)
+
 
 class _compute_descent(DynamicEquilibrium):
     """
@@ -1017,6 +1055,9 @@ class _compute_descent(DynamicEquilibrium):
         self.declare_partials("*", "*", method="fd")
 
     def compute(self, inputs, outputs, discrete_inputs=None, discrete_outputs=None):
+        if self.load_cached_outputs(inputs, outputs):
+            return
+
         propulsion_model = HybridEngineSet(
             self._engine_wrapper.get_model(inputs), inputs["data:geometry:propulsion:count"]
         )
@@ -1041,6 +1082,7 @@ class _compute_descent(DynamicEquilibrium):
         mass_fuel_t = 0.0
         mass_t = mtow - (m_to + m_tk + m_ic + m_cl + m_cr)
         previous_step = ()
+        equilibrium_snapshot = EquilibriumSnapshot.from_inputs(inputs)
 
         descent_power = [0]
         descent_time = [0]
@@ -1080,13 +1122,13 @@ class _compute_descent(DynamicEquilibrium):
 
             # Find equilibrium, decrease gamma if obtained thrust is negative
             previous_step = self.dynamic_equilibrium(
-                inputs, gamma, q, dvx_dt, 0.0, mass_t, "none", previous_step[0:2]
+                equilibrium_snapshot, gamma, q, dvx_dt, 0.0, mass_t, "none", previous_step[0:2]
             )
             thrust = previous_step[1]
             while thrust < 0.0:
                 gamma = 0.9 * gamma
                 previous_step = self.dynamic_equilibrium(
-                    inputs, gamma, q, dvx_dt, 0.0, mass_t, "none", previous_step[0:2]
+                    equilibrium_snapshot, gamma, q, dvx_dt, 0.0, mass_t, "none", previous_step[0:2]
                 )
                 thrust = previous_step[1]
 
@@ -1183,6 +1225,7 @@ class _compute_descent(DynamicEquilibrium):
                 flight_point.sfc,
                 "sizing:main_route:descent",
             )
+            self.flush_points()
 
         # outputs["data:mission:sizing:main_route:descent:fuel"] = mass_fuel_t
         outputs["data:mission:sizing:main_route:descent:battery_power"] = power_descent
@@ -1194,3 +1237,5 @@ class _compute_descent(DynamicEquilibrium):
         outputs["data:mission:sizing:main_route:descent:battery_capacity_array"] = descent_capacity
         outputs["data:mission:sizing:main_route:descent:distance"] = distance_t
         outputs["data:mission:sizing:main_route:descent:duration"] = time_t
+
+        self.save_cached_outputs(inputs, outputs)
@@ -28,11 +28,14 @@ from fastoad.module_management._bundle_loader import BundleLoader
 from fastoad.constants import EngineSetting
 
 from fastga.models.propulsion.fuel_propulsion.base import FuelEngineSet
+from fastga.models.performances.takeoff_simulation import (
+    TakeOffSimulation,
+    SAFETY_HEIGHT,
+    SPEED,
+    DISTANCE,
+    CONSUMPTIONS,
+)
 
-ALPHA_LIMIT = 13.5 * math.pi / 180.0  # Limit angle to touch tail on ground in rad
-ALPHA_RATE = 3.0 * math.pi / 180.0  # Angular rotation speed in rad/s
-SAFETY_HEIGHT = 50 * 0.3048  # Height in meters to reach V2 speed
-TIME_STEP = 0.1  # For time dependent simulation
 CLIMB_GRAD_AEO = 0.083  # Climb gradient when all engine are operating, based on CS23.65
 
 _LOGGER = logging.getLogger(__name__)
@@ -270,116 +273,25 @@ class _v_lift_off_from_v2(om.ExplicitComponent):
         v2_target = float(inputs["v2:speed"])
         alpha_v2 = float(inputs["v2:angle"])
 
-        # Define ground factor effect on Drag
-        def k_ground(altitude):
-            return (
-                33.0
-                * ((lg_height + altitude) / wing_span) ** 1.5
-                / (1.0 + 33.0 * ((lg_height + altitude) / wing_span) ** 1.5)
-            )
-
-        # Calculate v2 speed @ safety height for different alpha lift-off
-        alpha = np.linspace(0.0, min(ALPHA_LIMIT, alpha_v2), num=10)
-        v_lift_off = np.zeros(np.size(alpha))
-        v2 = np.zeros(np.size(alpha))
-        atm_0 = Atmosphere(0.0)
-
-        # Step 1.0 computes the lift-off speed for different value of angle of attack ranging from 0° to the angle of
-        # attack corresponding to the V2 computation from previously
-
-        for i in range(len(alpha)):
-
-            # Calculate lift coefficient
-            cl = cl0 + cl_alpha * alpha[i]
-            # Loop on estimated lift-off speed error induced by thrust estimation
-            rel_error = 0.1
-            v_lift_off[i] = math.sqrt((mtow * g) / (0.5 * atm_0.density * wing_area * cl))
-            while rel_error > 0.05:
-                # Update thrust with v_lift_off
-                flight_point = FlightPoint(
-                    mach=v_lift_off[i] / atm_0.speed_of_sound,
-                    altitude=0.0,
-                    engine_setting=EngineSetting.TAKEOFF,
-                    thrust_rate=thrust_rate,
-                )
-                propulsion_model.compute_flight_points(flight_point)
-                thrust = float(flight_point.thrust)
-                # Calculate v_lift_off necessary to overcome weight
-                if thrust * math.sin(alpha[i]) > mtow * g:
-                    break
-                else:
-                    v = math.sqrt(
-                        (mtow * g - thrust * math.sin(alpha[i]))
-                        / (0.5 * atm_0.density * wing_area * cl)
-                    )
-                rel_error = abs(v - v_lift_off[i]) / v
-                v_lift_off[i] = v
-
-            # Step 2.0 consists in performing the transition from v_lift_off to V2 with a constant rotation speed for
-            # the same range of AOA
-
-            # Perform climb with imposed rotational speed till reaching safety height
-            alpha_t = alpha[i]
-            gamma_t = 0.0
-            v_t = float(v_lift_off[i])
-            altitude_t = 0.0
-            distance_t = 0.0
-            while altitude_t < SAFETY_HEIGHT:
-                # Estimation of thrust
-                atm = Atmosphere(altitude_t, altitude_in_feet=False)
-                flight_point = FlightPoint(
-                    mach=v_t / atm.speed_of_sound,
-                    altitude=altitude_t,
-                    engine_setting=EngineSetting.TAKEOFF,
-                    thrust_rate=thrust_rate,
-                )
-                propulsion_model.compute_flight_points(flight_point)
-                thrust = float(flight_point.thrust)
-                # Calculate lift and drag
-                cl = cl0 + cl_alpha * alpha_t
-                lift = 0.5 * atm.density * wing_area * cl * v_t ** 2
-                cd = cd0 + k_ground(altitude_t) * coeff_k * cl ** 2
-                drag = 0.5 * atm.density * wing_area * cd * v_t ** 2
-                # Calculate acceleration on x/z air axis
-                weight = mtow * g
-                acc_x = (thrust * math.cos(alpha_t) - weight * math.sin(gamma_t) - drag) / mtow
-                acc_z = (lift + thrust * math.sin(alpha_t) - weight * math.cos(gamma_t)) / mtow
-                # Calculate gamma change and new speed
-                delta_gamma = math.atan((acc_z * TIME_STEP) / (v_t + acc_x * TIME_STEP))
-                v_t_new = math.sqrt((acc_z * TIME_STEP) ** 2 + (v_t + acc_x * TIME_STEP) ** 2)
-                # Trapezoidal integration on distance/altitude
-                delta_altitude = (
-                    (v_t_new * math.sin(gamma_t + delta_gamma) + v_t * math.sin(gamma_t))
-                    / 2
-                    * TIME_STEP
-                )
-                delta_distance = (
-                    (v_t_new * math.cos(gamma_t + delta_gamma) + v_t * math.cos(gamma_t))
-                    / 2
-                    * TIME_STEP
-                )
-                # Update temporal values
-                alpha_t = min(alpha_v2, alpha_t + ALPHA_RATE * TIME_STEP)
-                gamma_t = gamma_t + delta_gamma
-                altitude_t = altitude_t + delta_altitude
-                distance_t = distance_t + delta_distance
-                v_t = v_t_new
-            # Save obtained v2
-            v2[i] = v_t
-
+        # Search the lift-off angle of attack (from 0° to the angle of attack of V2) such that the
+        # transition from lift-off to safety height, with a constant rotation speed, ends at V2
+        simulation = TakeOffSimulation(
+            propulsion_model,
+            mtow,
+            wing_area,
+            wing_span,
+            lg_height,
+            cl0,
+            cl_alpha,
+            cd0,
+            coeff_k,
+            thrust_rate,
+        )
+        v_lift_off, alpha, reachable = simulation.lift_off_from_v2(v2_target, alpha_v2)
         # If v2 target speed not reachable maximum lift-off speed chosen (alpha=0°)
-        if sum(v2 > v2_target) == 0:
-            alpha = 0.0
-            v_lift_off = v_lift_off[0]  # FIXME: not reachable v2
+        if not reachable:
+            # FIXME: not reachable v2
             warnings.warn("V2 @ 50ft requirement not reachable with max lift-off speed!")
-        else:
-            # If max alpha angle lead to v2 > v2 target take it
-            if v2[-1] > v2_target:
-                alpha = alpha[-1]
-                v_lift_off = v_lift_off[-1]
-            else:
-                alpha = np.interp(v2_target, v2, alpha)
-                v_lift_off = np.interp(v2_target, v2, v_lift_off)
 
         outputs["v_lift_off:speed"] = v_lift_off
         outputs["v_lift_off:angle"] = alpha
@@ -444,42 +356,27 @@ class _vr_from_v2(om.ExplicitComponent):
         mtow = inputs["data:weight:aircraft:MTOW"]
         thrust_rate = inputs["data:mission:sizing:takeoff:thrust_rate"]
         friction_coeff = inputs["data:mission:sizing:takeoff:friction_coefficient_no_brake"]
-        v_t = float(inputs["v_lift_off:speed"])
-        alpha_t = float(inputs["v_lift_off:angle"])
-
-        # Define ground factor effect on Drag
-        k_ground = (
-            33.0 * (lg_height / wing_span) ** 1.5 / (1.0 + 33.0 * (lg_height / wing_span) ** 1.5)
+        v_lift_off = float(inputs["v_lift_off:speed"])
+        alpha_lift_off = float(inputs["v_lift_off:angle"])
+
+        # We find the value that corresponds to the speed at which, if we engage in a constant speed
+        # rotation we will get the AOA computed for v_lift_off at v_lift_off, by simulating the
+        # ground roll backwards from lift-off to 0° alpha angle (with ground effect on drag)
+        simulation = TakeOffSimulation(
+            propulsion_model,
+            mtow,
+            wing_area,
+            wing_span,
+            lg_height,
+            cl0,
+            cl_alpha,
+            cd0,
+            coeff_k,
+            thrust_rate,
+            friction_coeff,
         )
-        # Start reverted calculation of flight from lift-off to 0° alpha angle
-        atm = Atmosphere(0.0)
-        # We find the value that corresponds to the speed at which, if we engage in a constant speed rotation we will
-        # get the AOA computed for v_lift_off at v_lift_off
-        while (alpha_t != 0.0) and (v_t != 0.0):
-            # Estimation of thrust
-            flight_point = FlightPoint(
-                mach=v_t / atm.speed_of_sound,
-                altitude=0.0,
-                engine_setting=EngineSetting.TAKEOFF,
-                thrust_rate=thrust_rate,
-            )
-            propulsion_model.compute_flight_points(flight_point)
-            thrust = float(flight_point.thrust)
-            # Calculate lift and drag
-            cl = cl0 + cl_alpha * alpha_t
-            lift = 0.5 * atm.density * wing_area * cl * v_t ** 2
-            cd = cd0 + k_ground * coeff_k * cl ** 2
-            drag = 0.5 * atm.density * wing_area * cd * v_t ** 2
-            # Calculate rolling resistance load
-            friction = (mtow * g - lift - thrust * math.sin(alpha_t)) * friction_coeff
-            # Calculate acceleration
-            acc_x = (thrust * math.cos(alpha_t) - drag - friction) / mtow
-            # Speed and angle update (feedback)
-            dt = min(TIME_STEP / 5, alpha_t / ALPHA_RATE, v_t / acc_x)
-            v_t = v_t - acc_x * dt
-            alpha_t = alpha_t - ALPHA_RATE * dt
-
-        outputs["vr:speed"] = v_t
+
+        outputs["vr:speed"] = simulation.rotation_speed(v_lift_off, alpha_lift_off)
 
 
 class _simulate_takeoff(om.ExplicitComponent):
@@ -552,14 +449,6 @@ class _simulate_takeoff(om.ExplicitComponent):
         friction_coeff = inputs["data:mission:sizing:takeoff:friction_coefficient_no_brake"]
         alpha_v2 = float(inputs["v2:angle"])
 
-        # Define ground factor effect on Drag
-        def k_ground(altitude):
-            return (
-                33.0
-                * ((lg_height + altitude) / wing_span) ** 1.5
-                / (1.0 + 33.0 * ((lg_height + altitude) / wing_span) ** 1.5)
-            )
-
         # Determine rotation speed from regulation CS23.51
         vs1 = math.sqrt((mtow * g) / (0.5 * Atmosphere(0).density * wing_area * cl_max_clean))
         if inputs["data:geometry:propulsion:count"] == 1.0:
@@ -567,86 +456,41 @@ class _simulate_takeoff(om.ExplicitComponent):
         else:
             k = 1.1
         vr = max(k * vs1, float(inputs["vr:speed"]))
-        # Start calculation of flight from null speed to 35ft high
-        alpha_t = 0.0
-        gamma_t = 0.0
-        v_t = 0.0
-        altitude_t = 0.0
-        distance_t_ground = 0.0
-        distance_t_airborne = 0.0
-        mass_fuel1_t = 0.0
-        mass_fuel2_t = 0.0
-        time_t = 0.0
-        v_lift_off = 0.0
-        climb = False
-        while altitude_t < SAFETY_HEIGHT:
-            # Estimation of thrust
-            atm = Atmosphere(altitude_t, altitude_in_feet=False)
-            flight_point = FlightPoint(
-                mach=max(v_t, vr) / atm.speed_of_sound,
-                altitude=altitude_t,
-                engine_setting=EngineSetting.TAKEOFF,
-                thrust_rate=thrust_rate,
-            )
-            # FIXME: (speed increased to vr to have feasible consumptions)
-            propulsion_model.compute_flight_points(flight_point)
-            thrust = float(flight_point.thrust)
-            # Calculate lift and drag
-            cl = cl0 + cl_alpha * alpha_t
-            lift = 0.5 * atm.density * wing_area * cl * v_t ** 2
-            cd = cd0 + k_ground(altitude_t) * coeff_k * cl ** 2
-            drag = 0.5 * atm.density * wing_area * cd * v_t ** 2
-            # Check if lift-off condition reached
-            if (
-                (lift + thrust * math.sin(alpha_t) - mtow * g * math.cos(gamma_t)) >= 0.0
-            ) and not climb:
-                climb = True
-                v_lift_off = v_t
-            # Calculate acceleration on x/z air axis
-            if climb:
-                acc_z = (lift + thrust * math.sin(alpha_t) - mtow * g * math.cos(gamma_t)) / mtow
-                acc_x = (thrust * math.cos(alpha_t) - mtow * g * math.sin(gamma_t) - drag) / mtow
-            else:
-                friction = (mtow * g - lift - thrust * math.sin(alpha_t)) * friction_coeff
-                acc_z = 0.0
-                acc_x = (thrust * math.cos(alpha_t) - drag - friction) / mtow
-            # Calculate gamma change and new speed
-            delta_gamma = math.atan((acc_z * TIME_STEP) / (v_t + acc_x * TIME_STEP))
-            v_t_new = math.sqrt((acc_z * TIME_STEP) ** 2 + (v_t + acc_x * TIME_STEP) ** 2)
-            # Trapezoidal integration on distance/altitude
-            delta_altitude = (
-                (v_t_new * math.sin(gamma_t + delta_gamma) + v_t * math.sin(gamma_t))
-                / 2
-                * TIME_STEP
-            )
-            delta_distance = (
-                (v_t_new * math.cos(gamma_t + delta_gamma) + v_t * math.cos(gamma_t))
-                / 2
-                * TIME_STEP
-            )
-            # Update temporal values
-            if v_t >= vr:
-                alpha_t = min(alpha_v2, alpha_t + ALPHA_RATE * TIME_STEP)
-            gamma_t = gamma_t + delta_gamma
-            altitude_t = altitude_t + delta_altitude
-            if not climb:
-                mass_fuel1_t += propulsion_model.get_consumed_mass(flight_point, TIME_STEP)
-                distance_t_ground += delta_distance
-                time_t = time_t + TIME_STEP
-            else:
-                mass_fuel2_t += propulsion_model.get_consumed_mass(flight_point, TIME_STEP)
-                distance_t_airborne += delta_distance
-                time_t = time_t + TIME_STEP
-            v_t = v_t_new
 
-        climb_gradient = thrust / (mtow * g) - cd / cl
+        # Simulate flight from null speed to 35ft high
+        # FIXME: (speed increased to vr to have feasible consumptions)
+        simulation = TakeOffSimulation(
+            propulsion_model,
+            mtow,
+            wing_area,
+            wing_span,
+            lg_height,
+            cl0,
+            cl_alpha,
+            cd0,
+            coeff_k,
+            thrust_rate,
+            friction_coeff,
+        )
+        result = simulation.simulate(
+            simulation.state(), False, alpha_v2, rotation_speed=vr, engine_speed=vr
+        )
+        if result.lift_off is None:
+            raise RuntimeError(
+                "Aircraft did not lift off after %.0fs of takeoff simulation, check the thrust "
+                "and lift inputs" % result.time
+            )
+        fuel_ground = result.lift_off[CONSUMPTIONS]
+        fuel_airborne = result.end[CONSUMPTIONS] - fuel_ground
 
         outputs["data:mission:sizing:takeoff:VR"] = vr
-        outputs["data:mission:sizing:takeoff:VLOF"] = v_lift_off
-        outputs["data:mission:sizing:takeoff:V2"] = v_t
-        outputs["data:mission:sizing:takeoff:climb_gradient"] = climb_gradient
-        outputs["data:mission:sizing:takeoff:ground_roll"] = distance_t_ground
-        outputs["data:mission:sizing:takeoff:TOFL"] = distance_t_ground + distance_t_airborne
-        outputs["data:mission:sizing:takeoff:duration"] = time_t
-        outputs["data:mission:sizing:takeoff:fuel"] = mass_fuel1_t
-        outputs["data:mission:sizing:initial_climb:fuel"] = mass_fuel2_t
+        outputs["data:mission:sizing:takeoff:VLOF"] = result.lift_off[SPEED]
+        outputs["data:mission:sizing:takeoff:V2"] = result.end[SPEED]
+        outputs["data:mission:sizing:takeoff:climb_gradient"] = simulation.climb_gradient(
+            result.end, engine_speed=vr
+        )
+        outputs["data:mission:sizing:takeoff:ground_roll"] = result.lift_off[DISTANCE]
+        outputs["data:mission:sizing:takeoff:TOFL"] = result.end[DISTANCE]
+        outputs["data:mission:sizing:takeoff:duration"] = result.time
+        outputs["data:mission:sizing:takeoff:fuel"] = fuel_ground
+        outputs["data:mission:sizing:initial_climb:fuel"] = fuel_airborne
@@ -0,0 +1,404 @@
+"""Takeoff simulation with adaptive time steps and event detection."""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import math
+import logging
+from collections import namedtuple
+from typing import Callable, Optional, Sequence, Tuple
+
+import numpy as np
+from scipy.constants import g
+from scipy.integrate import solve_ivp
+from scipy.optimize import brentq
+
+from fastoad.model_base import Atmosphere, FlightPoint
+from fastoad.constants import EngineSetting
+
+ALPHA_LIMIT = 13.5 * math.pi / 180.0  # Limit angle to touch tail on ground in rad
+ALPHA_RATE = 3.0 * math.pi / 180.0  # Angular rotation speed in rad/s
+SAFETY_HEIGHT = 50 * 0.3048  # Height in meters to reach V2 speed
+INTEGRATION_RTOL = 1.0e-5  # Relative tolerance of the adaptive time step integration
+ALPHA_TOLERANCE = 1.0e-4  # Tolerance on the lift-off angle matching V2 in rad
+MAX_DURATION = 600.0  # Maximum duration of a simulated takeoff in s
+
+# Indices of the simulated states, the integrated consumption quantities starting at CONSUMPTIONS
+SPEED, GAMMA, ALTITUDE, DISTANCE, ALPHA, CONSUMPTIONS = range(6)
+
+_LOGGER = logging.getLogger(__name__)
+
+TakeOffResult = namedtuple(
+    "TakeOffResult", ["lift_off_time", "lift_off", "time", "end", "points_time", "points"]
+)
+"""
+Simulated takeoff: time and states at lift-off (None if the simulation starts airborne), at the
+end (safety height) and at the integration steps (one column per step).
+"""
+
+
+class TakeOffSimulation:
+    """
+    Simulation of the takeoff of an aircraft of constant mass from its speed, path angle, height,
+    distance and angle of attack, integrated with adaptive time steps (explicit Runge-Kutta method
+    of order 5(4)).
+
+    The events changing the equations of motion (rotation speed, alpha limit, lift-off) and ending
+    the simulation (safety height) are located by root finding on the continuous solution, and the
+    simulation continues from their exact state.
+    """
+
+    def __init__(
+        self,
+        propulsion_model,
+        mtow: float,
+        wing_area: float,
+        wing_span: float,
+        lg_height: float,
+        cl0: float,
+        cl_alpha: float,
+        cd0: float,
+        coeff_k: float,
+        thrust_rate: float,
+        friction_coeff: float = 0.0,
+        consumption_rates: Optional[Callable[[FlightPoint], Sequence[float]]] = None,
+        rtol: float = INTEGRATION_RTOL,
+    ):
+        """
+        :param propulsion_model: propulsion model of the aircraft
+        :param mtow: mass of the aircraft in kg
+        :param wing_area: wing area in m**2
+        :param wing_span: wing span in m
+        :param lg_height: landing gear height in m
+        :param cl0: lift coefficient at null angle of attack, with takeoff flaps
+        :param cl_alpha: lift coefficient slope in rad**-1
+        :param cd0: profile drag coefficient, with takeoff flaps
+        :param coeff_k: induced drag coefficient (out of ground effect)
+        :param thrust_rate: takeoff thrust rate
+        :param friction_coeff: rolling friction coefficient
+        :param consumption_rates: function returning, for a computed flight point, the rates in
+        time of the quantities consumed during takeoff (by default the fuel mass in kg/s)
+        :param rtol: relative tolerance of the integration
+        """
+        self.propulsion_model = propulsion_model
+        self.mtow = float(mtow)
+        self.wing_area = float(wing_area)
+        self.wing_span = float(wing_span)
+        self.lg_height = float(lg_height)
+        self.cl0 = float(cl0)
+        self.cl_alpha = float(cl_alpha)
+        self.cd0 = float(cd0)
+        self.coeff_k = float(coeff_k)
+        self.thrust_rate = float(thrust_rate)
+        self.friction_coeff = float(friction_coeff)
+        if consumption_rates is None:
+            consumption_rates = self.fuel_consumption_rates
+        self.consumption_rates = consumption_rates
+        self.rtol = rtol
+        self._consumptions_count = None
+
+    def state(
+        self,
+        speed: float = 0.0,
+        alpha: float = 0.0,
+        gamma: float = 0.0,
+        altitude: float = 0.0,
+        distance: float = 0.0,
+    ) -> np.ndarray:
+        """
+        :return: state vector with no consumption
+        """
+
+        if self._consumptions_count is None:
+            self._consumptions_count = np.size(
+                self.consumption_rates(self.flight_point(max(speed, 1.0), altitude))
+            )
+
+        return np.concatenate(
+            ([speed, gamma, altitude, distance, alpha], np.zeros(self._consumptions_count))
+        )
+
+    def fuel_consumption_rates(self, flight_point: FlightPoint) -> Sequence[float]:
+        """
+        Default consumption rates: fuel mass only.
+
+        :return: fuel consumption in kg/s at given computed flight point
+        """
+
+        return [self.propulsion_model.get_consumed_mass(flight_point, 1.0)]
+
+    def flight_point(
+        self, speed: float, altitude: float, atm: Optional[Atmosphere] = None
+    ) -> FlightPoint:
+        """
+        :return: flight point at given true airspeed (m/s) and altitude (m), computed with the
+        takeoff thrust rate
+        """
+
+        if atm is None:
+            atm = Atmosphere(altitude, altitude_in_feet=False)
+        flight_point = FlightPoint(
+            mach=speed / atm.speed_of_sound,
+            altitude=altitude,
+            engine_setting=EngineSetting.TAKEOFF,
+            thrust_rate=self.thrust_rate,
+        )
+        self.propulsion_model.compute_flight_points(flight_point)
+
+        return flight_point
+
+    def k_ground(self, altitude: float) -> float:
+        """
+        :return: ground factor effect on induced drag at given altitude (m)
+        """
+
+        ratio = 33.0 * ((self.lg_height + altitude) / self.wing_span) ** 1.5
+
+        return ratio / (1.0 + ratio)
+
+    def forces(
+        self, speed: float, altitude: float, alpha: float, engine_speed: float
+    ) -> Tuple[float, float, float, FlightPoint]:
+        """
+        :param engine_speed: speed the thrust is computed at in m/s
+        :return: thrust, lift and drag in N, and the computed flight point
+        """
+
+        atm = Atmosphere(altitude, altitude_in_feet=False)
+        flight_point = self.flight_point(engine_speed, altitude, atm)
+        cl = self.cl0 + self.cl_alpha * alpha
+        cd = self.cd0 + self.k_ground(altitude) * self.coeff_k * cl ** 2
+        q_s = 0.5 * atm.density * self.wing_area * speed ** 2
+
+        return float(flight_point.thrust), q_s * cl, q_s * cd, flight_point
+
+    def climb_gradient(self, state: np.ndarray, engine_speed: float = 0.0) -> float:
+        """
+        :return: climb gradient at given state
+        """
+
+        thrust, lift, drag, _ = self.forces(
+            state[SPEED], state[ALTITUDE], state[ALPHA], max(state[SPEED], engine_speed),
+        )
+
+        return thrust / (self.mtow * g) - drag / lift
+
+    def lift_off_speed(self, alpha: float) -> float:
+        """
+        :return: speed (m/s) at which lift and thrust overcome weight on ground at given angle of
+        attack
+        """
+
+        weight = self.mtow * g
+        density = Atmosphere(0.0).density
+        cl = self.cl0 + self.cl_alpha * alpha
+        v_max = math.sqrt(weight / (0.5 * density * self.wing_area * cl))
+
+        def vertical_force(speed):
+            thrust = float(self.flight_point(speed, 0.0).thrust)
+            return (
+                0.5 * density * self.wing_area * cl * speed ** 2 + thrust * math.sin(alpha) - weight
+            )
+
+        if vertical_force(0.5 * v_max) >= 0.0:
+            return 0.5 * v_max
+        # Without thrust contribution (null angle of attack), weight is overcome at v_max
+        if vertical_force(v_max) <= 0.0:
+            return v_max
+
+        return brentq(vertical_force, 0.5 * v_max, v_max, rtol=self.rtol)
+
+    def simulate(
+        self,
+        state: np.ndarray,
+        airborne: bool,
+        alpha_max: float,
+        rotation_speed: float = 0.0,
+        engine_speed: float = 0.0,
+    ) -> TakeOffResult:
+        """
+        Simulates the takeoff until safety height.
+
+        :param state: initial state
+        :param airborne: True if the simulation starts after lift-off
+        :param alpha_max: angle of attack the rotation stops at in rad
+        :param rotation_speed: speed the rotation starts at in m/s
+        :param engine_speed: minimum speed the thrust is computed at in m/s
+        :return: simulated takeoff
+        """
+
+        state = np.array(state, dtype=float)
+        time = 0.0
+        lift_off_time = None
+        lift_off = None
+        rotating = state[ALPHA] < alpha_max and state[SPEED] >= rotation_speed
+        rotation_done = state[ALPHA] >= alpha_max
+        points_time = [np.array([time])]
+        points = [state[:, np.newaxis]]
+        while True:
+            # Events are found in the order of their first (terminal) occurrence
+            if airborne:
+                events = {"safety_height": lambda _, y: y[ALTITUDE] - SAFETY_HEIGHT}
+            else:
+                events = {"lift_off": lambda _, y: self._vertical_force(y, engine_speed)}
+            if rotating:
+                events["alpha_limit"] = lambda _, y: y[ALPHA] - alpha_max
+            elif not rotation_done:
+                events["rotation"] = lambda _, y: y[SPEED] - rotation_speed
+            for event in events.values():
+                event.terminal = True
+                event.direction = 1.0
+
+            solution = solve_ivp(
+                lambda _, y, airborne=airborne, rotating=rotating: self._derivatives(
+                    y, airborne, rotating, engine_speed
+                ),
+                (time, MAX_DURATION),
+                state,
+                events=list(events.values()),
+                rtol=self.rtol,
+                atol=self.rtol,
+            )
+            time = solution.t[-1]
+            state = solution.y[:, -1]
+            points_time.append(solution.t[1:])
+            points.append(solution.y[:, 1:])
+            if solution.status != 1:
+                _LOGGER.warning("Safety height not reached after %.0fs of takeoff", MAX_DURATION)
+                break
+
+            event = [name for name, times in zip(events, solution.t_events) if len(times) > 0][0]
+            if event == "safety_height":
+                break
+            if event == "lift_off":
+                airborne = True
+                lift_off_time = time
+                lift_off = state.copy()
+            elif event == "alpha_limit":
+                rotating = False
+                rotation_done = True
+                state[ALPHA] = alpha_max
+            else:
+                rotating = True
+
+        return TakeOffResult(
+            lift_off_time,
+            lift_off,
+            time,
+            state,
+            np.concatenate(points_time),
+            np.concatenate(points, axis=1),
+        )
+
+    def v2(self, alpha_lift_off: float, alpha_max: float) -> Tuple[float, float]:
+        """
+        Simulates the transition from lift-off to safety height, rotating at constant speed.
+
+        :param alpha_lift_off: angle of attack at lift-off in rad
+        :param alpha_max: angle of attack the rotation stops at in rad
+        :return: speed at safety height and lift-off speed in m/s
+        """
+
+        v_lift_off = self.lift_off_speed(alpha_lift_off)
+        result = self.simulate(self.state(v_lift_off, alpha_lift_off), True, alpha_max)
+
+        return result.end[SPEED], v_lift_off
+
+    def lift_off_from_v2(self, v2_target: float, alpha_v2: float) -> Tuple[float, float, bool]:
+        """
+        Searches the angle of attack (lower than alpha_v2 and ALPHA_LIMIT) at lift-off such that
+        the speed at safety height is v2_target.
+
+        :param v2_target: speed at safety height in m/s
+        :param alpha_v2: angle of attack at safety height in rad
+        :return: lift-off speed in m/s, lift-off angle of attack in rad, and False if v2_target
+        cannot be reached (in which case the null angle of attack is returned)
+        """
+
+        alpha_max = min(ALPHA_LIMIT, alpha_v2)
+        v2, v_lift_off = self.v2(alpha_max, alpha_v2)
+        if v2 > v2_target:
+            return v_lift_off, alpha_max, True
+        v2, v_lift_off = self.v2(0.0, alpha_v2)
+        if v2 <= v2_target:
+            return v_lift_off, 0.0, False
+
+        alpha = brentq(
+            lambda x: self.v2(x, alpha_v2)[0] - v2_target, 0.0, alpha_max, xtol=ALPHA_TOLERANCE
+        )
+
+        return self.lift_off_speed(alpha), alpha, True
+
+    def rotation_speed(self, v_lift_off: float, alpha_lift_off: float) -> float:
+        """
+        Searches the speed the rotation must start at on ground to lift-off at given speed and
+        angle of attack, by simulating the ground roll backwards.
+
+        :return: rotation speed in m/s
+        """
+
+        if alpha_lift_off <= 0.0 or v_lift_off <= 0.0:
+            return v_lift_off
+
+        def null_speed(_, y):
+            return y[SPEED]
+
+        null_speed.terminal = True
+        solution = solve_ivp(
+            lambda _, y: self._derivatives(y, False, True, 0.0),
+            (0.0, -alpha_lift_off / ALPHA_RATE),
+            self.state(v_lift_off, alpha_lift_off),
+            events=null_speed,
+            rtol=self.rtol,
+            atol=self.rtol,
+        )
+
+        return max(solution.y[SPEED, -1], 0.0)
+
+    def _vertical_force(self, state: np.ndarray, engine_speed: float) -> float:
+
+        thrust, lift, _, _ = self.forces(
+            state[SPEED], state[ALTITUDE], state[ALPHA], max(state[SPEED], engine_speed),
+        )
+
+        return lift + thrust * math.sin(state[ALPHA]) - self.mtow * g * math.cos(state[GAMMA])
+
+    def _derivatives(
+        self, state: np.ndarray, airborne: bool, rotating: bool, engine_speed: float
+    ) -> np.ndarray:
+
+        speed, gamma, altitude, _, alpha = state[:CONSUMPTIONS]
+        thrust, lift, drag, flight_point = self.forces(
+            speed, altitude, alpha, max(speed, engine_speed)
+        )
+        weight = self.mtow * g
+        if airborne:
+            acc_x = (thrust * math.cos(alpha) - weight * math.sin(gamma) - drag) / self.mtow
+            acc_z = (lift + thrust * math.sin(alpha) - weight * math.cos(gamma)) / self.mtow
+            gamma_rate = acc_z / speed
+        else:
+            friction = (weight - lift - thrust * math.sin(alpha)) * self.friction_coeff
+            acc_x = (thrust * math.cos(alpha) - drag - friction) / self.mtow
+            gamma_rate = 0.0
+
+        return np.concatenate(
+            (
+                [
+                    acc_x,
+                    gamma_rate,
+                    speed * math.sin(gamma),
+                    speed * math.cos(gamma),
+                    ALPHA_RATE if rotating else 0.0,
+                ],
+                np.ravel(self.consumption_rates(flight_point)),
+            )
+        )
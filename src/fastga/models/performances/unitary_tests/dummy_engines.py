@@ -60,20 +60,18 @@ class DummyEngineBE76(AbstractFuelPropulsion):
 
     def compute_flight_points(self, flight_points: Union[FlightPoint, pd.DataFrame]):
 
-        altitude = float(
-            Atmosphere(np.array(flight_points.altitude)).get_altitude(altitude_in_feet=True)
-        )
+        altitude = Atmosphere(np.array(flight_points.altitude)).get_altitude(altitude_in_feet=True)
         mach = np.array(flight_points.mach)
         thrust = np.array(flight_points.thrust)
         sigma = Atmosphere(altitude).density / Atmosphere(0.0).density
         max_power = self.max_power * (sigma - (1 - sigma) / 7.55)
-        max_thrust = min(
+        max_thrust = np.minimum(
             self.max_thrust * sigma ** (1.0 / 3.0),
             max_power * 0.8 / np.maximum(mach * Atmosphere(altitude).speed_of_sound, 1e-20),
         )
-        if flight_points.thrust_rate is None:
-            flight_points.thrust = min(max_thrust, float(thrust))
-            flight_points.thrust_rate = float(thrust) / max_thrust
+        if flight_points.thrust_rate is None or np.all(flight_points.thrust_is_regulated):
+            flight_points.thrust = np.minimum(max_thrust, thrust)
+            flight_points.thrust_rate = thrust / max_thrust
         else:
             flight_points.thrust = max_thrust * np.array(flight_points.thrust_rate)
         sfc_pmax = 7.96359441e-08  # fixed whatever the thrust ratio, sfc for ONE 130kW engine !
@@ -134,20 +132,18 @@ class DummyEngineSR22(AbstractFuelPropulsion):
 
     def compute_flight_points(self, flight_points: Union[FlightPoint, pd.DataFrame]):
 
-        altitude = float(
-            Atmosphere(np.array(flight_points.altitude)).get_altitude(altitude_in_feet=True)
-        )
+        altitude = Atmosphere(np.array(flight_points.altitude)).get_altitude(altitude_in_feet=True)
         mach = np.array(flight_points.mach)
         thrust = np.array(flight_points.thrust)
         sigma = Atmosphere(altitude).density / Atmosphere(0.0).density
         max_power = self.max_power * (sigma - (1 - sigma) / 7.55)
-        max_thrust = min(
+        max_thrust = np.minimum(
             self.max_thrust * sigma ** (1.0 / 3.0),
             max_power * 0.8 / np.maximum(mach * Atmosphere(altitude).speed_of_sound, 1e-20),
         )
-        if flight_points.thrust_rate is None:
-            flight_points.thrust = min(max_thrust, float(thrust))
-            flight_points.thrust_rate = float(thrust) / max_thrust
+        if flight_points.thrust_rate is None or np.all(flight_points.thrust_is_regulated):
+            flight_points.thrust = np.minimum(max_thrust, thrust)
+            flight_points.thrust_rate = thrust / max_thrust
         else:
             flight_points.thrust = max_thrust * np.array(flight_points.thrust_rate)
         sfc_pmax = 8.5080e-08  # fixed whatever the thrust ratio, sfc for ONE 130kW engine !
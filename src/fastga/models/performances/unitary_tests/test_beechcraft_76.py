@@ -14,12 +14,22 @@ Test takeoff module
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import os.path as pth
+
+import numpy as np
+import pandas as pd
 from openmdao.core.group import Group
 import pytest
 
 from ..takeoff import TakeOffPhase, _v2, _vr_from_v2, _v_lift_off_from_v2, _simulate_takeoff
 from ..mission import _compute_taxi, _compute_climb, _compute_cruise, _compute_descent
 from ..mission import Mission
+from ..dynamic_equilibrium import (
+    DynamicEquilibrium,
+    EquilibriumSnapshot,
+    TrajectoryRecorder,
+    CSV_DATA_LABELS,
+)
 
 from tests.testing_utilities import run_system, get_indep_var_comp, list_inputs
 
@@ -59,7 +69,7 @@ def test_vloff():
     # Run problem and check obtained value(s) is/(are) correct
     problem = run_system(_v_lift_off_from_v2(propulsion_id=ENGINE_WRAPPER), ivc)
     vloff = problem.get_val("v_lift_off:speed", units="m/s")
-    assert vloff == pytest.approx(38.10, abs=1e-2)
+    assert vloff == pytest.approx(38.08, abs=1e-2)
     alpha = problem.get_val("v_lift_off:angle", units="deg")
     assert alpha == pytest.approx(8.23, abs=1e-2)
 
@@ -77,7 +87,7 @@ def test_vr():
     # Run problem and check obtained value(s) is/(are) correct
     problem = run_system(_vr_from_v2(propulsion_id=ENGINE_WRAPPER), ivc)
     vr = problem.get_val("vr:speed", units="m/s")
-    assert vr == pytest.approx(29.91, abs=1e-2)
+    assert vr == pytest.approx(29.90, abs=1e-2)
 
 
 def test_simulate_takeoff():
@@ -95,15 +105,15 @@ def test_simulate_takeoff():
     vr = problem.get_val("data:mission:sizing:takeoff:VR", units="m/s")
     assert vr == pytest.approx(38.16, abs=1e-2)
     vloff = problem.get_val("data:mission:sizing:takeoff:VLOF", units="m/s")
-    assert vloff == pytest.approx(42.74, abs=1e-2)
+    assert vloff == pytest.approx(42.61, abs=1e-2)
     v2 = problem.get_val("data:mission:sizing:takeoff:V2", units="m/s")
-    assert v2 == pytest.approx(44.99, abs=1e-2)
+    assert v2 == pytest.approx(44.78, abs=1e-2)
     tofl = problem.get_val("data:mission:sizing:takeoff:TOFL", units="m")
-    assert tofl == pytest.approx(500, abs=1)
+    assert tofl == pytest.approx(496, abs=1)
     ground_roll = problem.get_val("data:mission:sizing:takeoff:ground_roll", units="m")
-    assert ground_roll == pytest.approx(349, abs=1)
+    assert ground_roll == pytest.approx(347, abs=1)
     duration = problem.get_val("data:mission:sizing:takeoff:duration", units="s")
-    assert duration == pytest.approx(19.3, abs=1e-1)
+    assert duration == pytest.approx(19.2, abs=1e-1)
     fuel1 = problem.get_val("data:mission:sizing:takeoff:fuel", units="kg")
     assert fuel1 == pytest.approx(0.26, abs=1e-2)
     fuel2 = problem.get_val("data:mission:sizing:initial_climb:fuel", units="kg")
@@ -124,15 +134,15 @@ def test_takeoff_phase_connections():
     vr = problem.get_val("data:mission:sizing:takeoff:VR", units="m/s")
     assert vr == pytest.approx(38.16, abs=1e-2)
     vloff = problem.get_val("data:mission:sizing:takeoff:VLOF", units="m/s")
-    assert vloff == pytest.approx(42.73, abs=1e-2)
+    assert vloff == pytest.approx(42.61, abs=1e-2)
     v2 = problem.get_val("data:mission:sizing:takeoff:V2", units="m/s")
-    assert v2 == pytest.approx(44.99, abs=1e-2)
+    assert v2 == pytest.approx(44.78, abs=1e-2)
     tofl = problem.get_val("data:mission:sizing:takeoff:TOFL", units="m")
-    assert tofl == pytest.approx(500, abs=1)
+    assert tofl == pytest.approx(496, abs=1)
     ground_roll = problem.get_val("data:mission:sizing:takeoff:ground_roll", units="m")
-    assert ground_roll == pytest.approx(349, abs=1)
+    assert ground_roll == pytest.approx(347, abs=1)
     duration = problem.get_val("data:mission:sizing:takeoff:duration", units="s")
-    assert duration == pytest.approx(19.3, abs=1e-1)
+    assert duration == pytest.approx(19.2, abs=1e-1)
     fuel1 = problem.get_val("data:mission:sizing:takeoff:fuel", units="kg")
     assert fuel1 == pytest.approx(0.26, abs=1e-2)
     fuel2 = problem.get_val("data:mission:sizing:initial_climb:fuel", units="kg")
@@ -190,6 +200,110 @@ def test_compute_climb():
     assert duration == pytest.approx(8.56, abs=1e-2)
 
 
+def test_equilibrium_snapshot():
+    """ Tests the dynamic equilibrium computed from the inputs snapshot """
+
+    # Research independent input value in .xml file
+    group = Group()
+    group.add_subsystem("in_flight_cg_variation", InFlightCGVariation(), promotes=["*"])
+    group.add_subsystem("climb", _compute_climb(propulsion_id=ENGINE_WRAPPER), promotes=["*"])
+    ivc = get_indep_var_comp(list_inputs(group), __file__, XML_FILE)
+    problem = run_system(group, ivc)
+    inputs = {
+        name: problem.get_val("component.climb." + name)
+        for name in list_inputs(_compute_climb(propulsion_id=ENGINE_WRAPPER))
+    }
+
+    # Check the equilibrium is the same with the snapshot as with the inputs
+    snapshot = EquilibriumSnapshot.from_inputs(inputs)
+    equilibrium = DynamicEquilibrium()
+    for gamma, mass in [(0.0, 1700.0), (0.05, 1600.0)]:
+        expected = equilibrium.dynamic_equilibrium(
+            inputs, gamma, 3000.0, 0.0, 0.0, mass, "none", ()
+        )
+        result = equilibrium.dynamic_equilibrium(
+            snapshot, gamma, 3000.0, 0.0, 0.0, mass, "none", expected[0:2]
+        )
+        assert result[0:6] == pytest.approx(expected[0:6], rel=1e-3)
+
+    # Check the equilibrium of a segment is solved at once for all its points
+    gamma = np.array([0.0, 0.05, -0.03])
+    mass = np.array([1700.0, 1600.0, 1650.0])
+    results = equilibrium.dynamic_equilibrium_segment(snapshot, gamma, 3000.0, 0.0, 0.0, mass)
+    for idx in range(3):
+        expected = equilibrium.dynamic_equilibrium(
+            snapshot, gamma[idx], 3000.0, 0.0, 0.0, mass[idx], "none", ()
+        )
+        assert [result[idx] for result in results[0:6]] == pytest.approx(expected[0:6], rel=1e-2)
+
+    # Check the snapshot is not used with other aerodynamic models
+    with pytest.raises(ValueError):
+        equilibrium.dynamic_equilibrium(
+            snapshot, 0.0, 3000.0, 0.0, 0.0, 1700.0, "takeoff", (), low_speed=True
+        )
+
+
+def test_trajectory_recorder(tmp_path):
+    """ Tests the mission points are buffered and appended to the results files """
+
+    file_path = pth.join(str(tmp_path), "mission.csv")
+    recorder = TrajectoryRecorder(capacity=2)
+    for phase in ["climb", "cruise"]:
+        for idx in range(3):
+            recorder.append([float(idx)] * (len(CSV_DATA_LABELS) - 1) + [phase])
+        assert len(recorder) == 3
+        recorder.flush(file_path, formats=["csv", "npz"])
+        assert len(recorder) == 0
+
+    df = pd.read_csv(file_path, index_col=0)
+    assert list(df.columns) == CSV_DATA_LABELS
+    assert list(df.index) == list(range(6))
+    assert list(df["time"]) == [0.0, 1.0, 2.0] * 2
+    assert list(df["name"]) == ["climb"] * 3 + ["cruise"] * 3
+    with np.load(pth.join(str(tmp_path), "mission.npz")) as columns:
+        assert list(columns["mass"]) == list(df["mass"])
+        assert list(columns["name"]) == list(df["name"])
+
+    with pytest.raises(ValueError):
+        DynamicEquilibrium(out_file_formats=["xlsx"])
+
+
+def test_phase_cache():
+    """ Tests the outputs of a phase are reused for the same quantized inputs """
+
+    # Research independent input value in .xml file
+    group = Group()
+    group.add_subsystem("in_flight_cg_variation", InFlightCGVariation(), promotes=["*"])
+    group.add_subsystem(
+        "climb",
+        _compute_climb(propulsion_id=ENGINE_WRAPPER, cache_size=1, cache_tolerance=1e-4),
+        promotes=["*"],
+    )
+    ivc = get_indep_var_comp(list_inputs(group), __file__, XML_FILE)
+
+    # Run problem and check the outputs are found in cache when inputs do not change enough
+    problem = run_system(group, ivc)
+    climb = problem.model.component.climb
+    fuel_mass = problem.get_val("data:mission:sizing:main_route:climb:fuel", units="kg").copy()
+    problem.run_model()
+    assert (climb.cache_hits, climb.cache_misses) == (1, 1)
+    mtow = problem.get_val("data:weight:aircraft:MTOW", units="kg").copy()
+    problem.set_val("data:weight:aircraft:MTOW", mtow * (1.0 + 1e-6), units="kg")
+    problem.run_model()
+    assert (climb.cache_hits, climb.cache_misses) == (2, 1)
+    assert problem.get_val("data:mission:sizing:main_route:climb:fuel", units="kg") == fuel_mass
+    problem.set_val("data:weight:aircraft:MTOW", mtow * 1.01, units="kg")
+    problem.run_model()
+    assert (climb.cache_hits, climb.cache_misses) == (2, 2)
+    assert problem.get_val("data:mission:sizing:main_route:climb:fuel", units="kg") != fuel_mass
+
+    # Check the least recently used outputs are dropped
+    problem.set_val("data:weight:aircraft:MTOW", mtow, units="kg")
+    problem.run_model()
+    assert (climb.cache_hits, climb.cache_misses) == (2, 3)
+    assert problem.get_val("data:mission:sizing:main_route:climb:fuel", units="kg") == fuel_mass
+
+
 def test_compute_cruise():
     """ Tests cruise phase """
 
@@ -228,6 +342,40 @@ def test_compute_descent():
     assert duration == pytest.approx(25, abs=1)
 
 
+def test_adaptive_integration():
+    """ Tests climb, cruise and descent phases integrated with adaptive steps """
+
+    values = {}
+    for name, phase in [
+        ("climb", _compute_climb),
+        ("cruise", _compute_cruise),
+        ("descent", _compute_descent),
+    ]:
+        # Research independent input value in .xml file
+        group = Group()
+        group.add_subsystem("in_flight_cg_variation", InFlightCGVariation(), promotes=["*"])
+        group.add_subsystem(
+            name, phase(propulsion_id=ENGINE_WRAPPER, integration_tolerance=1e-3), promotes=["*"],
+        )
+        ivc = get_indep_var_comp(list_inputs(group), __file__, XML_FILE)
+
+        # Run problem and check obtained value(s) is/(are) consistent with fixed steps ones
+        problem = run_system(group, ivc)
+        for value in ["fuel", "distance", "duration"]:
+            values[name + ":" + value] = problem.get_val(
+                "data:mission:sizing:main_route:" + name + ":" + value
+            )
+        if name == "cruise":
+            v_tas = problem.get_val("data:TLAR:v_cruise", units="m/s")
+
+    assert values["climb:fuel"] == pytest.approx(4.22, abs=1e-2)
+    assert values["climb:distance"] / 1000.0 == pytest.approx(24.65, abs=1e-2)
+    assert values["cruise:fuel"] == pytest.approx(117, abs=1)
+    assert values["cruise:duration"] == pytest.approx(values["cruise:distance"] / v_tas)
+    assert values["descent:fuel"] == pytest.approx(0.70, abs=1e-2)
+    assert values["descent:distance"] / 1000.0 == pytest.approx(79, abs=1)
+
+
 def test_loop_cruise_distance():
     """ Tests a distance computation loop matching the descent value/TLAR total range. """
 
@@ -59,7 +59,7 @@ def test_vloff():
     # Run problem and check obtained value(s) is/(are) correct
     problem = run_system(_v_lift_off_from_v2(propulsion_id=ENGINE_WRAPPER), ivc)
     vloff = problem.get_val("v_lift_off:speed", units="m/s")
-    assert vloff == pytest.approx(38.39, abs=1e-2)
+    assert vloff == pytest.approx(38.36, abs=1e-2)
     alpha = problem.get_val("v_lift_off:angle", units="deg")
     assert alpha == pytest.approx(10.25, abs=1e-2)
 
@@ -79,7 +79,7 @@ def test_vr():
 
     problem = run_system(_vr_from_v2(propulsion_id=ENGINE_WRAPPER), ivc)
     vr = problem.get_val("vr:speed", units="m/s")
-    assert vr == pytest.approx(28.55, abs=1e-2)
+    assert vr == pytest.approx(28.56, abs=1e-2)
 
 
 def test_simulate_takeoff():
@@ -97,15 +97,15 @@ def test_simulate_takeoff():
     vr = problem.get_val("data:mission:sizing:takeoff:VR", units="m/s")
     assert vr == pytest.approx(35.19, abs=1e-2)
     vloff = problem.get_val("data:mission:sizing:takeoff:VLOF", units="m/s")
-    assert vloff == pytest.approx(42.21, abs=1e-2)
+    assert vloff == pytest.approx(42.04, abs=1e-2)
     v2 = problem.get_val("data:mission:sizing:takeoff:V2", units="m/s")
-    assert v2 == pytest.approx(45.24, abs=1e-2)
+    assert v2 == pytest.approx(45.00, abs=1e-2)
     tofl = problem.get_val("data:mission:sizing:takeoff:TOFL", units="m")
-    assert tofl == pytest.approx(475, abs=1)
+    assert tofl == pytest.approx(470, abs=1)
     ground_roll = problem.get_val("data:mission:sizing:takeoff:ground_roll", units="m")
-    assert ground_roll == pytest.approx(320, abs=1)
+    assert ground_roll == pytest.approx(317, abs=1)
     duration = problem.get_val("data:mission:sizing:takeoff:duration", units="s")
-    assert duration == pytest.approx(18.3, abs=1e-1)
+    assert duration == pytest.approx(18.2, abs=1e-1)
     fuel1 = problem.get_val("data:mission:sizing:takeoff:fuel", units="kg")
     assert fuel1 == pytest.approx(0.23, abs=1e-2)
     fuel2 = problem.get_val("data:mission:sizing:initial_climb:fuel", units="kg")
@@ -126,15 +126,15 @@ def test_takeoff_phase_connections():
     vr = problem.get_val("data:mission:sizing:takeoff:VR", units="m/s")
     assert vr == pytest.approx(35.19, abs=1e-2)
     vloff = problem.get_val("data:mission:sizing:takeoff:VLOF", units="m/s")
-    assert vloff == pytest.approx(42.21, abs=1e-2)
+    assert vloff == pytest.approx(42.04, abs=1e-2)
     v2 = problem.get_val("data:mission:sizing:takeoff:V2", units="m/s")
-    assert v2 == pytest.approx(45.24, abs=1e-2)
+    assert v2 == pytest.approx(45.00, abs=1e-2)
     tofl = problem.get_val("data:mission:sizing:takeoff:TOFL", units="m")
-    assert tofl == pytest.approx(475, abs=1)
+    assert tofl == pytest.approx(470, abs=1)
     ground_roll = problem.get_val("data:mission:sizing:takeoff:ground_roll", units="m")
-    assert ground_roll == pytest.approx(320, abs=1)
+    assert ground_roll == pytest.approx(317, abs=1)
     duration = problem.get_val("data:mission:sizing:takeoff:duration", units="s")
-    assert duration == pytest.approx(18.3, abs=1e-1)
+    assert duration == pytest.approx(18.2, abs=1e-1)
     fuel1 = problem.get_val("data:mission:sizing:takeoff:fuel", units="kg")
     assert fuel1 == pytest.approx(0.23, abs=1e-2)
     fuel2 = problem.get_val("data:mission:sizing:initial_climb:fuel", units="kg")
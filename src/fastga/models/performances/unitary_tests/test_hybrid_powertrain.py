@@ -60,9 +60,9 @@ def test_vloff():
     # Run problem and check obtained value(s) is/(are) correct
     problem = run_system(_v_lift_off_from_v2(propulsion_id=ENGINE_WRAPPER), ivc)
     vloff = problem.get_val("v_lift_off:speed", units="m/s")
-    assert vloff == pytest.approx(28.49, abs=1e-2)
+    assert vloff == pytest.approx(43.50, abs=1e-2)
     alpha = problem.get_val("v_lift_off:angle", units="deg")
-    assert alpha == pytest.approx(10.25, abs=1e-2)
+    assert alpha == pytest.approx(2.19, abs=1e-2)
 
 
 def test_vr():
@@ -98,13 +98,13 @@ def test_simulate_takeoff():
     vr = problem.get_val("data:mission:sizing:takeoff:VR", units="m/s")
     assert vr == pytest.approx(28.55, abs=1e-2)
     vloff = problem.get_val("data:mission:sizing:takeoff:VLOF", units="m/s")
-    assert vloff == pytest.approx(30.64, abs=1e-2)
+    assert vloff == pytest.approx(30.54, abs=1e-2)
     v2 = problem.get_val("data:mission:sizing:takeoff:V2", units="m/s")
-    assert v2 == pytest.approx(27.80, abs=1e-2)
+    assert v2 == pytest.approx(27.73, abs=1e-2)
     tofl = problem.get_val("data:mission:sizing:takeoff:TOFL", units="m")
     assert tofl == pytest.approx(750, abs=1)
     ground_roll = problem.get_val("data:mission:sizing:takeoff:ground_roll", units="m")
-    assert ground_roll == pytest.approx(607, abs=1)
+    assert ground_roll == pytest.approx(602, abs=1)
     duration = problem.get_val("data:mission:sizing:takeoff:duration", units="s")
     assert duration == pytest.approx(43, abs=1e-1)
     fuel1 = problem.get_val("data:mission:sizing:takeoff:fuel", units="kg")
@@ -125,21 +125,21 @@ def test_takeoff_phase_connections():
     # noinspection PyTypeChecker
     problem = run_system(TakeOffPhase(propulsion_id=ENGINE_WRAPPER), ivc)
     vr = problem.get_val("data:mission:sizing:takeoff:VR", units="m/s")
-    assert vr == pytest.approx(25.74, abs=1e-2)
+    assert vr == pytest.approx(30.68, abs=1e-2)
     vloff = problem.get_val("data:mission:sizing:takeoff:VLOF", units="m/s")
-    assert vloff == pytest.approx(28.56, abs=1e-2)
+    assert vloff == pytest.approx(32.20, abs=1e-2)
     v2 = problem.get_val("data:mission:sizing:takeoff:V2", units="m/s")
-    assert v2 == pytest.approx(27.41, abs=1e-2)
+    assert v2 == pytest.approx(28.78, abs=1e-2)
     tofl = problem.get_val("data:mission:sizing:takeoff:TOFL", units="m")
-    assert tofl == pytest.approx(690, abs=1)
+    assert tofl == pytest.approx(870, abs=1)
     ground_roll = problem.get_val("data:mission:sizing:takeoff:ground_roll", units="m")
-    assert ground_roll == pytest.approx(467, abs=1)
+    assert ground_roll == pytest.approx(745, abs=1)
     duration = problem.get_val("data:mission:sizing:takeoff:duration", units="s")
-    assert duration == pytest.approx(39.5, abs=1e-1)
+    assert duration == pytest.approx(48.3, abs=1e-1)
     fuel1 = problem.get_val("data:mission:sizing:takeoff:fuel", units="kg")
-    assert fuel1 == pytest.approx(0.011, abs=1e-3)
+    assert fuel1 == pytest.approx(0.016, abs=1e-3)
     fuel2 = problem.get_val("data:mission:sizing:initial_climb:fuel", units="kg")
-    assert fuel2 == pytest.approx(0.002, abs=1e-3)
+    assert fuel2 == pytest.approx(0.001, abs=1e-3)
 
 
 def test_compute_taxi():
@@ -0,0 +1,74 @@
+"""
+Test takeoff simulation module
+"""
+#  This file is part of FAST : A framework for rapid Overall Aircraft Design
+#  Copyright (C) 2020  ONERA & ISAE-SUPAERO
+#  FAST is free software: you can redistribute it and/or modify
+#  it under the terms of the GNU General Public License as published by
+#  the Free Software Foundation, either version 3 of the License, or
+#  (at your option) any later version.
+#  This program is distributed in the hope that it will be useful,
+#  but WITHOUT ANY WARRANTY; without even the implied warranty of
+#  MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+#  GNU General Public License for more details.
+#  You should have received a copy of the GNU General Public License
+#  along with this program.  If not, see <https://www.gnu.org/licenses/>.
+
+import pytest
+
+from ..takeoff_simulation import (
+    TakeOffSimulation,
+    SAFETY_HEIGHT,
+    SPEED,
+    ALTITUDE,
+    ALPHA,
+    CONSUMPTIONS,
+)
+
+from fastga.models.propulsion.fuel_propulsion.base import FuelEngineSet
+
+from .dummy_engines import DummyEngineSR22
+
+
+def test_takeoff_simulation():
+    """ Tests the takeoff simulation events and root finding """
+
+    simulation = TakeOffSimulation(
+        FuelEngineSet(DummyEngineSR22(), 1.0),
+        mtow=1633.0,
+        wing_area=13.5,
+        wing_span=11.7,
+        lg_height=0.8,
+        cl0=0.6,
+        cl_alpha=4.7,
+        cd0=0.04,
+        coeff_k=0.04,
+        thrust_rate=1.0,
+        friction_coeff=0.03,
+    )
+    alpha_max = 0.18
+
+    # Simulation stops exactly at safety height, and lifts off when weight is overcome
+    result = simulation.simulate(simulation.state(), False, alpha_max, rotation_speed=30.0)
+    assert result.end[ALTITUDE] == pytest.approx(SAFETY_HEIGHT, rel=1e-6)
+    assert result.lift_off[SPEED] == pytest.approx(
+        simulation.lift_off_speed(result.lift_off[ALPHA]), rel=1e-4
+    )
+    assert result.end[CONSUMPTIONS] > result.lift_off[CONSUMPTIONS] > 0.0
+    assert result.points_time[-1] == result.time
+
+    # Rotating from the backward simulated speed lifts off at the expected speed
+    v_lift_off = simulation.lift_off_speed(0.1)
+    vr = simulation.rotation_speed(v_lift_off, 0.1)
+    result = simulation.simulate(simulation.state(), False, alpha_max, rotation_speed=vr)
+    assert result.lift_off[ALPHA] == pytest.approx(0.1, abs=1e-3)
+    assert result.lift_off[SPEED] == pytest.approx(v_lift_off, rel=1e-3)
+
+    # Lift-off angle is searched such that V2 is reached at safety height
+    v_lift_off, alpha, reachable = simulation.lift_off_from_v2(45.0, alpha_max)
+    assert reachable
+    assert 0.0 < alpha < alpha_max
+    assert simulation.v2(alpha, alpha_max)[0] == pytest.approx(45.0, abs=1e-2)
+    _, alpha, reachable = simulation.lift_off_from_v2(100.0, alpha_max)
+    assert not reachable
+    assert alpha == 0.0
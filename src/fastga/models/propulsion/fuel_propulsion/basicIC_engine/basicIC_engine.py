@@ -18,7 +18,8 @@ import math
 import numpy as np
 import pandas as pd
 from typing import Union, Sequence, Tuple, Optional
-from scipy.interpolate import interp2d
+from scipy.interpolate import RectBivariateSpline
+import os
 import os.path as pth
 
 from fastoad.model_base import FlightPoint, Atmosphere
@@ -36,6 +37,11 @@ _LOGGER = logging.getLogger(__name__)
 
 PROPELLER_EFFICIENCY = 0.83  # Used to be 0.8 maybe make it an xml parameter
 
+# Engine maps and the interpolators built on them are shared within the process, entries are identified by map file
+# path, map file modification time and engine displacement volume (None for the raw map)
+ENGINE_MAP_CACHE_SIZE = 64
+_ENGINE_MAP_CACHE = {}
+
 # Set of dictionary keys that are mapped to instance attributes.
 ENGINE_LABELS = {
     "power_SL": dict(doc="Power at sea level in watts."),
@@ -120,8 +126,29 @@ class BasicICEngine(AbstractFuelPropulsion):
         self.efficiency_CL = efficiency_CL
         self.specific_shape = None
 
+        # Propeller efficiency interpolators on the (speed, thrust) regular grids, same interpolation as a cubic
+        # interp2d
+        self.propeller_efficiency_SL = RectBivariateSpline(
+            np.asarray(speed_SL).ravel(),
+            np.asarray(thrust_SL).ravel(),
+            np.asarray(efficiency_SL),
+            kx=3,
+            ky=3,
+            s=0,
+        )
+        self.propeller_efficiency_CL = RectBivariateSpline(
+            np.asarray(speed_CL).ravel(),
+            np.asarray(thrust_CL).ravel(),
+            np.asarray(efficiency_CL),
+            kx=3,
+            ky=3,
+            s=0,
+        )
+
         # Evaluate engine volume based on max power @ 0.0m
-        rpm_vect, _, pme_limit_vect, _ = self.read_map(self.map_file_path)
+        engine_map = self.get_engine_map(self.map_file_path)
+        rpm_vect = engine_map["rpm"]
+        pme_limit_vect = engine_map["pme_limit"]
         volume = self.max_power / np.max(
             pme_limit_vect * 1e5 * rpm_vect / 240.0
         )  # conversion rpm to rad/s included
@@ -180,6 +207,47 @@ class BasicICEngine(AbstractFuelPropulsion):
 
         return rpm_vect, pme_vect, pme_limit_vect, sfc_matrix
 
+    @staticmethod
+    def get_engine_map(map_file_path: str, volume: Optional[float] = None) -> dict:
+        """
+        Memoized access to the engine map: the file is read once per process (and again only if modified) and
+        the interpolators are built once per engine volume.
+
+        :param map_file_path: path of the engine map .csv file
+        :param volume: engine displacement volume (in m**3), if None only the raw map is returned
+        :return: dictionary with rpm, pme, pme_limit and sfc map vectors, and for a given volume the maximum
+        power vector (in W) and the sfc interpolator taking rpm and torque (in N.m) as arguments
+        """
+        if volume is not None:
+            volume = float(volume)
+        key = (pth.abspath(map_file_path), os.stat(map_file_path).st_mtime_ns, volume)
+        engine_map = _ENGINE_MAP_CACHE.get(key)
+        if engine_map is None:
+            if volume is None:
+                rpm_vect, pme_vect, pme_limit_vect, sfc_matrix = BasicICEngine.read_map(
+                    map_file_path
+                )
+                engine_map = {
+                    "rpm": rpm_vect,
+                    "pme": pme_vect,
+                    "pme_limit": pme_limit_vect,
+                    "sfc": sfc_matrix,
+                }
+            else:
+                engine_map = dict(BasicICEngine.get_engine_map(map_file_path))
+                torque_vect = engine_map["pme"] * 1e5 * volume / (8.0 * np.pi)
+                torque_limit_vect = engine_map["pme_limit"] * 1e5 * volume / (8.0 * np.pi)
+                engine_map["power_max"] = torque_limit_vect * engine_map["rpm"] * (np.pi / 30.0)
+                # Same interpolation as a cubic interp2d on the regular (torque, rpm) grid
+                engine_map["sfc_interpolator"] = RectBivariateSpline(
+                    engine_map["rpm"], torque_vect, engine_map["sfc"], kx=3, ky=3, s=0
+                )
+            if len(_ENGINE_MAP_CACHE) >= ENGINE_MAP_CACHE_SIZE:
+                del _ENGINE_MAP_CACHE[next(iter(_ENGINE_MAP_CACHE))]
+            _ENGINE_MAP_CACHE[key] = engine_map
+
+        return engine_map
+
     def compute_flight_points(self, flight_points: FlightPoint):
         # pylint: disable=too-many-arguments  # they define the trajectory
         self.specific_shape = np.shape(flight_points.mach)
@@ -393,56 +461,45 @@ class BasicICEngine(AbstractFuelPropulsion):
         :return: efficiency
         """
 
-        propeller_efficiency_SL = interp2d(
-            self.thrust_SL, self.speed_SL, self.efficiency_SL, kind="cubic"
+        propeller_efficiency = self._propeller_efficiency(
+            thrust, atmosphere.true_airspeed, atmosphere.get_altitude(altitude_in_feet=False)
         )
-        propeller_efficiency_CL = interp2d(
-            self.thrust_CL, self.speed_CL, self.efficiency_CL, kind="cubic"
-        )
-        if isinstance(atmosphere.true_airspeed, float):
-            thrust_interp_SL = np.minimum(
-                np.maximum(np.min(self.thrust_SL), thrust),
-                np.interp(atmosphere.true_airspeed, self.speed_SL, self.thrust_limit_SL),
-            )
-            thrust_interp_CL = np.minimum(
-                np.maximum(np.min(self.thrust_CL), thrust),
-                np.interp(atmosphere.true_airspeed, self.speed_CL, self.thrust_limit_CL),
-            )
-        else:
-            thrust_interp_SL = np.minimum(
-                np.maximum(np.min(self.thrust_SL), thrust),
-                np.interp(list(atmosphere.true_airspeed), self.speed_SL, self.thrust_limit_SL),
-            )
-            thrust_interp_CL = np.minimum(
-                np.maximum(np.min(self.thrust_CL), thrust),
-                np.interp(list(atmosphere.true_airspeed), self.speed_CL, self.thrust_limit_CL),
-            )
-        if np.size(thrust) == 1:  # calculate for float
-            lower_bound = float(propeller_efficiency_SL(thrust_interp_SL, atmosphere.true_airspeed))
-            upper_bound = float(propeller_efficiency_CL(thrust_interp_CL, atmosphere.true_airspeed))
-            altitude = atmosphere.get_altitude(altitude_in_feet=False)
-            propeller_efficiency = np.interp(
-                altitude, [0, self.cruise_altitude], [lower_bound, upper_bound]
-            )
-        else:  # calculate for array
-            propeller_efficiency = np.zeros(np.size(thrust))
-            for idx in range(np.size(thrust)):
-                lower_bound = propeller_efficiency_SL(
-                    thrust_interp_SL[idx], atmosphere.true_airspeed[idx]
-                )
-                upper_bound = propeller_efficiency_CL(
-                    thrust_interp_CL[idx], atmosphere.true_airspeed[idx]
-                )
-                altitude = atmosphere.get_altitude(altitude_in_feet=False)[idx]
-                propeller_efficiency[idx] = (
-                    lower_bound
-                    + (upper_bound - lower_bound)
-                    * np.minimum(altitude, self.cruise_altitude)
-                    / self.cruise_altitude
-                )
+        if np.size(propeller_efficiency) == 1:  # return float
+            propeller_efficiency = np.ravel(propeller_efficiency)[0]
 
         return propeller_efficiency
 
+    def _propeller_efficiency(
+        self, thrust: np.ndarray, true_airspeed: np.ndarray, altitude: np.ndarray
+    ) -> np.ndarray:
+        """
+        Vectorized computation of the propeller efficiency, inputs are broadcast against each other.
+
+        :param thrust: Thrust (in N)
+        :param true_airspeed: true airspeed (in m/s)
+        :param altitude: altitude (in m)
+        :return: efficiency
+        """
+
+        true_airspeed = np.asarray(true_airspeed)
+        thrust_interp_SL = np.minimum(
+            np.maximum(np.min(self.thrust_SL), thrust),
+            np.interp(true_airspeed, self.speed_SL, self.thrust_limit_SL),
+        )
+        thrust_interp_CL = np.minimum(
+            np.maximum(np.min(self.thrust_CL), thrust),
+            np.interp(true_airspeed, self.speed_CL, self.thrust_limit_CL),
+        )
+        speed_SL, thrust_interp_SL = np.broadcast_arrays(true_airspeed, thrust_interp_SL)
+        speed_CL, thrust_interp_CL = np.broadcast_arrays(true_airspeed, thrust_interp_CL)
+        lower_bound = self.propeller_efficiency_SL.ev(speed_SL, thrust_interp_SL)
+        upper_bound = self.propeller_efficiency_CL.ev(speed_CL, thrust_interp_CL)
+
+        # Linear interpolation between sea level and cruise altitude (bounds are kept outside)
+        altitude_ratio = np.clip(np.asarray(altitude) / self.cruise_altitude, 0.0, 1.0)
+
+        return lower_bound + (upper_bound - lower_bound) * altitude_ratio
+
     def compute_max_power(self, flight_points: FlightPoint) -> Union[float, Sequence]:
         """
         Compute the ICE maximum power @ given flight-point.
@@ -472,10 +529,8 @@ class BasicICEngine(AbstractFuelPropulsion):
         :return: SFC (in g/kw) and Power (in W)
         """
 
-        # Load engine map and save interpolation formula
-        rpm_vect, pme_vect, _, sfc_matrix = self.read_map(self.map_file_path)
-        torque_vect = pme_vect * 1e5 * self.volume / (8.0 * np.pi)
-        ICE_sfc = interp2d(torque_vect, rpm_vect, sfc_matrix, kind="cubic")
+        # Load engine map interpolation formula
+        ICE_sfc = self.get_engine_map(self.map_file_path, self.volume)["sfc_interpolator"]
 
         # Define RPM & mixture using engine settings
         if np.size(engine_setting) == 1:
@@ -489,29 +544,14 @@ class BasicICEngine(AbstractFuelPropulsion):
                 [self.mixture_values[engine_setting[idx]] for idx in range(np.size(engine_setting))]
             )
 
-        # Compute sfc @ 2500RPM
-        real_power = np.zeros(np.size(thrust))
-        torque = np.zeros(np.size(thrust))
-        sfc = np.zeros(np.size(thrust))
-        if np.size(thrust) == 1:
-            real_power = (
-                thrust * atmosphere.true_airspeed / self.propeller_efficiency(thrust, atmosphere)
-            )
-            torque = real_power / (rpm_values * np.pi / 30.0)
-            sfc = ICE_sfc(torque, rpm_values) * mixture_values
-        else:
-            for idx in range(np.size(thrust)):
-                local_atmosphere = Atmosphere(
-                    atmosphere.get_altitude()[idx], altitude_in_feet=False
-                )
-                local_atmosphere.mach = atmosphere.mach[idx]
-                real_power[idx] = (
-                    thrust[idx]
-                    * atmosphere.true_airspeed[idx]
-                    / self.propeller_efficiency(thrust[idx], local_atmosphere)
-                )
-                torque[idx] = real_power[idx] / (rpm_values[idx] * np.pi / 30.0)
-                sfc[idx] = ICE_sfc(torque[idx], rpm_values[idx]) * mixture_values[idx]
+        # Compute sfc @ given RPM (all flight points evaluated at once)
+        real_power = (
+            thrust * atmosphere.true_airspeed / self.propeller_efficiency(thrust, atmosphere)
+        )
+        torque = real_power / (rpm_values * np.pi / 30.0)
+        rpm_values, torque = np.broadcast_arrays(rpm_values, torque)
+        sfc = np.ravel(ICE_sfc.ev(rpm_values, torque)) * mixture_values
+
         return sfc, real_power
 
     def max_thrust(
@@ -526,16 +566,8 @@ class BasicICEngine(AbstractFuelPropulsion):
         """
 
         # Calculate maximum propeller thrust @ given altitude and speed
-        if isinstance(atmosphere.true_airspeed, float):
-            lower_bound = np.interp(atmosphere.true_airspeed, self.speed_SL, self.thrust_limit_SL)
-            upper_bound = np.interp(atmosphere.true_airspeed, self.speed_CL, self.thrust_limit_CL)
-        else:
-            lower_bound = np.interp(
-                list(atmosphere.true_airspeed), self.speed_SL, self.thrust_limit_SL
-            )
-            upper_bound = np.interp(
-                list(atmosphere.true_airspeed), self.speed_CL, self.thrust_limit_CL
-            )
+        lower_bound = np.interp(atmosphere.true_airspeed, self.speed_SL, self.thrust_limit_SL)
+        upper_bound = np.interp(atmosphere.true_airspeed, self.speed_CL, self.thrust_limit_CL)
         altitude = atmosphere.get_altitude(altitude_in_feet=False)
         thrust_max_propeller = (
             lower_bound
@@ -545,9 +577,9 @@ class BasicICEngine(AbstractFuelPropulsion):
         )
 
         # Calculate engine max power @ given RPM & altitude
-        rpm_vect, _, pme_limit_vect, _ = self.read_map(self.map_file_path)
-        torque_vect = pme_limit_vect * 1e5 * self.volume / (8.0 * np.pi)
-        power_max_vect = torque_vect * rpm_vect * (np.pi / 30.0)
+        engine_map = self.get_engine_map(self.map_file_path, self.volume)
+        rpm_vect = engine_map["rpm"]
+        power_max_vect = engine_map["power_max"]
         if np.size(engine_setting) == 1:
             rpm_values = np.array(self.rpm_values[int(engine_setting)])
             max_power_SL = np.interp(rpm_values, rpm_vect, power_max_vect)
@@ -562,70 +594,71 @@ class BasicICEngine(AbstractFuelPropulsion):
         # Found thrust relative to ICE maximum power @ given altitude and speed:
         # calculates first thrust interpolation vector (between min and max of propeller table) and associated
         # efficiency, then calculates power and found thrust (interpolation limits to max propeller thrust)
+        true_airspeed = np.atleast_1d(atmosphere.true_airspeed).ravel()
+        altitude = np.atleast_1d(altitude).ravel()
+        max_power = np.broadcast_to(max_power, np.shape(altitude)).ravel()
         thrust_interp = np.linspace(
             np.min(self.thrust_SL) * np.ones(np.size(thrust_max_propeller)),
-            thrust_max_propeller,
+            np.ravel(thrust_max_propeller),
             10,
         ).transpose()
-        if np.size(altitude) == 1:  # Calculate for float
-            thrust_max_global = 0.0
-            local_atmosphere = Atmosphere(
-                altitude * np.ones(np.size(thrust_interp)), altitude_in_feet=False
+        propeller_efficiency = self._propeller_efficiency(
+            thrust_interp, true_airspeed[:, np.newaxis], altitude[:, np.newaxis]
+        )
+        mechanical_power = thrust_interp * true_airspeed[:, np.newaxis] / propeller_efficiency
+
+        # Interpolate thrust at max power on each (increasing) mechanical power vector
+        thrust_max_global = np.zeros(np.size(altitude))
+        in_range = np.min(mechanical_power, axis=1) <= max_power
+        if np.any(in_range):
+            power_in_range = mechanical_power[in_range]
+            thrust_in_range = thrust_interp[in_range]
+            idx_in_range = np.arange(np.size(power_in_range, axis=0))
+            idx_sup = np.clip(
+                np.sum(power_in_range <= max_power[in_range, np.newaxis], axis=1),
+                1,
+                np.size(power_in_range, axis=1) - 1,
             )
-            local_atmosphere.mach = atmosphere.mach * np.ones(np.size(thrust_interp))
-            propeller_efficiency = self.propeller_efficiency(thrust_interp[0], local_atmosphere)
-            mechanical_power = thrust_interp[0] * atmosphere.true_airspeed / propeller_efficiency
-            if np.min(mechanical_power) > max_power:
-                efficiency_relative_error = 1
-                propeller_efficiency = propeller_efficiency[0]
-                while efficiency_relative_error > 1e-2:
-                    thrust_max_global = max_power * propeller_efficiency / atmosphere.true_airspeed
-                    propeller_efficiency_new = self.propeller_efficiency(
-                        thrust_max_global, atmosphere
-                    )
-                    efficiency_relative_error = np.abs(
-                        (propeller_efficiency_new - propeller_efficiency)
-                        / efficiency_relative_error
-                    )
-                    propeller_efficiency = propeller_efficiency_new
-            else:
-                thrust_max_global = np.interp(max_power, mechanical_power, thrust_interp[0])
-        else:  # Calculate for array
-            thrust_max_global = np.zeros(np.size(altitude))
-            for idx in range(np.size(altitude)):
-                local_atmosphere = Atmosphere(
-                    altitude[idx] * np.ones(np.size(thrust_interp[idx])), altitude_in_feet=False
+            power_inf = power_in_range[idx_in_range, idx_sup - 1]
+            power_sup = power_in_range[idx_in_range, idx_sup]
+            thrust_inf = thrust_in_range[idx_in_range, idx_sup - 1]
+            thrust_sup = thrust_in_range[idx_in_range, idx_sup]
+            thrust_max_global[in_range] = np.where(
+                max_power[in_range] >= power_sup,
+                thrust_sup,
+                thrust_inf
+                + (thrust_sup - thrust_inf)
+                * (max_power[in_range] - power_inf)
+                / (power_sup - power_inf),
+            )
+
+        # Where even the lowest thrust needs more than max power, take the lower bound efficiency for calculation
+        # and iterate on efficiency
+        out_of_range = np.logical_not(in_range)
+        if np.any(out_of_range):
+            efficiency_relative_error = np.ones(np.size(altitude))
+            propeller_efficiency = propeller_efficiency[:, 0]
+            not_converged = out_of_range
+            while np.any(not_converged):
+                thrust_max_global[not_converged] = (
+                    max_power[not_converged]
+                    * propeller_efficiency[not_converged]
+                    / true_airspeed[not_converged]
                 )
-                local_atmosphere.mach = atmosphere.mach[idx] * np.ones(np.size(thrust_interp[idx]))
-                propeller_efficiency = self.propeller_efficiency(
-                    thrust_interp[idx], local_atmosphere
+                propeller_efficiency_new = self._propeller_efficiency(
+                    thrust_max_global[not_converged],
+                    true_airspeed[not_converged],
+                    altitude[not_converged],
                 )
-                mechanical_power = (
-                    thrust_interp[idx] * atmosphere.true_airspeed[idx] / propeller_efficiency
+                efficiency_relative_error[not_converged] = np.abs(
+                    (propeller_efficiency_new - propeller_efficiency[not_converged])
+                    / efficiency_relative_error[not_converged]
                 )
-                if (
-                    np.min(mechanical_power) > max_power[idx]
-                ):  # take the lower bound efficiency for calculation
-                    efficiency_relative_error = 1
-                    local_atmosphere = Atmosphere(altitude[idx], altitude_in_feet=False)
-                    local_atmosphere.mach = atmosphere.mach[idx]
-                    propeller_efficiency = propeller_efficiency[0]
-                    while efficiency_relative_error > 1e-2:
-                        thrust_max_global[idx] = (
-                            max_power[idx] * propeller_efficiency / atmosphere.true_airspeed[idx]
-                        )
-                        propeller_efficiency_new = self.propeller_efficiency(
-                            thrust_max_global[idx], local_atmosphere
-                        )
-                        efficiency_relative_error = np.abs(
-                            (propeller_efficiency_new - propeller_efficiency)
-                            / efficiency_relative_error
-                        )
-                        propeller_efficiency = propeller_efficiency_new
-                else:
-                    thrust_max_global[idx] = np.interp(
-                        max_power[idx], mechanical_power, thrust_interp[idx]
-                    )
+                propeller_efficiency[not_converged] = propeller_efficiency_new
+                not_converged = out_of_range & (efficiency_relative_error > 1e-2)
+
+        if np.size(thrust_max_global) == 1:  # return float
+            thrust_max_global = thrust_max_global[0]
 
         return thrust_max_global
 
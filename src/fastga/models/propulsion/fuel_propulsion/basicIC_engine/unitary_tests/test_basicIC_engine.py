@@ -15,13 +15,18 @@ Test module for basicIC_engine.py
 #  You should have received a copy of the GNU General Public License
 #  along with this program.  If not, see <https://www.gnu.org/licenses/>.
 
+import logging
+import time
+
 import numpy as np
 import pandas as pd
 
-from fastoad.model_base import FlightPoint
+from fastoad.model_base import FlightPoint, Atmosphere
 from fastoad.constants import EngineSetting
 
-from ..basicIC_engine import BasicICEngine
+from ..basicIC_engine import BasicICEngine, _ENGINE_MAP_CACHE
+
+_LOGGER = logging.getLogger(__name__)
 
 THRUST_SL = np.array(
     [
@@ -834,7 +839,7 @@ def test_compute_flight_points():
         EngineSetting.IDLE,
         EngineSetting.CRUISE,
     ]  # mix EngineSetting with integers
-    expected_sfc = [2.41416580e-16, 1.35684586e-05, 1.35684586e-05, 1.96216640e-05, 1.50682721e-05]
+    expected_sfc = [2.41416580e-16, 1.35684586e-05, 1.35684586e-05, 2.05397179e-05, 1.50682721e-05]
 
     flight_points = FlightPoint(
         mach=machs + machs,
@@ -850,6 +855,163 @@ def test_compute_flight_points():
     np.testing.assert_allclose(flight_points.thrust, thrusts + thrusts, rtol=1e-4)
 
 
+def test_engine_map_cache(monkeypatch):
+    # BasicICEngine(max_power(W), design_altitude(m), design_speed(m/s), fuel_type, strokes_nb, prop_layout)
+    engine = BasicICEngine(
+        130000.0,
+        2400.0,
+        81.0,
+        1.0,
+        4.0,
+        1.0,
+        SPEED,
+        THRUST_SL,
+        THRUST_SL_LIMIT,
+        EFFICIENCY_SL,
+        SPEED,
+        THRUST_CL,
+        THRUST_CL_LIMIT,
+        EFFICIENCY_CL,
+    )  # load a 4-strokes 130kW gasoline engine
+
+    # Map reading and interpolator build are done once, next calls are lookups
+    read_map = BasicICEngine.read_map
+    read_map_calls = []
+
+    def counted_read_map(map_file_path):
+        read_map_calls.append(map_file_path)
+        return read_map(map_file_path)
+
+    monkeypatch.setattr(BasicICEngine, "read_map", staticmethod(counted_read_map))
+    _ENGINE_MAP_CACHE.clear()
+    engine_map = engine.get_engine_map(engine.map_file_path, engine.volume)
+    assert len(read_map_calls) == 1
+    for _ in range(100):
+        assert engine.get_engine_map(engine.map_file_path, engine.volume) is engine_map
+    assert len(read_map_calls) == 1
+
+    # The map read is shared by the engine volumes
+    other_engine_map = engine.get_engine_map(engine.map_file_path, 2.0 * engine.volume)
+    assert other_engine_map is not engine_map
+    assert other_engine_map["rpm"] is engine_map["rpm"]
+    assert len(read_map_calls) == 1
+
+    # Vectorized evaluation gives the same result as point by point evaluation
+    machs = np.linspace(0.1, 0.4, 20)
+    altitudes = np.linspace(0.0, 2400.0, 20)
+    thrust_rates = np.linspace(0.2, 0.9, 20)
+    flight_points = FlightPoint(
+        mach=machs,
+        altitude=altitudes,
+        engine_setting=np.full(20, EngineSetting.CRUISE),
+        thrust_rate=thrust_rates,
+    )
+    engine.compute_flight_points(flight_points)
+    for idx in range(20):
+        flight_point = FlightPoint(
+            mach=machs[idx],
+            altitude=altitudes[idx],
+            engine_setting=EngineSetting.CRUISE,
+            thrust_rate=thrust_rates[idx],
+        )
+        engine.compute_flight_points(flight_point)
+        np.testing.assert_allclose(flight_points.sfc[idx], flight_point.sfc, rtol=1e-6)
+
+
+def test_engine_map_benchmark():
+    # BasicICEngine(max_power(W), design_altitude(m), design_speed(m/s), fuel_type, strokes_nb, prop_layout)
+    engine = BasicICEngine(
+        130000.0,
+        2400.0,
+        81.0,
+        1.0,
+        4.0,
+        1.0,
+        SPEED,
+        THRUST_SL,
+        THRUST_SL_LIMIT,
+        EFFICIENCY_SL,
+        SPEED,
+        THRUST_CL,
+        THRUST_CL_LIMIT,
+        EFFICIENCY_CL,
+    )  # load a 4-strokes 130kW gasoline engine
+
+    # Micro-benchmark on scalar flight points, with the map read at each call (empty cache) or
+    # once: durations depend on the machine and are only logged
+    flight_points = [
+        FlightPoint(
+            mach=mach, altitude=1000.0, engine_setting=EngineSetting.CRUISE, thrust_rate=0.8
+        )
+        for mach in np.linspace(0.1, 0.4, 200)
+    ]
+    start = time.time()
+    for flight_point in flight_points:
+        _ENGINE_MAP_CACHE.clear()
+        engine.compute_flight_points(flight_point)
+    duration_no_cache = time.time() - start
+    start = time.time()
+    for flight_point in flight_points:
+        engine.compute_flight_points(flight_point)
+    duration_cache = time.time() - start
+    _LOGGER.info(
+        "200 scalar flight points computed in %.3fs without engine map cache, %.3fs with it",
+        duration_no_cache,
+        duration_cache,
+    )
+
+
+def test_max_thrust():
+    # BasicICEngine(max_power(W), design_altitude(m), design_speed(m/s), fuel_type, strokes_nb, prop_layout)
+    engine = BasicICEngine(
+        130000.0,
+        2400.0,
+        81.0,
+        1.0,
+        4.0,
+        1.0,
+        SPEED,
+        THRUST_SL,
+        THRUST_SL_LIMIT,
+        EFFICIENCY_SL,
+        SPEED,
+        THRUST_CL,
+        THRUST_CL_LIMIT,
+        EFFICIENCY_CL,
+    )  # load a 4-strokes 130kW gasoline engine
+
+    # Array evaluation gives the same result as point by point evaluation, both when max thrust is
+    # limited by the propeller and by the engine power
+    altitudes = np.array([0.0, 0.0, 1000.0, 2400.0, 4000.0])
+    machs = np.array([1e-12, 0.1, 0.2, 0.3, 0.4])
+    engine_settings = np.array(
+        [
+            EngineSetting.TAKEOFF,
+            EngineSetting.TAKEOFF,
+            EngineSetting.CLIMB,
+            EngineSetting.CRUISE,
+            EngineSetting.IDLE,
+        ]
+    )
+    for max_power in [130000.0, 3000.0]:
+        engine.max_power = max_power
+        engine.volume = max_power / np.max(
+            engine.get_engine_map(engine.map_file_path)["pme_limit"]
+            * 1e5
+            * engine.get_engine_map(engine.map_file_path)["rpm"]
+            / 240.0
+        )
+        atmosphere = Atmosphere(altitudes, altitude_in_feet=False)
+        atmosphere.mach = machs
+        max_thrust = engine.max_thrust(engine_settings, atmosphere)
+        for idx in range(np.size(altitudes)):
+            atmosphere = Atmosphere(altitudes[idx], altitude_in_feet=False)
+            atmosphere.mach = machs[idx]
+            np.testing.assert_allclose(
+                max_thrust[idx], engine.max_thrust(engine_settings[idx], atmosphere), rtol=1e-9
+            )
+
+
 def test_engine_weight():
     # BasicICEngine(max_power(W), design_altitude(m), design_speed(m/s), fuel_type, strokes_nb, prop_layout)
     _50kw_engine = BasicICEngine(
@@ -16,6 +16,7 @@ Convenience functions for helping tests
 
 import logging
 import os.path as pth
+import numpy as np
 import openmdao.api as om
 from typing import Union, List
 import time
@@ -62,6 +63,31 @@ def run_system(
     return problem
 
 
+def check_partials(
+    problem: om.Problem, rtol: float = 1e-5, atol: float = 1e-8, excluded_inputs: List[str] = None,
+):
+    """
+    Checks that the analytic partials of the components of a problem run with run_system match
+    their central finite differences approximation.
+
+    :param excluded_inputs: inputs the outputs are not differentiable with respect to (integer
+    values, flags...), not checked
+    """
+    data = problem.check_partials(out_stream=None, form="central", step=1e-6)
+    for component_name, component_data in data.items():
+        for (output_name, input_name), pair_data in component_data.items():
+            if excluded_inputs and input_name in excluded_inputs:
+                continue
+            np.testing.assert_allclose(
+                pair_data["J_fwd"],
+                pair_data["J_fd"],
+                rtol=rtol,
+                atol=atol,
+                err_msg="Partials of %s with respect to %s in %s"
+                % (output_name, input_name, component_name),
+            )
+
+
 # FIXME: problem to be solved on the register
 def register_wrappers():
     """ Register all the wrappers from models """